@@ -559,12 +559,13 @@ def document():
 @click.option('--basket-id', required=True, help='Basket ID')
 @click.option('--limit', type=int, help='Maximum number of documents to return (pagination)')
 @click.option('--offset', type=int, default=0, help='Number of documents to skip (pagination)')
+@click.option('--cursor', help="Resume after this cursor (keyset pagination); use '' for the first page")
 @click.option('--order-by', type=click.Choice(['name', 'created_at', 'updated_at', 'size', 'status']), help='Field to sort by')
 @click.option('--order-desc', is_flag=True, help='Sort in descending order')
 @click.option('--status', help='Filter by document status')
 @click.option('--document-type', help='Filter by document type')
 @click.option('--format', type=click.Choice(['table', 'json', 'simple']), default='table', help='Output format')
-def list_documents(tenant_id, basket_id, limit, offset, order_by, order_desc, status, document_type, format):
+def list_documents(tenant_id, basket_id, limit, offset, cursor, order_by, order_desc, status, document_type, format):
     """
     List documents in a basket with pagination, sorting, and filtering.
     
@@ -585,6 +586,12 @@ def list_documents(tenant_id, basket_id, limit, offset, order_by, order_desc, st
     \b
     # List newest first
     docex document list --basket-id bas_123 --order-by created_at --order-desc
+    
+    \b
+    # Cursor pagination (constant cost per page): start with an empty cursor,
+    # then pass the printed "Next cursor" to fetch the following page
+    docex document list --basket-id bas_123 --limit 100 --order-desc --cursor ''
+    docex document list --basket-id bas_123 --limit 100 --order-desc --cursor <next>
     """
     try:
         from docex.context import UserContext
@@ -601,14 +608,25 @@ def list_documents(tenant_id, basket_id, limit, offset, order_by, order_desc, st
             raise click.Abort()
         
         # Get documents with filters
-        docs = basket.list_documents(
-            limit=limit,
-            offset=offset,
-            order_by=order_by,
-            order_desc=order_desc,
-            status=status,
-            document_type=document_type
-        )
+        next_cursor = None
+        if cursor is not None:
+            docs, next_cursor = basket.list_documents_page(
+                page_size=limit or 100,
+                after=cursor or None,
+                order_by=order_by or 'created_at',
+                order_desc=order_desc,
+                status=status,
+                document_type=document_type
+            )
+        else:
+            docs = basket.list_documents(
+                limit=limit,
+                offset=offset,
+                order_by=order_by,
+                order_desc=order_desc,
+                status=status,
+                document_type=document_type
+            )
         
         if format == 'json':
             import json
@@ -619,10 +637,15 @@ def list_documents(tenant_id, basket_id, limit, offset, order_by, order_desc, st
                 'status': d.status,
                 'created_at': d.created_at.isoformat() if d.created_at else None
             } for d in docs]
-            click.echo(json.dumps(doc_data, indent=2))
+            if cursor is not None:
+                click.echo(json.dumps({'documents': doc_data, 'next_cursor': next_cursor}, indent=2))
+            else:
+                click.echo(json.dumps(doc_data, indent=2))
         elif format == 'simple':
             for doc in docs:
                 click.echo(f"{doc.id}\t{doc.name}")
+            if next_cursor:
+                click.echo(f"next_cursor\t{next_cursor}")
         else:
             click.echo(f"\nFound {len(docs)} document(s):\n")
             if docs:
@@ -633,7 +656,9 @@ def list_documents(tenant_id, basket_id, limit, offset, order_by, order_desc, st
                     click.echo(f"{doc.id:<40} {doc.name:<30} {size_str:<10} {doc.status:<15}")
             
             # Show pagination info if limit is set
-            if limit:
+            if cursor is not None:
+                click.echo(f"\nNext cursor: {next_cursor}" if next_cursor else "\nNo more documents.")
+            elif limit:
                 total = basket.count_documents(status=status, document_type=document_type)
                 total_pages = (total + limit - 1) // limit if limit > 0 else 1
                 current_page = (offset // limit) + 1 if limit > 0 else 1
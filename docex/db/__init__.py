@@ -1,7 +1,8 @@
-from docex.db.connection import Database
+from docex.db.audit_writer import AuditWriter
+from docex.db.connection import Database, EngineRegistry
 from docex.db.tenant_database_manager import TenantDatabaseManager
 from docex.db.tenant_registry_model import TenantRegistry
 from docex.db.schema_resolver import SchemaResolver
 
-__all__ = ['Database', 'TenantDatabaseManager', 'TenantRegistry', 'SchemaResolver']
+__all__ = ['AuditWriter', 'Database', 'EngineRegistry', 'TenantDatabaseManager', 'TenantRegistry', 'SchemaResolver']
 
@@ -0,0 +1,390 @@
+"""
+Buffered audit writer for DocEX
+
+Operation, ProcessingOperation and RouteOperation rows are bookkeeping: a
+processor used to look up its ``Processor`` row, INSERT, COMMIT and refresh
+an operation twice per document, so auditing doubled the write load of
+every pipeline. The AuditWriter instead
+
+- caches processor ids (one lookup per processor name and process)
+- buffers audit rows in memory, with ids and timestamps assigned when the
+  event happens
+- folds updates of a still-buffered row into its INSERT (an ``in_progress``
+  row finished before the flush is written once, with its final status)
+- flushes with one multi-row INSERT per table when ``max_rows`` rows are
+  buffered, ``flush_interval`` seconds after the oldest one, at batch end
+  (flush()) and at interpreter exit
+- keeps rows whose write failed for a transient reason (e.g. the database
+  is briefly unavailable) buffered for the next flush, ``max_retries``
+  times; only rows that violate a constraint are dropped at once
+
+Callers that need the row in the database before they continue pass
+``sync=True``. Readers of audit tables call flush() first so they see their
+own writes.
+"""
+
+import atexit
+import logging
+import os
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+logger = logging.getLogger(__name__)
+
+
+class AuditWriter:
+    """
+    Buffers audit rows for one database and writes them in batches.
+
+    Use AuditWriter.for_database(db) to share one writer per database (and
+    tenant) within a process.
+    """
+
+    _writers: Dict[int, 'AuditWriter'] = {}
+    _registry_lock = threading.Lock()
+
+    def __init__(
+        self,
+        db: Any,
+        max_rows: int = 500,
+        flush_interval: Optional[float] = 1.0,
+        max_retries: int = 3,
+    ):
+        """
+        Initialize audit writer
+
+        Args:
+            db: DocEX Database the rows are written to
+            max_rows: Buffered rows (inserts and updates) that trigger a flush
+            flush_interval: Seconds after which buffered rows are flushed by a
+                background timer (None: only on size, flush() and exit)
+            max_retries: Further flushes that retry a row whose write failed
+                for a reason other than a constraint violation
+        """
+        if max_rows <= 0:
+            raise ValueError("max_rows must be positive")
+        if flush_interval is not None and flush_interval <= 0:
+            raise ValueError("flush_interval must be positive")
+        if max_retries < 0:
+            raise ValueError("max_retries must not be negative")
+        self.db = db
+        self.max_rows = max_rows
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self._inserts: Dict[Type, Dict[str, Dict[str, Any]]] = {}
+        self._updates: Dict[Type, Dict[str, Dict[str, Any]]] = {}
+        # Failed writes per (model, row id) of rows buffered for a retry;
+        # only touched while holding _write_lock
+        self._attempts: Dict[Tuple[Type, str], int] = {}
+        self._processor_ids: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        # Serialises writes so an UPDATE never overtakes the INSERT of its row
+        self._write_lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+
+    @classmethod
+    def for_database(cls, db: Any) -> 'AuditWriter':
+        """The process-wide writer for a database (one per engine)"""
+        key = id(getattr(db, 'engine', None) or db)
+        writer = cls._writers.get(key)
+        if writer is not None:
+            return writer
+        with cls._registry_lock:
+            writer = cls._writers.get(key)
+            if writer is None:
+                writer = cls(db)
+                cls._writers[key] = writer
+            return writer
+
+    @classmethod
+    def flush_all(cls) -> None:
+        """Flush every writer of this process"""
+        for writer in list(cls._writers.values()):
+            writer.flush()
+
+    @property
+    def pending(self) -> int:
+        """Buffered rows not written yet"""
+        with self._lock:
+            return self._count()
+
+    def add(self, model: Type, values: Dict[str, Any], sync: bool = False) -> Dict[str, Any]:
+        """
+        Buffer a new audit row
+
+        Args:
+            model: Audit model class (Operation, ProcessingOperation, RouteOperation)
+            values: Column values; ``id`` and ``created_at`` are filled in
+                when missing
+            sync: Write it (and everything buffered before it) now
+
+        Returns:
+            The row's column values, including its id
+        """
+        from docex.db.models import generate_id
+
+        row = dict(values)
+        if not row.get('id'):
+            row['id'] = generate_id(model)
+        row.setdefault('created_at', datetime.now(timezone.utc))
+        with self._lock:
+            self._inserts.setdefault(model, {})[row['id']] = row
+        self._buffered(sync)
+        return dict(row)
+
+    def update(self, model: Type, row_id: str, values: Dict[str, Any], sync: bool = False) -> None:
+        """
+        Change columns of an audit row
+
+        An update of a row that is still buffered is merged into its INSERT;
+        otherwise it is written by primary key at the next flush. Values
+        replace columns as a whole (merge JSON ``details`` before calling).
+        """
+        with self._lock:
+            pending = self._inserts.get(model, {}).get(row_id)
+            if pending is not None:
+                pending.update(values)
+            else:
+                self._updates.setdefault(model, {}).setdefault(row_id, {'id': row_id}).update(values)
+        self._buffered(sync)
+
+    def processor_id(self, name: str, config: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Database id of a processor, registering it on first use
+
+        The id is cached, so recording an operation does not look it up again.
+        """
+        processor_id = self._processor_ids.get(name)
+        if processor_id is not None:
+            return processor_id
+
+        from sqlalchemy import select
+        from sqlalchemy.exc import IntegrityError
+
+        from docex.db.models import Processor
+
+        query = select(Processor.id).where(Processor.name == name)
+        with self.db.session() as session:
+            processor_id = session.execute(query).scalar_one_or_none()
+            if processor_id is None:
+                processor = Processor(
+                    name=name,
+                    type='custom',
+                    description=f'Auto-registered processor: {name}',
+                    config=config or {},
+                    enabled=True
+                )
+                session.add(processor)
+                try:
+                    session.commit()
+                    processor_id = processor.id
+                except IntegrityError:
+                    # Registered concurrently by another process
+                    session.rollback()
+                    processor_id = session.execute(query).scalar_one()
+        self._processor_ids[name] = processor_id
+        return processor_id
+
+    def flush(self) -> None:
+        """Write every buffered row (one INSERT per table, then the updates)"""
+        with self._write_lock:
+            with self._lock:
+                inserts, self._inserts = self._inserts, {}
+                updates, self._updates = self._updates, {}
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+            if inserts or updates:
+                self._write(inserts, updates)
+
+    def _count(self) -> int:
+        return sum(len(rows) for rows in self._inserts.values()) + sum(
+            len(rows) for rows in self._updates.values()
+        )
+
+    def _buffered(self, sync: bool) -> None:
+        """Flush when asked to or over max_rows, else make sure a timed flush is scheduled"""
+        with self._lock:
+            full = self._count() >= self.max_rows
+            if not (sync or full):
+                self._schedule()
+        if sync:
+            # Errors reach callers that need the row
+            self._flush_or_raise()
+        elif full:
+            self.flush()
+
+    def _schedule(self) -> None:
+        # Called with self._lock held
+        if self.flush_interval is not None and self._timer is None:
+            self._timer = threading.Timer(self.flush_interval, self._timed_flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _timed_flush(self) -> None:
+        with self._lock:
+            self._timer = None
+        self.flush()
+
+    def _flush_or_raise(self) -> None:
+        with self._write_lock:
+            with self._lock:
+                inserts, self._inserts = self._inserts, {}
+                updates, self._updates = self._updates, {}
+            self._write(inserts, updates, raise_errors=True)
+
+    def _write(
+        self,
+        inserts: Dict[Type, Dict[str, Dict[str, Any]]],
+        updates: Dict[Type, Dict[str, Dict[str, Any]]],
+        raise_errors: bool = False,
+    ) -> None:
+        """
+        Write a batch in one transaction
+
+        When the database is unreachable or busy the whole batch is buffered
+        again (see _retry_later). Any other failure is isolated by writing
+        the batch row by row: rows that violate a constraint are dropped,
+        the others are buffered again.
+        """
+        from sqlalchemy.exc import DisconnectionError, IntegrityError, InterfaceError, OperationalError
+        from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+        unavailable = (OperationalError, InterfaceError, DisconnectionError, PoolTimeoutError)
+        try:
+            with self.db.session() as session:
+                for model, rows in inserts.items():
+                    self._insert(session, model, list(rows.values()))
+                for model, rows in updates.items():
+                    self._update(session, model, list(rows.values()))
+                session.commit()
+            self._written(inserts, updates)
+            return
+        except unavailable as e:
+            self._retry_later(inserts, updates, e)
+            if raise_errors:
+                raise
+            return
+        except Exception as e:
+            logger.warning(f"Batched audit write failed, retrying row by row: {e}")
+
+        error: Optional[Exception] = None
+        stopped = False
+        retry_inserts: Dict[Type, Dict[str, Dict[str, Any]]] = {}
+        retry_updates: Dict[Type, Dict[str, Dict[str, Any]]] = {}
+        for batch, retry, write in ((inserts, retry_inserts, self._insert), (updates, retry_updates, self._update)):
+            for model, rows in batch.items():
+                for row_id, row in rows.items():
+                    if stopped:
+                        # The database stopped accepting writes; keep the rest for the next flush
+                        retry.setdefault(model, {})[row_id] = row
+                        continue
+                    try:
+                        with self.db.session() as session:
+                            write(session, model, [row])
+                            session.commit()
+                        self._attempts.pop((model, row_id), None)
+                    except IntegrityError as e:
+                        # e.g. the document was deleted before the flush
+                        logger.error(f"Dropped audit row {row_id}: {e}")
+                        self._attempts.pop((model, row_id), None)
+                        error = e
+                    except Exception as e:
+                        retry.setdefault(model, {})[row_id] = row
+                        stopped = isinstance(e, unavailable)
+                        error = e
+        if retry_inserts or retry_updates:
+            self._retry_later(retry_inserts, retry_updates, error)
+        if error is not None and raise_errors:
+            raise error
+
+    def _retry_later(
+        self,
+        inserts: Dict[Type, Dict[str, Dict[str, Any]]],
+        updates: Dict[Type, Dict[str, Dict[str, Any]]],
+        error: Exception,
+    ) -> None:
+        """Buffer rows of a failed write again, dropping those out of retries"""
+        dropped: List[str] = []
+        kept = 0
+        with self._lock:
+            for batch, buffer in ((inserts, self._inserts), (updates, self._updates)):
+                for model, rows in batch.items():
+                    for row_id, row in rows.items():
+                        attempts = self._attempts.get((model, row_id), 0) + 1
+                        if attempts > self.max_retries:
+                            self._attempts.pop((model, row_id), None)
+                            dropped.append(row_id)
+                            continue
+                        self._attempts[(model, row_id)] = attempts
+                        buffered = buffer.setdefault(model, {})
+                        # Values buffered since the failed flush are newer
+                        buffered[row_id] = {**row, **buffered.get(row_id, {})}
+                        kept += 1
+            # An update buffered since the failed INSERT of its row folds into it
+            for model, rows in inserts.items():
+                pending = self._updates.get(model, {})
+                for row_id in rows:
+                    if row_id in pending and row_id in self._inserts.get(model, {}):
+                        self._inserts[model][row_id].update(pending.pop(row_id))
+            if kept:
+                self._schedule()
+        if kept:
+            logger.warning(f"Audit write failed, {kept} rows kept for the next flush: {error}")
+        for row_id in dropped:
+            logger.error(f"Dropped audit row {row_id} after {self.max_retries} retries: {error}")
+
+    def _written(
+        self,
+        inserts: Dict[Type, Dict[str, Dict[str, Any]]],
+        updates: Dict[Type, Dict[str, Dict[str, Any]]],
+    ) -> None:
+        if self._attempts:
+            for batch in (inserts, updates):
+                for model, rows in batch.items():
+                    for row_id in rows:
+                        self._attempts.pop((model, row_id), None)
+
+    @staticmethod
+    def _insert(session: Any, model: Type, rows: List[Dict[str, Any]]) -> None:
+        from sqlalchemy import insert
+
+        # Core statements on the table: plain executemany, without ORM
+        # bookkeeping (or evaluating the model's hybrid attributes). One
+        # statement per set of given columns, so omitted columns keep their
+        # defaults instead of being written as NULL
+        table = model.__table__
+        for group in AuditWriter._by_columns(rows).values():
+            session.execute(insert(table), group)
+
+    @staticmethod
+    def _update(session: Any, model: Type, rows: List[Dict[str, Any]]) -> None:
+        from sqlalchemy import bindparam, update
+
+        # UPDATE by primary key; one statement per set of changed columns
+        table = model.__table__
+        statement = update(table).where(table.c.id == bindparam('row_id'))
+        for group in AuditWriter._by_columns(rows).values():
+            session.execute(statement, [
+                {'row_id': row['id'], **{column: value for column, value in row.items() if column != 'id'}}
+                for row in group
+            ])
+
+    @staticmethod
+    def _by_columns(rows: List[Dict[str, Any]]) -> Dict[Tuple[str, ...], List[Dict[str, Any]]]:
+        groups: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+        for row in rows:
+            groups.setdefault(tuple(sorted(row)), []).append(row)
+        return groups
+
+
+def _reset_after_fork() -> None:
+    # A child process must not write rows buffered by its parent
+    AuditWriter._writers = {}
+    AuditWriter._registry_lock = threading.Lock()
+
+
+atexit.register(AuditWriter.flush_all)
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
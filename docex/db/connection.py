@@ -1,8 +1,20 @@
 import logging
+import threading
 import time
 from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Dict, Generator, List, Optional, Type, TypeVar, Union
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
 
 from sqlalchemy import MetaData, create_engine, event, inspect, text
 from sqlalchemy.exc import SQLAlchemyError
@@ -32,6 +44,82 @@ def get_base() -> Type:
     """
     return Base
 
+class _EngineEntry:
+    """Shared engine, session factory and schema state for one database."""
+
+    def __init__(self, engine: Any):
+        self.engine = engine
+        self.session_factory = sessionmaker(
+            bind=engine,
+            expire_on_commit=False,
+            autocommit=False,
+            autoflush=False
+        )
+        self.schema_verified = False
+        self.lock = threading.Lock()
+
+
+class EngineRegistry:
+    """
+    Process-wide registry of SQLAlchemy engines.
+
+    ``Database()`` is constructed on many hot paths (baskets, metadata
+    service, documents, routes). Without sharing, each construction built a
+    new QueuePool, ran ``SELECT 1`` and re-ran ``create_all``/``inspect``.
+    The registry hands out one engine and one sessionmaker per resolved
+    database URL and tenant, so those paths reuse pooled connections.
+    """
+
+    _entries: Dict[Tuple[str, Optional[str]], _EngineEntry] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_or_create(
+        cls,
+        url: str,
+        tenant_id: Optional[str],
+        factory: Callable[[], Any],
+    ) -> _EngineEntry:
+        """
+        Get the entry for ``(url, tenant_id)``, creating the engine if needed.
+
+        Args:
+            url: Resolved database URL
+            tenant_id: Tenant identifier (None for single-tenant databases)
+            factory: Callable creating a connected engine; invoked at most once per key
+
+        Returns:
+            Shared registry entry
+        """
+        key = (url, tenant_id)
+        entry = cls._entries.get(key)
+        if entry is not None:
+            return entry
+        with cls._lock:
+            # Double-check after acquiring lock
+            entry = cls._entries.get(key)
+            if entry is None:
+                entry = _EngineEntry(factory())
+                cls._entries[key] = entry
+                logger.debug(f"Registered database engine for tenant {tenant_id or 'default'}")
+            return entry
+
+    @classmethod
+    def discard(cls, url: str) -> None:
+        """Dispose and forget every engine registered for ``url``."""
+        with cls._lock:
+            for key in [key for key in cls._entries if key[0] == url]:
+                cls._entries.pop(key).engine.dispose()
+
+    @classmethod
+    def dispose_all(cls) -> None:
+        """Dispose all registered engines (e.g. after fork or in test teardown)."""
+        with cls._lock:
+            for entry in cls._entries.values():
+                entry.engine.dispose()
+            cls._entries.clear()
+
+
 class Database:
     """
     Database connection manager for DocEX
@@ -91,27 +179,42 @@ class Database:
             # Use tenant-aware database manager
             from docex.db.tenant_database_manager import TenantDatabaseManager
             self.tenant_manager = TenantDatabaseManager()
-            # Check if read_only mode is requested (for status checks)
-            read_only = getattr(self, '_read_only', False)
-            self.engine = self.tenant_manager.get_tenant_engine(tenant_id, read_only=read_only)
-            # Get session factory from tenant manager
-            session_factory = self.tenant_manager._tenant_sessions.get(tenant_id)
-            if session_factory:
-                self.Session = session_factory
-            else:
-                # Create session factory if not already created
-                self.Session = sessionmaker(
-                    bind=self.engine,
-                    expire_on_commit=False,
-                    autocommit=False,
-                    autoflush=False
-                )
+            self._initialize_tenant()
         else:
             # Use standard single-tenant initialization
             self._initialize()
 
+    def _initialize_tenant(self):
+        """Take the engine and session factory for this tenant from the tenant manager."""
+        # Check if read_only mode is requested (for status checks)
+        read_only = getattr(self, '_read_only', False)
+        self.engine = self.tenant_manager.get_tenant_engine(self.tenant_id, read_only=read_only)
+        # Get session factory from tenant manager
+        session_factory = self.tenant_manager._tenant_sessions.get(self.tenant_id)
+        if session_factory:
+            self.Session = session_factory
+        else:
+            # Create session factory if not already created
+            self.Session = sessionmaker(
+                bind=self.engine,
+                expire_on_commit=False,
+                autocommit=False,
+                autoflush=False
+            )
+
+    def _reconnect(self):
+        """Re-resolve the engine and session factory released by close()."""
+        if getattr(self, '_owns_engine', False):
+            self._initialize_system_database()
+        elif getattr(self, 'tenant_manager', None) is not None:
+            self._initialize_tenant()
+        else:
+            self._initialize()
+
     def _initialize_system_database(self):
         """Initialize database for system/bootstrap operations (bypasses tenant manager)."""
+        # This handle builds its own engine instead of sharing a registered one
+        self._owns_engine = True
         # Get database configuration
         db_config = self.config.get('database', {})
         db_type = db_config.get('type', 'sqlite')
@@ -235,7 +338,12 @@ class Database:
         db._initialize()
         return db
     def _initialize(self):
-        """Initialize database connection and session"""
+        """Initialize database connection and session
+
+        Engines and session factories come from :class:`EngineRegistry`, so
+        repeated ``Database()`` construction against the same database reuses
+        one connection pool and only verifies the schema once per process.
+        """
         max_retries = 3
         retry_delay = 1  # seconds
         
@@ -248,39 +356,21 @@ class Database:
                 if db_type == 'sqlite':
                     # Get database path from config
                     db_path = db_config.get('path', 'docex.db')
-                    db_path = Path(db_path)
+                    db_path = Path(db_path).resolve()
+                    connection_url = f'sqlite:///{db_path}'
                     
                     # Ensure directory exists
                     db_path.parent.mkdir(parents=True, exist_ok=True)
                     
                     # Create database file if it doesn't exist
                     if not db_path.exists():
+                        # A pooled engine for a file that has since been removed
+                        # would keep writing to the unlinked inode - start fresh.
+                        EngineRegistry.discard(connection_url)
                         db_path.touch()
                         # Set permissions to 644 (rw-r--r--)
                         db_path.chmod(0o644)
                     
-                    # Create SQLite engine with proper configuration
-                    self.engine = create_engine(
-                        f'sqlite:///{db_path}',
-                        poolclass=QueuePool,
-                        pool_size=5,
-                        max_overflow=10,
-                        pool_timeout=30,
-                        pool_recycle=1800,
-                        connect_args={
-                            'timeout': 30,  # Connection timeout in seconds
-                            'check_same_thread': False  # Allow multiple threads
-                        }
-                    )
-                    
-                    # Enable foreign key support
-                    @event.listens_for(self.engine, "connect")
-                    def set_sqlite_pragma(dbapi_connection, connection_record):
-                        cursor = dbapi_connection.cursor()
-                        cursor.execute("PRAGMA foreign_keys=ON")
-                        cursor.close()
-                    
-                    
                 elif db_type in ['postgresql', 'postgres']:
                     # PostgreSQL configuration
                     from urllib.parse import quote_plus
@@ -308,30 +398,17 @@ class Database:
                     else:
                         sslmode = postgres_config.get('sslmode', 'prefer')
                     connection_url = f'postgresql://{user_encoded}:{password_encoded}@{host}:{port}/{database}?sslmode={sslmode}'
-                    self.engine = create_engine(
-                        connection_url,
-                        poolclass=QueuePool,
-                        pool_size=5,
-                        max_overflow=10,
-                        pool_timeout=30,
-                        pool_recycle=1800
-                    )
+                else:
+                    raise ValueError(f"Unsupported database type: {db_type}")
                 
-                # Test connection
-                with self.engine.connect() as conn:
-                    conn.execute(text("SELECT 1"))
-
-                # Ensure tenant registry schema for PostgreSQL
-                if db_type in ['postgresql', 'postgres']:
-                    self.ensure_tenant_registry_schema()
-
-                # Create session factory
-                self.Session = sessionmaker(
-                    bind=self.engine,
-                    expire_on_commit=False,
-                    autocommit=False,
-                    autoflush=False
+                self._connection_url = connection_url
+                entry = EngineRegistry.get_or_create(
+                    connection_url,
+                    self.tenant_id,
+                    lambda: self._create_engine(connection_url, db_type),
                 )
+                self.engine = entry.engine
+                self.Session = entry.session_factory
                 
                 # Skip table creation if in read-only mode or database-level multi-tenancy is enabled
                 if getattr(self, '_read_only', False):
@@ -343,19 +420,28 @@ class Database:
                     logger.info("Tables will be created in tenant schemas on first access")
                     return
                 
-                # Create all tables
-                Base.metadata.create_all(self.engine)
-                
-                # Verify table creation
-                inspector = inspect(self.engine)
-                tables = inspector.get_table_names()
-                required_tables = ['docbasket', 'document', 'document_metadata', 'file_history', 'operations', 'operation_dependencies', 'doc_events', 'transport_routes', 'route_operations', 'processors', 'processing_operations']
-                missing_tables = [table for table in required_tables if table not in tables]
-                
-                if missing_tables:
-                    raise RuntimeError(f"Failed to create required tables: {', '.join(missing_tables)}")
-                
-                logger.info("Database tables initialized successfully")
+                with entry.lock:
+                    if entry.schema_verified:
+                        return
+                    
+                    # Create all tables
+                    Base.metadata.create_all(self.engine)
+                    
+                    # Verify table creation
+                    inspector = inspect(self.engine)
+                    tables = inspector.get_table_names()
+                    required_tables = ['docbasket', 'document', 'document_metadata', 'file_history', 'operations', 'operation_dependencies', 'doc_events', 'transport_routes', 'route_operations', 'processors', 'processing_operations']
+                    missing_tables = [table for table in required_tables if table not in tables]
+                    
+                    if missing_tables:
+                        raise RuntimeError(f"Failed to create required tables: {', '.join(missing_tables)}")
+                    
+                    # Bring tables created by older versions up to date
+                    from docex.db.schema_upgrade import ensure_model_columns
+                    ensure_model_columns(self.engine, Base.metadata.sorted_tables)
+                    
+                    entry.schema_verified = True
+                    logger.info("Database tables initialized successfully")
                 return
                 
             except SQLAlchemyError as e:
@@ -367,21 +453,85 @@ class Database:
                     raise RuntimeError(f"Failed to connect to database after {max_retries} attempts: {str(e)}")
             except Exception as e:
                 raise RuntimeError(f"Unexpected error during database initialization: {str(e)}")
+
+    def _create_engine(self, connection_url: str, db_type: str) -> Any:
+        """
+        Create and verify a new engine for ``connection_url``.
+
+        Only called by :class:`EngineRegistry` the first time a URL/tenant pair
+        is requested in this process.
+        """
+        if db_type == 'sqlite':
+            # Create SQLite engine with proper configuration
+            engine = create_engine(
+                connection_url,
+                poolclass=QueuePool,
+                pool_size=5,
+                max_overflow=10,
+                pool_timeout=30,
+                pool_recycle=1800,
+                connect_args={
+                    'timeout': 30,  # Connection timeout in seconds
+                    'check_same_thread': False  # Allow multiple threads
+                }
+            )
+            
+            # Enable foreign key support
+            @event.listens_for(engine, "connect")
+            def set_sqlite_pragma(dbapi_connection, connection_record):
+                cursor = dbapi_connection.cursor()
+                cursor.execute("PRAGMA foreign_keys=ON")
+                cursor.close()
+        else:
+            engine = create_engine(
+                connection_url,
+                poolclass=QueuePool,
+                pool_size=5,
+                max_overflow=10,
+                pool_timeout=30,
+                pool_recycle=1800
+            )
+        
+        try:
+            # Test connection
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+
+            # Ensure tenant registry schema for PostgreSQL
+            if db_type in ['postgresql', 'postgres']:
+                self.engine = engine
+                self.ensure_tenant_registry_schema()
+        except Exception:
+            engine.dispose()
+            raise
+        
+        return engine
     
     def get_engine(self):
         """Get SQLAlchemy engine instance"""
+        if self.engine is None:
+            self._reconnect()
         return self.engine
     
     def get_session(self):
         """Get database session"""
         if not self.Session:
-            self._initialize()
+            self._reconnect()
         return self.Session()
     
     def close(self):
-        """Close database connection"""
-        if self.engine:
+        """
+        Release this handle
+
+        The engine is shared with every other handle on the same database
+        (see EngineRegistry), so it stays open; the handle reconnects to it
+        on its next session, transaction or query. Use dispose() to close the pool itself. Only an
+        engine built for this handle alone (system database) is disposed.
+        """
+        if self.engine is not None and getattr(self, '_owns_engine', False):
             self.engine.dispose()
+        self.engine = None
+        self.Session = None
     
     def session(self):
         """
@@ -395,7 +545,7 @@ class Database:
                 # For tenant-aware mode, get session from tenant manager
                 return self.tenant_manager.get_tenant_session(self.tenant_id)
             else:
-                self._initialize()
+                self._reconnect()
         return self.Session()
     
     def initialize(self):
@@ -420,6 +570,8 @@ class Database:
                 yield session
         else:
             # Use standard transaction
+            if self.Session is None:
+                self._reconnect()
             session = self.Session()
             try:
                 yield session
@@ -636,7 +788,13 @@ class Database:
         return postgres_config.get('system_schema', 'docex_system')
 
     def dispose(self) -> None:
-        """Close all database connections"""
-        if self.engine:
-            self.engine.dispose()
-            self.engine = None 
+        """
+        Close all connections to this database
+
+        Disposes the shared engine through EngineRegistry.discard, so every
+        handle on the same database gets a new pool on its next session.
+        """
+        connection_url = getattr(self, '_connection_url', None)
+        if connection_url is not None:
+            EngineRegistry.discard(connection_url)
+        self.close()
@@ -0,0 +1,64 @@
+BEGIN;
+
+-- Add typed shadow columns (value_num, value_ts, value_text) to every
+-- document_metadata table, backfill them from the JSON value and index
+-- them together with the key for range/prefix queries.
+DO $$
+DECLARE
+    schema_row RECORD;
+BEGIN
+    FOR schema_row IN
+        SELECT DISTINCT table_schema
+        FROM information_schema.tables
+        WHERE table_name = 'document_metadata'
+    LOOP
+        EXECUTE format(
+            'ALTER TABLE %I.document_metadata
+                ADD COLUMN IF NOT EXISTS value_num DOUBLE PRECISION,
+                ADD COLUMN IF NOT EXISTS value_ts TIMESTAMP,
+                ADD COLUMN IF NOT EXISTS value_text VARCHAR(255)',
+            schema_row.table_schema
+        );
+
+        -- JSON numbers
+        EXECUTE format(
+            $sql$UPDATE %I.document_metadata
+                SET value_num = value::double precision
+                WHERE value_num IS NULL
+                  AND value ~ '^-?[0-9]+(\.[0-9]+)?([eE][-+]?[0-9]+)?$'$sql$,
+            schema_row.table_schema
+        );
+
+        -- JSON strings (and ISO-8601 dates within them)
+        EXECUTE format(
+            $sql$UPDATE %I.document_metadata
+                SET value_text = left(value::json #>> '{}', 255),
+                    value_ts = CASE
+                        WHEN (value::json #>> '{}') !~ '^\d{4}-\d{2}-\d{2}([T ]\d{2}:\d{2}(:\d{2}(\.\d+)?)?)?(Z|[+-]\d{2}:?\d{2})?$'
+                        THEN NULL
+                        -- Offsets are normalised to UTC; naive values are kept as written
+                        WHEN (value::json #>> '{}') ~ '(Z|[+-]\d{2}:?\d{2})$'
+                        THEN ((value::json #>> '{}')::timestamptz AT TIME ZONE 'UTC')
+                        ELSE (value::json #>> '{}')::timestamp
+                    END
+                WHERE value_text IS NULL
+                  AND value LIKE '"%%'$sql$,
+            schema_row.table_schema
+        );
+
+        EXECUTE format(
+            'CREATE INDEX IF NOT EXISTS idx_document_metadata_key_num ON %I.document_metadata(key, value_num)',
+            schema_row.table_schema
+        );
+        EXECUTE format(
+            'CREATE INDEX IF NOT EXISTS idx_document_metadata_key_ts ON %I.document_metadata(key, value_ts)',
+            schema_row.table_schema
+        );
+        EXECUTE format(
+            'CREATE INDEX IF NOT EXISTS idx_document_metadata_key_text ON %I.document_metadata(key, value_text)',
+            schema_row.table_schema
+        );
+    END LOOP;
+END $$;
+
+COMMIT;
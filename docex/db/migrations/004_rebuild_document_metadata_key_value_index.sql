@@ -0,0 +1,26 @@
+BEGIN;
+
+-- idx_document_metadata_key_value is retired. Earlier versions of this
+-- migration built it on (key, value), which PostgreSQL rejects for values
+-- over ~2.7KB (e.g. stored embeddings), and on (key) it only duplicated
+-- idx_document_metadata_key. Equality filters seek on the bounded
+-- (key, value_num) / (key, value_text) indexes instead. Schemas that never
+-- had the index are left untouched.
+DO $$
+DECLARE
+    index_row RECORD;
+BEGIN
+    FOR index_row IN
+        SELECT schemaname
+        FROM pg_indexes
+        WHERE tablename = 'document_metadata'
+          AND indexname = 'idx_document_metadata_key_value'
+    LOOP
+        EXECUTE format(
+            'DROP INDEX %I.idx_document_metadata_key_value',
+            index_row.schemaname
+        );
+    END LOOP;
+END $$;
+
+COMMIT;
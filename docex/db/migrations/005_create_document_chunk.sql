@@ -0,0 +1,39 @@
+BEGIN;
+
+-- Chunk-level vector index: one row per indexed text chunk with its offsets
+-- into the document text. The embedding column (public.vector(n)) and its
+-- HNSW index are added by ChunkedVectorIndexingProcessor once the embedding
+-- dimension is known.
+DO $$
+DECLARE
+    schema_row RECORD;
+BEGIN
+    FOR schema_row IN
+        SELECT DISTINCT table_schema
+        FROM information_schema.tables
+        WHERE table_name = 'document'
+          AND table_schema NOT IN ('pg_catalog', 'information_schema')
+    LOOP
+        EXECUTE format(
+            'CREATE TABLE IF NOT EXISTS %I.document_chunk (
+                id VARCHAR(36) PRIMARY KEY,
+                document_id VARCHAR(36) NOT NULL REFERENCES %I.document(id) ON DELETE CASCADE,
+                basket_id VARCHAR(36) NOT NULL REFERENCES %I.docbasket(id) ON DELETE CASCADE,
+                chunk_index INTEGER NOT NULL,
+                start_idx INTEGER NOT NULL,
+                end_idx INTEGER NOT NULL,
+                content TEXT NOT NULL,
+                chunk_metadata JSON,
+                created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                CONSTRAINT uq_document_chunk_document_index UNIQUE (document_id, chunk_index)
+            )',
+            schema_row.table_schema, schema_row.table_schema, schema_row.table_schema
+        );
+        EXECUTE format(
+            'CREATE INDEX IF NOT EXISTS idx_document_chunk_basket_id ON %I.document_chunk(basket_id)',
+            schema_row.table_schema
+        );
+    END LOOP;
+END $$;
+
+COMMIT;
@@ -0,0 +1,31 @@
+BEGIN;
+
+-- document_embedding_idx used to be built with vector_l2_ops while semantic
+-- search orders by the cosine operator (<=>), so the planner could never use
+-- it. Rebuild it with vector_cosine_ops wherever the embedding column exists.
+-- Deployments that cannot block writes for the build should instead call
+-- VectorIndexingProcessor.rebuild_vector_index() (CREATE INDEX CONCURRENTLY).
+DO $$
+DECLARE
+    schema_row RECORD;
+BEGIN
+    FOR schema_row IN
+        SELECT DISTINCT table_schema
+        FROM information_schema.columns
+        WHERE table_name = 'document'
+          AND column_name = 'embedding'
+          AND table_schema NOT IN ('pg_catalog', 'information_schema')
+    LOOP
+        EXECUTE format(
+            'DROP INDEX IF EXISTS %I.document_embedding_idx',
+            schema_row.table_schema
+        );
+        EXECUTE format(
+            'CREATE INDEX document_embedding_idx ON %I.document
+             USING hnsw (embedding public.vector_cosine_ops) WITH (m = 16, ef_construction = 64)',
+            schema_row.table_schema
+        );
+    END LOOP;
+END $$;
+
+COMMIT;
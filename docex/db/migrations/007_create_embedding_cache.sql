@@ -0,0 +1,36 @@
+BEGIN;
+
+-- Persistent embedding cache: one row per (embedding model, SHA-256 of the
+-- embedded text). Lets re-indexing, duplicate uploads and repeated queries
+-- reuse embeddings instead of calling the embedding model again.
+DO $$
+DECLARE
+    schema_row RECORD;
+BEGIN
+    FOR schema_row IN
+        SELECT DISTINCT table_schema
+        FROM information_schema.tables
+        WHERE table_name = 'document'
+          AND table_schema NOT IN ('pg_catalog', 'information_schema')
+    LOOP
+        EXECUTE format(
+            'CREATE TABLE IF NOT EXISTS %I.embedding_cache (
+                model_id VARCHAR(255) NOT NULL,
+                content_hash VARCHAR(64) NOT NULL,
+                dimension INTEGER NOT NULL,
+                embedding BYTEA NOT NULL,
+                created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                last_used_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (model_id, content_hash)
+            )',
+            schema_row.table_schema
+        );
+        EXECUTE format(
+            'CREATE INDEX IF NOT EXISTS idx_embedding_cache_model_last_used
+             ON %I.embedding_cache(model_id, last_used_at)',
+            schema_row.table_schema
+        );
+    END LOOP;
+END $$;
+
+COMMIT;
@@ -0,0 +1,32 @@
+BEGIN;
+
+-- Outbox consumption of doc_events: retry bookkeeping and claim leases, plus
+-- a partial (status, event_timestamp) index over claimable rows only.
+DO $$
+DECLARE
+    schema_row RECORD;
+BEGIN
+    FOR schema_row IN
+        SELECT DISTINCT table_schema
+        FROM information_schema.tables
+        WHERE table_name = 'doc_events'
+          AND table_schema NOT IN ('pg_catalog', 'information_schema')
+    LOOP
+        EXECUTE format(
+            'ALTER TABLE %I.doc_events
+                ADD COLUMN IF NOT EXISTS attempts INTEGER DEFAULT 0,
+                ADD COLUMN IF NOT EXISTS available_at TIMESTAMP,
+                ADD COLUMN IF NOT EXISTS locked_by VARCHAR(100),
+                ADD COLUMN IF NOT EXISTS locked_until TIMESTAMP',
+            schema_row.table_schema
+        );
+        EXECUTE format(
+            $sql$CREATE INDEX IF NOT EXISTS idx_doc_events_claim
+             ON %I.doc_events(status, event_timestamp)
+             WHERE status IN ('PENDING', 'PROCESSING')$sql$,
+            schema_row.table_schema
+        );
+    END LOOP;
+END $$;
+
+COMMIT;
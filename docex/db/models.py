@@ -1,6 +1,6 @@
 from datetime import datetime, timezone
 from typing import Dict, Any, Optional, Type
-from sqlalchemy import Column, String, Integer, DateTime, JSON, ForeignKey, Text, text, UniqueConstraint, Table, MetaData, Boolean, Uuid
+from sqlalchemy import Column, String, Integer, Float, DateTime, JSON, ForeignKey, Text, text, UniqueConstraint, Index, Table, MetaData, Boolean, Uuid, LargeBinary
 from sqlalchemy.orm import relationship
 from uuid import uuid4
 from docex.config.config_manager import ConfigManager
@@ -18,6 +18,7 @@ def generate_id(model_class=None) -> str:
         'OperationDependency': 'odp',
         'DocEvent': 'evt',
         'DocumentMetadata': 'dmt',
+        'DocumentChunk': 'chk',
         'DocBasket': 'bas',
         'Document': 'doc',
         'Route': 'rte',
@@ -85,6 +86,7 @@ class Document(Base):
     operations = relationship('Operation', back_populates='document', cascade='all, delete-orphan')
     events = relationship('DocEvent', back_populates='document', cascade='all, delete-orphan')
     processing_operations = relationship('ProcessingOperation', back_populates='document', cascade='all, delete-orphan')
+    chunks = relationship('DocumentChunk', back_populates='document', cascade='all, delete-orphan')
 
 class FileHistory(Base):
     """File history model for tracking document file locations"""
@@ -147,11 +149,23 @@ class DocumentMetadata(Base):
     Model for document metadata
     """
     __tablename__ = 'document_metadata'
+    __table_args__ = (
+        # Typed lookups: WHERE key = ? AND value_* <op> ?. Each index also
+        # serves plain key lookups. value is unbounded TEXT (embeddings, long
+        # strings) and would overflow a btree entry, so it is never indexed.
+        Index('idx_document_metadata_key_num', 'key', 'value_num'),
+        Index('idx_document_metadata_key_ts', 'key', 'value_ts'),
+        Index('idx_document_metadata_key_text', 'key', 'value_text'),
+    )
     
     id = Column(String(36), primary_key=True, default=lambda: f"dmt_{uuid4().hex}")
     document_id = Column(String(36), ForeignKey('document.id'), nullable=False)
     key = Column(String(255), nullable=False)
-    value = Column(Text, nullable=False)
+    value = Column(Text, nullable=False)  # JSON-encoded value (source of truth)
+    # Typed shadow columns derived from value on write, for range/prefix queries
+    value_num = Column(Float, nullable=True)
+    value_ts = Column(DateTime, nullable=True)
+    value_text = Column(String(255), nullable=True)
     metadata_type = Column(String(50), nullable=False, default='custom')
     coordination_id = Column(Uuid(as_uuid=False), nullable=True)
     created_at = Column(DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
@@ -160,9 +174,72 @@ class DocumentMetadata(Base):
     # Relationships
     document = relationship('Document', back_populates='doc_metadata')
 
+class DocumentChunk(Base):
+    """
+    Model for indexed text chunks of a document
+
+    Offsets refer to the document's extracted text, so a chunk can be shown
+    in context without re-chunking. On PostgreSQL the chunk embedding lives
+    in an ``embedding public.vector(n)`` column that the chunked vector
+    indexing processor adds (with an HNSW index) once the dimension is known.
+    """
+    __tablename__ = 'document_chunk'
+    __table_args__ = (
+        UniqueConstraint('document_id', 'chunk_index', name='uq_document_chunk_document_index'),
+        Index('idx_document_chunk_basket_id', 'basket_id'),
+    )
+
+    id = Column(String(36), primary_key=True, default=lambda: generate_id(DocumentChunk))
+    document_id = Column(String(36), ForeignKey('document.id', ondelete='CASCADE'), nullable=False)
+    basket_id = Column(String(36), ForeignKey('docbasket.id', ondelete='CASCADE'), nullable=False)
+    chunk_index = Column(Integer, nullable=False)
+    start_idx = Column(Integer, nullable=False)
+    end_idx = Column(Integer, nullable=False)
+    content = Column(Text, nullable=False)
+    chunk_metadata = Column(JSON, nullable=True)
+    created_at = Column(DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
+
+    # Relationships
+    document = relationship('Document', back_populates='chunks')
+
+class EmbeddingCacheEntry(Base):
+    """
+    Model for a cached embedding
+
+    Keyed by the embedding model and the SHA-256 of the embedded text, so an
+    unchanged text is never sent to the embedding model twice. The vector is
+    stored as packed float64 values; ``last_used_at`` drives LRU eviction.
+    """
+    __tablename__ = 'embedding_cache'
+    __table_args__ = (
+        Index('idx_embedding_cache_model_last_used', 'model_id', 'last_used_at'),
+    )
+
+    model_id = Column(String(255), primary_key=True)
+    content_hash = Column(String(64), primary_key=True)
+    dimension = Column(Integer, nullable=False)
+    embedding = Column(LargeBinary, nullable=False)
+    created_at = Column(DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
+    last_used_at = Column(DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
+
 class DocEvent(Base):
-    """Document event model for tracking document lifecycle events"""
+    """Document event model for tracking document lifecycle events
+    
+    Events form an outbox consumed by EventConsumer: PENDING events are
+    claimed (status PROCESSING with a lease until ``locked_until``), then
+    acknowledged (PROCESSED), rescheduled after ``available_at`` or, after
+    too many ``attempts``, marked FAILED.
+    """
     __tablename__ = 'doc_events'
+    __table_args__ = (
+        # Claim queries only touch claimable rows, so the index stays small
+        # however many processed events the table keeps
+        Index(
+            'idx_doc_events_claim', 'status', 'event_timestamp',
+            postgresql_where=text("status IN ('PENDING', 'PROCESSING')"),
+            sqlite_where=text("status IN ('PENDING', 'PROCESSING')"),
+        ),
+    )
     
     id = Column(String(36), primary_key=True, default=lambda: generate_id(DocEvent))
     basket_id = Column(String(36), ForeignKey('docbasket.id', ondelete='CASCADE'), nullable=False)
@@ -173,6 +250,10 @@ class DocEvent(Base):
     source = Column(String(50), nullable=False, server_default=text("'docex'"))
     status = Column(String(20), nullable=False, server_default=text("'PENDING'"))
     error_message = Column(Text)
+    attempts = Column(Integer, default=0)
+    available_at = Column(DateTime)  # Earliest retry time (NULL: now)
+    locked_by = Column(String(100))  # Claim token of the consumer holding the lease
+    locked_until = Column(DateTime)
     created_at = Column(DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
     updated_at = Column(DateTime, nullable=False, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
     
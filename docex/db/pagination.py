@@ -0,0 +1,117 @@
+"""
+Keyset (cursor) pagination helpers.
+
+Instead of ``LIMIT/OFFSET``, keyset pagination remembers the sort value and
+id of the last row of a page and seeks past it:
+
+    WHERE (sort_col, id) < (:last_value, :last_id)
+    ORDER BY sort_col DESC, id DESC
+    LIMIT :page_size
+
+With an index whose leading columns match the filter and sort (for example
+``(basket_id, created_at)``) every page costs the same as the first one.
+Cursors are opaque, URL-safe strings so callers can pass them around
+(CLI, HTTP APIs) without depending on their contents.
+"""
+
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, NamedTuple, Optional
+
+from sqlalchemy import and_, or_
+from sqlalchemy.sql import ColumnElement, Select
+
+
+class KeysetCursor(NamedTuple):
+    """Decoded position of the last row returned by a page"""
+
+    order_by: str
+    order_desc: bool
+    value: Any
+    id: str
+
+
+def encode_cursor(order_by: str, order_desc: bool, value: Any, row_id: str) -> str:
+    """
+    Encode the position of a row as an opaque cursor.
+
+    Args:
+        order_by: Name of the sort column
+        order_desc: Whether the listing is sorted in descending order
+        value: Sort column value of the last row on the page
+        row_id: Primary key of the last row on the page (tiebreaker)
+
+    Returns:
+        URL-safe cursor string
+    """
+    if isinstance(value, datetime):
+        encoded_value = {'dt': value.isoformat()}
+    else:
+        encoded_value = {'v': value}
+    payload = json.dumps(
+        {'o': order_by, 'd': order_desc, 'k': encoded_value, 'i': row_id},
+        separators=(',', ':'),
+    )
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> KeysetCursor:
+    """
+    Decode a cursor produced by :func:`encode_cursor`.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        encoded_value = payload['k']
+        if 'dt' in encoded_value:
+            value = datetime.fromisoformat(encoded_value['dt'])
+        else:
+            value = encoded_value['v']
+        return KeysetCursor(payload['o'], bool(payload['d']), value, payload['i'])
+    except (binascii.Error, UnicodeError, ValueError, KeyError, TypeError) as e:
+        raise ValueError(f"Invalid pagination cursor: {cursor!r}") from e
+
+
+def apply_keyset(
+    query: Select,
+    sort_column: ColumnElement,
+    id_column: ColumnElement,
+    order_desc: bool,
+    cursor: Optional[KeysetCursor] = None,
+) -> Select:
+    """
+    Order a query by (sort_column, id_column) and seek past a cursor.
+
+    The seek predicate is written as ``col < v OR (col = v AND id < i)``
+    (mirrored for ascending order), which every supported database can
+    satisfy with a range scan on a ``(..., sort_column)`` index.
+
+    Args:
+        query: Select to paginate (filters already applied)
+        sort_column: Non-nullable column to sort by
+        id_column: Unique column used as a tiebreaker
+        order_desc: Sort in descending order
+        cursor: Position of the last row of the previous page, if any
+
+    Returns:
+        The ordered (and, with a cursor, filtered) query; apply ``limit`` after
+    """
+    if cursor is not None:
+        if order_desc:
+            query = query.where(or_(
+                sort_column < cursor.value,
+                and_(sort_column == cursor.value, id_column < cursor.id),
+            ))
+        else:
+            query = query.where(or_(
+                sort_column > cursor.value,
+                and_(sort_column == cursor.value, id_column > cursor.id),
+            ))
+    if order_desc:
+        return query.order_by(sort_column.desc(), id_column.desc())
+    return query.order_by(sort_column.asc(), id_column.asc())
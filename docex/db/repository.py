@@ -1,8 +1,8 @@
-from typing import Type, TypeVar, Generic, Optional, List, Dict, Any
-from datetime import datetime, timedelta
+from typing import Type, TypeVar, Generic, Optional, List, Dict, Any, Sequence, Tuple
+from datetime import datetime, timedelta, timezone
 from uuid import uuid4
 from sqlalchemy.orm import Session
-from sqlalchemy import desc, asc, and_, or_, select, update, delete
+from sqlalchemy import desc, asc, and_, or_, select, update, delete, bindparam, func
 
 from .models import (
     DocBasket, Document, FileHistory, Operation,
@@ -223,4 +223,137 @@ class DocEventRepository(BaseRepository[DocEvent]):
                 event.error_message = error_message
                 session.commit()
                 return True
-            return False 
\ No newline at end of file
+            return False
+    
+    def claim_events(
+        self,
+        claim_token: str,
+        batch_size: int = 100,
+        lease_seconds: float = 60.0,
+        basket_id: Optional[str] = None,
+        event_types: Optional[Sequence[str]] = None
+    ) -> List[DocEvent]:
+        """Atomically claim a batch of events for one consumer
+        
+        Claims the oldest PENDING events that are due and PROCESSING events
+        whose lease expired (their consumer died), in one UPDATE. On
+        PostgreSQL the candidate rows are selected with FOR UPDATE SKIP
+        LOCKED, so concurrent consumers claim disjoint batches without
+        waiting on each other; SQLite serialises writers and the UPDATE
+        re-checks that every row is still claimable.
+        
+        Args:
+            claim_token: Unique token of this claim; acknowledgements must present it
+            batch_size: Maximum number of events to claim
+            lease_seconds: How long the events stay claimed before another
+                consumer may take them over
+            basket_id: Only claim events of this basket
+            event_types: Only claim events of these types
+            
+        Returns:
+            Claimed events (status PROCESSING, ``attempts`` incremented), oldest first
+        """
+        now = datetime.now(timezone.utc)
+        claimable = or_(
+            and_(
+                DocEvent.status == 'PENDING',
+                or_(DocEvent.available_at.is_(None), DocEvent.available_at <= now)
+            ),
+            and_(DocEvent.status == 'PROCESSING', DocEvent.locked_until < now)
+        )
+        candidates = select(DocEvent.id).where(claimable)
+        if basket_id:
+            candidates = candidates.where(DocEvent.basket_id == basket_id)
+        if event_types:
+            candidates = candidates.where(DocEvent.event_type.in_(list(event_types)))
+        candidates = (
+            candidates
+            .order_by(DocEvent.event_timestamp.asc())
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        with self.db.session() as session:
+            session.execute(
+                update(DocEvent)
+                .where(DocEvent.id.in_(candidates), claimable)
+                .values(
+                    status='PROCESSING',
+                    locked_by=claim_token,
+                    locked_until=now + timedelta(seconds=lease_seconds),
+                    attempts=func.coalesce(DocEvent.attempts, 0) + 1,
+                    updated_at=now
+                )
+                .execution_options(synchronize_session=False)
+            )
+            events = list(session.execute(
+                select(DocEvent)
+                .where(DocEvent.status == 'PROCESSING', DocEvent.locked_by == claim_token)
+                .order_by(DocEvent.event_timestamp.asc())
+            ).scalars())
+            session.commit()
+            return events
+    
+    def ack_events(self, claim_token: str, event_ids: Sequence[str]) -> int:
+        """Mark claimed events as processed with one UPDATE
+        
+        Events whose lease was taken over by another claim are left alone.
+        
+        Returns:
+            Number of events acknowledged
+        """
+        if not event_ids:
+            return 0
+        with self.db.session() as session:
+            result = session.execute(
+                update(DocEvent)
+                .where(DocEvent.id.in_(list(event_ids)), DocEvent.locked_by == claim_token)
+                .values(
+                    status='PROCESSED',
+                    error_message=None,
+                    locked_by=None,
+                    locked_until=None,
+                    updated_at=datetime.now(timezone.utc)
+                )
+                .execution_options(synchronize_session=False)
+            )
+            session.commit()
+            return result.rowcount
+    
+    def release_events(
+        self,
+        claim_token: str,
+        failures: Sequence[Tuple[str, str, Optional[datetime]]]
+    ) -> None:
+        """Reschedule or fail claimed events with one batched UPDATE
+        
+        Args:
+            claim_token: Token the events were claimed with
+            failures: ``(event_id, error_message, retry_at)`` per event;
+                ``retry_at`` None marks the event FAILED for good
+        """
+        if not failures:
+            return
+        table = DocEvent.__table__
+        statement = (
+            update(table)
+            .where(table.c.id == bindparam('event_id'), table.c.locked_by == claim_token)
+            .values(
+                status=bindparam('new_status'),
+                error_message=bindparam('error'),
+                available_at=bindparam('retry_at'),
+                locked_by=None,
+                locked_until=None,
+                updated_at=datetime.now(timezone.utc)
+            )
+        )
+        with self.db.session() as session:
+            session.execute(statement, [
+                {
+                    'event_id': event_id,
+                    'new_status': 'FAILED' if retry_at is None else 'PENDING',
+                    'error': error,
+                    'retry_at': retry_at,
+                }
+                for event_id, error, retry_at in failures
+            ])
+            session.commit()
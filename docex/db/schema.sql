@@ -83,6 +83,10 @@ CREATE TABLE IF NOT EXISTS doc_events (
     source VARCHAR(50) NOT NULL DEFAULT 'docex',
     status VARCHAR(20) NOT NULL DEFAULT 'PENDING',
     error_message TEXT,
+    attempts INTEGER DEFAULT 0,
+    available_at TIMESTAMP,
+    locked_by VARCHAR(100),
+    locked_until TIMESTAMP,
     created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
 );
@@ -93,6 +97,9 @@ CREATE TABLE IF NOT EXISTS document_metadata (
     document_id VARCHAR(36) NOT NULL REFERENCES documents(id) ON DELETE CASCADE,
     key VARCHAR(100) NOT NULL,
     value JSON NOT NULL,  -- SQLite will store as TEXT, handled by SQLAlchemy
+    value_num DOUBLE PRECISION,  -- Typed shadow columns derived from value on write
+    value_ts TIMESTAMP,
+    value_text VARCHAR(255),
     metadata_type VARCHAR(50) NOT NULL DEFAULT 'custom',
     coordination_id UUID,
     created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
@@ -100,6 +107,33 @@ CREATE TABLE IF NOT EXISTS document_metadata (
     UNIQUE(document_id, key)
 );
 
+-- Create document_chunk table (chunk-level vector index; the embedding
+-- column is added by the chunked vector indexing processor on PostgreSQL)
+CREATE TABLE IF NOT EXISTS document_chunk (
+    id VARCHAR(36) PRIMARY KEY,
+    document_id VARCHAR(36) NOT NULL REFERENCES documents(id) ON DELETE CASCADE,
+    basket_id VARCHAR(36) NOT NULL REFERENCES docbasket(id) ON DELETE CASCADE,
+    chunk_index INTEGER NOT NULL,
+    start_idx INTEGER NOT NULL,
+    end_idx INTEGER NOT NULL,
+    content TEXT NOT NULL,
+    chunk_metadata JSON,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE(document_id, chunk_index)
+);
+
+-- Create embedding_cache table (embeddings keyed by model and SHA-256 of the
+-- embedded text; packed float64 values)
+CREATE TABLE IF NOT EXISTS embedding_cache (
+    model_id VARCHAR(255) NOT NULL,
+    content_hash VARCHAR(64) NOT NULL,
+    dimension INTEGER NOT NULL,
+    embedding BLOB NOT NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    last_used_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (model_id, content_hash)
+);
+
 -- Create indexes for better query performance
 CREATE INDEX IF NOT EXISTS idx_documents_basket_id ON documents(basket_id);
 CREATE INDEX IF NOT EXISTS idx_documents_document_type ON documents(document_type);
@@ -115,10 +149,15 @@ CREATE INDEX IF NOT EXISTS idx_doc_events_event_type ON doc_events(event_type);
 CREATE INDEX IF NOT EXISTS idx_doc_events_document_id ON doc_events(document_id);
 CREATE INDEX IF NOT EXISTS idx_doc_events_event_timestamp ON doc_events(event_timestamp);
 CREATE INDEX IF NOT EXISTS idx_doc_events_status ON doc_events(status);
+CREATE INDEX IF NOT EXISTS idx_doc_events_claim ON doc_events(status, event_timestamp) WHERE status IN ('PENDING', 'PROCESSING');
 CREATE INDEX IF NOT EXISTS idx_document_metadata_document_id ON document_metadata(document_id);
 CREATE INDEX IF NOT EXISTS idx_document_metadata_key ON document_metadata(key);
 CREATE INDEX IF NOT EXISTS idx_document_metadata_type ON document_metadata(metadata_type);
-CREATE INDEX IF NOT EXISTS idx_document_metadata_key_value ON document_metadata(key);
+CREATE INDEX IF NOT EXISTS idx_document_metadata_key_num ON document_metadata(key, value_num);
+CREATE INDEX IF NOT EXISTS idx_document_metadata_key_ts ON document_metadata(key, value_ts);
+CREATE INDEX IF NOT EXISTS idx_document_metadata_key_text ON document_metadata(key, value_text);
+CREATE INDEX IF NOT EXISTS idx_document_chunk_basket_id ON document_chunk(basket_id);
+CREATE INDEX IF NOT EXISTS idx_embedding_cache_model_last_used ON embedding_cache(model_id, last_used_at);
 
 -- Indexes for basket queries
 CREATE INDEX IF NOT EXISTS idx_docbasket_status ON docbasket(status);
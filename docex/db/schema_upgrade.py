@@ -0,0 +1,92 @@
+"""
+In-place upgrades for existing DocEX databases.
+
+``create_all()`` only creates missing tables; it never adds columns or
+indexes to tables that already exist. When a model gains a nullable column
+(or a declared ``Index``), existing SQLite files and PostgreSQL schemas are
+brought up to date here, so upgraded installs keep working without a manual
+migration step.
+"""
+
+import logging
+from typing import Any, Iterable, List
+
+from sqlalchemy import Table, inspect, text
+
+logger = logging.getLogger(__name__)
+
+# Indexes earlier versions created that are no longer declared on the models
+RETIRED_INDEXES = {
+    # Duplicated idx_document_metadata_key (and briefly covered unbounded values)
+    'document_metadata': ['idx_document_metadata_key_value'],
+}
+
+
+def ensure_model_columns(engine: Any, tables: Iterable[Table]) -> List[str]:
+    """
+    Add model columns missing from existing tables and create declared indexes.
+
+    Only nullable columns without server defaults are added automatically;
+    anything else is logged and left for an explicit migration. Declared
+    indexes that exist under the same name but cover different columns are
+    rebuilt and retired indexes are dropped. Tables that do not exist yet are
+    skipped (create_all handles them).
+    When the typed metadata columns are added, existing metadata rows are
+    backfilled from their JSON values.
+
+    Args:
+        engine: SQLAlchemy engine (tenant engines already carry their search_path)
+        tables: Model tables to check
+
+    Returns:
+        List of ``table.column`` names that were added
+    """
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    added = []
+
+    for table in tables:
+        if table.name not in existing_tables:
+            continue
+        existing_columns = {column['name'] for column in inspector.get_columns(table.name)}
+        missing = [column for column in table.columns if column.name not in existing_columns]
+        if missing:
+            with engine.begin() as conn:
+                for column in missing:
+                    if not column.nullable and column.server_default is None:
+                        logger.warning(
+                            f"Cannot add NOT NULL column {table.name}.{column.name} automatically; "
+                            "apply a migration"
+                        )
+                        continue
+                    column_type = column.type.compile(dialect=engine.dialect)
+                    conn.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}'))
+                    added.append(f"{table.name}.{column.name}")
+                    logger.info(f"Added column {table.name}.{column.name} ({column_type})")
+
+        existing_indexes = {
+            index['name']: index['column_names'] for index in inspector.get_indexes(table.name)
+        }
+        for index in table.indexes:
+            declared = [column.name for column in index.columns]
+            current = existing_indexes.get(index.name)
+            if current is not None and declared and current != declared:
+                logger.info(f"Rebuilding index {index.name} on {table.name}({', '.join(declared)})")
+                index.drop(engine)
+                current = None
+            if current is None:
+                index.create(engine, checkfirst=True)
+        for name in RETIRED_INDEXES.get(table.name, []):
+            if name in existing_indexes:
+                logger.info(f"Dropping retired index {name} on {table.name}")
+                with engine.begin() as conn:
+                    conn.execute(text(f'DROP INDEX {name}'))
+
+    if any(name.startswith('document_metadata.value_') for name in added):
+        # Rows written before the typed columns existed would otherwise stop
+        # matching filters that compare against them
+        from docex.services.metadata_service import backfill_typed_metadata
+        filled = backfill_typed_metadata(engine.begin)
+        logger.info(f"Filled typed metadata columns for {filled} existing rows")
+
+    return added
@@ -445,6 +445,10 @@ class TenantDatabaseManager:
             else:
                 logger.info(f"Schema initialized for tenant {tenant_id}")
             
+            # Add columns/indexes introduced after the tenant schema was created
+            from docex.db.schema_upgrade import ensure_model_columns
+            ensure_model_columns(engine, tables_to_create)
+            
             # Create performance indexes from schema.sql
             # SQLAlchemy only creates primary key and unique indexes, not performance indexes
             # This ensures all tenants have optimal query performance
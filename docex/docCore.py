@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import logging
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 import yaml
 from sqlalchemy import inspect, text
@@ -757,8 +757,6 @@ class DocEX:
             >>> # List all baskets sorted by name
             >>> baskets = docex.list_baskets(order_by='name', order_desc=False)
         """
-        import json
-
         from sqlalchemy import select
 
         from docex.db.models import DocBasket as DocBasketModel
@@ -800,23 +798,100 @@ class DocEX:
             basket_models = session.execute(query).scalars().all()
             
             # Convert to DocBasket instances
-            baskets = []
-            for basket_model in basket_models:
-                storage_config = json.loads(basket_model.storage_config) if isinstance(basket_model.storage_config, str) else basket_model.storage_config
-                
-                basket = DocBasket(
-                    id=basket_model.id,
-                    name=basket_model.name,
-                    description=basket_model.description,
-                    storage_config=storage_config,
-                    created_at=basket_model.created_at,
-                    updated_at=basket_model.updated_at,
-                    model=basket_model,
-                    db=self.db
-                )
-                baskets.append(basket)
+            return [self._basket_from_model(basket_model) for basket_model in basket_models]
+    
+    def _basket_from_model(self, basket_model: Any) -> DocBasket:
+        """Build a DocBasket bound to this instance's database from a basket row"""
+        import json
+
+        storage_config = json.loads(basket_model.storage_config) if isinstance(basket_model.storage_config, str) else basket_model.storage_config
+        return DocBasket(
+            id=basket_model.id,
+            name=basket_model.name,
+            description=basket_model.description,
+            storage_config=storage_config,
+            created_at=basket_model.created_at,
+            updated_at=basket_model.updated_at,
+            model=basket_model,
+            db=self.db
+        )
+    
+    def list_baskets_page(
+        self,
+        page_size: int = 100,
+        after: Optional[str] = None,
+        status: Optional[str] = None,
+        order_by: str = 'created_at',
+        order_desc: bool = True
+    ) -> Tuple[List[DocBasket], Optional[str]]:
+        """
+        Fetch one page of baskets using keyset (cursor) pagination.
+        
+        Seeks past the last basket of the previous page (sort column plus
+        basket id as a tiebreaker) instead of scanning OFFSET rows.
+        
+        Args:
+            page_size: Maximum number of baskets per page
+            after: Cursor returned with the previous page (None for the first page)
+            status: Optional filter by basket status
+            order_by: Field to sort by ('created_at', 'updated_at', 'name')
+            order_desc: If True, sort in descending order (default: True)
             
-            return baskets
+        Returns:
+            Tuple of (baskets, next_cursor); next_cursor is None on the last page
+            
+        Raises:
+            ValueError: If order_by is not supported or the cursor does not
+                belong to this ordering
+        """
+        from sqlalchemy import select
+
+        from docex.db.models import DocBasket as DocBasketModel
+        from docex.db.pagination import apply_keyset, decode_cursor, encode_cursor
+        
+        if page_size <= 0:
+            raise ValueError("page_size must be positive")
+        if order_by not in ('created_at', 'updated_at', 'name'):
+            raise ValueError(f"Cursor pagination does not support order_by '{order_by}'")
+        cursor = decode_cursor(after) if after else None
+        if cursor is not None and (cursor.order_by, cursor.order_desc) != (order_by, order_desc):
+            raise ValueError("Cursor was created for a different ordering")
+        
+        with self.db.session() as session:
+            query = select(DocBasketModel)
+            if status:
+                query = query.where(DocBasketModel.status == status)
+            query = apply_keyset(
+                query, getattr(DocBasketModel, order_by), DocBasketModel.id, order_desc, cursor
+            )
+            rows = session.execute(query.limit(page_size + 1)).scalars().all()
+            
+            next_cursor = None
+            if len(rows) > page_size:
+                rows = rows[:page_size]
+                last = rows[-1]
+                next_cursor = encode_cursor(order_by, order_desc, getattr(last, order_by), last.id)
+            return [self._basket_from_model(basket_model) for basket_model in rows], next_cursor
+    
+    def iter_baskets(
+        self,
+        page_size: int = 100,
+        after: Optional[str] = None,
+        status: Optional[str] = None,
+        order_by: str = 'created_at',
+        order_desc: bool = True
+    ) -> Iterator[DocBasket]:
+        """
+        Iterate over all baskets, fetching them page by page with keyset pagination.
+        
+        Yields:
+            DocBasket instances in the requested order
+        """
+        while True:
+            baskets, after = self.list_baskets_page(page_size, after, status, order_by, order_desc)
+            yield from baskets
+            if after is None:
+                return
     
     def list_baskets_with_metadata(
         self,
@@ -11,7 +11,7 @@ import json
 import logging
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
 
 from sqlalchemy import func, select
 
@@ -139,7 +139,33 @@ class DocBasket:
                 f"Must be one of: {', '.join(allowed_types)}"
             )
         return storage_type
-    
+
+    def _storage_option(self, key: str, default: Any) -> Any:
+        """Read a basket option from storage_config (flattened or nested under the storage type)."""
+        if key in self.storage_config:
+            return self.storage_config[key]
+        nested = self.storage_config.get(self.storage_config.get('type'), {})
+        if isinstance(nested, dict) and key in nested:
+            return nested[key]
+        return default
+
+    @property
+    def store_content(self) -> bool:
+        """
+        Whether document text is persisted in the database on ingest.
+
+        Set ``store_content: False`` in the basket's storage_config to keep
+        the ``content``/``raw_content`` columns empty. Files are then hashed
+        in fixed-size chunks and streamed to storage without ever being
+        loaded into memory, so peak memory does not grow with file size.
+        """
+        return bool(self._storage_option('store_content', True))
+
+    @property
+    def ingest_chunk_size(self) -> int:
+        """Chunk size in bytes used when streaming files on ingest (default: 1 MiB)."""
+        return int(self._storage_option('ingest_chunk_size', 1024 * 1024))
+
     def get_basket_path(self) -> str:
         """
         Get the storage path for this basket.
@@ -511,6 +537,36 @@ class DocBasket:
             Document instance
         """
         return self.document_manager.add(file_path, document_type, metadata)
+
+    def add_many(
+        self,
+        file_paths: Sequence[str],
+        document_type: str = 'file',
+        metadata: Optional[Union[Dict[str, Any], Sequence[Optional[Dict[str, Any]]]]] = None,
+        batch_size: int = 500,
+        max_workers: int = 8,
+    ) -> List['Document']:
+        """
+        Add many documents to the basket in batches.
+        
+        Use this instead of calling :meth:`add` in a loop for bulk ingestion:
+        each batch costs one duplicate-check query, one multi-row INSERT per
+        table and one commit, and storage writes run on a bounded thread pool.
+        
+        Args:
+            file_paths: Paths to the documents
+            document_type: Type of document (file, url, etc.)
+            metadata: Optional metadata applied to every document, or a sequence
+                with one metadata dict (or None) per file path
+            batch_size: Number of files written per database transaction
+            max_workers: Maximum concurrent checksum/storage workers
+            
+        Returns:
+            Document instances in the same order as file_paths
+        """
+        return self.document_manager.add_many(
+            file_paths, document_type, metadata, batch_size, max_workers
+        )
     
     def list_documents(
         self,
@@ -519,7 +575,8 @@ class DocBasket:
         order_by: Optional[str] = None,
         order_desc: bool = False,
         status: Optional[str] = None,
-        document_type: Optional[str] = None
+        document_type: Optional[str] = None,
+        with_metadata: bool = False
     ) -> List['Document']:
         """
         List documents in this basket with pagination, sorting, and filtering.
@@ -532,12 +589,108 @@ class DocBasket:
             order_desc: If True, sort in descending order
             status: Optional filter by document status
             document_type: Optional filter by document type
+            with_metadata: Fetch metadata for all listed documents in one
+                query and cache it on each Document
             
         Returns:
             List of Document instances
         """
-        return self.document_manager.list_documents(limit, offset, order_by, order_desc, status, document_type)
-    
+        return self.document_manager.list_documents(
+            limit, offset, order_by, order_desc, status, document_type, with_metadata
+        )
+
+    def list_documents_page(
+        self,
+        page_size: int = 100,
+        after: Optional[str] = None,
+        order_by: str = 'created_at',
+        order_desc: bool = True,
+        status: Optional[str] = None,
+        document_type: Optional[str] = None,
+        metadata: Optional[Union[Dict[str, Any], str]] = None
+    ) -> Tuple[List['Document'], Optional[str]]:
+        """
+        Fetch one page of documents using an opaque cursor instead of OFFSET.
+
+        Args:
+            page_size: Maximum number of documents per page
+            after: Cursor returned with the previous page (None for the first page)
+            order_by: Field to sort by ('created_at', 'updated_at', 'name')
+            order_desc: If True, sort in descending order (newest first)
+            status: Optional filter by document status
+            document_type: Optional filter by document type
+            metadata: Optional metadata filter (same forms as find_documents_by_metadata)
+
+        Returns:
+            Tuple of (documents, next_cursor); next_cursor is None on the last page
+
+        Example:
+            >>> docs, cursor = basket.list_documents_page(page_size=50)
+            >>> while cursor:
+            ...     docs, cursor = basket.list_documents_page(page_size=50, after=cursor)
+        """
+        return self.document_manager.list_documents_page(
+            page_size, after, order_by, order_desc, status, document_type, metadata
+        )
+
+    def iter_documents(
+        self,
+        page_size: int = 100,
+        after: Optional[str] = None,
+        order_by: str = 'created_at',
+        order_desc: bool = True,
+        status: Optional[str] = None,
+        document_type: Optional[str] = None,
+        metadata: Optional[Union[Dict[str, Any], str]] = None
+    ) -> Iterator['Document']:
+        """
+        Iterate over all matching documents with keyset pagination.
+
+        Documents are fetched ``page_size`` at a time; pass ``after`` to resume
+        from a cursor returned by list_documents_page.
+
+        Yields:
+            Document instances in the requested order
+        """
+        return self.document_manager.iter_documents(
+            page_size, after, order_by, order_desc, status, document_type, metadata
+        )
+
+    def stream_documents(
+        self,
+        columns: Optional[List[str]] = None,
+        batch_size: int = 1000,
+        status: Optional[str] = None,
+        document_type: Optional[str] = None,
+        include_content: bool = False
+    ) -> Iterator[Union['Document', Dict[str, Any]]]:
+        """
+        Stream every document in the basket with bounded memory.
+
+        Built on ``yield_per`` (a server-side cursor on PostgreSQL) with the
+        ``content``/``raw_content`` columns deferred, so exporting or
+        reprocessing a basket of millions of documents never holds more than
+        one batch in memory.
+
+        Args:
+            columns: If given, yield dictionaries with only these columns
+                instead of Document instances
+            batch_size: Number of rows fetched per database round trip
+            status: Optional filter by document status
+            document_type: Optional filter by document type
+            include_content: Also load the heavy content columns
+
+        Yields:
+            Document instances, or dictionaries when ``columns`` is given
+
+        Example:
+            >>> for row in basket.stream_documents(columns=['id', 'name', 'size']):
+            ...     writer.writerow(row)
+        """
+        return self.document_manager.stream_documents(
+            columns, batch_size, status, document_type, include_content
+        )
+
     def list_documents_with_metadata(
         self,
         columns: Optional[List[str]] = None,
@@ -702,6 +855,18 @@ class DocBasket:
         """
         return self.document_manager.get_document(document_id)
     
+    def get_documents(self, document_ids: List[str]) -> List['Document']:
+        """
+        Get several documents with a single query.
+        
+        Args:
+            document_ids: Document IDs
+            
+        Returns:
+            Documents in the order of document_ids; unknown IDs are skipped
+        """
+        return self.document_manager.get_documents(document_ids)
+    
     def update_document(self, document_id: int, file_path: str) -> 'Document':
         """
         Update a document.
@@ -855,8 +1020,7 @@ class DocBasket:
     
     def get_stats(self) -> Dict[str, Any]:
         """Get basket statistics."""
-        db = Database()
-        with db.transaction() as session:
+        with self.db.transaction() as session:
             basket = session.get(DocBasketModel, self.id)
             if not basket:
                 raise ValueError(f"Basket with ID {self.id} not found")
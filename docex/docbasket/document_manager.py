@@ -10,28 +10,54 @@ from __future__ import annotations
 import hashlib
 import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
+from decimal import Decimal
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+from uuid import uuid4
 
-from sqlalchemy import and_, func, select
+from sqlalchemy import and_, false, func, insert, or_, select
+from sqlalchemy.orm import defer
 
 from docex.db.models import (
     DocEvent,
     DocumentMetadata,
     Operation,
+    generate_id,
 )
 from docex.db.models import (
     Document as DocumentModel,
 )
+from docex.db.pagination import apply_keyset, decode_cursor, encode_cursor
 from docex.models.document_metadata import DocumentMetadata as MetaModel
 from docex.models.metadata_keys import MetadataKey
+from docex.services.metadata_service import (
+    VALUE_TEXT_LENGTH,
+    MetadataService,
+    normalize_metadata_timestamp,
+    typed_metadata_values,
+)
 from docex.utils.file_utils import is_binary_file
 
 if TYPE_CHECKING:
     from docex.docbasket import DocBasket
     from docex.document import Document
 
+# Lightweight document columns selectable by the metadata-first list methods
+DOCUMENT_LIST_COLUMNS = {
+    'id': DocumentModel.id,
+    'name': DocumentModel.name,
+    'path': DocumentModel.path,
+    'document_type': DocumentModel.document_type,
+    'content_type': DocumentModel.content_type,
+    'size': DocumentModel.size,
+    'checksum': DocumentModel.checksum,
+    'status': DocumentModel.status,
+    'created_at': DocumentModel.created_at,
+    'updated_at': DocumentModel.updated_at,
+}
+
 # Avoid circular import - import Document lazily when needed
 def _get_document_class():
     """Lazy import of Document to avoid circular imports"""
@@ -49,6 +75,12 @@ class DocBasketDocumentManager:
     DocBasket class focused on basket-level operations.
     """
     
+    # Non-nullable document columns that support cursor pagination
+    KEYSET_ORDER_FIELDS = ('created_at', 'updated_at', 'name')
+
+    # Operators accepted in metadata filters, e.g. {'amount': {'gt': 1000}}
+    METADATA_OPERATORS = frozenset({'eq', 'gt', 'gte', 'lt', 'lte', 'between', 'in', 'prefix'})
+
     def __init__(self, basket: DocBasket):
         """
         Initialize document manager with reference to parent basket.
@@ -73,50 +105,255 @@ class DocBasketDocumentManager:
             created_at=document.created_at,
             updated_at=document.updated_at,
             model=document,
+            storage_service=self.basket._storage_service,
             storage_config=self.basket.storage_config,
             db=self.basket.db,
         )
 
-    def _serialize_metadata_value(self, value: Any) -> str:
-        """Serialize metadata values the same way the write path stores them."""
+    def _attach_metadata(self, documents: List[Document]) -> None:
+        """Load metadata for all documents in bulk and cache it on each one."""
+        if not documents:
+            return
+        metadata = MetadataService(self.basket.db).get_metadata_bulk([doc.id for doc in documents])
+        for document in documents:
+            document.attach_metadata(metadata[document.id])
+
+    @staticmethod
+    def _plain_metadata_value(value: Any) -> Any:
+        """Unwrap DocumentMetadata objects and dicts to the value they carry."""
         if isinstance(value, MetaModel):
             value = value.to_dict()
         if isinstance(value, dict) and 'extra' in value:
             value = value['extra'].get('value', None)
+        return value
+
+    @classmethod
+    def _serialize_metadata_value(cls, value: Any) -> str:
+        """Serialize metadata values the same way the write path stores them."""
+        value = cls._plain_metadata_value(value)
         try:
             return json.dumps(value, default=str)
         except (TypeError, ValueError):
             return json.dumps(str(value))
 
+    @classmethod
+    def _metadata_value_condition(cls, key: str, value: Any) -> Any:
+        """
+        Build the condition matching one metadata key against a filter value.
+
+        Plain values are matched through the bounded typed columns, so every
+        lookup is a seek on a ``(key, value_*)`` index: numbers compare on
+        value_num (1000 finds 1000.0), strings on value_text and then on the
+        stored JSON (value_text holds only the first 255 characters). Rows
+        whose typed column is still NULL are matched on the stored JSON. Other
+        values (booleans, None, lists) compare the stored JSON under the key
+        index. ``value`` itself is unbounded and never indexed. Operator
+        dictionaries such as ``{'gt': 1000}``,
+        ``{'between': ['2024-01-01', '2024-03-31']}``,
+        ``{'in': ['ACME', 'Globex']}`` or ``{'prefix': 'INV-2024'}`` compare
+        against the typed value_num/value_ts/value_text columns.
+        """
+        if isinstance(value, dict) and value and set(value) <= cls.METADATA_OPERATORS:
+            conditions = [
+                cls._metadata_operator_condition(operator, operand)
+                for operator, operand in value.items()
+            ]
+            return and_(DocumentMetadata.key == key, *conditions)
+
+        value_json = cls._serialize_metadata_value(value)
+        typed = typed_metadata_values(cls._plain_metadata_value(value))
+        # Rows whose typed columns are still NULL (written before the columns
+        # existed and not yet backfilled) fall back to the stored JSON. The key
+        # is repeated in each branch so both halves seek the (key, value_*) index.
+        if typed['value_num'] is not None:
+            return or_(
+                and_(DocumentMetadata.key == key, DocumentMetadata.value_num == typed['value_num']),
+                and_(
+                    DocumentMetadata.key == key,
+                    DocumentMetadata.value_num.is_(None),
+                    DocumentMetadata.value == value_json,
+                ),
+            )
+        if typed['value_text'] is not None:
+            return and_(
+                or_(
+                    and_(DocumentMetadata.key == key, DocumentMetadata.value_text == typed['value_text']),
+                    and_(DocumentMetadata.key == key, DocumentMetadata.value_text.is_(None)),
+                ),
+                DocumentMetadata.value == value_json,
+            )
+        return and_(DocumentMetadata.key == key, DocumentMetadata.value == value_json)
+
+    @staticmethod
+    def _typed_operand(operand: Any) -> Tuple[Any, Any]:
+        """Pick the typed metadata column an operand is compared against."""
+        if isinstance(operand, bool):
+            raise ValueError("Boolean metadata values cannot be used with comparison operators")
+        if isinstance(operand, (int, float, Decimal)):
+            return DocumentMetadata.value_num, float(operand)
+        timestamp = normalize_metadata_timestamp(operand)
+        if timestamp is not None:
+            return DocumentMetadata.value_ts, timestamp
+        if isinstance(operand, str):
+            return DocumentMetadata.value_text, operand[:VALUE_TEXT_LENGTH]
+        raise ValueError(f"Unsupported metadata filter operand: {operand!r}")
+
+    @classmethod
+    def _metadata_operator_condition(cls, operator: str, operand: Any) -> Any:
+        """Translate one filter operator into a condition on the typed columns."""
+        if operator == 'prefix':
+            if not isinstance(operand, str):
+                raise ValueError("The 'prefix' metadata operator requires a string")
+            column = DocumentMetadata.value_text
+            if not operand:
+                return column.isnot(None)
+            escaped = operand.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            upper = operand[:-1] + chr(ord(operand[-1]) + 1)
+            # The range lets the (key, value_text) index seek; LIKE keeps the
+            # match exact under any collation
+            return and_(column >= operand, column < upper, column.like(f"{escaped}%", escape='\\'))
+        if operator == 'in':
+            if isinstance(operand, (str, bytes)) or not isinstance(operand, (list, tuple, set)):
+                raise ValueError("The 'in' metadata operator requires a list of values")
+            groups: Dict[Any, List[Any]] = {}
+            columns = {}
+            for item in operand:
+                column, typed = cls._typed_operand(item)
+                groups.setdefault(column.key, []).append(typed)
+                columns[column.key] = column
+            if not groups:
+                return false()
+            return or_(*[columns[name].in_(values) for name, values in groups.items()])
+        if operator == 'between':
+            if not isinstance(operand, (list, tuple)) or len(operand) != 2:
+                raise ValueError("The 'between' metadata operator requires [low, high]")
+            low_column, low = cls._typed_operand(operand[0])
+            high_column, high = cls._typed_operand(operand[1])
+            if low_column is not high_column:
+                raise ValueError("Both 'between' bounds must have the same type")
+            return low_column.between(low, high)
+
+        column, typed = cls._typed_operand(operand)
+        if operator == 'eq':
+            return column == typed
+        if operator == 'gt':
+            return column > typed
+        if operator == 'gte':
+            return column >= typed
+        if operator == 'lt':
+            return column < typed
+        return column <= typed
+
+    @classmethod
+    def metadata_value_matches(cls, stored: Any, value: Any) -> bool:
+        """
+        Evaluate one metadata filter against a value held in memory.
+
+        Mirrors _metadata_value_condition for stores that are not in the
+        database: plain values match like the SQL equality (numbers on their
+        value_num, everything else on the stored JSON) and operator
+        dictionaries compare against the same typed values.
+        """
+        typed = typed_metadata_values(cls._plain_metadata_value(stored))
+        if isinstance(value, dict) and value and set(value) <= cls.METADATA_OPERATORS:
+            return all(
+                cls._metadata_operator_matches(typed, operator, operand)
+                for operator, operand in value.items()
+            )
+
+        expected = typed_metadata_values(cls._plain_metadata_value(value))
+        if expected['value_num'] is not None:
+            return typed['value_num'] == expected['value_num']
+        return cls._serialize_metadata_value(stored) == cls._serialize_metadata_value(value)
+
+    @classmethod
+    def _metadata_operator_matches(cls, typed: Dict[str, Any], operator: str, operand: Any) -> bool:
+        """Python counterpart of _metadata_operator_condition on typed_metadata_values."""
+        if operator == 'prefix':
+            if not isinstance(operand, str):
+                raise ValueError("The 'prefix' metadata operator requires a string")
+            return typed['value_text'] is not None and typed['value_text'].startswith(operand)
+        if operator == 'in':
+            if isinstance(operand, (str, bytes)) or not isinstance(operand, (list, tuple, set)):
+                raise ValueError("The 'in' metadata operator requires a list of values")
+            return any(cls._metadata_operator_matches(typed, 'eq', item) for item in operand)
+        if operator == 'between':
+            if not isinstance(operand, (list, tuple)) or len(operand) != 2:
+                raise ValueError("The 'between' metadata operator requires [low, high]")
+            low_column, low = cls._typed_operand(operand[0])
+            high_column, high = cls._typed_operand(operand[1])
+            if low_column is not high_column:
+                raise ValueError("Both 'between' bounds must have the same type")
+            stored = typed[low_column.key]
+            return stored is not None and low <= stored <= high
+
+        column, expected = cls._typed_operand(operand)
+        stored = typed[column.key]
+        if stored is None:
+            return False
+        if operator == 'eq':
+            return stored == expected
+        if operator == 'gt':
+            return stored > expected
+        if operator == 'gte':
+            return stored >= expected
+        if operator == 'lt':
+            return stored < expected
+        return stored <= expected
+
+    @classmethod
+    def metadata_filter_ids(cls, metadata: Dict[str, Any], basket_id: Optional[str] = None) -> Any:
+        """
+        Select the ids of documents matching every metadata filter.
+
+        Dictionary filters are answered by one aggregate over
+        document_metadata instead of one subquery per key:
+
+            SELECT document_id FROM document_metadata JOIN document ...
+            WHERE basket_id = ? AND ((key = ? AND value = ?) OR (key = ? AND ...))
+            GROUP BY document_id HAVING COUNT(DISTINCT key) = <number of keys>
+
+        Every branch of the OR starts with ``key = ?`` so each is a seek on a
+        ``(key, value_*)`` (or key) index, and only the matching metadata
+        rows are ever read.
+
+        Args:
+            metadata: Filters, as accepted by find_documents_by_metadata
+            basket_id: Only select documents of this basket
+
+        Returns:
+            SELECT of document_metadata.document_id, usable as an IN subquery
+        """
+        conditions = [
+            cls._metadata_value_condition(key, value)
+            for key, value in metadata.items()
+        ]
+        matching = select(DocumentMetadata.document_id).where(or_(*conditions))
+        if basket_id is not None:
+            matching = matching.join(
+                DocumentModel, DocumentModel.id == DocumentMetadata.document_id
+            ).where(DocumentModel.basket_id == basket_id)
+        if len(conditions) > 1:
+            matching = matching.group_by(DocumentMetadata.document_id).having(
+                func.count(func.distinct(DocumentMetadata.key)) == len(conditions)
+            )
+        return matching
+
     def _apply_metadata_filter(
         self,
         query: Any,
         metadata: Union[Dict[str, Any], str],
     ) -> Any:
-        """Apply metadata filtering to a base document query."""
+        """
+        Apply metadata filtering to a base document query.
+
+        Dictionary filters restrict the query to metadata_filter_ids for the
+        basket; a string matches documents with any key of that value.
+        """
         if isinstance(metadata, dict):
-            metadata_filters = []
-            for key, value in metadata.items():
-                value_json = self._serialize_metadata_value(value)
-                subquery = select(DocumentMetadata.document_id).where(
-                    and_(
-                        DocumentMetadata.key == key,
-                        DocumentMetadata.value == value_json,
-                        DocumentMetadata.document_id.in_(
-                            select(DocumentModel.id).where(
-                                DocumentModel.basket_id == self.basket.id
-                            )
-                        ),
-                    )
-                )
-                metadata_filters.append(subquery)
-            if not metadata_filters:
+            if not metadata:
                 return None
-
-            base_subquery = metadata_filters[0]
-            for subquery in metadata_filters[1:]:
-                base_subquery = base_subquery.intersect(subquery)
-            return query.where(DocumentModel.id.in_(base_subquery))
+            return query.where(DocumentModel.id.in_(self.metadata_filter_ids(metadata, self.basket.id)))
 
         if isinstance(metadata, str):
             search_value_json = json.dumps(metadata)
@@ -127,6 +364,63 @@ class DocBasketDocumentManager:
             return query.where(DocumentMetadata.value == search_value_json).distinct()
 
         raise ValueError("Metadata must be a dictionary or a string.")
+
+    def _read_source(self, file_path: Path) -> Tuple[Optional[Union[str, bytes]], str, int]:
+        """
+        Read a source file and compute its checksum and size.
+
+        Text files are checksummed on their decoded text so duplicate
+        detection matches documents that were added before. When the basket
+        does not store content in the database the file is only streamed
+        through the hash and no content is returned.
+
+        Returns:
+            Tuple of (content, checksum, size)
+        """
+        if not self.basket.store_content:
+            checksum, size = self._hash_source(file_path, self.basket.ingest_chunk_size)
+            return None, checksum, size
+        if is_binary_file(file_path):
+            content = file_path.read_bytes()
+            return content, hashlib.sha256(content).hexdigest(), len(content)
+        content = file_path.read_text()
+        encoded = content.encode()
+        return content, hashlib.sha256(encoded).hexdigest(), len(encoded)
+
+    @staticmethod
+    def _hash_source(file_path: Path, chunk_size: int) -> Tuple[str, int]:
+        """
+        Compute the checksum and size of a source file in fixed-size chunks.
+
+        Produces the same checksum as hashing the whole file at once, so
+        streamed and fully-read documents are detected as duplicates of
+        each other.
+
+        Returns:
+            Tuple of (checksum, size)
+        """
+        digest = hashlib.sha256()
+        size = 0
+        if is_binary_file(file_path):
+            with open(file_path, 'rb') as f:
+                for chunk in iter(lambda: f.read(chunk_size), b''):
+                    digest.update(chunk)
+                    size += len(chunk)
+        else:
+            with open(file_path, 'r') as f:
+                for chunk in iter(lambda: f.read(chunk_size), ''):
+                    encoded = chunk.encode()
+                    digest.update(encoded)
+                    size += len(encoded)
+        return digest.hexdigest(), size
+
+    @staticmethod
+    def _metadata_json(value: Any) -> str:
+        """Serialize a metadata value for the document_metadata.value column."""
+        try:
+            return json.dumps(value, default=str)
+        except (TypeError, ValueError):
+            return json.dumps(str(value))
     
     
     def add(
@@ -149,16 +443,8 @@ class DocBasketDocumentManager:
         # Use tenant-aware database from basket instance
         with self.basket.db.session() as session:
             file_path = Path(file_path)
-            if is_binary_file(file_path):
-                content = file_path.read_bytes()
-                checksum = hashlib.sha256(content).hexdigest()
-                size = len(content)
-                raw_content = content
-            else:
-                content = file_path.read_text()
-                checksum = hashlib.sha256(content.encode()).hexdigest()
-                size = len(content.encode())
-                raw_content = content
+            content, checksum, size = self._read_source(file_path)
+            raw_content = content
             
             # Check for duplicates: same checksum AND same source/filename
             # This allows same file content with different names to be treated as different documents
@@ -255,7 +541,8 @@ class DocBasketDocumentManager:
                         key=key,
                         value=value_json,
                         created_at=datetime.now(timezone.utc),
-                        updated_at=datetime.now(timezone.utc)
+                        updated_at=datetime.now(timezone.utc),
+                        **typed_metadata_values(value)
                     )
                     session.add(meta)
             
@@ -277,6 +564,231 @@ class DocBasketDocumentManager:
             session.commit()
             
             return self._document_instance(document)
+
+    def add_many(
+        self,
+        file_paths: Sequence[str],
+        document_type: str = 'file',
+        metadata: Optional[Union[Dict[str, Any], Sequence[Optional[Dict[str, Any]]]]] = None,
+        batch_size: int = 500,
+        max_workers: int = 8,
+    ) -> List[Document]:
+        """
+        Add many documents to the basket using batched database writes.
+
+        Per batch, checksums are computed on a worker pool, duplicates are
+        found with a single ``IN`` query, storage writes run concurrently on a
+        bounded thread pool, and Document/DocumentMetadata/Operation rows are
+        inserted with one multi-row INSERT per table before a single commit.
+
+        Args:
+            file_paths: Paths to the documents
+            document_type: Type of document (file, url, etc.)
+            metadata: Optional metadata - a dict applied to every document, or a
+                sequence aligned with ``file_paths`` (one dict or None per file)
+            batch_size: Number of files written per database transaction
+            max_workers: Maximum concurrent checksum/storage workers
+
+        Returns:
+            Document instances in the same order as ``file_paths``. Files that
+            already exist in the basket return the existing document, as
+            :meth:`add` does.
+
+        Raises:
+            ValueError: If metadata is a sequence whose length differs from file_paths
+        """
+        file_paths = [Path(file_path) for file_path in file_paths]
+        if metadata is None or isinstance(metadata, dict):
+            metadata_list = [metadata] * len(file_paths)
+        else:
+            metadata_list = list(metadata)
+            if len(metadata_list) != len(file_paths):
+                raise ValueError("metadata sequence must have one entry per file path")
+        if batch_size <= 0:
+            raise ValueError("batch_size must be positive")
+
+        documents: List[Document] = []
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            for start in range(0, len(file_paths), batch_size):
+                documents.extend(self._add_batch(
+                    file_paths[start:start + batch_size],
+                    metadata_list[start:start + batch_size],
+                    document_type,
+                    executor,
+                ))
+        return documents
+
+    def _add_batch(
+        self,
+        file_paths: List[Path],
+        metadata_list: List[Optional[Dict[str, Any]]],
+        document_type: str,
+        executor: ThreadPoolExecutor,
+    ) -> List[Document]:
+        """Ingest one batch for :meth:`add_many` in a single transaction."""
+        sources = list(executor.map(self._read_source, file_paths))
+
+        with self.basket.db.session() as session:
+            checksums = {checksum for _, checksum, _ in sources}
+            source_names = {str(file_path) for file_path in file_paths}
+            existing_rows = session.execute(
+                select(DocumentModel).where(
+                    and_(
+                        DocumentModel.basket_id == self.basket.id,
+                        DocumentModel.checksum.in_(checksums),
+                        DocumentModel.source.in_(source_names),
+                    )
+                )
+            ).scalars().all()
+            existing = {(doc.checksum, doc.source): doc for doc in existing_rows}
+
+            now = datetime.now(timezone.utc)
+            results: List[Optional[DocumentModel]] = []
+            pending: List[Tuple[DocumentModel, Path, Dict[str, Any], str]] = []
+            event_rows: List[Dict[str, Any]] = []
+            for file_path, (content, checksum, size), file_metadata in zip(file_paths, sources, metadata_list):
+                key = (checksum, str(file_path))
+                if key in existing:
+                    event_rows.append({
+                        'id': generate_id(DocEvent),
+                        'basket_id': self.basket.id,
+                        'document_id': existing[key].id,
+                        'event_type': 'DUPLICATE',
+                        'event_timestamp': now,
+                        'data': {'source': str(file_path)},
+                        'created_at': now,
+                        'updated_at': now,
+                    })
+                    results.append(existing[key])
+                    continue
+
+                file_metadata = dict(file_metadata or {})
+                document = DocumentModel(
+                    id=f"doc_{uuid4().hex}",
+                    basket_id=self.basket.id,
+                    source=str(file_path),
+                    path='',
+                    document_type=document_type,
+                    content={'content': content if isinstance(content, str) else None},
+                    raw_content=content if isinstance(content, str) else None,
+                    content_type=self.basket.path_helper.get_content_type(file_path),
+                    size=size,
+                    checksum=checksum,
+                    status='RECEIVED',
+                    processing_attempts=0,
+                    created_at=now,
+                    updated_at=now,
+                )
+                readable_name = self.basket.path_helper.get_readable_document_name(
+                    document, str(file_path), file_metadata
+                )
+                document.name = f"{readable_name}{file_path.suffix}"
+                full_path = self.basket.path_helper.build_document_path(
+                    document, str(file_path), file_metadata
+                )
+                file_metadata.setdefault('original_filename', file_path.name)
+                # Later copies of the same file in this batch resolve to the first one
+                existing[key] = document
+                results.append(document)
+                pending.append((document, file_path, file_metadata, full_path))
+
+            self._store_batch(pending, executor)
+            try:
+                if pending:
+                    session.execute(
+                        insert(DocumentModel),
+                        [
+                            {
+                                column.key: getattr(document, column.key)
+                                for column in DocumentModel.__table__.columns
+                            }
+                            for document, _, _, _ in pending
+                        ],
+                    )
+                    metadata_rows = [
+                        {
+                            'id': f"dmt_{uuid4().hex}",
+                            'document_id': document.id,
+                            'key': key,
+                            'value': self._metadata_json(value),
+                            **typed_metadata_values(value),
+                            'metadata_type': 'custom',
+                            'created_at': now,
+                            'updated_at': now,
+                        }
+                        for document, _, file_metadata, _ in pending
+                        for key, value in file_metadata.items()
+                    ]
+                    if metadata_rows:
+                        session.execute(insert(DocumentMetadata), metadata_rows)
+                    session.execute(
+                        insert(Operation),
+                        [
+                            {
+                                'id': generate_id(Operation),
+                                'document_id': document.id,
+                                'operation_type': 'ADD',
+                                'status': 'success',
+                                'details': {
+                                    'source': str(file_path),
+                                    'stored_path': document.path,
+                                    'document_type': document_type,
+                                    'size': document.size,
+                                    'checksum': document.checksum,
+                                },
+                                'created_at': now,
+                                'completed_at': now,
+                            }
+                            for document, file_path, _, _ in pending
+                        ],
+                    )
+                if event_rows:
+                    session.execute(insert(DocEvent), event_rows)
+                session.commit()
+            except Exception:
+                # Nothing was committed for this batch; don't leave its files behind
+                session.rollback()
+                self._remove_stored([document for document, _, _, _ in pending])
+                raise
+
+            return [self._document_instance(document) for document in results]
+
+    def _store_batch(
+        self,
+        pending: List[Tuple[DocumentModel, Path, Dict[str, Any], str]],
+        executor: ThreadPoolExecutor,
+    ) -> None:
+        """
+        Copy a batch of source files to storage concurrently.
+
+        Sets ``document.path`` to the stored path. If any write fails, the
+        objects already written for this batch are removed and the error is
+        re-raised so no rows are committed for the batch. ``_add_batch`` does
+        the same if the database writes fail after storage succeeded.
+        """
+        storage_service = self.basket.storage_service
+        futures = {
+            executor.submit(storage_service.store_document, str(file_path), full_path): document
+            for document, file_path, _, full_path in pending
+        }
+        errors = []
+        for future, document in futures.items():
+            try:
+                document.path = future.result()
+            except Exception as e:
+                errors.append(e)
+        if errors:
+            self._remove_stored(list(futures.values()))
+            raise errors[0]
+
+    def _remove_stored(self, documents: List[DocumentModel]) -> None:
+        """Best-effort removal of the stored files of a batch that was not committed."""
+        for document in documents:
+            if document.path:
+                try:
+                    self.basket.storage_service.delete_document(document.path)
+                except Exception as e:
+                    logger.warning(f"Failed to remove {document.path} after batch error: {e}")
     
     def list_documents(
         self,
@@ -285,7 +797,8 @@ class DocBasketDocumentManager:
         order_by: Optional[str] = None,
         order_desc: bool = False,
         status: Optional[str] = None,
-        document_type: Optional[str] = None
+        document_type: Optional[str] = None,
+        with_metadata: bool = False
     ) -> List[Document]:
         """
         List documents in this basket with pagination, sorting, and filtering.
@@ -298,6 +811,9 @@ class DocBasketDocumentManager:
             order_desc: If True, sort in descending order
             status: Optional filter by document status
             document_type: Optional filter by document type
+            with_metadata: Load the metadata of all listed documents with one
+                extra query and cache it on each Document, instead of one
+                query per document on get_metadata()
             
         Returns:
             List of Document instances
@@ -335,7 +851,166 @@ class DocBasketDocumentManager:
             documents = session.execute(query).scalars().all()
             
             # document.path already contains the full path (no reconstruction needed)
-            return [self._document_instance(doc) for doc in documents]
+            result = [self._document_instance(doc) for doc in documents]
+        
+        if with_metadata:
+            self._attach_metadata(result)
+        return result
+    
+    def list_documents_page(
+        self,
+        page_size: int = 100,
+        after: Optional[str] = None,
+        order_by: str = 'created_at',
+        order_desc: bool = True,
+        status: Optional[str] = None,
+        document_type: Optional[str] = None,
+        metadata: Optional[Union[Dict[str, Any], str]] = None
+    ) -> Tuple[List[Document], Optional[str]]:
+        """
+        Fetch one page of documents using keyset (cursor) pagination.
+        
+        Pages seek past the last row of the previous page on the
+        (basket_id, created_at/updated_at) indexes with the document id as a
+        tiebreaker, so deep pages cost the same as the first one.
+        
+        Args:
+            page_size: Maximum number of documents per page
+            after: Cursor returned with the previous page (None for the first page)
+            order_by: Field to sort by ('created_at', 'updated_at', 'name')
+            order_desc: If True, sort in descending order (newest first)
+            status: Optional filter by document status
+            document_type: Optional filter by document type
+            metadata: Optional metadata filter (same forms as find_documents_by_metadata)
+            
+        Returns:
+            Tuple of (documents, next_cursor); next_cursor is None on the last page
+            
+        Raises:
+            ValueError: If order_by is not supported or the cursor does not
+                belong to this ordering
+        """
+        if page_size <= 0:
+            raise ValueError("page_size must be positive")
+        if order_by not in self.KEYSET_ORDER_FIELDS:
+            raise ValueError(
+                f"Cursor pagination supports order_by in {self.KEYSET_ORDER_FIELDS}, got '{order_by}'"
+            )
+        cursor = decode_cursor(after) if after else None
+        if cursor is not None and (cursor.order_by, cursor.order_desc) != (order_by, order_desc):
+            raise ValueError("Cursor was created for a different ordering")
+        
+        sort_column = getattr(DocumentModel, order_by)
+        with self.basket.db.session() as session:
+            query = select(DocumentModel).where(DocumentModel.basket_id == self.basket.id)
+            if status:
+                query = query.where(DocumentModel.status == status)
+            if document_type:
+                query = query.where(DocumentModel.document_type == document_type)
+            if metadata:
+                query = self._apply_metadata_filter(query, metadata)
+                if query is None:
+                    return [], None
+            query = apply_keyset(query, sort_column, DocumentModel.id, order_desc, cursor)
+            # Fetch one extra row to know whether another page exists
+            rows = session.execute(query.limit(page_size + 1)).scalars().all()
+            
+            next_cursor = None
+            if len(rows) > page_size:
+                rows = rows[:page_size]
+                last = rows[-1]
+                next_cursor = encode_cursor(order_by, order_desc, getattr(last, order_by), last.id)
+            return [self._document_instance(doc) for doc in rows], next_cursor
+    
+    def iter_documents(
+        self,
+        page_size: int = 100,
+        after: Optional[str] = None,
+        order_by: str = 'created_at',
+        order_desc: bool = True,
+        status: Optional[str] = None,
+        document_type: Optional[str] = None,
+        metadata: Optional[Union[Dict[str, Any], str]] = None
+    ) -> Iterator[Document]:
+        """
+        Iterate over all matching documents, fetching them page by page.
+        
+        Each page is a separate keyset query (see list_documents_page), so
+        iteration never holds a long-running cursor or an OFFSET scan open.
+        
+        Yields:
+            Document instances in the requested order
+        """
+        while True:
+            documents, after = self.list_documents_page(
+                page_size, after, order_by, order_desc, status, document_type, metadata
+            )
+            yield from documents
+            if after is None:
+                return
+    
+    def stream_documents(
+        self,
+        columns: Optional[List[str]] = None,
+        batch_size: int = 1000,
+        status: Optional[str] = None,
+        document_type: Optional[str] = None,
+        include_content: bool = False
+    ) -> Iterator[Union[Document, Dict[str, Any]]]:
+        """
+        Stream every document in the basket with bounded memory.
+        
+        Rows are fetched ``batch_size`` at a time with ``yield_per``, which
+        uses a server-side cursor (``stream_results``) on PostgreSQL, so a
+        full-basket scan never materialises the whole result set. Rows are
+        ordered by id for a stable scan.
+        
+        Args:
+            columns: If given, yield lightweight dictionaries with only these
+                columns (see list_documents_with_metadata for available names)
+                instead of Document instances
+            batch_size: Number of rows fetched from the database per round trip
+            status: Optional filter by document status
+            document_type: Optional filter by document type
+            include_content: Load the ``content``/``raw_content`` columns too.
+                They are deferred by default; a deferred column cannot be
+                loaded from a yielded Document once iteration has moved on.
+            
+        Yields:
+            Document instances, or dictionaries when ``columns`` is given
+        """
+        if batch_size <= 0:
+            raise ValueError("batch_size must be positive")
+        
+        if columns is not None:
+            valid_columns = [col for col in columns if col in DOCUMENT_LIST_COLUMNS]
+            if not valid_columns:
+                raise ValueError("No valid columns specified")
+            query = select(*[DOCUMENT_LIST_COLUMNS[col] for col in valid_columns])
+        else:
+            query = select(DocumentModel)
+            if not include_content:
+                query = query.options(defer(DocumentModel.content), defer(DocumentModel.raw_content))
+        
+        query = query.where(DocumentModel.basket_id == self.basket.id)
+        if status:
+            query = query.where(DocumentModel.status == status)
+        if document_type:
+            query = query.where(DocumentModel.document_type == document_type)
+        query = query.order_by(DocumentModel.id).execution_options(yield_per=batch_size)
+        
+        with self.basket.db.session() as session:
+            if columns is not None:
+                for row in session.execute(query):
+                    yield {
+                        col: (value.isoformat() if hasattr(value, 'isoformat') else value)
+                        for col, value in zip(valid_columns, row)
+                    }
+                return
+            for document in session.scalars(query):
+                # Detach each row so the session does not accumulate the whole scan
+                session.expunge(document)
+                yield self._document_instance(document)
     
     def list_documents_with_metadata(
         self,
@@ -383,18 +1058,7 @@ class DocBasketDocumentManager:
             columns = ['id', 'name', 'document_type', 'status', 'size', 'created_at']
         
         # Map column names to model attributes
-        column_map = {
-            'id': DocumentModel.id,
-            'name': DocumentModel.name,
-            'path': DocumentModel.path,
-            'document_type': DocumentModel.document_type,
-            'content_type': DocumentModel.content_type,
-            'size': DocumentModel.size,
-            'checksum': DocumentModel.checksum,
-            'status': DocumentModel.status,
-            'created_at': DocumentModel.created_at,
-            'updated_at': DocumentModel.updated_at,
-        }
+        column_map = DOCUMENT_LIST_COLUMNS
         
         # Build select statement with only requested columns
         selected_columns = []
@@ -586,18 +1250,7 @@ class DocBasketDocumentManager:
         if columns is None:
             columns = ['id', 'name', 'document_type', 'status', 'size', 'created_at']
 
-        column_map = {
-            'id': DocumentModel.id,
-            'name': DocumentModel.name,
-            'path': DocumentModel.path,
-            'document_type': DocumentModel.document_type,
-            'content_type': DocumentModel.content_type,
-            'size': DocumentModel.size,
-            'checksum': DocumentModel.checksum,
-            'status': DocumentModel.status,
-            'created_at': DocumentModel.created_at,
-            'updated_at': DocumentModel.updated_at,
-        }
+        column_map = DOCUMENT_LIST_COLUMNS
         valid_columns = [col for col in columns if col in column_map]
         selected_columns = [column_map[col] for col in valid_columns]
         if not selected_columns:
@@ -663,6 +1316,30 @@ class DocBasketDocumentManager:
                 return None
             return self._document_instance(document)
     
+    def get_documents(self, document_ids: Sequence[str]) -> List[Document]:
+        """
+        Get several documents of this basket with one ``WHERE id IN (...)`` query.
+
+        Args:
+            document_ids: Document IDs
+
+        Returns:
+            Documents in the order of ``document_ids``; unknown IDs and IDs
+            of other baskets are skipped
+        """
+        document_ids = list(dict.fromkeys(document_ids))
+        if not document_ids:
+            return []
+        with self.basket.db.session() as session:
+            models = session.execute(
+                select(DocumentModel).where(
+                    DocumentModel.id.in_(document_ids),
+                    DocumentModel.basket_id == self.basket.id,
+                )
+            ).scalars().all()
+            by_id = {model.id: self._document_instance(model) for model in models}
+        return [by_id[document_id] for document_id in document_ids if document_id in by_id]
+
     def update_document(self, document_id: int, file_path: str) -> Document:
         """
         Update a document.
@@ -710,8 +1387,12 @@ class DocBasketDocumentManager:
                         DocumentMetadata.key == key
                     )
                 ).scalar_one_or_none()
+                typed = typed_metadata_values(value)
                 if doc_metadata:
                     doc_metadata.value = value
+                    doc_metadata.value_num = typed['value_num']
+                    doc_metadata.value_ts = typed['value_ts']
+                    doc_metadata.value_text = typed['value_text']
                     doc_metadata.updated_at = datetime.now(timezone.utc)
                 else:
                     doc_metadata = DocumentMetadata(
@@ -719,7 +1400,8 @@ class DocBasketDocumentManager:
                         key=key,
                         value=value,
                         created_at=datetime.now(timezone.utc),
-                        updated_at=datetime.now(timezone.utc)
+                        updated_at=datetime.now(timezone.utc),
+                        **typed
                     )
                     session.add(doc_metadata)
             session.commit()
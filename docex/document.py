@@ -1,6 +1,6 @@
 import json
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Union
 
 try:  # Python 3.11+ exposes datetime.UTC
     from datetime import UTC
@@ -10,6 +10,7 @@ except ImportError:  # Fallback for older runtimes (e.g., macOS system Python 3.
 from sqlalchemy import text
 
 from docex.config.config_manager import ConfigManager
+from docex.db.audit_writer import AuditWriter
 from docex.db.connection import Database
 from docex.db.models import Operation
 from docex.models.records import DocumentRecord
@@ -54,6 +55,8 @@ class Document:
         
         # Store tenant-aware database if provided (for multi-tenancy support)
         self.db = db
+        # Metadata loaded on first access or attached by a bulk listing
+        self._metadata: Optional[Dict[str, Any]] = None
 
     @property
     def storage_service(self) -> StorageService:
@@ -119,6 +122,62 @@ class Document:
     def get_content(self, mode: str = 'bytes') -> Union[bytes, str, Dict[str, Any]]:
         """Instance method version of get_content for compatibility."""
         return Document._get_content_static(self, mode)
+
+    def open(self) -> BinaryIO:
+        """
+        Open the document content as a readable binary stream.
+
+        Nothing is buffered up front: filesystem storage returns the open
+        file and S3 returns the object's streaming body. Use it as a context
+        manager so the underlying file or connection is released.
+
+        Returns:
+            Readable binary file-like object
+
+        Raises:
+            FileNotFoundError: If document content cannot be found
+        """
+        return self.storage_service.open_document(self.path)
+
+    def iter_content(self, chunk_size: int = 1024 * 1024) -> Iterator[bytes]:
+        """
+        Iterate over the document content in chunks.
+
+        Args:
+            chunk_size: Maximum number of bytes per chunk (default: 1 MiB)
+
+        Yields:
+            Successive chunks of the document content
+        """
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+        with self.open() as stream:
+            while True:
+                chunk = stream.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+
+    def read_range(self, start: int, end: Optional[int] = None) -> bytes:
+        """
+        Read a byte range of the document content.
+
+        Only the requested bytes are fetched (an HTTP Range GET on S3, a
+        seek on the filesystem), which keeps previews of large documents cheap.
+
+        Args:
+            start: Offset of the first byte to read
+            end: Offset one past the last byte to read (None reads to the end)
+
+        Returns:
+            The requested bytes
+
+        Raises:
+            ValueError: If the range is invalid
+        """
+        if start < 0 or (end is not None and end < start):
+            raise ValueError(f"Invalid byte range: start={start}, end={end}")
+        return self.storage_service.read_document_range(self.path, start, end)
     
     def get_details(self) -> DocumentRecord:
         """Get document details.
@@ -141,17 +200,37 @@ class Document:
             updated_at=self.updated_at,
         )
 
-    def get_metadata(self) -> Dict[str, Any]:
-        """Get all metadata for this document from the database as direct values."""
-        # Use tenant-aware database if available, otherwise create new one
-        doc_db = self.db or Database()
-        service = MetadataService(doc_db)
-        return service.get_metadata(self.id)
+    def get_metadata(self, refresh: bool = False) -> Dict[str, Any]:
+        """Get all metadata for this document from the database as direct values.
+        
+        The result is cached on the document, so repeated calls (and documents
+        returned by ``list_documents(with_metadata=True)``) do not query again.
+        
+        Args:
+            refresh: Reload metadata from the database even if it is cached
+        """
+        if self._metadata is None or refresh:
+            # Use tenant-aware database if available, otherwise create new one
+            doc_db = self.db or Database()
+            service = MetadataService(doc_db)
+            self._metadata = service.get_metadata(self.id)
+        return dict(self._metadata)
 
     def get_metadata_dict(self) -> Dict[str, Any]:
         """Get all metadata as a plain dict."""
         # MetadataService.get_metadata() returns Dict[str, Any] with direct values
         return self.get_metadata()
+
+    def attach_metadata(self, metadata: Dict[str, Any]) -> None:
+        """Cache metadata loaded in bulk (see MetadataService.get_metadata_bulk)."""
+        self._metadata = dict(metadata)
+
+    def invalidate_metadata(self) -> None:
+        """Drop cached metadata so the next get_metadata() reloads it.
+
+        Call after writing this document's metadata through MetadataService.
+        """
+        self._metadata = None
     
     def update_metadata(self, metadata: Dict[str, Any]) -> None:
         """Update metadata for this document.
@@ -163,24 +242,28 @@ class Document:
         doc_db = self.db or Database()
         service = MetadataService(doc_db)
         service.update_metadata(self.id, metadata)
+        # Stored values are JSON round-tripped; reload on next access
+        self.invalidate_metadata()
 
-    def create_operation(self, operation_type: str, status: str, details: Optional[Dict] = None) -> Any:
-        """Create an operation record for this document."""
+    def create_operation(self, operation_type: str, status: str, details: Optional[Dict] = None, sync: bool = False) -> Any:
+        """Create an operation record for this document.
+        
+        The row is buffered and written in a batch by the AuditWriter; pass
+        ``sync=True`` to write it before returning. The returned Operation
+        carries its id but is not attached to a session.
+        """
         # Use tenant-aware database if available, otherwise create new one
         doc_db = self.db or Database()
-        with doc_db.transaction() as session:
-            operation = Operation(
-                document_id=self.id,
-                operation_type=operation_type,
-                status=status,
-                details=details or {},
-                created_at=datetime.now(UTC),
-                completed_at=datetime.now(UTC)
-            )
-            session.add(operation)
-            session.commit()
-            session.refresh(operation)
-            return operation
+        now = datetime.now(UTC)
+        row = AuditWriter.for_database(doc_db).add(Operation, {
+            'document_id': self.id,
+            'operation_type': operation_type,
+            'status': status,
+            'details': details or {},
+            'created_at': now,
+            'completed_at': now
+        }, sync=sync)
+        return Operation(**row)
 
     def remove_from_basket(self) -> None:
         """Remove this document from its basket. This deletes the document from the database and cleans up its storage."""
@@ -200,6 +283,7 @@ class Document:
         """Retrieve all operations associated with this document from the database."""
         # Use tenant-aware database if available, otherwise create new one
         doc_db = self.db or Database()
+        AuditWriter.for_database(doc_db).flush()
         with doc_db.session() as session:
             operations = session.query(Operation).filter(Operation.document_id == self.id).all()
             return [{"type": op.operation_type, "status": op.status, "created_at": op.created_at, "completed_at": op.completed_at, "error": op.error, "details": op.details} for op in operations]
@@ -208,6 +292,7 @@ class Document:
         """Retrieve all route operations associated with this document from the database."""
         # Use tenant-aware database if available, otherwise create new one
         doc_db = self.db or Database()
+        AuditWriter.for_database(doc_db).flush()
         with doc_db.session() as session:
             route_operations = session.query(RouteOperation).filter(RouteOperation.document_id == self.id).all()
             return [{"type": op.operation_type, "status": op.status, "created_at": op.created_at, "completed_at": op.completed_at, "error": op.error, "details": op.details} for op in route_operations] 
@@ -1,9 +1,10 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional, Union
-from datetime import datetime
+from typing import Dict, Any, List, Optional, Union
+from datetime import datetime, timezone
 from uuid import uuid4
 
 from docex.document import Document
+from docex.db.audit_writer import AuditWriter
 from docex.db.connection import Database
 from docex.db.models import ProcessingOperation
 from docex.models.document_metadata import DocumentMetadata as MetaModel
@@ -46,6 +47,14 @@ class ProcessingResult:
 class BaseProcessor(ABC):
     """Base class for document processors"""
     
+    # Where ProcessingEngine runs process(): 'async' (event loop), 'thread',
+    # 'process' (CPU-bound; rebuilt in the worker from its config) or 'auto'
+    # (the loop for coroutine process methods, a thread otherwise)
+    execution_mode = 'auto'
+    # Whether process() records its own processing operations; ProcessingEngine
+    # records the outcome of processors that do not
+    records_operations = False
+    
     def __init__(self, config: Dict[str, Any], db: Optional[Database] = None):
         """
         Initialize processor
@@ -117,66 +126,102 @@ class BaseProcessor(ABC):
         """Get document content as text"""
         return Document.get_content(document, mode='text')
     
+    def get_extracted_text(self, document: Document) -> str:
+        """
+        Get the document's extracted text
+        
+        PDF and DOCX text is extracted once per document checksum and kept
+        as a derived artifact in the basket storage (see ExtractedTextStore),
+        so processors sharing a document do not parse it again. Other types
+        are read with get_document_text.
+        """
+        from docex.services.extracted_text_store import ExtractedTextStore
+        store = ExtractedTextStore()
+        if not store.supports(document):
+            return self.get_document_text(document)
+        return store.get_text(document)
+    
     def get_document_json(self, document: Document) -> Dict[str, Any]:
         """Get document content as JSON"""
         return Document.get_content(document, mode='json')
     
+    @property
+    def audit_writer(self) -> AuditWriter:
+        """Buffered writer of this processor's operation rows"""
+        return AuditWriter.for_database(self.db)
+    
     def _record_operation(
         self,
         document: Document,
         status: str,
         input_metadata: Optional[Dict[str, Any]] = None,
         output_metadata: Optional[Dict[str, Any]] = None,
-        error: Optional[str] = None
+        error: Optional[str] = None,
+        sync: bool = False
     ) -> ProcessingOperation:
         """Record a processing operation
         
+        The row is buffered by the AuditWriter and written with other rows
+        in one INSERT; pass ``sync=True`` when it must be in the database
+        before processing continues.
+        
         Args:
             document: Document being processed
             status: Operation status
             input_metadata: Input metadata
             output_metadata: Output metadata
             error: Error message if any
+            sync: Write the operation now
             
         Returns:
-            Created processing operation
+            The processing operation (not attached to a session)
         """
-        from docex.db.models import Processor
-        from sqlalchemy import select
-        
-        processor_name = self.__class__.__name__
+        row = self.audit_writer.add(
+            ProcessingOperation,
+            self._operation_row(document, status, input_metadata, output_metadata, error),
+            sync=sync
+        )
+        return ProcessingOperation(**row)
+    
+    def _record_operations(self, records: List[Dict[str, Any]], flush: bool = True) -> None:
+        """Record many processing operations, written with one INSERT
         
-        with self.db.session() as session:
-            # Get or create processor in database
-            processor = session.execute(
-                select(Processor).where(Processor.name == processor_name)
-            ).scalar_one_or_none()
-            
-            if not processor:
-                # Create processor if it doesn't exist
-                processor = Processor(
-                    name=processor_name,
-                    type='custom',
-                    description=f'Auto-registered processor: {processor_name}',
-                    config=self.config,
-                    enabled=True
-                )
-                session.add(processor)
-                session.flush()  # Flush to get the ID
-            
-            # Create processing operation
-            operation = ProcessingOperation(
-                id=f"pop_{uuid4().hex}",
-                document_id=document.id,
-                processor_id=processor.id,  # Use database ID, not class name
-                status=status,
-                input_metadata=input_metadata,
-                output_metadata=output_metadata,
-                error=error
-            )
-            
-            session.add(operation)
-            session.commit()
-            session.refresh(operation)
-            
-        return operation 
\ No newline at end of file
+        Args:
+            records: One dict per operation with a ``document`` and ``status``
+                and optional ``input_metadata``, ``output_metadata`` and ``error``
+                (the keyword arguments of _record_operation)
+            flush: Write them (and other buffered rows) at once, e.g. at the
+                end of a batch; otherwise they stay buffered
+        """
+        writer = self.audit_writer
+        for record in records:
+            writer.add(ProcessingOperation, self._operation_row(
+                record['document'],
+                record['status'],
+                record.get('input_metadata'),
+                record.get('output_metadata'),
+                record.get('error')
+            ))
+        if flush and records:
+            writer.flush()
+    
+    def _operation_row(
+        self,
+        document: Document,
+        status: str,
+        input_metadata: Optional[Dict[str, Any]],
+        output_metadata: Optional[Dict[str, Any]],
+        error: Optional[str]
+    ) -> Dict[str, Any]:
+        """Column values of one ProcessingOperation row, with ``processor_id`` from the audit writer's cache"""
+        return {
+            'id': f"pop_{uuid4().hex}",
+            'document_id': document.id,
+            # Cached database id, not the class name
+            'processor_id': self.audit_writer.processor_id(self.__class__.__name__, self.config),
+            'status': status,
+            'input_metadata': input_metadata,
+            'output_metadata': output_metadata,
+            'error': error,
+            'created_at': datetime.now(timezone.utc),
+        }
@@ -0,0 +1,471 @@
+"""
+Processing engine for DocEX processor pipelines
+
+Runs a list of processors over a basket (or any iterable of documents) with
+bounded concurrency. Each document goes through the processors in order;
+each processor runs where it does not block the others:
+
+- ``async``: awaited on the event loop (I/O-bound async processors)
+- ``thread``: in a thread pool (sync processors, blocking I/O)
+- ``process``: in a process pool (CPU-bound parsing). The processor is
+  rebuilt in the worker as ``type(processor)(processor.config, db=...)``
+  and receives a detached copy of the document, so it must be constructible
+  from its config.
+
+A processor chooses its mode with the ``execution_mode`` class attribute
+('auto' runs coroutine ``process`` methods on the loop and sync ones in a
+thread); ``modes`` overrides it per processor name.
+"""
+
+import asyncio
+import inspect
+import json
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from docex.document import Document
+from docex.processors.base import BaseProcessor, ProcessingResult
+
+logger = logging.getLogger(__name__)
+
+EXECUTION_MODES = ('async', 'thread', 'process')
+
+# Called with (document, processor name, result) after every processor run
+ResultCallback = Callable[[Document, str, ProcessingResult], Any]
+
+
+@dataclass
+class ProcessorStats:
+    """Throughput counters of one processor in a ProcessingEngine run"""
+
+    name: str
+    mode: str
+    processed: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    skipped: int = 0  # can_process() was False, or already done when resuming
+    busy_seconds: float = 0.0  # summed wall time of process() calls
+    elapsed_seconds: float = 0.0  # wall time of the whole run
+
+    @property
+    def throughput(self) -> float:
+        """Documents processed per second of the run"""
+        return self.processed / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+    @property
+    def average_seconds(self) -> float:
+        """Mean wall time of one process() call"""
+        return self.busy_seconds / self.processed if self.processed else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'mode': self.mode,
+            'processed': self.processed,
+            'succeeded': self.succeeded,
+            'failed': self.failed,
+            'skipped': self.skipped,
+            'busy_seconds': self.busy_seconds,
+            'elapsed_seconds': self.elapsed_seconds,
+            'throughput': self.throughput,
+            'average_seconds': self.average_seconds,
+        }
+
+
+class ProcessingEngine:
+    """
+    Runs processor pipelines over many documents concurrently.
+
+    Documents are read a page at a time into a bounded queue, so a slow
+    pipeline applies backpressure to reading instead of buffering the
+    basket. Outcomes of processors that do not record their own processing
+    operations are recorded in batches, which makes every run resumable:
+    with ``resume=True`` a (document, processor) pair that already has a
+    successful processing operation is skipped.
+
+    Example:
+        >>> engine = ProcessingEngine([PDFToText(config), VectorIndexingProcessor(embed, db=db)])
+        >>> stats = await engine.run(basket, resume=True)
+        >>> stats['VectorIndexingProcessor'].throughput
+    """
+
+    def __init__(
+        self,
+        processors: List[BaseProcessor],
+        concurrency: Optional[int] = None,
+        thread_workers: Optional[int] = None,
+        process_workers: Optional[int] = None,
+        queue_size: Optional[int] = None,
+        batch_size: int = 100,
+        modes: Optional[Dict[str, str]] = None,
+        stop_on_failure: bool = True,
+        mp_context: Optional[Any] = None,
+    ):
+        """
+        Initialize processing engine
+
+        Args:
+            processors: Processors applied to each document, in order
+            concurrency: Documents in flight at once (default: twice the CPU
+                count, so the pools stay busy while async stages wait)
+            thread_workers: Thread pool size (default: min(32, CPUs + 4))
+            process_workers: Process pool size (default: CPU count)
+            queue_size: Documents read ahead of the workers (default: 2 x concurrency)
+            batch_size: Documents per page read, per resume lookup and per
+                batch of recorded operations
+            modes: Execution mode per processor class name, overriding the
+                processor's ``execution_mode``
+            stop_on_failure: Skip a document's remaining processors once one fails
+            mp_context: multiprocessing context for the process pool
+        """
+        if not processors:
+            raise ValueError("At least one processor is required")
+        names = [processor.__class__.__name__ for processor in processors]
+        if len(set(names)) != len(names):
+            raise ValueError("Each processor class may appear only once in a pipeline")
+        if batch_size <= 0:
+            raise ValueError("batch_size must be positive")
+
+        cpus = os.cpu_count() or 1
+        self.processors = processors
+        self.concurrency = concurrency or 2 * cpus
+        self.thread_workers = thread_workers or min(32, cpus + 4)
+        self.process_workers = process_workers or cpus
+        self.queue_size = queue_size or 2 * self.concurrency
+        self.batch_size = batch_size
+        self.stop_on_failure = stop_on_failure
+        self.mp_context = mp_context
+        if min(self.concurrency, self.thread_workers, self.process_workers, self.queue_size) <= 0:
+            raise ValueError("concurrency, worker counts and queue_size must be positive")
+
+        modes = modes or {}
+        self.modes: Dict[str, str] = {}
+        for name, processor in zip(names, processors):
+            mode = modes.get(name, getattr(processor, 'execution_mode', 'auto'))
+            if mode == 'auto':
+                mode = 'async' if inspect.iscoroutinefunction(processor.process) else 'thread'
+            if mode not in EXECUTION_MODES:
+                raise ValueError(f"Unsupported execution mode for {name}: {mode}. Supported: {', '.join(EXECUTION_MODES)}")
+            self.modes[name] = mode
+        self.stats: Dict[str, ProcessorStats] = {}
+
+    async def run(
+        self,
+        documents: Union[Any, Iterable[Document], AsyncIterable[Document]],
+        resume: bool = False,
+        metadata: Optional[Dict[str, Any]] = None,
+        on_result: Optional[ResultCallback] = None,
+    ) -> Dict[str, ProcessorStats]:
+        """
+        Run the pipeline over documents
+
+        Args:
+            documents: A DocBasket (every document, oldest first), or an
+                iterable / async iterable of documents such as the result of
+                find_documents_by_metadata
+            resume: Skip processors that already succeeded on a document
+            metadata: Metadata filter applied when ``documents`` is a basket
+            on_result: Optional callback (sync or async) receiving
+                (document, processor name, result) after every processor run
+
+        Returns:
+            ProcessorStats per processor name (also kept in ``self.stats``)
+        """
+        self.stats = {
+            processor.__class__.__name__: ProcessorStats(
+                name=processor.__class__.__name__, mode=self.modes[processor.__class__.__name__]
+            )
+            for processor in self.processors
+        }
+        self._pending_operations: Dict[str, List[Dict[str, Any]]] = {name: [] for name in self.stats}
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        started = time.perf_counter()
+
+        thread_pool = ThreadPoolExecutor(max_workers=self.thread_workers, thread_name_prefix='docex-engine')
+        process_pool = None
+        if 'process' in self.modes.values():
+            process_pool = ProcessPoolExecutor(
+                max_workers=self.process_workers,
+                mp_context=self.mp_context or multiprocessing.get_context(),
+                initializer=_init_worker,
+                initargs=(self._docex_config(),),
+            )
+        executors: Dict[str, Optional[Executor]] = {'async': None, 'thread': thread_pool, 'process': process_pool}
+
+        workers = [
+            asyncio.create_task(self._worker(queue, executors, on_result))
+            for _ in range(self.concurrency)
+        ]
+        try:
+            await self._produce(queue, documents, resume, metadata)
+            await queue.join()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            thread_pool.shutdown(wait=True)
+            if process_pool is not None:
+                process_pool.shutdown(wait=True)
+            self._flush_operations(force=True)
+            elapsed = time.perf_counter() - started
+            for stats in self.stats.values():
+                stats.elapsed_seconds = elapsed
+        for stats in self.stats.values():
+            logger.info(
+                f"{stats.name} ({stats.mode}): {stats.succeeded} succeeded, {stats.failed} failed, "
+                f"{stats.skipped} skipped, {stats.throughput:.1f} documents/s"
+            )
+        return self.stats
+
+    async def _produce(
+        self,
+        queue: asyncio.Queue,
+        documents: Union[Any, Iterable[Document], AsyncIterable[Document]],
+        resume: bool,
+        metadata: Optional[Dict[str, Any]],
+    ) -> None:
+        """Feed (document, processors already done) pairs into the queue, a batch at a time"""
+        async for batch in self._batches(documents, metadata):
+            done = await asyncio.to_thread(self._completed, batch) if resume else {}
+            for document in batch:
+                # Blocks while the queue is full: backpressure on reading
+                await queue.put((document, done.get(document.id, set())))
+
+    async def _batches(
+        self,
+        documents: Union[Any, Iterable[Document], AsyncIterable[Document]],
+        metadata: Optional[Dict[str, Any]],
+    ) -> AsyncIterator[List[Document]]:
+        """Yield lists of up to batch_size documents without blocking the loop on database reads"""
+        if hasattr(documents, 'list_documents_page'):
+            cursor = None
+            while True:
+                page, cursor = await asyncio.to_thread(
+                    documents.list_documents_page, self.batch_size, cursor, 'created_at', False, None, None, metadata
+                )
+                if page:
+                    yield page
+                if not cursor:
+                    return
+        if metadata is not None:
+            raise ValueError("metadata filters apply only when running over a basket")
+
+        batch: List[Document] = []
+        if hasattr(documents, '__aiter__'):
+            async for document in documents:
+                batch.append(document)
+                if len(batch) >= self.batch_size:
+                    yield batch
+                    batch = []
+        else:
+            for document in documents:
+                batch.append(document)
+                if len(batch) >= self.batch_size:
+                    yield batch
+                    batch = []
+        if batch:
+            yield batch
+
+    async def _worker(
+        self,
+        queue: asyncio.Queue,
+        executors: Dict[str, Optional[Executor]],
+        on_result: Optional[ResultCallback],
+    ) -> None:
+        while True:
+            document, done = await queue.get()
+            try:
+                await self._run_pipeline(document, done, executors, on_result)
+            except Exception as e:
+                logger.error(f"Processing pipeline failed for document {document.id}: {e}")
+            finally:
+                queue.task_done()
+
+    async def _run_pipeline(
+        self,
+        document: Document,
+        done: Set[str],
+        executors: Dict[str, Optional[Executor]],
+        on_result: Optional[ResultCallback],
+    ) -> None:
+        """Run every processor on one document, in order"""
+        for processor in self.processors:
+            name = processor.__class__.__name__
+            stats = self.stats[name]
+            if name in done or not await asyncio.to_thread(processor.can_process, document):
+                stats.skipped += 1
+                continue
+
+            mode = self.modes[name]
+            started = time.perf_counter()
+            try:
+                result = await self._call(processor, document, mode, executors[mode])
+            except Exception as e:
+                logger.error(f"{name} failed for document {document.id}: {e}")
+                result = ProcessingResult(success=False, error=str(e))
+            stats.busy_seconds += time.perf_counter() - started
+            stats.processed += 1
+            if result.success:
+                stats.succeeded += 1
+            else:
+                stats.failed += 1
+
+            if not getattr(processor, 'records_operations', False):
+                self._pending_operations[name].append({
+                    'document': document,
+                    'status': 'success' if result.success else 'failed',
+                    'output_metadata': {'engine_mode': mode},
+                    'error': result.error,
+                })
+                self._flush_operations()
+            if on_result is not None:
+                callback = on_result(document, name, result)
+                if inspect.isawaitable(callback):
+                    await callback
+            if not result.success and self.stop_on_failure:
+                return
+
+    async def _call(
+        self,
+        processor: BaseProcessor,
+        document: Document,
+        mode: str,
+        executor: Optional[Executor],
+    ) -> ProcessingResult:
+        """Run processor.process where its execution mode says"""
+        loop = asyncio.get_running_loop()
+        if mode == 'async':
+            result = processor.process(document)
+            return await result if inspect.isawaitable(result) else result
+        if mode == 'thread':
+            return await loop.run_in_executor(executor, _call_process, processor, document)
+        return await loop.run_in_executor(
+            executor,
+            _process_in_worker,
+            type(processor),
+            processor.config,
+            getattr(getattr(processor, 'db', None), 'tenant_id', None),
+            _detached(document),
+        )
+
+    def _completed(self, documents: List[Document]) -> Dict[str, Set[str]]:
+        """Processor names that already succeeded, per document id (one query per database)"""
+        from sqlalchemy import select
+
+        from docex.db.models import ProcessingOperation, Processor
+
+        done: Dict[str, Set[str]] = {}
+        document_ids = [document.id for document in documents]
+        for processor in self.processors:
+            if getattr(processor, 'db', None) is None:
+                continue
+            name = processor.__class__.__name__
+            # Operations recorded by this run may still be buffered
+            processor.audit_writer.flush()
+            with processor.db.session() as session:
+                rows = session.execute(
+                    select(ProcessingOperation.document_id)
+                    .join(Processor, Processor.id == ProcessingOperation.processor_id)
+                    .where(
+                        Processor.name == name,
+                        ProcessingOperation.status == 'success',
+                        ProcessingOperation.document_id.in_(document_ids),
+                    )
+                    .distinct()
+                ).scalars()
+                for document_id in rows:
+                    done.setdefault(document_id, set()).add(name)
+        return done
+
+    def _flush_operations(self, force: bool = False) -> None:
+        """Record buffered outcomes, one INSERT per processor and batch"""
+        for processor in self.processors:
+            name = processor.__class__.__name__
+            pending = self._pending_operations.get(name)
+            if not pending or (len(pending) < self.batch_size and not force):
+                continue
+            self._pending_operations[name] = []
+            try:
+                processor._record_operations(pending)
+            except Exception as e:
+                logger.warning(f"Could not record {len(pending)} processing operations for {name}: {e}")
+        if force:
+            # Write the operations processors buffered themselves
+            for processor in self.processors:
+                if getattr(processor, 'db', None) is not None:
+                    processor.audit_writer.flush()
+
+    def _docex_config(self) -> Optional[Dict[str, Any]]:
+        """Configuration the process-pool workers open their databases with"""
+        for processor in self.processors:
+            config = getattr(getattr(processor, 'db', None), 'config', None)
+            if config is not None and isinstance(getattr(config, 'config', None), dict):
+                return config.config
+        return None
+
+
+def _call_process(processor: BaseProcessor, document: Document) -> ProcessingResult:
+    """Run process() to completion in the current (worker) thread"""
+    result = processor.process(document)
+    if inspect.isawaitable(result):
+        return asyncio.run(result)
+    return result
+
+
+def _detached(document: Document) -> Document:
+    """Copy of a document without database handles, so it can be pickled to a worker process"""
+    detached = Document(
+        id=document.id,
+        name=document.name,
+        path=document.path,
+        content_type=document.content_type,
+        document_type=document.document_type,
+        size=document.size,
+        checksum=document.checksum,
+        status=document.status,
+        created_at=document.created_at,
+        updated_at=document.updated_at,
+        storage_config=document._storage_config,
+    )
+    if document._metadata is not None:
+        detached.attach_metadata(document._metadata)
+    return detached
+
+
+# Processors built in this worker process, reused across documents
+_worker_processors: Dict[Tuple[type, Optional[str], str], BaseProcessor] = {}
+
+
+def _init_worker(config: Optional[Dict[str, Any]]) -> None:
+    """Process-pool initializer: use the parent's DocEX configuration"""
+    if config is not None:
+        from docex.config.docex_config import DocEXConfig
+
+        DocEXConfig().config = config
+
+
+def _process_in_worker(
+    processor_class: type,
+    config: Dict[str, Any],
+    tenant_id: Optional[str],
+    document: Document,
+) -> ProcessingResult:
+    """Process one document in a process-pool worker"""
+    from docex.db.connection import Database
+
+    key = (processor_class, tenant_id, json.dumps(config, sort_keys=True, default=str))
+    processor = _worker_processors.get(key)
+    if processor is None:
+        processor = processor_class(config, db=Database(tenant_id=tenant_id))
+        _worker_processors[key] = processor
+    document.db = processor.db
+    try:
+        return _call_process(processor, document)
+    finally:
+        # Pool workers exit without running atexit handlers
+        processor.audit_writer.flush()
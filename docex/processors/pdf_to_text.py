@@ -1,4 +1,3 @@
-import io
 import re
 from typing import Dict, Any
 from docex.processors.base import BaseProcessor, ProcessingResult
@@ -8,27 +7,24 @@ from docex.db.connection import Database
 
 # Optional PDF processing - only available if pdfminer is installed
 try:
-    from pdfminer.high_level import extract_text
+    import pdfminer  # noqa: F401
     HAS_PDFMINER = True
 except ImportError:
     HAS_PDFMINER = False
-    def extract_text(*args, **kwargs):
-        raise ImportError(
-            "PDF processing requires 'pdfminer.six' package. "
-            "Install it with: pip install docex[pdf]"
-        )
 
 class MatchingInvoiceToPOProcessor(BaseProcessor):
     """Processor that extracts PO number from invoice PDF and updates document metadata"""
+    # pdfminer parsing is CPU-bound pure Python
+    execution_mode = 'process'
+
     def can_process(self, document: Document) -> bool:
         return document.name.lower().endswith('.pdf')
 
     def process(self, document: Document) -> ProcessingResult:
         try:
-            # Get PDF content as bytes
-            pdf_bytes = self.get_document_bytes(document)
-            # Use pdfminer to extract text
-            text = extract_text(io.BytesIO(pdf_bytes))
+            # Text is extracted with pdfminer once per document checksum and
+            # shared with other processors through the extracted-text store
+            text = self.get_extracted_text(document)
             # Find PO number using regex (e.g., PO-000111)
             po_match = re.search(r'PO[-\s]?([0-9]{6,})', text, re.IGNORECASE)
             po_number = po_match.group(0) if po_match else None
@@ -38,6 +34,7 @@ class MatchingInvoiceToPOProcessor(BaseProcessor):
                 from docex.services.metadata_service import MetadataService
                 service = MetadataService(self.db)
                 service.update_metadata(document.id, {'cus_PO': po_number})
+                document.invalidate_metadata()
             return ProcessingResult(
                 success=True,
                 content=text,
@@ -6,10 +6,14 @@ for DocEX documents, enabling similarity search and RAG functionality.
 """
 
 from .vector_indexing_processor import VectorIndexingProcessor
+from .chunked_vector_indexing_processor import ChunkedVectorIndexingProcessor
 from .semantic_search_service import SemanticSearchService
+from .embedding_cache import EmbeddingCache
 
 __all__ = [
     'VectorIndexingProcessor',
+    'ChunkedVectorIndexingProcessor',
     'SemanticSearchService',
+    'EmbeddingCache',
 ]
 
@@ -0,0 +1,270 @@
+"""
+Chunked Vector Indexing Processor for DocEX
+
+Splits document text with a configured chunking strategy and indexes one
+embedding per chunk in the document_chunk table, so retrieval can return the
+best passages (with their offsets) instead of one vector per document.
+"""
+
+import logging
+from datetime import UTC, datetime
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from docex.db.models import DocumentChunk, generate_id
+from docex.document import Document
+from docex.processors.base import ProcessingResult
+from docex.processors.chunking import Chunk, ChunkingConfig, ChunkingFactory, ChunkingStrategy
+from docex.processors.vector.embeddings import BatchEmbeddingFn, EmbeddingFn, resolve_embeddings
+from docex.processors.vector.vector_indexing_processor import VectorIndexingProcessor
+
+logger = logging.getLogger(__name__)
+
+
+class ChunkedVectorIndexingProcessor(VectorIndexingProcessor):
+    """
+    Processor that indexes document chunks for chunk-level semantic search.
+
+    This processor:
+    1. Extracts document text and splits it with a ChunkingStrategy
+    2. Embeds every chunk (in batches of ``ChunkingConfig.embedding_batch_size``)
+    3. Replaces the document's rows in document_chunk (text, offsets, embedding)
+    4. Records chunk indexing metadata and operations in DocEX
+
+    Search the result with ``SemanticSearchService.search(..., granularity='chunk')``.
+    """
+    
+    index_table = 'document_chunk'
+
+    def __init__(
+        self,
+        embedding_fn: Union[EmbeddingFn, BatchEmbeddingFn],
+        chunking_strategy: Union[str, ChunkingStrategy] = 'recursive',
+        chunking_config: Optional[ChunkingConfig] = None,
+        **kwargs: Any,
+    ):
+        """
+        Initialize chunked vector indexing processor
+
+        Args:
+            embedding_fn: Sync or async embedding callable (see VectorIndexingProcessor)
+            chunking_strategy: ChunkingStrategy instance or ChunkingFactory strategy name
+            chunking_config: Configuration used when chunking_strategy is a name
+            **kwargs: VectorIndexingProcessor options (vector_db_type, db, batch_embedding, ...)
+        """
+        if kwargs.get('vector_db_type') == 'mmap':
+            raise ValueError("Chunk indexing supports vector_db_type 'pgvector' and 'memory'")
+        if isinstance(chunking_strategy, ChunkingStrategy):
+            self.chunker = chunking_strategy
+        else:
+            self.chunker = ChunkingFactory.create(chunking_strategy, chunking_config)
+        self.embedding_batch_size = max(1, self.chunker.config.embedding_batch_size)
+
+        super().__init__(embedding_fn, **kwargs)
+        self.config['chunking_strategy'] = self.chunker.__class__.__name__
+
+    def _init_memory_db(self):
+        """Initialize in-memory chunk store (for testing/SQLite)"""
+        return {'type': 'memory', 'vectors': {}, 'chunks': {}}
+
+    def can_process(self, document: Document) -> bool:
+        """
+        Check if document needs chunk indexing
+
+        Args:
+            document: Document to check
+
+        Returns:
+            True unless the document is already chunk-indexed (or force_reindex is set)
+        """
+        if self.config.get('force_reindex', False):
+            return True
+        return not document.get_metadata_dict().get('chunk_indexed')
+
+    async def process(self, document: Document) -> ProcessingResult:
+        """
+        Chunk and index a document
+
+        Args:
+            document: Document to index
+
+        Returns:
+            ProcessingResult with indexing outcome
+        """
+        return (await self._process_batch([document]))[0]
+
+    async def _process_batch(self, documents: List[Document]) -> List[ProcessingResult]:
+        """Chunk, embed and store one batch of documents (see process_many)."""
+        from docex.services.metadata_service import MetadataService
+
+        results: List[Optional[ProcessingResult]] = [None] * len(documents)
+        self._record_operations([
+            {
+                'document': document,
+                'status': 'in_progress',
+                'input_metadata': {
+                    'document_id': document.id,
+                    'vector_db_type': self.vector_db_type,
+                    'chunking_strategy': self.config['chunking_strategy'],
+                },
+            }
+            for document in documents
+        ], flush=False)
+        if self.include_metadata and self.db is not None:
+            self._hydrate_metadata(documents)
+
+        # (position in batch, document, text content, chunks)
+        chunked: List[Tuple[int, Document, str, List[Chunk]]] = []
+        for index, document in enumerate(documents):
+            try:
+                text_content = self.get_extracted_text(document)
+                if not isinstance(text_content, str):
+                    text_content = str(text_content) if text_content else ''
+                if not text_content.strip():
+                    results[index] = ProcessingResult(success=False, error="No text content available for indexing")
+                    continue
+                chunks = await self.chunker.chunk(text_content, {'document_id': document.id})
+                if not chunks:
+                    results[index] = ProcessingResult(success=False, error="Chunking produced no chunks")
+                    continue
+                chunked.append((index, document, text_content, chunks))
+            except Exception as e:
+                logger.error(f"Chunk indexing failed for document {document.id}: {e}")
+                results[index] = ProcessingResult(success=False, error=str(e))
+
+        operations = []
+        if chunked:
+            try:
+                texts = []
+                for _, document, _, chunks in chunked:
+                    # Prefix every chunk with the document's metadata text so a
+                    # passage can still be found by invoice number, vendor, ...
+                    prefix = self._build_metadata_text(document) if self.include_metadata else ''
+                    texts.extend(f"{prefix}\n\n{chunk.content}" if prefix else chunk.content for chunk in chunks)
+
+                logger.info(f"Generating embeddings for {len(texts)} chunks of {len(chunked)} documents")
+                embeddings: List[List[float]] = []
+                for start in range(0, len(texts), self.embedding_batch_size):
+                    embeddings.extend(await resolve_embeddings(
+                        self.embedding_fn, texts[start:start + self.embedding_batch_size], self.batch_embedding,
+                        cache=self.embedding_cache,
+                    ))
+
+                await self._store_chunks(chunked, embeddings)
+                dimension = len(embeddings[0])
+                metadata_updates = {
+                    document.id: self._chunk_indexing_metadata(len(chunks), dimension)
+                    for _, document, _, chunks in chunked
+                }
+                if self.db is not None:
+                    MetadataService(self.db).update_metadata_bulk(metadata_updates)
+                    for _, document, _, _ in chunked:
+                        document.invalidate_metadata()
+            except Exception as e:
+                logger.error(f"Chunk indexing failed for batch of {len(chunked)} documents: {e}")
+                for index, _, _, _ in chunked:
+                    results[index] = ProcessingResult(success=False, error=str(e))
+            else:
+                for index, document, text_content, chunks in chunked:
+                    results[index] = ProcessingResult(
+                        success=True,
+                        content=text_content,
+                        metadata=metadata_updates[document.id]
+                    )
+                    operations.append({
+                        'document': document,
+                        'status': 'success',
+                        'output_metadata': {
+                            'chunk_count': len(chunks),
+                            'embedding_dimension': dimension,
+                            'vector_db_type': self.vector_db_type
+                        },
+                    })
+
+        operations.extend(
+            {'document': document, 'status': 'failed', 'error': result.error}
+            for document, result in zip(documents, results)
+            if not result.success
+        )
+        self._record_operations(operations)
+        return results
+
+    def _chunk_indexing_metadata(self, chunk_count: int, dimension: int) -> Dict[str, Any]:
+        """Build the metadata recorded on a document once its chunks are indexed."""
+        return {
+            'chunk_indexed': True,
+            'chunk_indexed_at': datetime.now(UTC).isoformat(),
+            'chunk_count': chunk_count,
+            'chunking_strategy': self.config['chunking_strategy'],
+            'vector_db_type': self.vector_db_type,
+            'embedding_dimension': dimension,
+        }
+
+    async def _store_chunks(
+        self,
+        chunked: List[Tuple[int, Document, str, List[Chunk]]],
+        embeddings: List[List[float]],
+    ) -> None:
+        """
+        Replace the stored chunks of a batch of documents
+
+        Chunk rows are persisted in document_chunk whenever a database is
+        available; embeddings go to the document_chunk.embedding column
+        (pgvector) or to the in-memory chunk store.
+        """
+        from sqlalchemy import delete, insert
+
+        basket_ids = self._resolve_basket_ids([document for _, document, _, _ in chunked])
+        created_at = datetime.now(UTC)
+        rows = []
+        for _, document, _, chunks in chunked:
+            for chunk_index, chunk in enumerate(chunks):
+                rows.append({
+                    'id': generate_id(DocumentChunk),
+                    'document_id': document.id,
+                    'basket_id': basket_ids.get(document.id),
+                    'chunk_index': chunk_index,
+                    'start_idx': chunk.start_idx,
+                    'end_idx': chunk.end_idx,
+                    'content': chunk.content,
+                    'chunk_metadata': {'chunk_id': chunk.id, 'semantic_level': chunk.semantic_level},
+                    'created_at': created_at,
+                })
+        document_ids = [document.id for _, document, _, _ in chunked]
+
+        db = self.vector_db['db'] if self.vector_db_type == 'pgvector' else self.db
+        if db is not None:
+            with db.session() as session:
+                try:
+                    if self.vector_db_type == 'pgvector':
+                        self._ensure_chunk_embedding_column(session, len(embeddings[0]))
+                    session.execute(delete(DocumentChunk).where(DocumentChunk.document_id.in_(document_ids)))
+                    session.execute(insert(DocumentChunk), rows)
+                    if self.vector_db_type == 'pgvector':
+                        self._write_vectors(
+                            session, 'document_chunk', [(row['id'], embedding) for row, embedding in zip(rows, embeddings)]
+                        )
+                    session.commit()
+                except Exception:
+                    session.rollback()
+                    raise
+
+        if self.vector_db_type == 'memory':
+            chunk_store = self.vector_db['chunks']
+            replaced = set(document_ids)
+            for chunk_id in [key for key, entry in chunk_store.items() if entry['document_id'] in replaced]:
+                del chunk_store[chunk_id]
+            for row, embedding in zip(rows, embeddings):
+                chunk_store[row['id']] = {
+                    'embedding': embedding,
+                    'document_id': row['document_id'],
+                    'basket_id': row['basket_id'],
+                    'chunk_index': row['chunk_index'],
+                    'start_idx': row['start_idx'],
+                    'end_idx': row['end_idx'],
+                    'content': row['content'],
+                }
+
+    def _ensure_chunk_embedding_column(self, session: Any, dimension: int) -> None:
+        """Add document_chunk.embedding and its vector index if missing"""
+        self._ensure_embedding_column(session, dimension, table_name='document_chunk')
+        self._ensure_vector_index(session)
@@ -0,0 +1,272 @@
+"""
+Embedding cache for DocEX vector processors
+
+Embeddings are keyed by ``(model_id, sha256(text))``: re-indexing an
+unchanged corpus, the same content uploaded to several baskets and repeated
+search queries all reuse the stored vector instead of calling the (slow,
+often paid) embedding model again.
+
+Two tiers:
+
+- an in-process LRU of recently used vectors
+- an optional ``embedding_cache`` table in the DocEX database, shared by
+  every process using that database
+
+Pass one EmbeddingCache to VectorIndexingProcessor and SemanticSearchService
+(``embedding_cache=``) to share it between indexing and query embedding. The
+model id must change whenever the embedding model (or its dimension) does.
+"""
+
+import hashlib
+import logging
+import threading
+from array import array
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+
+def content_hash(text: str) -> str:
+    """SHA-256 hex digest of a text, as used for cache keys"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def _pack(embedding: List[float]) -> bytes:
+    # float64 so cached vectors are identical to freshly computed ones
+    return array('d', embedding).tobytes()
+
+
+def _unpack(data: bytes) -> List[float]:
+    values = array('d')
+    values.frombytes(data)
+    return values.tolist()
+
+
+class EmbeddingCache:
+    """
+    Two-tier (memory LRU + database) cache of embeddings for one model.
+
+    Database errors never fail the caller: a tier that cannot be read or
+    written is logged and treated as a miss.
+    """
+
+    def __init__(
+        self,
+        model_id: str,
+        db: Optional[Any] = None,
+        max_memory_entries: int = 10000,
+        max_db_entries: Optional[int] = 1000000,
+    ):
+        """
+        Initialize embedding cache
+
+        Args:
+            model_id: Identifier of the embedding model (e.g.
+                'text-embedding-3-small'); part of every key
+            db: Optional DocEX Database for the persistent tier; memory only
+                when None
+            max_memory_entries: LRU size of the in-process tier
+            max_db_entries: Rows kept for this model in the database tier;
+                the least recently used rows are evicted beyond it (None
+                disables eviction)
+        """
+        if not model_id:
+            raise ValueError("model_id is required")
+        if max_memory_entries < 0:
+            raise ValueError("max_memory_entries must not be negative")
+        if max_db_entries is not None and max_db_entries <= 0:
+            raise ValueError("max_db_entries must be positive")
+        self.model_id = model_id
+        self.db = db
+        self.max_memory_entries = max_memory_entries
+        self.max_db_entries = max_db_entries
+        self._memory: 'OrderedDict[str, List[float]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {'memory_hits': 0, 'db_hits': 0, 'misses': 0, 'memory_evictions': 0, 'db_evictions': 0}
+
+    def get(self, text: str) -> Optional[List[float]]:
+        """Get the cached embedding of a text, or None"""
+        return self.get_many([text])[0]
+
+    def get_many(self, texts: Sequence[str]) -> List[Optional[List[float]]]:
+        """
+        Look up several texts, reading the database tier with one query
+
+        Returns:
+            One embedding (or None on a miss) per text, in input order
+        """
+        keys = [content_hash(text) for text in texts]
+        found: Dict[str, List[float]] = {}
+        with self._lock:
+            for key in keys:
+                if key in self._memory:
+                    self._memory.move_to_end(key)
+                    found[key] = self._memory[key]
+        memory_hits = set(found)
+
+        missing = [key for key in dict.fromkeys(keys) if key not in found]
+        if missing and self.db is not None:
+            loaded = self._load(missing)
+            found.update(loaded)
+            with self._lock:
+                for key, embedding in loaded.items():
+                    self._remember(key, embedding)
+
+        with self._lock:
+            for key in keys:
+                if key in memory_hits:
+                    self._stats['memory_hits'] += 1
+                elif key in found:
+                    self._stats['db_hits'] += 1
+                else:
+                    self._stats['misses'] += 1
+        return [found.get(key) for key in keys]
+
+    def put(self, text: str, embedding: List[float]) -> None:
+        """Cache the embedding of a text"""
+        self.put_many([text], [embedding])
+
+    def put_many(self, texts: Sequence[str], embeddings: Sequence[List[float]]) -> None:
+        """Cache several embeddings, writing the database tier with one INSERT"""
+        if len(texts) != len(embeddings):
+            raise ValueError("texts and embeddings must have the same length")
+        entries = {content_hash(text): list(embedding) for text, embedding in zip(texts, embeddings)}
+        with self._lock:
+            for key, embedding in entries.items():
+                self._remember(key, embedding)
+        if entries and self.db is not None:
+            self._store(entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters, evictions and tier sizes"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['memory_entries'] = len(self._memory)
+        stats['hits'] = stats['memory_hits'] + stats['db_hits']
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        stats['model_id'] = self.model_id
+        return stats
+
+    def clear(self, persistent: bool = False) -> None:
+        """
+        Empty the in-process tier (and this model's database rows when
+        ``persistent``); counters are reset
+        """
+        with self._lock:
+            self._memory.clear()
+            self._stats = dict.fromkeys(self._stats, 0)
+        if persistent and self.db is not None:
+            from sqlalchemy import delete
+
+            from docex.db.models import EmbeddingCacheEntry
+
+            with self.db.session() as session:
+                session.execute(delete(EmbeddingCacheEntry).where(EmbeddingCacheEntry.model_id == self.model_id))
+                session.commit()
+
+    def _remember(self, key: str, embedding: List[float]) -> None:
+        """Add to the LRU tier (caller holds the lock)"""
+        if self.max_memory_entries == 0:
+            return
+        self._memory[key] = embedding
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+            self._stats['memory_evictions'] += 1
+
+    def _load(self, keys: List[str]) -> Dict[str, List[float]]:
+        """Read rows for ``keys`` and mark them used"""
+        from sqlalchemy import select, update
+
+        from docex.db.models import EmbeddingCacheEntry
+
+        try:
+            with self.db.session() as session:
+                rows = session.execute(
+                    select(EmbeddingCacheEntry.content_hash, EmbeddingCacheEntry.embedding).where(
+                        EmbeddingCacheEntry.model_id == self.model_id,
+                        EmbeddingCacheEntry.content_hash.in_(keys),
+                    )
+                ).all()
+                if rows:
+                    session.execute(
+                        update(EmbeddingCacheEntry)
+                        .where(
+                            EmbeddingCacheEntry.model_id == self.model_id,
+                            EmbeddingCacheEntry.content_hash.in_([row.content_hash for row in rows]),
+                        )
+                        .values(last_used_at=datetime.now(timezone.utc))
+                    )
+                    session.commit()
+        except Exception as e:
+            logger.warning(f"Embedding cache read failed for model {self.model_id}: {e}")
+            return {}
+        return {row.content_hash: _unpack(row.embedding) for row in rows}
+
+    def _store(self, entries: Dict[str, List[float]]) -> None:
+        """Insert rows not stored yet, then evict beyond max_db_entries"""
+        from sqlalchemy import func, insert, select
+
+        from docex.db.models import EmbeddingCacheEntry
+
+        try:
+            with self.db.session() as session:
+                existing = set(session.execute(
+                    select(EmbeddingCacheEntry.content_hash).where(
+                        EmbeddingCacheEntry.model_id == self.model_id,
+                        EmbeddingCacheEntry.content_hash.in_(list(entries)),
+                    )
+                ).scalars())
+                now = datetime.now(timezone.utc)
+                rows = [
+                    {
+                        'model_id': self.model_id,
+                        'content_hash': key,
+                        'dimension': len(embedding),
+                        'embedding': _pack(embedding),
+                        'created_at': now,
+                        'last_used_at': now,
+                    }
+                    for key, embedding in entries.items()
+                    if key not in existing
+                ]
+                if rows:
+                    session.execute(insert(EmbeddingCacheEntry), rows)
+                    session.commit()
+                if rows and self.max_db_entries is not None:
+                    count = session.execute(
+                        select(func.count()).select_from(EmbeddingCacheEntry)
+                        .where(EmbeddingCacheEntry.model_id == self.model_id)
+                    ).scalar()
+                    if count > self.max_db_entries:
+                        self._evict(session, count - self.max_db_entries)
+        except Exception as e:
+            # Another process may have cached the same text concurrently
+            logger.warning(f"Embedding cache write failed for model {self.model_id}: {e}")
+
+    def _evict(self, session: Any, excess: int) -> None:
+        """Delete this model's ``excess`` least recently used rows"""
+        from sqlalchemy import delete, select
+
+        from docex.db.models import EmbeddingCacheEntry
+
+        oldest = (
+            select(EmbeddingCacheEntry.content_hash)
+            .where(EmbeddingCacheEntry.model_id == self.model_id)
+            .order_by(EmbeddingCacheEntry.last_used_at, EmbeddingCacheEntry.content_hash)
+            .limit(excess)
+        )
+        keys = list(session.execute(oldest).scalars())
+        session.execute(
+            delete(EmbeddingCacheEntry).where(
+                EmbeddingCacheEntry.model_id == self.model_id,
+                EmbeddingCacheEntry.content_hash.in_(keys),
+            )
+        )
+        session.commit()
+        with self._lock:
+            self._stats['db_evictions'] += len(keys)
+        logger.debug(f"Evicted {len(keys)} embeddings of model {self.model_id} from the cache")
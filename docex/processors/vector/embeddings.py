@@ -0,0 +1,117 @@
+"""
+Embedding function protocol for DocEX vector processors
+
+Callers provide the embedding model as a plain callable. Two signatures are
+supported (sync or async):
+
+- ``embedding_fn(text: str) -> List[float]`` (default)
+- ``embedding_fn(texts: List[str]) -> ndarray | List[List[float]]`` when the
+  processor/service is created with ``batch_embedding=True``
+
+Local models are typically an order of magnitude faster on batches, so bulk
+indexing should use the batched signature where the model supports it.
+
+Both helpers accept an optional EmbeddingCache; only texts missing from it
+are passed to ``embedding_fn``.
+"""
+
+import inspect
+from collections.abc import Awaitable, Callable
+from typing import TYPE_CHECKING, Any, List, Optional, Sequence, Union
+
+if TYPE_CHECKING:
+    from docex.processors.vector.embedding_cache import EmbeddingCache
+
+EmbeddingFn = Callable[[str], Union[List[float], Awaitable[List[float]]]]
+BatchEmbeddingFn = Callable[[List[str]], Union[Any, Awaitable[Any]]]
+
+
+def _coerce_vector(embedding: Any) -> List[float]:
+    """Validate one embedding and convert it to a list of floats."""
+    if hasattr(embedding, 'tolist'):
+        embedding = embedding.tolist()
+    if not isinstance(embedding, list) or not embedding:
+        raise ValueError("embedding_fn must return a non-empty list of floats")
+
+    try:
+        return [float(value) for value in embedding]
+    except (TypeError, ValueError) as exc:
+        raise ValueError(f"embedding_fn returned non-numeric values: {exc}") from exc
+
+
+async def resolve_embedding(
+    embedding_fn: Union[EmbeddingFn, BatchEmbeddingFn],
+    text: str,
+    batched: bool = False,
+    cache: Optional['EmbeddingCache'] = None,
+) -> List[float]:
+    """
+    Embed a single text.
+
+    Args:
+        embedding_fn: Caller-provided embedding callable
+        text: Text to embed
+        batched: Whether ``embedding_fn`` uses the batched signature
+        cache: Optional embedding cache to consult first
+
+    Returns:
+        Embedding as a list of floats
+    """
+    if cache is not None:
+        return (await resolve_embeddings(embedding_fn, [text], batched, cache=cache))[0]
+    if batched:
+        return (await resolve_embeddings(embedding_fn, [text], batched=True))[0]
+
+    embedding = embedding_fn(text)
+    if inspect.isawaitable(embedding):
+        embedding = await embedding
+    return _coerce_vector(embedding)
+
+
+async def resolve_embeddings(
+    embedding_fn: Union[EmbeddingFn, BatchEmbeddingFn],
+    texts: Sequence[str],
+    batched: bool = False,
+    cache: Optional['EmbeddingCache'] = None,
+) -> List[List[float]]:
+    """
+    Embed several texts, with a single call when ``embedding_fn`` is batched.
+
+    Args:
+        embedding_fn: Caller-provided embedding callable
+        texts: Texts to embed
+        batched: Whether ``embedding_fn`` accepts a list of texts and returns
+            one row per text (a 2-D ndarray or a list of lists)
+        cache: Optional embedding cache; only cache misses (each distinct
+            text once) are embedded, and their embeddings are cached
+
+    Returns:
+        One embedding per text, in input order
+    """
+    texts = list(texts)
+    if not texts:
+        return []
+    if cache is not None:
+        embeddings = cache.get_many(texts)
+        missing = list(dict.fromkeys(text for text, embedding in zip(texts, embeddings) if embedding is None))
+        if missing:
+            computed = await resolve_embeddings(embedding_fn, missing, batched)
+            cache.put_many(missing, computed)
+            by_text = dict(zip(missing, computed))
+            embeddings = [by_text[text] if embedding is None else embedding
+                          for text, embedding in zip(texts, embeddings)]
+        return embeddings
+    if not batched:
+        return [await resolve_embedding(embedding_fn, text) for text in texts]
+
+    embeddings = embedding_fn(texts)
+    if inspect.isawaitable(embeddings):
+        embeddings = await embeddings
+    if hasattr(embeddings, 'tolist'):
+        embeddings = embeddings.tolist()
+    if not isinstance(embeddings, list) or len(embeddings) != len(texts):
+        raise ValueError(
+            f"Batched embedding_fn must return one embedding per text "
+            f"(expected {len(texts)}, got {len(embeddings) if isinstance(embeddings, list) else type(embeddings).__name__})"
+        )
+    return [_coerce_vector(embedding) for embedding in embeddings]
@@ -0,0 +1,330 @@
+"""
+Approximate nearest neighbour index for the memory and mmap vector backends
+
+IVF-Flat in pure NumPy: a spherical k-means coarse quantiser splits the
+vectors into ``nlist`` inverted lists and a query only scans the ``nprobe``
+lists whose centroids are closest to it, trading a little recall for
+roughly ``nlist / nprobe`` times less work than a brute-force scan.
+"""
+
+import logging
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from docex.processors.vector.memory_vector_store import MemoryVectorStore, normalise_rows, top_k_rows
+
+logger = logging.getLogger(__name__)
+
+
+class IVFFlatIndex:
+    """
+    Inverted-file index with exact (flat) cosine scoring inside each list.
+
+    Vectors are L2-normalised on insert. Each inverted list keeps its own
+    float32 matrix that grows by doubling, so inserts after training are
+    amortised O(1) plus one centroid assignment.
+
+    Knobs:
+    - ``nlist``: number of inverted lists (more lists = less work per probe)
+    - ``nprobe``: lists scanned per query (more probes = higher recall)
+    """
+
+    def __init__(self, nlist: int = 256, nprobe: int = 8, max_iterations: int = 20, seed: int = 0):
+        """
+        Initialize an untrained index
+
+        Args:
+            nlist: Number of inverted lists (k-means clusters)
+            nprobe: Default number of lists scanned per query
+            max_iterations: k-means iterations used by train
+            seed: Random seed for k-means initialisation and sampling
+        """
+        if nlist <= 0 or nprobe <= 0:
+            raise ValueError("nlist and nprobe must be positive")
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.max_iterations = max_iterations
+        self.seed = seed
+        self.dimension: Optional[int] = None
+        self.centroids: Optional[np.ndarray] = None
+        self._lists: List[np.ndarray] = []
+        self._list_sizes: List[int] = []
+        self._list_ids: List[List[Optional[str]]] = []
+        self._list_baskets: List[np.ndarray] = []  # Basket code per row
+        self._basket_codes: Dict[Optional[str], int] = {None: 0}
+        self._basket_names: List[Optional[str]] = [None]
+        self._positions: Dict[str, Tuple[int, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def __contains__(self, vector_id: object) -> bool:
+        return vector_id in self._positions
+
+    @property
+    def is_trained(self) -> bool:
+        return self.centroids is not None
+
+    @classmethod
+    def build(
+        cls,
+        store: MemoryVectorStore,
+        nlist: int = 256,
+        nprobe: int = 8,
+        sample_size: Optional[int] = None,
+        **kwargs,
+    ) -> 'IVFFlatIndex':
+        """
+        Train an index on a MemoryVectorStore (or MmapVectorStore) and add all its vectors
+
+        Args:
+            store: Store to index
+            nlist: Number of inverted lists; capped at the number of vectors
+            nprobe: Default number of lists scanned per query
+            sample_size: Vectors used for k-means (default: 64 per list)
+            **kwargs: Other IVFFlatIndex options
+
+        Returns:
+            Trained index containing every live vector of the store
+        """
+        rows = np.flatnonzero(store._alive[:store._size])
+        if len(rows) == 0:
+            raise ValueError("Cannot build an index from an empty store")
+        index = cls(nlist=min(nlist, len(rows)), nprobe=nprobe, **kwargs)
+        rng = np.random.default_rng(index.seed)
+        sample_size = min(len(rows), sample_size or 64 * index.nlist)
+        sample = np.sort(rng.choice(rows, sample_size, replace=False))
+        index.train(store._matrix[sample])
+        basket_names = store._label_names['basket']
+        for start in range(0, len(rows), 65536):
+            batch = rows[start:start + 65536]
+            index.add(
+                [store._ids[row] for row in batch],
+                store._matrix[batch],
+                basket_ids=[basket_names[code] for code in store._basket_codes[batch]],
+            )
+        return index
+
+    def train(self, embeddings: Sequence[Sequence[float]]) -> None:
+        """
+        Learn the coarse quantiser with spherical k-means
+
+        Args:
+            embeddings: Training vectors (at least ``nlist`` of them)
+        """
+        data = np.asarray(embeddings, dtype=np.float32)
+        if data.ndim != 2 or len(data) < self.nlist:
+            raise ValueError(f"Training needs at least nlist={self.nlist} vectors")
+        self.dimension = data.shape[1]
+        data = normalise_rows(data, self.dimension)
+        rng = np.random.default_rng(self.seed)
+
+        centroids = data[rng.choice(len(data), self.nlist, replace=False)].copy()
+        for iteration in range(self.max_iterations):
+            assignment = self._assign(data, centroids)
+            order = np.argsort(assignment, kind='stable')
+            counts = np.bincount(assignment, minlength=self.nlist)
+            sums = np.zeros_like(centroids)
+            occupied = np.flatnonzero(counts)
+            sums[occupied] = np.add.reduceat(data[order], np.concatenate([[0], np.cumsum(counts)[:-1]])[occupied])
+            empty = np.flatnonzero(counts == 0)
+            if len(empty):
+                # Re-seed empty lists with random training vectors
+                sums[empty] = data[rng.choice(len(data), len(empty), replace=False)]
+            updated = normalise_rows(sums, self.dimension)
+            shift = float(np.max(np.linalg.norm(updated - centroids, axis=1)))
+            centroids = updated
+            if shift < 1e-4:
+                break
+        logger.debug(f"Trained IVF quantiser with {self.nlist} lists in {iteration + 1} iterations")
+
+        self.centroids = centroids
+        self._lists = [np.zeros((16, self.dimension), dtype=np.float32) for _ in range(self.nlist)]
+        self._list_sizes = [0] * self.nlist
+        self._list_ids = [[] for _ in range(self.nlist)]
+        self._list_baskets = [np.zeros(16, dtype=np.int32) for _ in range(self.nlist)]
+        self._positions = {}
+
+    def add(
+        self,
+        ids: Sequence[str],
+        embeddings: Sequence[Sequence[float]],
+        basket_ids: Optional[Sequence[Optional[str]]] = None,
+    ) -> None:
+        """
+        Add or replace vectors in a trained index
+
+        Args:
+            ids: Vector ids (document ids)
+            embeddings: One embedding per id
+            basket_ids: Optional basket id per vector, used by search filters
+        """
+        if not self.is_trained:
+            raise ValueError("IVFFlatIndex must be trained before vectors are added")
+        if len(ids) != len(embeddings):
+            raise ValueError("ids and embeddings must have the same length")
+        if not ids:
+            return
+        rows = normalise_rows(embeddings, self.dimension)
+        assignment = self._assign(rows, self.centroids)
+        for offset, (vector_id, list_no) in enumerate(zip(ids, assignment)):
+            list_no = int(list_no)
+            self.delete([vector_id])  # Replaces an existing id
+            size = self._list_sizes[list_no]
+            if size == len(self._lists[list_no]):
+                grown = np.zeros((2 * size, self.dimension), dtype=np.float32)
+                grown[:size] = self._lists[list_no]
+                self._lists[list_no] = grown
+                self._list_baskets[list_no] = np.concatenate(
+                    [self._list_baskets[list_no], np.zeros(size, dtype=np.int32)]
+                )
+            self._lists[list_no][size] = rows[offset]
+            self._list_ids[list_no].append(vector_id)
+            self._list_baskets[list_no][size] = self._basket_code(basket_ids[offset] if basket_ids is not None else None)
+            self._list_sizes[list_no] = size + 1
+            self._positions[vector_id] = (list_no, size)
+
+    def delete(self, ids: Iterable[str]) -> int:
+        """
+        Remove vectors by swapping the last row of their list into their slot
+
+        Returns:
+            Number of vectors removed
+        """
+        removed = 0
+        for vector_id in ids:
+            location = self._positions.pop(vector_id, None)
+            if location is None:
+                continue
+            list_no, position = location
+            last = self._list_sizes[list_no] - 1
+            if position != last:
+                self._lists[list_no][position] = self._lists[list_no][last]
+                moved_id = self._list_ids[list_no][last]
+                self._list_ids[list_no][position] = moved_id
+                self._list_baskets[list_no][position] = self._list_baskets[list_no][last]
+                self._positions[moved_id] = (list_no, position)
+            self._list_ids[list_no].pop()
+            self._list_sizes[list_no] = last
+            removed += 1
+        return removed
+
+    def search(
+        self,
+        query_embedding: Sequence[float],
+        top_k: int,
+        nprobe: Optional[int] = None,
+        basket_id: Optional[str] = None,
+    ) -> List[Tuple[str, float]]:
+        """
+        Find approximately the most similar vectors
+
+        Args:
+            query_embedding: Query embedding (need not be normalised)
+            top_k: Maximum number of results
+            nprobe: Lists to scan (defaults to the index's nprobe)
+            basket_id: Only return vectors of this basket
+
+        Returns:
+            (vector id, cosine similarity) pairs, most similar first
+        """
+        if not self.is_trained or top_k <= 0 or not self._positions:
+            return []
+        query = np.asarray(query_embedding, dtype=np.float32)
+        if query.shape != (self.dimension,):
+            raise ValueError("Cannot compare embeddings with different dimensions")
+        query_norm = np.linalg.norm(query)
+        if query_norm == 0:
+            raise ValueError("Cannot compare zero-magnitude query embedding")
+        query = query / query_norm
+
+        nprobe = min(nprobe or self.nprobe, self.nlist)
+        centroid_scores = self.centroids @ query
+        probes = top_k_rows(centroid_scores, np.arange(self.nlist), nprobe)
+
+        scores, ids = [], []
+        for list_no, _ in probes:
+            size = self._list_sizes[list_no]
+            if size == 0:
+                continue
+            list_scores = self._lists[list_no][:size] @ query
+            list_ids = self._list_ids[list_no]
+            if basket_id is not None:
+                keep = np.flatnonzero(self._list_baskets[list_no][:size] == self._basket_codes.get(basket_id, -1))
+                list_scores = list_scores[keep]
+                list_ids = [list_ids[row] for row in keep]
+            scores.append(list_scores)
+            ids.extend(list_ids)
+        if not ids:
+            return []
+        scores = np.concatenate(scores)
+        return [(ids[row], score) for row, score in top_k_rows(scores, np.arange(len(ids)), top_k)]
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Write the trained index to an .npz file"""
+        if not self.is_trained:
+            raise ValueError("Cannot save an untrained IVFFlatIndex")
+        sizes = np.asarray(self._list_sizes, dtype=np.int64)
+        vectors = np.concatenate([self._lists[list_no][:size] for list_no, size in enumerate(self._list_sizes)])
+        ids = [vector_id for list_ids in self._list_ids for vector_id in list_ids]
+        baskets = [
+            self._basket_names[code] or ''
+            for list_no, size in enumerate(self._list_sizes)
+            for code in self._list_baskets[list_no][:size]
+        ]
+        with open(path, 'wb') as handle:
+            np.savez(
+                handle,
+                params=np.asarray([self.nlist, self.nprobe, self.max_iterations, self.seed], dtype=np.int64),
+                centroids=self.centroids,
+                sizes=sizes,
+                vectors=vectors,
+                ids=np.asarray(ids, dtype=str),
+                baskets=np.asarray(baskets, dtype=str),
+            )
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> 'IVFFlatIndex':
+        """Read an index written by save"""
+        with np.load(path, allow_pickle=False) as data:
+            nlist, nprobe, max_iterations, seed = (int(value) for value in data['params'])
+            index = cls(nlist=nlist, nprobe=nprobe, max_iterations=max_iterations, seed=seed)
+            index.centroids = data['centroids']
+            index.dimension = index.centroids.shape[1]
+            sizes = data['sizes']
+            vectors = data['vectors']
+            ids = data['ids'].tolist()
+            baskets = [basket or None for basket in data['baskets'].tolist()]
+        start = 0
+        for list_no, size in enumerate(int(size) for size in sizes):
+            capacity = max(16, size)
+            matrix = np.zeros((capacity, index.dimension), dtype=np.float32)
+            matrix[:size] = vectors[start:start + size]
+            index._lists.append(matrix)
+            index._list_sizes.append(size)
+            index._list_ids.append(ids[start:start + size])
+            codes = np.zeros(capacity, dtype=np.int32)
+            codes[:size] = [index._basket_code(basket) for basket in baskets[start:start + size]]
+            index._list_baskets.append(codes)
+            index._positions.update(
+                (vector_id, (list_no, position)) for position, vector_id in enumerate(ids[start:start + size])
+            )
+            start += size
+        return index
+
+    def _basket_code(self, basket_id: Optional[str]) -> int:
+        code = self._basket_codes.get(basket_id)
+        if code is None:
+            code = self._basket_codes[basket_id] = len(self._basket_names)
+            self._basket_names.append(basket_id)
+        return code
+
+    @staticmethod
+    def _assign(rows: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+        """Nearest centroid (by cosine) for every row, in batches to bound memory"""
+        assignment = np.empty(len(rows), dtype=np.int64)
+        for start in range(0, len(rows), 16384):
+            assignment[start:start + 16384] = np.argmax(rows[start:start + 16384] @ centroids.T, axis=1)
+        return assignment
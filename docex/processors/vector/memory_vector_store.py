@@ -0,0 +1,307 @@
+"""
+In-process vector store for the 'memory' vector backend
+
+Keeps every embedding as one row of a preallocated, L2-normalised float32
+matrix, so a query is a single matrix-vector product over the live rows
+instead of rebuilding a matrix from Python lists.
+"""
+
+import logging
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def normalise_rows(embeddings: Sequence[Sequence[float]], dimension: int) -> np.ndarray:
+    """
+    Convert embeddings to an L2-normalised float32 matrix
+
+    Zero vectors stay zero instead of becoming NaN.
+
+    Raises:
+        ValueError: If an embedding does not have ``dimension`` values
+    """
+    rows = np.asarray(embeddings, dtype=np.float32)
+    if rows.ndim != 2 or rows.shape[1] != dimension:
+        raise ValueError(f"Cannot add embeddings of a different dimension to a store of dimension {dimension}")
+    norms = np.linalg.norm(rows, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    return rows / norms
+
+
+def top_k_rows(scores: np.ndarray, candidates: np.ndarray, top_k: int) -> List[Tuple[int, float]]:
+    """
+    Select the best scoring candidate rows with np.argpartition
+
+    Args:
+        scores: Score per row
+        candidates: Row numbers allowed in the result
+        top_k: Maximum number of rows
+
+    Returns:
+        (row, score) pairs, best first
+    """
+    if len(candidates) == 0 or top_k <= 0:
+        return []
+    candidate_scores = scores[candidates]
+    if len(candidates) > top_k:
+        best = np.argpartition(-candidate_scores, top_k - 1)[:top_k]
+    else:
+        best = np.arange(len(candidates))
+    best = best[np.argsort(-candidate_scores[best], kind='stable')]
+    return [(int(candidates[i]), float(candidate_scores[i])) for i in best]
+
+
+class MemoryVectorStore:
+    """
+    Contiguous float32 vector store with cosine top-k search.
+
+    Rows are L2-normalised on insert, so cosine similarity is a dot product.
+    Every row also carries a basket and a document type code, which lets
+    searches pre-filter with a vectorised mask. Deletes (and re-adds of an
+    existing id) tombstone the old row; the matrix is compacted once more
+    than ``compact_ratio`` of its rows are dead. Capacity grows by doubling,
+    so appends are amortised O(1).
+    """
+
+    def __init__(
+        self,
+        dimension: Optional[int] = None,
+        initial_capacity: int = 1024,
+        compact_ratio: float = 0.5,
+    ):
+        """
+        Initialize an empty store
+
+        Args:
+            dimension: Embedding dimension (taken from the first add when None)
+            initial_capacity: Rows allocated up front
+            compact_ratio: Fraction of tombstoned rows that triggers compaction
+        """
+        if initial_capacity <= 0:
+            raise ValueError("initial_capacity must be positive")
+        self.dimension = dimension
+        self.compact_ratio = compact_ratio
+        self._initial_capacity = initial_capacity
+        self._size = 0  # Rows in use, live or tombstoned
+        self._ids: List[Optional[str]] = []
+        self._positions: Dict[str, int] = {}
+        # Label vocabularies for the basket / document type columns; code 0 is "none"
+        self._labels: Dict[str, Dict[Optional[str], int]] = {'basket': {None: 0}, 'document_type': {None: 0}}
+        self._label_names: Dict[str, List[Optional[str]]] = {'basket': [None], 'document_type': [None]}
+        self._matrix: Optional[np.ndarray] = None
+        self._alive = np.zeros(0, dtype=bool)
+        self._basket_codes = np.zeros(0, dtype=np.int32)
+        self._type_codes = np.zeros(0, dtype=np.int32)
+        if dimension is not None:
+            self._allocate(initial_capacity)
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def __contains__(self, vector_id: object) -> bool:
+        return vector_id in self._positions
+
+    @property
+    def ids(self) -> List[str]:
+        """Ids of the live vectors, in row order"""
+        return [vector_id for vector_id in self._ids[:self._size] if vector_id is not None]
+
+    @property
+    def tombstones(self) -> int:
+        """Number of dead rows waiting for compaction"""
+        return self._size - len(self._positions)
+
+    def add(
+        self,
+        ids: Sequence[str],
+        embeddings: Sequence[Sequence[float]],
+        basket_ids: Optional[Sequence[Optional[str]]] = None,
+        document_types: Optional[Sequence[Optional[str]]] = None,
+    ) -> None:
+        """
+        Add or replace vectors
+
+        Args:
+            ids: Vector ids (document ids); an existing id is replaced
+            embeddings: One embedding per id
+            basket_ids: Optional basket id per vector, used by search filters
+            document_types: Optional document type per vector, used by search filters
+        """
+        if len(ids) != len(embeddings):
+            raise ValueError("ids and embeddings must have the same length")
+        if not ids:
+            return
+        if self.dimension is None:
+            self.dimension = len(embeddings[0])
+            self._allocate(self._initial_capacity)
+        rows = normalise_rows(embeddings, self.dimension)
+
+        # Tombstone replaced rows first so a compaction in _reserve reclaims them;
+        # an id repeated within one call keeps its last embedding (see below)
+        self.delete([vector_id for vector_id in ids if vector_id in self._positions], compact=False)
+        self._reserve(len(ids))
+        start, end = self._size, self._size + len(ids)
+        self._matrix[start:end] = rows
+        self._alive[start:end] = True
+        self._basket_codes[start:end] = self._codes('basket', basket_ids, len(ids))
+        self._type_codes[start:end] = self._codes('document_type', document_types, len(ids))
+        for offset, vector_id in enumerate(ids):
+            previous = self._positions.get(vector_id)
+            if previous is not None:
+                self._alive[previous] = False
+                self._ids[previous] = None
+            self._positions[vector_id] = start + offset
+            self._ids.append(vector_id)
+        self._size = end
+        self._maybe_compact()
+
+    def delete(self, ids: Iterable[str], compact: bool = True) -> int:
+        """
+        Tombstone vectors
+
+        Args:
+            ids: Vector ids to remove; unknown ids are ignored
+            compact: Compact the matrix if enough rows are dead
+
+        Returns:
+            Number of vectors removed
+        """
+        removed = 0
+        for vector_id in ids:
+            position = self._positions.pop(vector_id, None)
+            if position is None:
+                continue
+            self._alive[position] = False
+            self._ids[position] = None
+            removed += 1
+        if compact:
+            self._maybe_compact()
+        return removed
+
+    def compact(self) -> None:
+        """Drop tombstoned rows and renumber the live ones"""
+        if self._matrix is None or self.tombstones == 0:
+            return
+        keep = np.flatnonzero(self._alive[:self._size])
+        count = len(keep)
+        self._matrix[:count] = self._matrix[keep]
+        self._basket_codes[:count] = self._basket_codes[keep]
+        self._type_codes[:count] = self._type_codes[keep]
+        self._alive[:count] = True
+        self._alive[count:] = False
+        self._ids = [self._ids[position] for position in keep]
+        self._positions = {vector_id: position for position, vector_id in enumerate(self._ids)}
+        self._size = count
+
+    def get(self, vector_id: str) -> Optional[np.ndarray]:
+        """Return a copy of the normalised embedding of a vector, or None"""
+        position = self._positions.get(vector_id)
+        if position is None:
+            return None
+        return self._matrix[position].copy()
+
+    def basket_of(self, vector_id: str) -> Optional[str]:
+        """Return the basket id stored with a vector, or None"""
+        position = self._positions.get(vector_id)
+        if position is None:
+            return None
+        return self._label_names['basket'][self._basket_codes[position]]
+
+    def search(
+        self,
+        query_embedding: Sequence[float],
+        top_k: int,
+        basket_id: Optional[str] = None,
+        document_type: Optional[str] = None,
+        ids: Optional[Iterable[str]] = None,
+    ) -> List[Tuple[str, float]]:
+        """
+        Find the vectors most similar to a query
+
+        Args:
+            query_embedding: Query embedding (need not be normalised)
+            top_k: Maximum number of results
+            basket_id: Only consider vectors of this basket
+            document_type: Only consider vectors of this document type
+            ids: Only consider these vector ids (e.g. documents matching a
+                metadata pre-filter); unknown ids are ignored
+
+        Returns:
+            (vector id, cosine similarity) pairs, most similar first
+        """
+        if top_k <= 0 or self._size == 0:
+            return []
+        query = np.asarray(query_embedding, dtype=np.float32)
+        if query.shape != (self.dimension,):
+            raise ValueError("Cannot compare embeddings with different dimensions")
+        query_norm = np.linalg.norm(query)
+        if query_norm == 0:
+            raise ValueError("Cannot compare zero-magnitude query embedding")
+
+        query = query / query_norm
+        mask = self._alive[:self._size].copy()
+        if basket_id is not None:
+            mask &= self._basket_codes[:self._size] == self._labels['basket'].get(basket_id, -1)
+        if document_type is not None:
+            mask &= self._type_codes[:self._size] == self._labels['document_type'].get(document_type, -1)
+        if ids is not None:
+            selected = np.zeros(self._size, dtype=bool)
+            selected[[self._positions[vector_id] for vector_id in ids if vector_id in self._positions]] = True
+            mask &= selected
+        candidates = np.flatnonzero(mask)
+        if len(candidates) * 2 < self._size:
+            # Selective filters: only score the candidate rows
+            scores = self._matrix[candidates] @ query
+            hits = top_k_rows(scores, np.arange(len(candidates)), top_k)
+            return [(self._ids[candidates[row]], score) for row, score in hits]
+        scores = self._matrix[:self._size] @ query
+        return [(self._ids[row], score) for row, score in top_k_rows(scores, candidates, top_k)]
+
+    def _codes(self, column: str, labels: Optional[Sequence[Optional[str]]], count: int) -> np.ndarray:
+        """Encode per-row labels as integer codes, growing the column vocabulary"""
+        if labels is None:
+            return np.zeros(count, dtype=np.int32)
+        if len(labels) != count:
+            raise ValueError(f"Expected {count} {column} labels, got {len(labels)}")
+        vocabulary, names = self._labels[column], self._label_names[column]
+        codes = np.empty(count, dtype=np.int32)
+        for index, label in enumerate(labels):
+            code = vocabulary.get(label)
+            if code is None:
+                code = vocabulary[label] = len(names)
+                names.append(label)
+            codes[index] = code
+        return codes
+
+    def _allocate(self, capacity: int) -> None:
+        """Allocate (or grow to) ``capacity`` rows, keeping the rows in use"""
+        matrix = np.zeros((capacity, self.dimension), dtype=np.float32)
+        alive = np.zeros(capacity, dtype=bool)
+        basket_codes = np.zeros(capacity, dtype=np.int32)
+        type_codes = np.zeros(capacity, dtype=np.int32)
+        if self._matrix is not None:
+            matrix[:self._size] = self._matrix[:self._size]
+            alive[:self._size] = self._alive[:self._size]
+            basket_codes[:self._size] = self._basket_codes[:self._size]
+            type_codes[:self._size] = self._type_codes[:self._size]
+        self._matrix, self._alive = matrix, alive
+        self._basket_codes, self._type_codes = basket_codes, type_codes
+
+    def _reserve(self, extra: int) -> None:
+        """Make room for ``extra`` more rows, compacting before growing"""
+        if self._size + extra <= len(self._matrix):
+            return
+        self.compact()
+        capacity = len(self._matrix)
+        while capacity < self._size + extra:
+            capacity *= 2
+        if capacity != len(self._matrix):
+            logger.debug(f"Growing memory vector store to {capacity} rows")
+            self._allocate(capacity)
+
+    def _maybe_compact(self) -> None:
+        if self._size and self.tombstones > self.compact_ratio * self._size:
+            self.compact()
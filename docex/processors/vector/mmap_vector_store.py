@@ -0,0 +1,279 @@
+"""
+Persisted, memory-mapped vector store for the 'mmap' vector backend
+
+Vectors are appended to a flat float32 file next to the SQLite database and
+searched through ``np.memmap``, so a process can start searching without
+re-embedding or loading the index into its own heap, and processes on the
+same host share the OS page cache for it.
+"""
+
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from docex.processors.vector.memory_vector_store import MemoryVectorStore, normalise_rows
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+
+
+def default_index_path(db: Any) -> Optional[Path]:
+    """
+    Get the index path prefix next to a SQLite database file
+
+    Args:
+        db: Database instance
+
+    Returns:
+        ``<database file without suffix>.vectors``, or None when db is not a
+        file-backed SQLite database
+    """
+    engine = getattr(db, 'engine', None)
+    if engine is None or engine.url.get_backend_name() != 'sqlite':
+        return None
+    database = engine.url.database
+    if not database or database == ':memory:':
+        return None
+    return Path(database).with_suffix('.vectors')
+
+
+class MmapVectorStore(MemoryVectorStore):
+    """
+    MemoryVectorStore whose rows live in an on-disk, memory-mapped file.
+
+    Files (``path`` is a prefix):
+    - ``<path>.f32``: L2-normalised float32 rows, appended in insertion order
+    - ``<path>.ids.jsonl``: one record per row (id, basket_id, document_type)
+      plus ``{"delete": id}`` tombstone records
+    - ``<path>.meta.json``: embedding dimension and format version
+
+    Writes append to both files and are picked up incrementally by every
+    store opened on the same path (see refresh). There must be a single
+    writer per path; any number of processes may search concurrently.
+    """
+
+    def __init__(self, path: Union[str, Path], dimension: Optional[int] = None, compact_ratio: float = 0.5):
+        """
+        Open (or prepare) an index
+
+        Args:
+            path: Path prefix of the index files
+            dimension: Embedding dimension for a new index (taken from the
+                first add when None); an existing index keeps its own
+            compact_ratio: Fraction of tombstoned rows that triggers compaction
+        """
+        super().__init__(compact_ratio=compact_ratio)
+        self.path = Path(path)
+        self._vectors_path = self.path.with_name(self.path.name + '.f32')
+        self._ids_path = self.path.with_name(self.path.name + '.ids.jsonl')
+        self._meta_path = self.path.with_name(self.path.name + '.meta.json')
+        self._reset()
+        if self.dimension is None:
+            self.dimension = dimension
+        self.refresh()
+
+    def refresh(self) -> None:
+        """
+        Pick up rows and tombstones written since the last refresh
+
+        Only the new tail of the id sidecar is parsed and the vector file is
+        re-mapped when it grew, so this is cheap to call before every search.
+        """
+        try:
+            stat = self._ids_path.stat()
+        except FileNotFoundError:
+            return
+        if self._sidecar_inode is not None and (
+            stat.st_ino != self._sidecar_inode or stat.st_size < self._sidecar_offset
+        ):
+            # Rewritten by compact() (possibly in another process)
+            self._reset()
+        self._sidecar_inode = stat.st_ino
+
+        if stat.st_size > self._sidecar_offset:
+            with open(self._ids_path, 'rb') as sidecar:
+                sidecar.seek(self._sidecar_offset)
+                data = sidecar.read(stat.st_size - self._sidecar_offset)
+            # Ignore a trailing record that is still being written
+            end = data.rfind(b'\n') + 1
+            self._apply_records([json.loads(line) for line in data[:end].splitlines() if line.strip()])
+            self._sidecar_offset += end
+        self._map_vectors()
+
+    def add(
+        self,
+        ids: Sequence[str],
+        embeddings: Sequence[Sequence[float]],
+        basket_ids: Optional[Sequence[Optional[str]]] = None,
+        document_types: Optional[Sequence[Optional[str]]] = None,
+    ) -> None:
+        """
+        Append vectors to the index files (an existing id is replaced)
+
+        Args:
+            ids: Vector ids (document ids)
+            embeddings: One embedding per id
+            basket_ids: Optional basket id per vector, used by search filters
+            document_types: Optional document type per vector, used by search filters
+        """
+        if len(ids) != len(embeddings):
+            raise ValueError("ids and embeddings must have the same length")
+        if not ids:
+            return
+        for name, labels in (('basket_ids', basket_ids), ('document_types', document_types)):
+            if labels is not None and len(labels) != len(ids):
+                raise ValueError(f"Expected {len(ids)} {name}, got {len(labels)}")
+        self.refresh()
+        if self.dimension is None:
+            self.dimension = len(embeddings[0])
+        rows = normalise_rows(embeddings, self.dimension)
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if not self._meta_path.exists():
+            self._meta_path.write_text(json.dumps({'format': FORMAT_VERSION, 'dimension': self.dimension}))
+        # Vectors are written before their sidecar records, so readers never
+        # see a record without its row; drop rows left by an interrupted write.
+        with open(self._vectors_path, 'ab') as vectors:
+            vectors.truncate(self._size * self._row_bytes)
+            vectors.write(rows.tobytes())
+        records = [
+            {
+                'id': vector_id,
+                'basket_id': basket_ids[index] if basket_ids is not None else None,
+                'document_type': document_types[index] if document_types is not None else None,
+            }
+            for index, vector_id in enumerate(ids)
+        ]
+        self._append_records(records)
+        self.refresh()
+        self._maybe_compact()
+
+    def delete(self, ids: Iterable[str], compact: bool = True) -> int:
+        """
+        Append tombstones for vectors
+
+        Args:
+            ids: Vector ids to remove; unknown ids are ignored
+            compact: Rewrite the index files if enough rows are dead
+
+        Returns:
+            Number of vectors removed
+        """
+        self.refresh()
+        removed = [vector_id for vector_id in dict.fromkeys(ids) if vector_id in self._positions]
+        if removed:
+            self._append_records([{'delete': vector_id} for vector_id in removed])
+            self.refresh()
+        if compact:
+            self._maybe_compact()
+        return len(removed)
+
+    def compact(self) -> None:
+        """Rewrite the index files without tombstoned rows"""
+        self.refresh()
+        if self.tombstones == 0:
+            return
+        keep = np.flatnonzero(self._alive[:self._size])
+        basket_names, type_names = self._label_names['basket'], self._label_names['document_type']
+        vectors_tmp = self._vectors_path.with_name(self._vectors_path.name + '.tmp')
+        ids_tmp = self._ids_path.with_name(self._ids_path.name + '.tmp')
+        with open(vectors_tmp, 'wb') as vectors:
+            for start in range(0, len(keep), 65536):
+                vectors.write(np.ascontiguousarray(self._matrix[keep[start:start + 65536]]).tobytes())
+        with open(ids_tmp, 'w', encoding='utf-8') as sidecar:
+            for position in keep:
+                sidecar.write(json.dumps({
+                    'id': self._ids[position],
+                    'basket_id': basket_names[self._basket_codes[position]],
+                    'document_type': type_names[self._type_codes[position]],
+                }) + '\n')
+        self._matrix = None
+        os.replace(vectors_tmp, self._vectors_path)
+        os.replace(ids_tmp, self._ids_path)
+        logger.debug(f"Compacted {self.path}: {self._size - len(keep)} tombstoned rows dropped")
+        self._reset()
+        self.refresh()
+
+    def search(
+        self,
+        query_embedding: Sequence[float],
+        top_k: int,
+        basket_id: Optional[str] = None,
+        document_type: Optional[str] = None,
+        ids: Optional[Iterable[str]] = None,
+    ) -> List[Tuple[str, float]]:
+        """Refresh from disk, then search (see MemoryVectorStore.search)"""
+        self.refresh()
+        return super().search(query_embedding, top_k, basket_id=basket_id, document_type=document_type, ids=ids)
+
+    @property
+    def _row_bytes(self) -> int:
+        return self.dimension * np.dtype(np.float32).itemsize
+
+    def _reset(self) -> None:
+        """Forget all loaded state (the files are untouched)"""
+        self._size = 0
+        self._ids = []
+        self._positions = {}
+        self._labels = {'basket': {None: 0}, 'document_type': {None: 0}}
+        self._label_names = {'basket': [None], 'document_type': [None]}
+        self._matrix = None
+        self._alive = np.zeros(0, dtype=bool)
+        self._basket_codes = np.zeros(0, dtype=np.int32)
+        self._type_codes = np.zeros(0, dtype=np.int32)
+        self._sidecar_offset = 0
+        self._sidecar_inode: Optional[int] = None
+        if self._meta_path.exists():
+            meta = json.loads(self._meta_path.read_text())
+            if meta.get('format') != FORMAT_VERSION:
+                raise ValueError(f"Unsupported vector index format in {self._meta_path}: {meta.get('format')}")
+            self.dimension = meta['dimension']
+
+    def _append_records(self, records: List[Dict[str, Any]]) -> None:
+        with open(self._ids_path, 'a', encoding='utf-8') as sidecar:
+            sidecar.write(''.join(json.dumps(record) + '\n' for record in records))
+
+    def _apply_records(self, records: List[Dict[str, Any]]) -> None:
+        """Apply sidecar records to the in-memory id and label columns"""
+        capacity = self._size + sum(1 for record in records if 'delete' not in record)
+        if capacity > len(self._alive):
+            capacity = max(capacity, 2 * len(self._alive))
+            self._alive = np.concatenate([self._alive, np.zeros(capacity - len(self._alive), dtype=bool)])
+            for column in ('_basket_codes', '_type_codes'):
+                codes = getattr(self, column)
+                setattr(self, column, np.concatenate([codes, np.zeros(capacity - len(codes), dtype=np.int32)]))
+
+        for record in records:
+            vector_id = record.get('delete', record.get('id'))
+            position = self._positions.pop(vector_id, None)
+            if position is not None:
+                self._alive[position] = False
+                self._ids[position] = None
+            if 'delete' in record:
+                continue
+            position = self._size
+            self._ids.append(vector_id)
+            self._positions[vector_id] = position
+            self._alive[position] = True
+            self._basket_codes[position] = self._codes('basket', [record.get('basket_id')], 1)[0]
+            self._type_codes[position] = self._codes('document_type', [record.get('document_type')], 1)[0]
+            self._size += 1
+
+    def _map_vectors(self) -> None:
+        """Memory-map the vector file, re-mapping only when it grew"""
+        if self.dimension is None or not self._vectors_path.exists():
+            return
+        rows = self._vectors_path.stat().st_size // self._row_bytes
+        if rows < self._size:
+            raise ValueError(
+                f"Vector index {self._vectors_path} has {rows} rows but {self._ids_path} lists {self._size}"
+            )
+        if rows == 0:
+            self._matrix = None
+        elif self._matrix is None or len(self._matrix) != rows:
+            self._matrix = np.memmap(self._vectors_path, dtype=np.float32, mode='r', shape=(rows, self.dimension))
@@ -0,0 +1,301 @@
+"""
+pgvector index management for DocEX
+
+Keeps the ANN index on an embedding column consistent with the distance
+the search queries order by. An index built with one operator class (for
+example ``vector_l2_ops``) cannot serve ``ORDER BY`` on another operator
+(``<=>``), and PostgreSQL silently falls back to a sequential scan.
+"""
+
+import logging
+import re
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_IDENTIFIER = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
+# distance -> (operator, operator class, SQL turning the operator result into a similarity)
+DISTANCES: Dict[str, Dict[str, str]] = {
+    'cosine': {'operator': '<=>', 'opclass': 'vector_cosine_ops', 'similarity': '1 - ({distance})'},
+    'l2': {'operator': '<->', 'opclass': 'vector_l2_ops', 'similarity': '1 / (1 + ({distance}))'},
+    # <#> returns the negative inner product
+    'inner_product': {'operator': '<#>', 'opclass': 'vector_ip_ops', 'similarity': '-({distance})'},
+}
+INDEX_METHODS = ('hnsw', 'ivfflat')
+# pgvector's default and maximum hnsw.ef_search
+HNSW_DEFAULT_EF_SEARCH = 40
+HNSW_MAX_EF_SEARCH = 1000
+
+
+def _identifier(name: str) -> str:
+    """Validate a SQL identifier that has to be interpolated into DDL"""
+    if not _IDENTIFIER.match(name):
+        raise ValueError(f"Invalid SQL identifier: {name}")
+    return name
+
+
+class PgVectorIndexManager:
+    """
+    Creates, tunes and inspects the pgvector index on one embedding column.
+
+    Build parameters (``m``/``ef_construction`` for HNSW, ``lists`` for
+    IVFFlat) apply when the index is created; ``ef_search``/``probes`` are
+    applied per query with ``SET LOCAL`` (see apply_search_settings).
+    """
+
+    def __init__(
+        self,
+        table: str = 'document',
+        column: str = 'embedding',
+        distance: str = 'cosine',
+        method: str = 'hnsw',
+        m: int = 16,
+        ef_construction: int = 64,
+        lists: int = 100,
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+        index_name: Optional[str] = None,
+    ):
+        """
+        Initialize index manager
+
+        Args:
+            table: Table holding the embedding column
+            column: Embedding column (public.vector)
+            distance: 'cosine', 'l2' or 'inner_product'; decides the operator
+                class of the index and the operator searches order by
+            method: 'hnsw' or 'ivfflat'
+            m: HNSW graph degree
+            ef_construction: HNSW build-time candidate list size
+            lists: IVFFlat list count
+            ef_search: HNSW query-time candidate list size (server default when None)
+            probes: IVFFlat lists probed per query (server default when None)
+            index_name: Index name (default: ``<table>_<column>_idx``)
+        """
+        if distance not in DISTANCES:
+            raise ValueError(f"Unsupported distance: {distance}. Supported: {', '.join(DISTANCES)}")
+        if method not in INDEX_METHODS:
+            raise ValueError(f"Unsupported index method: {method}. Supported: {', '.join(INDEX_METHODS)}")
+        for name, value in (('m', m), ('ef_construction', ef_construction), ('lists', lists),
+                            ('ef_search', ef_search), ('probes', probes)):
+            if value is not None and (not isinstance(value, int) or value <= 0):
+                raise ValueError(f"{name} must be a positive integer")
+        self.table = _identifier(table)
+        self.column = _identifier(column)
+        self.distance = distance
+        self.method = method
+        self.m = m
+        self.ef_construction = ef_construction
+        self.lists = lists
+        self.ef_search = ef_search
+        self.probes = probes
+        self.index_name = _identifier(index_name or f"{table}_{column}_idx")
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], table: str = 'document', **kwargs: Any) -> 'PgVectorIndexManager':
+        """
+        Build a manager from a vector_db_config dict
+
+        Recognised keys: distance, index_method, hnsw_m, hnsw_ef_construction,
+        ivfflat_lists, ef_search, probes.
+        """
+        return cls(
+            table=table,
+            distance=config.get('distance', 'cosine'),
+            method=config.get('index_method', 'hnsw'),
+            m=config.get('hnsw_m', 16),
+            ef_construction=config.get('hnsw_ef_construction', 64),
+            lists=config.get('ivfflat_lists', 100),
+            ef_search=config.get('ef_search'),
+            probes=config.get('probes'),
+            **kwargs,
+        )
+
+    @property
+    def operator(self) -> str:
+        """Distance operator matching the index operator class"""
+        return DISTANCES[self.distance]['operator']
+
+    @property
+    def opclass(self) -> str:
+        return DISTANCES[self.distance]['opclass']
+
+    def distance_sql(self, vector_sql: str, alias: Optional[str] = None) -> str:
+        """SQL distance between the column and ``vector_sql`` (use in ORDER BY)"""
+        column = f"{_identifier(alias)}.{self.column}" if alias else self.column
+        return f"{column} {self.operator} {vector_sql}"
+
+    def similarity_sql(self, vector_sql: str, alias: Optional[str] = None) -> str:
+        """SQL similarity (higher is closer) between the column and ``vector_sql``"""
+        return DISTANCES[self.distance]['similarity'].format(distance=self.distance_sql(vector_sql, alias))
+
+    def create_index_sql(self, index_name: Optional[str] = None, concurrently: bool = False) -> str:
+        """CREATE INDEX statement for the configured method, operator class and build parameters"""
+        if self.method == 'hnsw':
+            options = f"m = {self.m}, ef_construction = {self.ef_construction}"
+        else:
+            options = f"lists = {self.lists}"
+        return (
+            f"CREATE INDEX {'CONCURRENTLY ' if concurrently else ''}IF NOT EXISTS "
+            f"{_identifier(index_name or self.index_name)} ON {self.table} "
+            f"USING {self.method} ({self.column} public.{self.opclass}) WITH ({options})"
+        )
+
+    def apply_search_settings(self, session: Any, candidates: Optional[int] = None) -> None:
+        """
+        Set the per-query recall knob for the current transaction
+
+        ``SET LOCAL`` only lasts until the transaction ends, so call this in
+        the same transaction as the search query.
+
+        Args:
+            session: SQLAlchemy session
+            candidates: Rows the query needs from the index. An HNSW scan
+                returns at most ``ef_search`` rows before WHERE filters apply,
+                so ef_search is raised to at least this (up to its maximum).
+        """
+        from sqlalchemy import text
+
+        if self.method == 'hnsw':
+            ef_search = max(self.ef_search or HNSW_DEFAULT_EF_SEARCH, candidates or 0)
+            if self.ef_search or ef_search > HNSW_DEFAULT_EF_SEARCH:
+                ef_search = min(ef_search, HNSW_MAX_EF_SEARCH)
+                session.execute(text(f"SET LOCAL hnsw.ef_search = {int(ef_search)}"))
+        elif self.method == 'ivfflat' and self.probes:
+            session.execute(text(f"SET LOCAL ivfflat.probes = {int(self.probes)}"))
+
+    def ensure_index(self, session: Any) -> bool:
+        """
+        Create the index if the column has no usable one
+
+        An index with the wrong operator class is reported but left in place;
+        use rebuild() to replace it without blocking writes.
+
+        Args:
+            session: SQLAlchemy session or connection
+
+        Returns:
+            True when a usable index exists afterwards (False while the
+            column does not exist yet)
+        """
+        from sqlalchemy import text
+
+        if not self.column_exists(session):
+            logger.debug(f"{self.table}.{self.column} does not exist yet; vector index not created")
+            return False
+        health = self.health(session)
+        if health['usable']:
+            return True
+        if any(index['name'] == self.index_name for index in health['indexes']):
+            logger.warning(
+                f"Index {self.index_name} on {self.table}.{self.column} does not use {self.opclass}; "
+                f"searches ordered by {self.operator} cannot use it. Call rebuild() to replace it."
+            )
+            return False
+        logger.info(f"Creating {self.method} index {self.index_name} on {self.table}.{self.column} ({self.opclass})")
+        session.execute(text(self.create_index_sql()))
+        session.commit()
+        return True
+
+    def column_exists(self, session: Any) -> bool:
+        """Check whether the embedding column exists (it is added once the dimension is known)"""
+        return self.column_dimension(session) is not None
+
+    def column_dimension(self, session: Any) -> Optional[int]:
+        """
+        Get the declared dimension of the embedding column
+
+        Returns:
+            The ``n`` of ``vector(n)`` (-1 when declared without one), or None
+            when the column does not exist
+        """
+        from sqlalchemy import text
+
+        # pgvector stores the dimension as the column's type modifier
+        return session.execute(text("""
+            SELECT atttypmod FROM pg_attribute
+            WHERE attrelid = to_regclass(:table) AND attname = :column AND NOT attisdropped
+        """), {'table': self.table, 'column': self.column}).scalar()
+
+    def rebuild(self, db: Any, concurrently: bool = True) -> None:
+        """
+        Replace the index, e.g. after changing the distance or build parameters
+
+        With ``concurrently`` the new index is built with CREATE INDEX
+        CONCURRENTLY under a temporary name and swapped in, so writes to the
+        table are not blocked while it builds.
+
+        Args:
+            db: Database instance
+            concurrently: Build without locking out writes
+        """
+        from sqlalchemy import text
+
+        staging = _identifier(f"{self.index_name}_rebuild")
+        keyword = 'CONCURRENTLY ' if concurrently else ''
+        # CREATE/DROP INDEX CONCURRENTLY cannot run inside a transaction block
+        with db.engine.connect() as connection:
+            connection = connection.execution_options(isolation_level='AUTOCOMMIT')
+            connection.execute(text(f"DROP INDEX {keyword}IF EXISTS {staging}"))
+            connection.execute(text(self.create_index_sql(index_name=staging, concurrently=concurrently)))
+            connection.execute(text(f"DROP INDEX {keyword}IF EXISTS {self.index_name}"))
+            connection.execute(text(f"ALTER INDEX {staging} RENAME TO {self.index_name}"))
+        logger.info(f"Rebuilt {self.method} index {self.index_name} on {self.table}.{self.column}")
+
+    def health(self, session: Any) -> Dict[str, Any]:
+        """
+        Report the indexes on the embedding column
+
+        Returns:
+            Dict with the expected operator class, the estimated table rows,
+            one entry per index on the column (name, method, opclass, valid,
+            size_bytes, scans) and ``usable``: whether a valid index with the
+            matching operator class exists
+        """
+        from sqlalchemy import text
+
+        rows = session.execute(text("""
+            SELECT i.relname AS name,
+                   am.amname AS method,
+                   opc.opcname AS opclass,
+                   ix.indisvalid AS valid,
+                   pg_relation_size(i.oid) AS size_bytes,
+                   COALESCE(s.idx_scan, 0) AS scans
+            FROM pg_index ix
+            JOIN pg_class i ON i.oid = ix.indexrelid
+            JOIN pg_am am ON am.oid = i.relam
+            JOIN pg_opclass opc ON opc.oid = ix.indclass[0]
+            JOIN pg_attribute a ON a.attrelid = ix.indrelid AND a.attnum = ix.indkey[0]
+            LEFT JOIN pg_stat_user_indexes s ON s.indexrelid = i.oid
+            WHERE ix.indrelid = to_regclass(:table) AND a.attname = :column
+            ORDER BY i.relname
+        """), {'table': self.table, 'column': self.column}).fetchall()
+        estimated_rows = session.execute(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)"),
+            {'table': self.table},
+        ).scalar()
+
+        indexes: List[Dict[str, Any]] = [
+            {
+                'name': row.name,
+                'method': row.method,
+                'opclass': row.opclass,
+                'valid': bool(row.valid),
+                'size_bytes': int(row.size_bytes),
+                'scans': int(row.scans),
+            }
+            for row in rows
+        ]
+        return {
+            'table': self.table,
+            'column': self.column,
+            'distance': self.distance,
+            'expected_opclass': self.opclass,
+            'estimated_rows': max(int(estimated_rows or 0), 0),
+            'indexes': indexes,
+            'usable': any(
+                index['valid'] and index['opclass'] == self.opclass and index['method'] in INDEX_METHODS
+                for index in indexes
+            ),
+        }
@@ -8,37 +8,29 @@ leveraging DocEX's document retrieval and metadata systems.
 import logging
 import time
 import hashlib
-import inspect
-from collections.abc import Awaitable, Callable
 from typing import Dict, Any, Optional, List, Tuple, Union
 
 try:
     import numpy as np
+    from docex.processors.vector.memory_vector_store import MemoryVectorStore
+    from docex.processors.vector.mmap_vector_store import MmapVectorStore, default_index_path
     HAS_NUMPY = True
 except ImportError:
     HAS_NUMPY = False
     # Fallback cosine similarity without numpy
 
 from docex import DocEX
+from docex.docbasket.document_manager import DOCUMENT_LIST_COLUMNS, DocBasketDocumentManager
 from docex.document import Document
+from docex.models.records import DocumentRecord
+from docex.processors.vector.embedding_cache import EmbeddingCache
+from docex.processors.vector.embeddings import BatchEmbeddingFn, EmbeddingFn, resolve_embedding
+from docex.processors.vector.pgvector_index import PgVectorIndexManager
 
 logger = logging.getLogger(__name__)
 
-EmbeddingFn = Callable[[str], Union[List[float], Awaitable[List[float]]]]
-
-
-async def _resolve_embedding(embedding_fn: EmbeddingFn, text: str) -> List[float]:
-    embedding = embedding_fn(text)
-    if inspect.isawaitable(embedding):
-        embedding = await embedding
-
-    if not isinstance(embedding, list) or not embedding:
-        raise ValueError("embedding_fn must return a non-empty list of floats")
-
-    try:
-        return [float(value) for value in embedding]
-    except (TypeError, ValueError) as exc:
-        raise ValueError(f"embedding_fn returned non-numeric values: {exc}") from exc
+# Upper bound on vector candidates fetched while widening a filtered search
+MAX_SEARCH_CANDIDATES = 1000
 
 
 class SemanticSearchResult:
@@ -48,20 +40,56 @@ class SemanticSearchResult:
         self,
         document: Document,
         similarity_score: float,
-        metadata: Optional[Dict[str, Any]] = None
+        metadata: Optional[Dict[str, Any]] = None,
+        chunk: Optional[Dict[str, Any]] = None
     ):
         self.document = document
         self.similarity_score = similarity_score
         self.metadata = metadata or {}
+        # Matching chunk for chunk-granularity searches: id, chunk_index,
+        # start_idx/end_idx offsets into the document text, and content
+        self.chunk = chunk
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary"""
-        return {
+        result = {
             'document_id': self.document.id,
             'document_name': self.document.name,
             'similarity_score': self.similarity_score,
             'metadata': self.metadata
         }
+        if self.chunk is not None:
+            result['chunk'] = self.chunk
+        return result
+
+
+class SemanticSearchRecord:
+    """Lightweight result of SemanticSearchService.search_records"""
+    
+    def __init__(
+        self,
+        record: DocumentRecord,
+        basket_id: str,
+        similarity_score: float,
+        chunk: Optional[Dict[str, Any]] = None
+    ):
+        self.record = record
+        self.basket_id = basket_id
+        self.similarity_score = similarity_score
+        # Matching chunk for chunk-granularity searches (see SemanticSearchResult.chunk)
+        self.chunk = chunk
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary"""
+        result = {
+            'document_id': self.record.id,
+            'document_name': self.record.name,
+            'basket_id': self.basket_id,
+            'similarity_score': self.similarity_score,
+        }
+        if self.chunk is not None:
+            result['chunk'] = self.chunk
+        return result
 
 
 class SemanticSearchService:
@@ -78,10 +106,12 @@ class SemanticSearchService:
     def __init__(
         self,
         doc_ex: DocEX,
-        embedding_fn: EmbeddingFn,
+        embedding_fn: Union[EmbeddingFn, BatchEmbeddingFn],
         vector_db_type: str = 'memory',
         vector_db_config: Optional[Dict[str, Any]] = None,
         db: Optional[Any] = None,
+        batch_embedding: bool = False,
+        embedding_cache: Optional[EmbeddingCache] = None,
     ):
         """
         Initialize semantic search service
@@ -89,18 +119,34 @@ class SemanticSearchService:
         Args:
             doc_ex: DocEX instance for document retrieval
             embedding_fn: Sync or async callable that accepts text and returns an embedding.
-            vector_db_type: Type of vector database ('pgvector' for production, 'memory' for testing)
-            vector_db_config: Configuration for vector database (not needed for memory)
+            vector_db_type: Type of vector database ('pgvector' for production, 'mmap' for
+                the persisted SQLite-side index, 'memory' for testing)
+            vector_db_config: Configuration for vector database (not needed for memory;
+                for mmap, 'path' or 'index' overrides the index next to the SQLite file).
+                For memory/mmap, 'ann' may hold a trained IVFFlatIndex to search
+                instead of scanning every vector. For pgvector, 'distance' must match
+                the indexing processor; 'ef_search' (HNSW) or 'probes' (IVFFlat)
+                trade recall for latency per query
+            batch_embedding: embedding_fn takes a list of texts and returns one
+                embedding per text (see docex.processors.vector.embeddings)
+            embedding_cache: Optional EmbeddingCache for query embeddings
+                (share the indexing processor's cache to reuse its entries)
         """
         if not callable(embedding_fn):
             raise ValueError("embedding_fn is required and must be callable")
 
         self.doc_ex = doc_ex
         self.embedding_fn = embedding_fn
+        self.batch_embedding = batch_embedding
+        self.embedding_cache = embedding_cache
         self.vector_db_type = vector_db_type
         self.vector_db_config = vector_db_config or {}
         self.db = db
         
+        # pgvector distance and per-query recall settings (must match the index)
+        self.index_manager = PgVectorIndexManager.from_config(self.vector_db_config)
+        self.chunk_index_manager = PgVectorIndexManager.from_config(self.vector_db_config, table='document_chunk')
+        
         # Initialize vector database connection
         self.vector_db = self._initialize_vector_db()
         
@@ -117,10 +163,12 @@ class SemanticSearchService:
         """Initialize vector database based on type"""
         if self.vector_db_type == 'pgvector':
             return self._init_pgvector()
+        elif self.vector_db_type == 'mmap':
+            return self._init_mmap_db()
         elif self.vector_db_type == 'memory':
             return self._init_memory_db()
         else:
-            raise ValueError(f"Unsupported vector_db_type: {self.vector_db_type}. Supported types: 'pgvector', 'memory'")
+            raise ValueError(f"Unsupported vector_db_type: {self.vector_db_type}. Supported types: 'pgvector', 'mmap', 'memory'")
     
     def _init_pgvector(self):
         """Initialize pgvector connection"""
@@ -143,11 +191,30 @@ class SemanticSearchService:
         return {'type': 'pgvector', 'db': db}
     
     
+    def _init_mmap_db(self):
+        """Open the memory-mapped vector index written by VectorIndexingProcessor"""
+        index = self.vector_db_config.get('index')
+        if index is None:
+            if not HAS_NUMPY:
+                raise ValueError("mmap semantic search requires numpy (pip install docex[vector])")
+            path = self.vector_db_config.get('path') or default_index_path(self.db or getattr(self.doc_ex, 'db', None))
+            if path is None:
+                raise ValueError("mmap semantic search requires a SQLite Database or vector_db_config['path']")
+            index = MmapVectorStore(path)
+        return {'type': 'mmap', 'index': index, 'ann': self.vector_db_config.get('ann')}
+    
     def _init_memory_db(self):
         """Initialize memory database (for testing)"""
         # Get vectors from config if provided (shared from VectorIndexingProcessor)
         vectors = self.vector_db_config.get('vectors', {})
-        return {'type': 'memory', 'vectors': vectors}
+        # MemoryVectorStore holding the embeddings of those vectors (shared from
+        # VectorIndexingProcessor); built from the 'vectors' embeddings when absent
+        index = self.vector_db_config.get('index')
+        # Chunk vectors shared from ChunkedVectorIndexingProcessor
+        chunks = self.vector_db_config.get('chunks', {})
+        # Optional approximate nearest neighbour index (IVFFlatIndex) over the same vectors
+        ann = self.vector_db_config.get('ann')
+        return {'type': 'memory', 'vectors': vectors, 'index': index, 'ann': ann, 'chunks': chunks}
     
     async def search(
         self,
@@ -156,7 +223,8 @@ class SemanticSearchService:
         basket_id: Optional[str] = None,
         filters: Optional[Dict[str, Any]] = None,
         min_similarity: float = 0.0,
-        use_cache: bool = True
+        use_cache: bool = True,
+        granularity: str = 'document'
     ) -> List[SemanticSearchResult]:
         """
         Perform semantic search
@@ -168,42 +236,26 @@ class SemanticSearchService:
             filters: Optional metadata filters
             min_similarity: Minimum similarity score (0.0 to 1.0)
             use_cache: Whether to use query result cache
+            granularity: 'document' to rank documents by their document embedding,
+                or 'chunk' to return the best chunks indexed by
+                ChunkedVectorIndexingProcessor (see SemanticSearchResult.chunk)
             
         Returns:
             List of SemanticSearchResult objects
         """
+        if granularity not in ('document', 'chunk'):
+            raise ValueError(f"Unsupported granularity: {granularity}. Supported: 'document', 'chunk'")
+        
         # Check cache first
         if use_cache:
-            cache_key = self._get_query_cache_key(query, basket_id, filters, top_k, min_similarity)
+            cache_key = self._get_query_cache_key(query, basket_id, filters, top_k, min_similarity, granularity)
             cached_result = self._get_cached_query(cache_key)
             if cached_result is not None:
                 logger.debug(f"Returning cached search results for query: {query[:50]}...")
                 return cached_result
         
-        # Generate query embedding
-        logger.info(f"Generating embedding for query: {query[:50]}...")
-        query_embedding = await _resolve_embedding(self.embedding_fn, query)
-        
-        # Search vector database
-        vector_results = await self._search_vectors(
-            query_embedding,
-            top_k=top_k * 2,  # Get more results for filtering
-            basket_id=basket_id,
-            filters=filters
-        )
-        
-        # Apply minimum similarity threshold early
-        filtered_results = [
-            r for r in vector_results
-            if r['similarity'] >= min_similarity
-        ]
-        
-        # Batch retrieve documents for better performance
-        results = await self._batch_retrieve_documents(
-            filtered_results,
-            basket_id=basket_id,
-            filters=filters,
-            top_k=top_k
+        results = await self._search_and_hydrate(
+            query, top_k, basket_id, filters, min_similarity, granularity, self._batch_retrieve_documents
         )
         
         # Cache results
@@ -212,6 +264,96 @@ class SemanticSearchService:
         
         return results
     
+    async def search_records(
+        self,
+        query: str,
+        top_k: int = 10,
+        basket_id: Optional[str] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        min_similarity: float = 0.0,
+        granularity: str = 'document'
+    ) -> List[SemanticSearchRecord]:
+        """
+        Perform semantic search, returning DocumentRecords instead of Documents
+        
+        Hits are hydrated with one ``WHERE id IN (...)`` query over the
+        document columns; no Document or DocBasket objects (and no storage
+        services) are built. Results are not cached.
+        
+        Args:
+            See search
+            
+        Returns:
+            List of SemanticSearchRecord objects, most similar first
+        """
+        if granularity not in ('document', 'chunk'):
+            raise ValueError(f"Unsupported granularity: {granularity}. Supported: 'document', 'chunk'")
+        return await self._search_and_hydrate(
+            query, top_k, basket_id, filters, min_similarity, granularity, self._batch_retrieve_records
+        )
+    
+    async def _search_and_hydrate(
+        self,
+        query: str,
+        top_k: int,
+        basket_id: Optional[str],
+        filters: Optional[Dict[str, Any]],
+        min_similarity: float,
+        granularity: str,
+        hydrate: Any
+    ) -> List[Any]:
+        """
+        Run the vector search and hydrate its hits with ``hydrate``
+        
+        Document searches apply metadata filters inside the vector search;
+        chunk hits are filtered during hydration. Either way, the candidate
+        list is widened until top_k results survive or nothing more can.
+        """
+        # Generate query embedding
+        logger.info(f"Generating embedding for query: {query[:50]}...")
+        query_embedding = await resolve_embedding(
+            self.embedding_fn, query, self.batch_embedding, cache=self.embedding_cache
+        )
+        
+        limit = top_k * 2
+        while True:
+            if granularity == 'chunk':
+                vector_results = await self._search_chunks(query_embedding, top_k=limit, basket_id=basket_id)
+            else:
+                vector_results = await self._search_vectors(
+                    query_embedding,
+                    top_k=limit,
+                    basket_id=basket_id,
+                    filters=filters
+                )
+            
+            # Apply minimum similarity threshold early
+            filtered_results = [
+                r for r in vector_results
+                if r['similarity'] >= min_similarity
+            ]
+            
+            results = await hydrate(
+                filtered_results,
+                basket_id=basket_id,
+                filters=filters if granularity == 'chunk' else None,
+                top_k=top_k
+            )
+            
+            # An HNSW scan can stop short of the limit when WHERE filters drop
+            # rows, so a short pgvector page is not proof that nothing is left
+            exhausted = len(vector_results) < limit and not (
+                self.vector_db_type == 'pgvector' and filters and granularity == 'document'
+            )
+            if (
+                len(results) >= top_k
+                or exhausted
+                or len(filtered_results) < len(vector_results)
+                or limit >= MAX_SEARCH_CANDIDATES
+            ):
+                return results
+            limit = min(limit * 2, MAX_SEARCH_CANDIDATES)
+    
     async def _search_vectors(
         self,
         query_embedding: List[float],
@@ -222,6 +364,8 @@ class SemanticSearchService:
         """Search vectors in database"""
         if self.vector_db_type == 'pgvector':
             return await self._search_pgvector(query_embedding, top_k, basket_id, filters)
+        elif self.vector_db_type == 'mmap':
+            return await self._search_mmap(query_embedding, top_k, basket_id, filters)
         elif self.vector_db_type == 'memory':
             return await self._search_memory(query_embedding, top_k, basket_id, filters)
         else:
@@ -239,7 +383,6 @@ class SemanticSearchService:
         
         with db.session() as session:
             from sqlalchemy import text
-            import json
             
             # Validate embedding input
             if not query_embedding or not isinstance(query_embedding, list):
@@ -251,9 +394,8 @@ class SemanticSearchService:
             except (ValueError, TypeError) as e:
                 raise ValueError(f"Invalid embedding values: {e}")
             
-            # Convert embedding to PostgreSQL array format using JSON for safe parameterization
-            # PostgreSQL can cast JSON arrays to vector type
-            embedding_json = json.dumps(embedding_array)
+            # Bound as a '[x,y,...]' literal and cast to the schema-qualified vector type
+            embedding_literal = '[' + ','.join(map(str, embedding_array)) + ']'
             
             # Ensure search_path includes public where pgvector types are
             try:
@@ -285,16 +427,17 @@ class SemanticSearchService:
 
             # Build parameterized query to prevent SQL injection
             # Optimized: Include basket_id in SELECT and apply metadata filters at database level
-            query_str = """
+            query_vector = "CAST(:embedding AS public.vector)"
+            query_str = f"""
                 SELECT
                     d.id,
                     d.basket_id,
-                    1 - (d.embedding <=> CAST(:embedding_json::jsonb AS public.vector)) AS similarity
+                    {self.index_manager.similarity_sql(query_vector, alias='d')} AS similarity
                 FROM document d
             """
 
             params = {
-                'embedding_json': embedding_json,
+                'embedding': embedding_literal,
                 'limit': int(top_k)
             }
 
@@ -305,35 +448,24 @@ class SemanticSearchService:
                 where_clauses.append("d.basket_id = :basket_id")
                 params['basket_id'] = basket_id
 
-            # Apply metadata filters at database level for better performance
+            # Apply metadata filters inside the vector query (same semantics as
+            # DocBasket.find_documents_by_metadata, including operator filters)
             if filters:
-                from docex.db.models import DocumentMetadata
-                # Join with metadata table
-                query_str += " INNER JOIN document_metadata dm ON dm.document_id = d.id"
-
-                # Add metadata filter conditions
-                filter_idx = 0
-                for key, value in filters.items():
-                    alias = f"dm{filter_idx}"
-                    if filter_idx == 0:
-                        # First filter uses the existing join
-                        where_clauses.append("dm.key = :filter_key_0")
-                        where_clauses.append("dm.value = :filter_value_0")
-                    else:
-                        # Additional filters need separate joins
-                        query_str += f" INNER JOIN document_metadata {alias} ON {alias}.document_id = d.id"
-                        where_clauses.append(f"{alias}.key = :filter_key_{filter_idx}")
-                        where_clauses.append(f"{alias}.value = :filter_value_{filter_idx}")
-
-                    params[f'filter_key_{filter_idx}'] = key
-                    params[f'filter_value_{filter_idx}'] = str(value)
-                    filter_idx += 1
+                from sqlalchemy.engine.default import DefaultDialect
+                
+                matching = DocBasketDocumentManager.metadata_filter_ids(filters).compile(
+                    dialect=DefaultDialect(paramstyle='named'),
+                    compile_kwargs={'render_postcompile': True}
+                )
+                where_clauses.append(f"d.id IN ({matching})")
+                params.update(matching.params)
 
             # Combine WHERE clauses
             query_str += " WHERE " + " AND ".join(where_clauses)
 
             # Add ORDER BY and LIMIT with parameterized values
-            query_str += " ORDER BY d.embedding <=> CAST(:embedding_json::jsonb AS public.vector) LIMIT :limit"
+            # Order by the operator of the index's operator class so the planner can use it
+            query_str += f" ORDER BY {self.index_manager.distance_sql(query_vector, alias='d')} LIMIT :limit"
 
             query_sql = text(query_str)
 
@@ -341,6 +473,7 @@ class SemanticSearchService:
             if params['limit'] <= 0 or params['limit'] > 10000:
                 raise ValueError(f"Invalid top_k value: {top_k} (must be between 1 and 10000)")
 
+            self.index_manager.apply_search_settings(session, candidates=params['limit'])
             results = session.execute(query_sql, params).fetchall()
 
             # Return results with basket_id included for batch retrieval optimization
@@ -361,43 +494,296 @@ class SemanticSearchService:
         basket_id: Optional[str] = None,
         filters: Optional[Dict[str, Any]] = None
     ) -> List[Dict[str, Any]]:
-        """Search in-memory vectors (for testing) - Optimized with vectorized operations"""
+        """Search in-memory vectors (for testing) - one matrix-vector product with numpy"""
         vectors = self.vector_db.get('vectors', {})
         
         if not vectors:
             raise ValueError("No vectors found in memory vector database")
         
-        # Pre-filter by basket_id if provided
-        filtered_vectors = {}
+        # Metadata pre-filter from the column store over the indexed metadata
+        allowed = self._memory_filter_ids(filters) if filters else None
+        if allowed is not None and not allowed:
+            return []
+        
+        if HAS_NUMPY:
+            hits = self._search_index(self._memory_store(), query_embedding, top_k, basket_id, ids=allowed)
+            if not hits:
+                raise ValueError("No vectors matched the provided search constraints")
+            return [
+                {
+                    'document_id': doc_id,
+                    'basket_id': vectors.get(doc_id, {}).get('basket_id'),
+                    'similarity': similarity,
+                    'metadata': vectors.get(doc_id, {}).get('metadata', {})
+                }
+                for doc_id, similarity in hits
+            ]
+        
+        # Fallback to individual calculations without numpy
+        similarities = []
         for doc_id, vector_data in vectors.items():
             if basket_id and vector_data.get('basket_id') != basket_id:
                 continue
-            embedding = vector_data.get('embedding')
-            if embedding:
-                filtered_vectors[doc_id] = vector_data
+            if allowed is not None and doc_id not in allowed:
+                continue
+            if not vector_data.get('embedding'):
+                continue
+            similarities.append({
+                'document_id': doc_id,
+                'basket_id': vector_data.get('basket_id'),
+                'similarity': self._cosine_similarity(query_embedding, vector_data['embedding']),
+                'metadata': vector_data.get('metadata', {})
+            })
         
-        if not filtered_vectors:
+        if not similarities:
             raise ValueError("No vectors matched the provided search constraints")
         
-        # Vectorized similarity calculation using numpy for better performance
-        if HAS_NUMPY and len(filtered_vectors) > 10:  # Use vectorized for larger sets
-            similarities = self._batch_cosine_similarity(query_embedding, filtered_vectors)
-        else:
-            # Fallback to individual calculations for small sets
-            similarities = []
-            for doc_id, vector_data in filtered_vectors.items():
-                similarity = self._cosine_similarity(query_embedding, vector_data['embedding'])
-                similarities.append({
-                    'document_id': doc_id,
-                    'basket_id': vector_data.get('basket_id'),
-                    'similarity': similarity,
-                    'metadata': vector_data.get('metadata', {})
-                })
-        
         # Sort by similarity and return top_k
         similarities.sort(key=lambda x: x['similarity'], reverse=True)
         return similarities[:top_k]
     
+    async def _search_mmap(
+        self,
+        query_embedding: List[float],
+        top_k: int,
+        basket_id: Optional[str] = None,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """Search the memory-mapped vector index (picks up rows appended since the last search)"""
+        index = self.vector_db['index']
+        allowed = self._database_filter_ids(filters, basket_id) if filters else None
+        if allowed is not None and not allowed:
+            return []
+        return [
+            {
+                'document_id': doc_id,
+                'basket_id': index.basket_of(doc_id),
+                'similarity': similarity,
+                'metadata': {}
+            }
+            for doc_id, similarity in self._search_index(index, query_embedding, top_k, basket_id, ids=allowed)
+        ]
+    
+    def _search_index(
+        self,
+        store: 'MemoryVectorStore',
+        query_embedding: List[float],
+        top_k: int,
+        basket_id: Optional[str] = None,
+        ids: Optional[set] = None
+    ) -> List[Tuple[str, float]]:
+        """
+        Search the ANN index when a trained one is configured, else scan the whole store
+        
+        A metadata pre-filter (ids) is answered exactly by the store: only
+        the matching rows are scored.
+        """
+        ann = self.vector_db.get('ann')
+        if ids is None and ann is not None and ann.is_trained:
+            return ann.search(query_embedding, top_k, basket_id=basket_id)
+        return store.search(query_embedding, top_k, basket_id=basket_id, ids=ids)
+    
+    def _memory_filter_ids(self, filters: Dict[str, Any]) -> set:
+        """
+        Ids of memory vectors whose indexed metadata matches every filter
+        
+        Filters have the semantics of find_documents_by_metadata, operator
+        dictionaries included (see DocBasketDocumentManager.metadata_value_matches).
+        """
+        columns = self._metadata_columns()
+        matching: Optional[set] = None
+        for key, value in filters.items():
+            ids = {
+                doc_id for doc_id, stored in columns.get(key, {}).items()
+                if DocBasketDocumentManager.metadata_value_matches(stored, value)
+            }
+            matching = ids if matching is None else matching & ids
+            if not matching:
+                break
+        return matching or set()
+    
+    def _metadata_columns(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Column store over the metadata indexed with the memory vectors
+        
+        Maps each metadata key to {document id: value}, so a filter reads one
+        column instead of every document's metadata. Rebuilt when the vectors
+        dict is replaced or changes size.
+        """
+        vectors = self.vector_db.get('vectors', {})
+        signature = (id(vectors), len(vectors))
+        cached = self.vector_db.get('_metadata_columns')
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        
+        columns: Dict[str, Dict[str, Any]] = {}
+        for doc_id, data in vectors.items():
+            for key, value in (data.get('metadata') or {}).items():
+                columns.setdefault(key, {})[doc_id] = self._metadata_value(value)
+        self.vector_db['_metadata_columns'] = (signature, columns)
+        return columns
+    
+    def _database_filter_ids(
+        self,
+        filters: Dict[str, Any],
+        basket_id: Optional[str] = None,
+        document_ids: Optional[List[str]] = None,
+        db: Any = None
+    ) -> set:
+        """
+        Ids of documents matching the metadata filters, with one query on document_metadata
+        
+        ``document_ids`` restricts the query to the given candidates (the
+        hits being hydrated).
+        """
+        from docex.db.models import DocumentMetadata
+        
+        query = DocBasketDocumentManager.metadata_filter_ids(filters, basket_id)
+        if document_ids is not None:
+            query = query.where(DocumentMetadata.document_id.in_(document_ids))
+        with (db or self._database()).session() as session:
+            return {row[0] for row in session.execute(query)}
+    
+    def _memory_store(self) -> 'MemoryVectorStore':
+        """
+        Get the MemoryVectorStore backing the memory vectors
+        
+        Uses the store shared by VectorIndexingProcessor when there is one.
+        Otherwise a store is built from the 'vectors' embeddings and reused
+        until that dict is replaced or changes size.
+        """
+        index = self.vector_db.get('index')
+        if index is not None:
+            return index
+        
+        vectors = self.vector_db.get('vectors', {})
+        signature = (id(vectors), len(vectors))
+        cached = self.vector_db.get('_built_index')
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        
+        entries = [(doc_id, data) for doc_id, data in vectors.items() if data.get('embedding')]
+        store = MemoryVectorStore(initial_capacity=max(1, len(entries)))
+        store.add(
+            [doc_id for doc_id, _ in entries],
+            [data['embedding'] for _, data in entries],
+            basket_ids=[data.get('basket_id') for _, data in entries],
+            document_types=[data.get('document_type') for _, data in entries],
+        )
+        self.vector_db['_built_index'] = (signature, store)
+        return store
+    
+    async def _search_chunks(
+        self,
+        query_embedding: List[float],
+        top_k: int,
+        basket_id: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Search chunk vectors (document_chunk) and return the best chunks"""
+        if self.vector_db_type == 'pgvector':
+            return await self._search_pgvector_chunks(query_embedding, top_k, basket_id)
+        elif self.vector_db_type == 'memory':
+            return await self._search_memory_chunks(query_embedding, top_k, basket_id)
+        else:
+            raise ValueError(f"Unsupported vector_db_type: {self.vector_db_type}")
+    
+    async def _search_pgvector_chunks(
+        self,
+        query_embedding: List[float],
+        top_k: int,
+        basket_id: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Search document_chunk embeddings with pgvector (configured distance)"""
+        from sqlalchemy import text
+        
+        if top_k <= 0 or top_k > 10000:
+            raise ValueError(f"Invalid top_k value: {top_k} (must be between 1 and 10000)")
+        try:
+            embedding_literal = '[' + ','.join(str(float(x)) for x in query_embedding) + ']'
+        except (ValueError, TypeError) as e:
+            raise ValueError(f"Invalid embedding values: {e}")
+        
+        manager = self.chunk_index_manager
+        query_vector = "CAST(:embedding AS public.vector)"
+        query_str = f"""
+            SELECT c.id, c.document_id, c.basket_id, c.chunk_index, c.start_idx, c.end_idx, c.content,
+                   {manager.similarity_sql(query_vector, alias='c')} AS similarity
+            FROM document_chunk c
+            WHERE c.embedding IS NOT NULL
+        """
+        params: Dict[str, Any] = {'embedding': embedding_literal, 'limit': int(top_k)}
+        if basket_id:
+            query_str += " AND c.basket_id = :basket_id"
+            params['basket_id'] = basket_id
+        query_str += f" ORDER BY {manager.distance_sql(query_vector, alias='c')} LIMIT :limit"
+        
+        with self.vector_db['db'].session() as session:
+            manager.apply_search_settings(session)
+            rows = session.execute(text(query_str), params).fetchall()
+        
+        return [
+            {
+                'document_id': row.document_id,
+                'basket_id': row.basket_id,
+                'similarity': float(row.similarity),
+                'metadata': {},
+                'chunk': {
+                    'id': row.id,
+                    'chunk_index': row.chunk_index,
+                    'start_idx': row.start_idx,
+                    'end_idx': row.end_idx,
+                    'content': row.content,
+                }
+            }
+            for row in rows
+        ]
+    
+    async def _search_memory_chunks(
+        self,
+        query_embedding: List[float],
+        top_k: int,
+        basket_id: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Search in-memory chunk vectors (for testing)"""
+        entries = [
+            (chunk_id, chunk_data)
+            for chunk_id, chunk_data in self.vector_db.get('chunks', {}).items()
+            if chunk_data.get('embedding') and (not basket_id or chunk_data.get('basket_id') == basket_id)
+        ]
+        if not entries:
+            return []
+        
+        if HAS_NUMPY:
+            query_vec = np.asarray(query_embedding, dtype=np.float32)
+            query_norm = np.linalg.norm(query_vec)
+            if query_norm == 0:
+                raise ValueError("Cannot compare zero-magnitude query embedding")
+            matrix = np.asarray([chunk_data['embedding'] for _, chunk_data in entries], dtype=np.float32)
+            norms = np.linalg.norm(matrix, axis=1)
+            norms[norms == 0] = 1  # Avoid division by zero
+            similarities = (matrix @ (query_vec / query_norm)) / norms
+            scores = [float(score) for score in similarities]
+        else:
+            scores = [self._cosine_similarity(query_embedding, chunk_data['embedding']) for _, chunk_data in entries]
+        
+        ranked = sorted(zip(scores, entries), key=lambda item: item[0], reverse=True)[:top_k]
+        return [
+            {
+                'document_id': chunk_data['document_id'],
+                'basket_id': chunk_data.get('basket_id'),
+                'similarity': score,
+                'metadata': {},
+                'chunk': {
+                    'id': chunk_id,
+                    'chunk_index': chunk_data['chunk_index'],
+                    'start_idx': chunk_data['start_idx'],
+                    'end_idx': chunk_data['end_idx'],
+                    'content': chunk_data['content'],
+                }
+            }
+            for score, (chunk_id, chunk_data) in ranked
+        ]
+    
     def _cosine_similarity(self, vec1: List[float], vec2: List[float]) -> float:
         """Calculate cosine similarity between two vectors"""
         try:
@@ -430,75 +816,6 @@ class SemanticSearchService:
             logger.error(f"Error calculating cosine similarity: {e}")
             raise
     
-    def _batch_cosine_similarity(
-        self,
-        query_embedding: List[float],
-        vectors: Dict[str, Dict[str, Any]]
-    ) -> List[Dict[str, Any]]:
-        """Calculate cosine similarity for multiple vectors using vectorized operations"""
-        if not HAS_NUMPY:
-            # Fallback to individual calculations
-            return [
-                {
-                    'document_id': doc_id,
-                    'basket_id': vector_data.get('basket_id'),
-                    'similarity': self._cosine_similarity(query_embedding, vector_data['embedding']),
-                    'metadata': vector_data.get('metadata', {})
-                }
-                for doc_id, vector_data in vectors.items()
-            ]
-        
-        try:
-            # Convert query to numpy array
-            query_vec = np.array(query_embedding, dtype=np.float32)
-            query_norm = np.linalg.norm(query_vec)
-            
-            if query_norm == 0:
-                raise ValueError("Cannot compare zero-magnitude query embedding")
-            
-            # Normalize query vector
-            query_vec = query_vec / query_norm
-            
-            # Prepare all embeddings
-            doc_ids = []
-            embeddings_list = []
-            basket_ids = []
-            metadata_list = []
-            
-            for doc_id, vector_data in vectors.items():
-                doc_ids.append(doc_id)
-                embeddings_list.append(vector_data['embedding'])
-                basket_ids.append(vector_data.get('basket_id'))
-                metadata_list.append(vector_data.get('metadata', {}))
-            
-            # Stack embeddings into a matrix
-            embeddings_matrix = np.array(embeddings_list, dtype=np.float32)
-            
-            # Normalize all embeddings
-            norms = np.linalg.norm(embeddings_matrix, axis=1, keepdims=True)
-            norms[norms == 0] = 1  # Avoid division by zero
-            embeddings_matrix = embeddings_matrix / norms
-            
-            # Calculate dot products (cosine similarity for normalized vectors)
-            similarities = np.dot(embeddings_matrix, query_vec)
-            
-            # Build results
-            results = [
-                {
-                    'document_id': doc_ids[i],
-                    'basket_id': basket_ids[i],
-                    'similarity': float(similarities[i]),
-                    'metadata': metadata_list[i]
-                }
-                for i in range(len(doc_ids))
-            ]
-            
-            return results
-            
-        except Exception as e:
-            logger.error(f"Vectorized similarity calculation failed: {e}")
-            raise
-    
     async def _batch_retrieve_documents(
         self,
         vector_results: List[Dict[str, Any]],
@@ -506,24 +823,28 @@ class SemanticSearchService:
         filters: Optional[Dict[str, Any]] = None,
         top_k: int = 10
     ) -> List[SemanticSearchResult]:
-        """Batch retrieve documents for better performance"""
+        """
+        Hydrate vector hits into Documents
+        
+        Unknown basket ids are resolved with one query, then each basket's
+        documents are loaded with one ``WHERE id IN (...)`` query (a single
+        query for basket-scoped searches).
+        """
         if not vector_results:
             return []
         
+        basket_ids = self._get_basket_ids_for_documents([
+            result['document_id'] for result in vector_results
+            if not (result.get('basket_id') or basket_id)
+        ])
+        
         # Group by basket_id for efficient batch retrieval
         basket_groups: Dict[str, List[Dict[str, Any]]] = {}
         for result in vector_results:
-            result_basket_id = result.get('basket_id') or basket_id
-            if not result_basket_id:
-                # Need to look up basket_id
-                result_basket_id = self._get_basket_id_for_document(result['document_id'])
-            
+            result_basket_id = result.get('basket_id') or basket_id or basket_ids.get(result['document_id'])
             if result_basket_id:
-                if result_basket_id not in basket_groups:
-                    basket_groups[result_basket_id] = []
-                basket_groups[result_basket_id].append(result)
+                basket_groups.setdefault(result_basket_id, []).append(result)
         
-        # Retrieve documents in batches per basket
         results = []
         for result_basket_id, group_results in basket_groups.items():
             try:
@@ -531,39 +852,26 @@ class SemanticSearchService:
                 if not basket:
                     continue
                 
-                # Batch get documents
-                doc_ids = [r['document_id'] for r in group_results]
-                documents = {}
+                # Chunk results can name the same document more than once
+                doc_ids = list(dict.fromkeys(r['document_id'] for r in group_results))
+                documents = {document.id: document for document in basket.get_documents(doc_ids)}
                 
-                # Try to get documents in batch if possible
-                for doc_id in doc_ids:
-                    try:
-                        doc = basket.get_document(doc_id)
-                        if doc:
-                            documents[doc_id] = doc
-                    except Exception as e:
-                        logger.debug(f"Failed to get document {doc_id}: {e}")
-                        continue
+                if filters and documents:
+                    # One query for the whole group, with the semantics of find_documents_by_metadata
+                    allowed = self._database_filter_ids(
+                        filters, result_basket_id, document_ids=list(documents), db=basket.db
+                    )
+                    documents = {doc_id: document for doc_id, document in documents.items() if doc_id in allowed}
                 
-                # Create results for successfully retrieved documents
                 for result in group_results:
-                    doc_id = result['document_id']
-                    if doc_id in documents:
-                        document = documents[doc_id]
-                        # Apply filters if needed
-                        if self._matches_filters(document, filters):
-                            results.append(SemanticSearchResult(
-                                document=document,
-                                similarity_score=result['similarity'],
-                                metadata=result.get('metadata', {})
-                            ))
-                            
-                            # Stop if we have enough results
-                            if len(results) >= top_k:
-                                break
-                
-                if len(results) >= top_k:
-                    break
+                    document = documents.get(result['document_id'])
+                    if document is not None:
+                        results.append(SemanticSearchResult(
+                            document=document,
+                            similarity_score=result['similarity'],
+                            metadata=result.get('metadata', {}),
+                            chunk=result.get('chunk')
+                        ))
                     
             except Exception as e:
                 logger.warning(f"Failed to retrieve documents from basket {result_basket_id}: {e}")
@@ -573,6 +881,50 @@ class SemanticSearchService:
         results.sort(key=lambda x: x.similarity_score, reverse=True)
         return results[:top_k]
     
+    async def _batch_retrieve_records(
+        self,
+        vector_results: List[Dict[str, Any]],
+        basket_id: Optional[str] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        top_k: int = 10
+    ) -> List[SemanticSearchRecord]:
+        """Hydrate vector hits into DocumentRecords with one query (plus one for chunk filters)"""
+        from sqlalchemy import select
+        from docex.db.models import Document as DocumentModel
+        
+        doc_ids = list(dict.fromkeys(result['document_id'] for result in vector_results))
+        if not doc_ids:
+            return []
+        
+        db = self.vector_db.get('db') or self._database()
+        with db.session() as session:
+            query = select(*DOCUMENT_LIST_COLUMNS.values(), DocumentModel.basket_id).where(
+                DocumentModel.id.in_(doc_ids)
+            )
+            if basket_id:
+                query = query.where(DocumentModel.basket_id == basket_id)
+            rows = {row.id: row for row in session.execute(query)}
+        
+        if filters and rows:
+            allowed = self._database_filter_ids(filters, document_ids=list(rows), db=db)
+            rows = {doc_id: row for doc_id, row in rows.items() if doc_id in allowed}
+        
+        results = []
+        for result in vector_results:
+            row = rows.get(result['document_id'])
+            if row is None:
+                continue
+            self._basket_id_cache[row.id] = row.basket_id
+            results.append(SemanticSearchRecord(
+                record=DocumentRecord(**{column: getattr(row, column) for column in DOCUMENT_LIST_COLUMNS}),
+                basket_id=row.basket_id,
+                similarity_score=result['similarity'],
+                chunk=result.get('chunk')
+            ))
+        
+        results.sort(key=lambda x: x.similarity_score, reverse=True)
+        return results[:top_k]
+    
     def _get_basket_cached(self, basket_id: str):
         """Get basket with caching"""
         if basket_id in self._basket_cache:
@@ -587,23 +939,39 @@ class SemanticSearchService:
     
     def _get_basket_id_for_document(self, document_id: str) -> Optional[str]:
         """Get basket_id for a document with caching"""
-        if document_id in self._basket_id_cache:
-            return self._basket_id_cache[document_id]
-        
-        from docex.db.connection import Database
-        from docex.db.models import Document as DocumentModel
-        
-        try:
-            db = Database()
-            with db.session() as session:
-                doc = session.get(DocumentModel, document_id)
-                if doc:
-                    self._basket_id_cache[document_id] = doc.basket_id
-                    return doc.basket_id
-        except Exception as e:
-            logger.debug(f"Failed to get basket_id for document {document_id}: {e}")
+        return self._get_basket_ids_for_documents([document_id]).get(document_id)
+    
+    def _get_basket_ids_for_documents(self, document_ids: List[str]) -> Dict[str, str]:
+        """Get basket_ids for documents, looking up cache misses with one query"""
+        missing = [doc_id for doc_id in dict.fromkeys(document_ids) if doc_id not in self._basket_id_cache]
+        if missing:
+            from sqlalchemy import select
+            from docex.db.models import Document as DocumentModel
+            
+            try:
+                with self._database().session() as session:
+                    rows = session.execute(
+                        select(DocumentModel.id, DocumentModel.basket_id).where(DocumentModel.id.in_(missing))
+                    )
+                    self._basket_id_cache.update({doc_id: doc_basket_id for doc_id, doc_basket_id in rows})
+            except Exception as e:
+                logger.debug(f"Failed to get basket_ids for {len(missing)} documents: {e}")
         
-        return None
+        return {
+            doc_id: self._basket_id_cache[doc_id]
+            for doc_id in document_ids
+            if doc_id in self._basket_id_cache
+        }
+    
+    def _database(self):
+        """Database for document lookups: the service's, else DocEX's, else one default handle"""
+        db = self.db or getattr(self.doc_ex, 'db', None)
+        if db is None:
+            from docex.db.connection import Database
+            
+            # Build the fallback once instead of once per lookup
+            self.db = db = Database()
+        return db
     
     def _find_basket_for_document(self, document_id: str):
         """Find basket containing a document - uses cache"""
@@ -624,7 +992,8 @@ class SemanticSearchService:
         basket_id: Optional[str],
         filters: Optional[Dict[str, Any]],
         top_k: int,
-        min_similarity: float
+        min_similarity: float,
+        granularity: str = 'document'
     ) -> str:
         """Generate cache key for query"""
         key_parts = [
@@ -632,7 +1001,8 @@ class SemanticSearchService:
             str(basket_id) if basket_id else '',
             str(sorted(filters.items())) if filters else '',
             str(top_k),
-            str(min_similarity)
+            str(min_similarity),
+            granularity
         ]
         key_string = '|'.join(key_parts)
         return hashlib.md5(key_string.encode()).hexdigest()
@@ -664,20 +1034,9 @@ class SemanticSearchService:
         
         self._query_cache[cache_key] = (results, time.time())
     
-    def _matches_filters(self, document: Document, filters: Optional[Dict[str, Any]]) -> bool:
-        """Check if document matches filters"""
-        if not filters:
-            return True
-        
-        metadata = document.get_metadata_dict()
-        
-        for key, value in filters.items():
-            # Extract actual value from metadata dict structure
-            meta_value = metadata.get(key)
-            if isinstance(meta_value, dict) and 'extra' in meta_value:
-                meta_value = meta_value['extra'].get('value', meta_value)
-            
-            if meta_value != value:
-                return False
-        
-        return True
+    @staticmethod
+    def _metadata_value(meta_value: Any) -> Any:
+        """Extract the actual value from a metadata dict entry"""
+        if isinstance(meta_value, dict) and 'extra' in meta_value:
+            return meta_value['extra'].get('value', meta_value)
+        return meta_value
@@ -7,32 +7,39 @@ for semantic search capabilities.
 
 import logging
 import json
-import inspect
-from collections.abc import Awaitable, Callable
-from typing import Dict, Any, Optional, List, Union
+from typing import Dict, Any, Optional, List, Tuple, Union
 from datetime import UTC, datetime
 
 from docex.processors.base import BaseProcessor, ProcessingResult
 from docex.document import Document
 from docex.db.connection import Database
+from docex.processors.vector.embeddings import (
+    BatchEmbeddingFn,
+    EmbeddingFn,
+    resolve_embedding,
+    resolve_embeddings,
+)
+from docex.processors.vector.embedding_cache import EmbeddingCache
 
-logger = logging.getLogger(__name__)
-
-EmbeddingFn = Callable[[str], Union[List[float], Awaitable[List[float]]]]
-
+try:
+    from docex.processors.vector.memory_vector_store import MemoryVectorStore
+    from docex.processors.vector.mmap_vector_store import MmapVectorStore, default_index_path
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+try:
+    from pgvector.sqlalchemy import Vector
+    HAS_PGVECTOR = True
+except ImportError:
+    HAS_PGVECTOR = False
+from docex.processors.vector.pgvector_index import PgVectorIndexManager
 
-async def _resolve_embedding(embedding_fn: EmbeddingFn, text: str) -> List[float]:
-    embedding = embedding_fn(text)
-    if inspect.isawaitable(embedding):
-        embedding = await embedding
-
-    if not isinstance(embedding, list) or not embedding:
-        raise ValueError("embedding_fn must return a non-empty list of floats")
+logger = logging.getLogger(__name__)
 
-    try:
-        return [float(value) for value in embedding]
-    except (TypeError, ValueError) as exc:
-        raise ValueError(f"embedding_fn returned non-numeric values: {exc}") from exc
+# (database URL, schema, table) -> dimension of an embedding column known to
+# exist. Shared by all processors so the column DDL runs at most once per
+# tenant schema and process instead of on every write.
+_prepared_embedding_columns: Dict[Tuple[str, str, str], int] = {}
 
 
 class VectorIndexingProcessor(BaseProcessor):
@@ -46,9 +53,13 @@ class VectorIndexingProcessor(BaseProcessor):
     4. Tracks indexing operations in DocEX
     """
     
+    # Table whose embedding column this processor writes and indexes
+    index_table = 'document'
+    records_operations = True
+    
     def __init__(
         self,
-        embedding_fn: EmbeddingFn,
+        embedding_fn: Union[EmbeddingFn, BatchEmbeddingFn],
         vector_db_type: str = 'memory',
         vector_db_config: Optional[Dict[str, Any]] = None,
         store_in_metadata: bool = True,
@@ -57,21 +68,39 @@ class VectorIndexingProcessor(BaseProcessor):
         force_reindex: bool = False,
         db: Optional[Database] = None,
         tenant_id: Optional[str] = None,
+        batch_embedding: bool = False,
+        embedding_cache: Optional[EmbeddingCache] = None,
     ):
         """
         Initialize vector indexing processor
         
         Args:
             embedding_fn: Sync or async callable that accepts text and returns an embedding.
-            vector_db_type: 'pgvector' (recommended for production) or 'memory' (for testing)
-            vector_db_config: Configuration for vector database (not needed for memory)
+            vector_db_type: 'pgvector' (recommended for production), 'mmap' (persisted
+                index file for SQLite deployments) or 'memory' (for testing)
+            vector_db_config: Configuration for vector database (not needed for memory;
+                for mmap, 'path' overrides the index path next to the SQLite file).
+                For memory/mmap, 'ann' may hold a trained IVFFlatIndex that new
+                embeddings are also added to (share it with SemanticSearchService).
+                For pgvector, 'distance', 'index_method', 'hnsw_m',
+                'hnsw_ef_construction' and 'ivfflat_lists' configure the index
+                (see PgVectorIndexManager.from_config); 'dimension' creates the
+                embedding column at init instead of on the first write
             store_in_metadata: Whether to store embeddings in DocEX metadata (default: True)
             db: Optional tenant-aware database instance (for multi-tenancy support)
+            batch_embedding: embedding_fn takes a list of texts and returns one
+                embedding per text (see docex.processors.vector.embeddings);
+                process_many then embeds each batch with a single call
+            embedding_cache: Optional EmbeddingCache consulted before calling
+                embedding_fn, so unchanged texts are never embedded twice
+                (e.g. when re-indexing with force_reindex)
         """
         if not callable(embedding_fn):
             raise ValueError("embedding_fn is required and must be callable")
 
         self.embedding_fn = embedding_fn
+        self.batch_embedding = batch_embedding
+        self.embedding_cache = embedding_cache
 
         serializable_config = {
             'vector_db_type': vector_db_type,
@@ -108,8 +137,13 @@ class VectorIndexingProcessor(BaseProcessor):
         ]
         
         # Validate vector_db_type
-        if self.vector_db_type not in ['pgvector', 'memory']:
-            raise ValueError(f"Unsupported vector_db_type: {self.vector_db_type}. Supported types: 'pgvector' (recommended for production), 'memory' (for testing)")
+        if self.vector_db_type not in ['pgvector', 'mmap', 'memory']:
+            raise ValueError(f"Unsupported vector_db_type: {self.vector_db_type}. Supported types: 'pgvector' (recommended for production), 'mmap' (SQLite), 'memory' (for testing)")
+        
+        # pgvector index on the embedding column; created once the column exists
+        self.index_manager = PgVectorIndexManager.from_config(self.vector_db_config, table=self.index_table)
+        self._vector_index_ready = False
+        self._schema: Optional[str] = None
         
         # Initialize vector database
         self.vector_db = self._initialize_vector_db()
@@ -118,10 +152,12 @@ class VectorIndexingProcessor(BaseProcessor):
         """Initialize vector database based on type"""
         if self.vector_db_type == 'pgvector':
             return self._init_pgvector()
+        elif self.vector_db_type == 'mmap':
+            return self._init_mmap_db()
         elif self.vector_db_type == 'memory':
             return self._init_memory_db()
         else:
-            raise ValueError(f"Unsupported vector_db_type: {self.vector_db_type}. Supported types: 'pgvector', 'memory'")
+            raise ValueError(f"Unsupported vector_db_type: {self.vector_db_type}. Supported types: 'pgvector', 'mmap', 'memory'")
     
     def _init_pgvector(self):
         """Initialize pgvector (PostgreSQL extension)"""
@@ -161,69 +197,108 @@ class VectorIndexingProcessor(BaseProcessor):
                     finally:
                         raw_conn.close()
                     
-                    # Create HNSW index if it doesn't exist
-                    # Re-open connection for index creation
-                    raw_conn = db.engine.raw_connection()
-                    try:
-                        cursor = raw_conn.cursor()
-                        self._ensure_hnsw_index(cursor, raw_conn)
-                        cursor.close()
-                    finally:
-                        raw_conn.close()
                 except Exception as e:
                     logger.error(f"Failed to initialize pgvector extension: {e}")
                     raise ValueError(f"pgvector extension is required but not available: {e}")
+                
+                self._prepare_schema(session)
             
             return {'type': 'pgvector', 'db': db}
         except ImportError:
             raise ValueError("pgvector requires PostgreSQL database")
     
-    def _ensure_hnsw_index(self, cursor, connection):
+    def _prepare_schema(self, session: Any) -> None:
         """
-        Ensure HNSW index exists on document.embedding column.
+        Prepare the tenant schema once, at init
         
-        Args:
-            cursor: Database cursor
-            connection: Database connection
+        Records the schema the session resolves to (tenant engines carry their
+        search_path), registers an existing embedding column so writes skip the
+        DDL, and creates the column (with 'dimension' configured) and its index.
         """
+        from sqlalchemy import text
+        
+        self._schema = session.execute(text("SELECT current_schema()")).scalar()
+        dimension = self.index_manager.column_dimension(session)
+        if dimension is not None:
+            _prepared_embedding_columns[self._column_key(self.index_table)] = dimension
+        elif self.vector_db_config.get('dimension'):
+            self._ensure_embedding_column(session, int(self.vector_db_config['dimension']), self.index_table)
+        self._ensure_vector_index(session)
+    
+    def _column_key(self, table_name: str) -> Tuple[str, str, str]:
+        """Cache key of an embedding column in the processor's database and schema"""
+        url = self.db.engine.url.render_as_string(hide_password=True)
+        return (url, self._schema or '', table_name)
+    
+    def _ensure_vector_index(self, session: Any) -> None:
+        """
+        Ensure the ANN index on the embedding column matches the search distance
+        
+        The index is created once the embedding column exists; failures are
+        logged rather than raised because searches still work (as sequential
+        scans) without it.
+        """
+        if self._vector_index_ready:
+            return
         try:
-            # Check if index already exists
-            cursor.execute("""
-                SELECT EXISTS (
-                    SELECT 1 FROM pg_indexes 
-                    WHERE indexname = 'document_embedding_idx'
-                )
-            """)
-            index_exists = cursor.fetchone()[0]
-            
-            if not index_exists:
-                logger.info("Creating HNSW index on document.embedding...")
-                # Use public.vector_l2_ops (most commonly supported)
-                # Note: We use vector_l2_ops even though we use <=> (cosine) in queries
-                # The index still works for cosine similarity with normalized vectors
-                cursor.execute("""
-                    CREATE INDEX document_embedding_idx 
-                    ON document 
-                    USING hnsw (embedding public.vector_l2_ops)
-                """)
-                connection.commit()
-                logger.info("✅ HNSW index created successfully")
-            else:
-                logger.debug("HNSW index already exists")
+            self._vector_index_ready = self.index_manager.ensure_index(session)
         except Exception as e:
-            logger.warning(f"Could not create HNSW index: {e}")
-            logger.warning("   Index creation may require superuser privileges")
-            logger.warning("   You can create it manually: CREATE INDEX document_embedding_idx ON document USING hnsw (embedding public.vector_l2_ops);")
-            # Don't fail initialization if index creation fails
-            try:
-                connection.rollback()
-            except:
-                pass
+            session.rollback()
+            logger.warning(f"Could not create vector index on {self.index_manager.table}.embedding: {e}")
+            logger.warning(f"   You can create it manually: {self.index_manager.create_index_sql()};")
     
+    def vector_index_health(self) -> Dict[str, Any]:
+        """
+        Report the pgvector index on the embedding column
+        
+        Returns:
+            See PgVectorIndexManager.health
+        """
+        if self.vector_db_type != 'pgvector':
+            raise ValueError("Vector index health is only available for vector_db_type 'pgvector'")
+        with self.vector_db['db'].session() as session:
+            return self.index_manager.health(session)
+    
+    def rebuild_vector_index(self, concurrently: bool = True) -> None:
+        """
+        Rebuild the pgvector index with the configured distance and parameters
+        
+        Args:
+            concurrently: Use CREATE INDEX CONCURRENTLY so writes are not blocked
+        """
+        if self.vector_db_type != 'pgvector':
+            raise ValueError("Vector index rebuilds are only available for vector_db_type 'pgvector'")
+        self.index_manager.rebuild(self.vector_db['db'], concurrently=concurrently)
+        self._vector_index_ready = True
     
     def _init_memory_db(self):
-        """Initialize in-memory vector database (for testing/SQLite)"""
-        return {'type': 'memory', 'vectors': {}}
+        """
+        Initialize in-memory vector database (for testing/SQLite)
+        
+        With numpy installed, embeddings live in a MemoryVectorStore under
+        'index' and the 'vectors' entries only keep per-document details;
+        share both with SemanticSearchService through vector_db_config.
+        """
+        return {
+            'type': 'memory',
+            'vectors': {},
+            'index': MemoryVectorStore() if HAS_NUMPY else None,
+            'ann': self.vector_db_config.get('ann'),
+        }
+    
+    def _init_mmap_db(self):
+        """
+        Open the persisted, memory-mapped vector index (for SQLite deployments)
+        
+        The index lives next to the SQLite database file unless
+        vector_db_config['path'] names another path prefix.
+        """
+        if not HAS_NUMPY:
+            raise ValueError("mmap vector indexing requires numpy (pip install docex[vector])")
+        path = self.vector_db_config.get('path') or default_index_path(self.db)
+        if path is None:
+            raise ValueError("mmap vector indexing requires a SQLite Database or vector_db_config['path']")
+        return {'type': 'mmap', 'path': str(path), 'index': MmapVectorStore(path), 'ann': self.vector_db_config.get('ann')}
     
     def _build_metadata_text(self, document: Document) -> str:
         """
@@ -346,6 +421,9 @@ class VectorIndexingProcessor(BaseProcessor):
         if not self.config.get('force_reindex', False):
             metadata = document.get_metadata_dict()
             if metadata.get('vector_indexed'):
+                if self.vector_db_type == 'mmap':
+                    # The persisted index is the source of truth for mmap
+                    return document.id not in self.vector_db['index']
                 if self.db is None:
                     return False
                 # Verify embedding actually exists in database
@@ -391,55 +469,29 @@ class VectorIndexingProcessor(BaseProcessor):
                 input_metadata={'document_id': document.id, 'vector_db_type': self.vector_db_type}
             )
             
-            # Get document text content. Hard fail rather than falling back to
-            # metadata/byte decoding so indexing uses a single explicit source.
-            text_content = self.get_document_text(document)
-            
-            # Ensure text_content is a string
-            if not isinstance(text_content, str):
-                text_content = str(text_content) if text_content else ''
-            
-            if not text_content or not text_content.strip():
+            text_content, text_for_embedding = self._texts_for_embedding(document)
+            if not text_content.strip():
                 return ProcessingResult(
                     success=False,
                     error="No text content available for indexing"
                 )
             
-            # Prepare text for embedding (combine content with metadata if enabled)
-            text_for_embedding = text_content
-            if self.include_metadata:
-                metadata_text = self._build_metadata_text(document)
-                if metadata_text:
-                    text_for_embedding = f"{metadata_text}\n\n{text_content}"
-                    logger.debug(f"Including metadata in embedding for document {document.id}")
-            
             # Generate embedding using caller-provided embedding function
             logger.info(f"Generating embedding for document {document.id}")
-            embedding = await _resolve_embedding(self.embedding_fn, text_for_embedding)
+            embedding = await resolve_embedding(
+                self.embedding_fn, text_for_embedding, self.batch_embedding, cache=self.embedding_cache
+            )
             
             # Store in vector database (store original text_content, not text_for_embedding)
             vector_id = await self._store_embedding(document, embedding, text_content)
             
             # Store metadata in DocEX
-            metadata_updates = {
-                'vector_indexed': True,
-                'vector_indexed_at': datetime.now(UTC).isoformat(),
-                'vector_db_type': self.vector_db_type,
-                'embedding_dimension': len(embedding),
-                'vector_indexed_with_metadata': self.include_metadata,  # Track if metadata was included
-            }
-            
-            if vector_id:
-                metadata_updates['vector_id'] = vector_id
-            
-            if self.store_in_metadata:
-                # Store embedding as JSON in metadata (for small embeddings)
-                if len(embedding) <= 2048:  # Only store small embeddings
-                    metadata_updates['embedding'] = json.dumps(embedding)
+            metadata_updates = self._indexing_metadata(embedding, vector_id)
             
             from docex.services.metadata_service import MetadataService
             metadata_service = MetadataService(self.db)  # Use tenant-aware database
             metadata_service.update_metadata(document.id, metadata_updates)
+            document.invalidate_metadata()
             
             # Record success
             self._record_operation(
@@ -467,86 +519,238 @@ class VectorIndexingProcessor(BaseProcessor):
             )
             return ProcessingResult(success=False, error=str(e))
     
+    async def process_many(self, documents: List[Document], batch_size: int = 64) -> List[ProcessingResult]:
+        """
+        Index many documents, a batch at a time.
+        
+        Per batch, metadata is hydrated with one query, all texts are embedded
+        together (a single call when ``batch_embedding`` is enabled), vectors
+        are written with one multi-row UPDATE, indexing metadata with one bulk
+        write and processing operations with one INSERT per status.
+        
+        Args:
+            documents: Documents to index
+            batch_size: Number of documents embedded and written together
+            
+        Returns:
+            One ProcessingResult per document, in input order
+        """
+        if batch_size <= 0:
+            raise ValueError("batch_size must be positive")
+        
+        results: List[ProcessingResult] = []
+        for start in range(0, len(documents), batch_size):
+            results.extend(await self._process_batch(documents[start:start + batch_size]))
+        return results
+    
+    async def _process_batch(self, documents: List[Document]) -> List[ProcessingResult]:
+        """Index one batch of documents (see process_many)."""
+        from docex.services.metadata_service import MetadataService
+        
+        results: List[Optional[ProcessingResult]] = [None] * len(documents)
+        self._record_operations([
+            {
+                'document': document,
+                'status': 'in_progress',
+                'input_metadata': {'document_id': document.id, 'vector_db_type': self.vector_db_type},
+            }
+            for document in documents
+        ], flush=False)
+        if self.include_metadata and self.db is not None:
+            self._hydrate_metadata(documents)
+        
+        # (position in batch, document, text to store, text to embed)
+        pending: List[Tuple[int, Document, str, str]] = []
+        for index, document in enumerate(documents):
+            try:
+                text_content, text_for_embedding = self._texts_for_embedding(document)
+            except Exception as e:
+                logger.error(f"Vector indexing failed for document {document.id}: {e}")
+                results[index] = ProcessingResult(success=False, error=str(e))
+                continue
+            if not text_content.strip():
+                results[index] = ProcessingResult(success=False, error="No text content available for indexing")
+                continue
+            pending.append((index, document, text_content, text_for_embedding))
+        
+        operations = []
+        if pending:
+            try:
+                logger.info(f"Generating embeddings for {len(pending)} documents")
+                embeddings = await resolve_embeddings(
+                    self.embedding_fn, [item[3] for item in pending], self.batch_embedding,
+                    cache=self.embedding_cache,
+                )
+                vector_ids = await self._store_embeddings(
+                    [(document, embedding, text_content)
+                     for (_, document, text_content, _), embedding in zip(pending, embeddings)]
+                )
+                metadata_updates = {
+                    document.id: self._indexing_metadata(embedding, vector_id)
+                    for (_, document, _, _), embedding, vector_id in zip(pending, embeddings, vector_ids)
+                }
+                MetadataService(self.db).update_metadata_bulk(metadata_updates)
+                for _, document, _, _ in pending:
+                    document.invalidate_metadata()
+            except Exception as e:
+                logger.error(f"Vector indexing failed for batch of {len(pending)} documents: {e}")
+                for index, _, _, _ in pending:
+                    results[index] = ProcessingResult(success=False, error=str(e))
+            else:
+                for (index, document, text_content, _), embedding, vector_id in zip(pending, embeddings, vector_ids):
+                    results[index] = ProcessingResult(
+                        success=True,
+                        content=text_content,
+                        metadata=metadata_updates[document.id]
+                    )
+                    operations.append({
+                        'document': document,
+                        'status': 'success',
+                        'output_metadata': {
+                            'vector_id': vector_id,
+                            'embedding_dimension': len(embedding),
+                            'vector_db_type': self.vector_db_type
+                        },
+                    })
+        
+        operations.extend(
+            {'document': document, 'status': 'failed', 'error': result.error}
+            for document, result in zip(documents, results)
+            if not result.success
+        )
+        self._record_operations(operations)
+        return results
+    
+    def _texts_for_embedding(self, document: Document) -> Tuple[str, str]:
+        """
+        Get the text to store and the text to embed for a document.
+        
+        Returns:
+            Tuple of (text content, text content prefixed with metadata text
+            when include_metadata is enabled); text content is empty when the
+            document has no text
+        """
+        # Get document text content. Hard fail rather than falling back to
+        # metadata/byte decoding so indexing uses a single explicit source.
+        text_content = self.get_extracted_text(document)
+        
+        # Ensure text_content is a string
+        if not isinstance(text_content, str):
+            text_content = str(text_content) if text_content else ''
+        if not text_content.strip():
+            return text_content, text_content
+        
+        # Prepare text for embedding (combine content with metadata if enabled)
+        text_for_embedding = text_content
+        if self.include_metadata:
+            metadata_text = self._build_metadata_text(document)
+            if metadata_text:
+                text_for_embedding = f"{metadata_text}\n\n{text_content}"
+                logger.debug(f"Including metadata in embedding for document {document.id}")
+        return text_content, text_for_embedding
+    
+    def _indexing_metadata(self, embedding: List[float], vector_id: Optional[str]) -> Dict[str, Any]:
+        """Build the metadata recorded on a document once it is indexed."""
+        metadata_updates = {
+            'vector_indexed': True,
+            'vector_indexed_at': datetime.now(UTC).isoformat(),
+            'vector_db_type': self.vector_db_type,
+            'embedding_dimension': len(embedding),
+            'vector_indexed_with_metadata': self.include_metadata,  # Track if metadata was included
+        }
+        
+        if vector_id:
+            metadata_updates['vector_id'] = vector_id
+        
+        if self.store_in_metadata:
+            # Store embedding as JSON in metadata (for small embeddings)
+            if len(embedding) <= 2048:  # Only store small embeddings
+                metadata_updates['embedding'] = json.dumps(embedding)
+        return metadata_updates
+    
+    def _hydrate_metadata(self, documents: List[Document]) -> None:
+        """Load metadata for a batch with one query and cache it on each document."""
+        from docex.services.metadata_service import MetadataService
+        
+        metadata = MetadataService(self.db).get_metadata_bulk([document.id for document in documents])
+        for document in documents:
+            document.attach_metadata(metadata[document.id])
+    
     async def _store_embedding(self, document: Document, embedding: List[float], text: str) -> Optional[str]:
         """Store embedding in vector database"""
+        return (await self._store_embeddings([(document, embedding, text)]))[0]
+    
+    async def _store_embeddings(self, items: List[Tuple[Document, List[float], str]]) -> List[Optional[str]]:
+        """
+        Store a batch of embeddings in the vector database
+        
+        Args:
+            items: (document, embedding, text) tuples
+            
+        Returns:
+            Vector id per item, in input order
+        """
         if self.vector_db_type == 'pgvector':
-            return await self._store_pgvector(document, embedding, text)
+            return await self._store_pgvector(items)
+        elif self.vector_db_type == 'mmap':
+            return await self._store_mmap(items)
         elif self.vector_db_type == 'memory':
-            return await self._store_memory(document, embedding, text)
+            return await self._store_memory(items)
         else:
             raise ValueError(f"Unsupported vector_db_type: {self.vector_db_type}")
     
-    async def _store_pgvector(self, document: Document, embedding: List[float], text: str) -> str:
-        """Store embedding in pgvector"""
-        db = self.vector_db['db']
-        
-        # Get document metadata for filtering
-        metadata_dict = document.get_metadata_dict()
+    def _ensure_embedding_column(self, session: Any, dimension: int, table_name: str = 'document') -> None:
+        """
+        Add the embedding column to a table (document by default) if it does not exist yet
         
+        Runs the DDL at most once per database schema: afterwards the column is
+        known from the cache and writes go straight to the UPDATE.
+        """
         from sqlalchemy import text
         
+        key = self._column_key(table_name)
+        known = _prepared_embedding_columns.get(key)
+        if known is not None:
+            if known > 0 and known != dimension:
+                raise ValueError(
+                    f"Embedding dimension {dimension} does not match {table_name}.embedding vector({known})"
+                )
+            return
+        
+        # Use fully qualified type name public.vector
+        # Reason: In multi-tenant setups, pgvector extension types are in public schema,
+        # but tenant schemas may not have 'public' in their search_path.
+        # Explicit qualification ensures the type is found regardless of search_path.
+        try:
+            session.execute(text(f"""
+                ALTER TABLE {table_name} 
+                ADD COLUMN IF NOT EXISTS embedding public.vector({dimension})
+            """))
+            session.commit()
+            logger.debug(f"✅ Embedding column added to {table_name} or already exists")
+        except Exception as e:
+            session.rollback()
+            raise ValueError(f"Could not create embedding column on {table_name}: {e}")
+        _prepared_embedding_columns[key] = dimension
+    
+    async def _store_pgvector(self, items: List[Tuple[Document, List[float], str]]) -> List[str]:
+        """Store a batch of embeddings in pgvector with one multi-row UPDATE"""
+        if not items:
+            return []
+        db = self.vector_db['db']
+        
         with db.session() as session:
             try:
-                # Ensure search_path includes public where pgvector types are
-                # This is needed for multi-tenant schemas
-                try:
-                    # Get current schema from search_path
-                    current_schema = session.execute(text("SELECT current_schema()")).scalar()
-                    session.execute(text(f"SET search_path TO {current_schema}, public, pg_catalog"))
-                except Exception as e:
-                    logger.debug(f"Could not set search_path: {e}")
+                self._ensure_embedding_column(session, len(items[0][1]))
+                self._ensure_vector_index(session)
                 
-                # Check if embedding column exists, if not, add it
-                # Use fully qualified type name public.vector
-                # Reason: In multi-tenant setups, pgvector extension types are in public schema,
-                # but tenant schemas may not have 'public' in their search_path.
-                # Explicit qualification ensures the type is found regardless of search_path.
-                try:
-                    session.execute(text(f"""
-                        ALTER TABLE document 
-                        ADD COLUMN IF NOT EXISTS embedding public.vector({len(embedding)})
-                    """))
-                    session.commit()
-                    logger.debug(f"✅ Embedding column added or already exists")
-                except Exception as e:
-                    logger.debug(f"Embedding column may already exist: {e}")
-                    # Rollback if error occurred to clear transaction state
-                    session.rollback()
-                    # Try to verify column exists (without using vector type)
-                    try:
-                        result = session.execute(text("""
-                            SELECT column_name 
-                            FROM information_schema.columns 
-                            WHERE table_name = 'document' AND column_name = 'embedding'
-                        """)).scalar()
-                        if not result:
-                            logger.warning(f"Embedding column does not exist and could not be created: {e}")
-                            # Try one more time with explicit schema qualification
-                            try:
-                                session.execute(text(f"""
-                                    ALTER TABLE document 
-                                    ADD COLUMN embedding public.vector({len(embedding)})
-                                """))
-                                session.commit()
-                            except Exception as e2:
-                                raise ValueError(f"Could not create embedding column: {e2}")
-                    except Exception as e2:
-                        raise ValueError(f"Could not verify embedding column: {e2}")
-                
-                # Update document with embedding
-                # Convert embedding list to PostgreSQL vector format
-                embedding_str = '[' + ','.join(map(str, embedding)) + ']'
-                
-                # Use string formatting for vector cast to avoid SQLAlchemy parameter binding issues
-                # Use fully qualified type name public.vector (see comment above for reason)
-                session.execute(text(f"""
-                    UPDATE document 
-                    SET embedding = '{embedding_str}'::public.vector
-                    WHERE id = :doc_id
-                """), {'doc_id': document.id})
+                # One round trip for the whole batch
+                self._write_vectors(
+                    session, 'document', [(document.id, embedding) for document, embedding, _ in items]
+                )
                 
                 session.commit()
-                logger.debug(f"✅ Embedding stored successfully for document {document.id}")
+                logger.debug(f"✅ Stored {len(items)} embeddings")
                 
             except Exception as e:
                 # Rollback on any error
@@ -554,42 +758,131 @@ class VectorIndexingProcessor(BaseProcessor):
                 logger.error(f"Error storing embedding in pgvector: {e}")
                 raise
         
-        return document.id
+        return [document.id for document, _, _ in items]
     
-    async def _store_memory(self, document: Document, embedding: List[float], text: str) -> str:
-        """Store embedding in memory (for testing)"""
+    @staticmethod
+    def _write_vectors(session: Any, table_name: str, rows: List[Tuple[str, List[float]]]) -> None:
+        """
+        Set the embedding column of one or many rows with a single UPDATE
+        
+        Vectors are bound parameters (encoded by the pgvector SQLAlchemy type
+        when installed) cast to the fully qualified public.vector type.
+        
+        Args:
+            session: Database session
+            table_name: Table with an ``id`` and an ``embedding`` column
+            rows: (row id, embedding) pairs
+        """
+        from sqlalchemy import bindparam, text
+        
+        if not rows:
+            return
+        params: Dict[str, Any] = {}
+        for index, (row_id, embedding) in enumerate(rows):
+            params[f"row_id_{index}"] = row_id
+            params[f"embedding_{index}"] = (
+                embedding if HAS_PGVECTOR else '[' + ','.join(map(str, embedding)) + ']'
+            )
+        if len(rows) == 1:
+            statement = text(f"""
+                UPDATE {table_name}
+                SET embedding = CAST(:embedding_0 AS public.vector)
+                WHERE id = :row_id_0
+            """)
+        else:
+            values = ', '.join(f"(:row_id_{index}, :embedding_{index})" for index in range(len(rows)))
+            statement = text(f"""
+                UPDATE {table_name} AS t
+                SET embedding = CAST(v.embedding AS public.vector)
+                FROM (VALUES {values}) AS v(id, embedding)
+                WHERE t.id = v.id
+            """)
+        if HAS_PGVECTOR:
+            statement = statement.bindparams(
+                *(bindparam(f"embedding_{index}", type_=Vector()) for index in range(len(rows)))
+            )
+        session.execute(statement, params)
+    
+    async def _store_memory(self, items: List[Tuple[Document, List[float], str]]) -> List[str]:
+        """Store a batch of embeddings in memory (for testing)"""
         vectors = self.vector_db['vectors']
+        index = self.vector_db.get('index')
+        basket_ids = self._resolve_basket_ids([document for document, _, _ in items])
         
-        # Get basket_id from document's basket if available
-        basket_id = None
-        try:
+        for document, embedding, text in items:
+            vectors[document.id] = {
+                'document_id': document.id,
+                'basket_id': basket_ids.get(document.id),
+                'document_type': document.document_type if hasattr(document, 'document_type') else None,
+                'text_preview': text[:1000],
+                'metadata': document.get_metadata_dict()
+            }
+            if index is None:
+                vectors[document.id]['embedding'] = embedding
+        
+        if index is not None:
+            index.add(
+                [document.id for document, _, _ in items],
+                [embedding for _, embedding, _ in items],
+                basket_ids=[vectors[document.id]['basket_id'] for document, _, _ in items],
+                document_types=[vectors[document.id]['document_type'] for document, _, _ in items],
+            )
+            self._add_to_ann(items, [vectors[document.id]['basket_id'] for document, _, _ in items])
+        
+        return [document.id for document, _, _ in items]
+    
+    async def _store_mmap(self, items: List[Tuple[Document, List[float], str]]) -> List[str]:
+        """Append a batch of embeddings to the memory-mapped index file"""
+        basket_ids = self._resolve_basket_ids([document for document, _, _ in items])
+        self.vector_db['index'].add(
+            [document.id for document, _, _ in items],
+            [embedding for _, embedding, _ in items],
+            basket_ids=[basket_ids.get(document.id) for document, _, _ in items],
+            document_types=[getattr(document, 'document_type', None) for document, _, _ in items],
+        )
+        self._add_to_ann(items, [basket_ids.get(document.id) for document, _, _ in items])
+        return [document.id for document, _, _ in items]
+    
+    def _add_to_ann(self, items: List[Tuple[Document, List[float], str]], basket_ids: List[Optional[str]]) -> None:
+        """Insert new embeddings into the shared ANN index, if one is trained"""
+        ann = self.vector_db.get('ann')
+        if ann is None or not ann.is_trained:
+            return
+        ann.add(
+            [document.id for document, _, _ in items],
+            [embedding for _, embedding, _ in items],
+            basket_ids=basket_ids,
+        )
+    
+    def _resolve_basket_ids(self, documents: List[Document]) -> Dict[str, Optional[str]]:
+        """Get the basket id of each document, looking up the rest with one query"""
+        basket_ids: Dict[str, Optional[str]] = {}
+        missing = []
+        for document in documents:
             # Try to get from document's basket attribute
             if hasattr(document, 'basket') and document.basket:
-                basket_id = document.basket.id if hasattr(document.basket, 'id') else str(document.basket)
+                basket = document.basket
+                basket_ids[document.id] = basket.id if hasattr(basket, 'id') else str(basket)
             # Try to get from document's basket_id attribute
             elif hasattr(document, 'basket_id'):
-                basket_id = document.basket_id
-            # Try to get from database
+                basket_ids[document.id] = document.basket_id
+            elif getattr(getattr(document, 'model', None), 'basket_id', None):
+                basket_ids[document.id] = document.model.basket_id
             else:
-                from docex.db.connection import Database
+                missing.append(document.id)
+        
+        if missing:
+            # Try to get from database
+            try:
                 from docex.db.models import Document as DocumentModel
                 from sqlalchemy import select
                 db = self.db or Database()
                 with db.session() as session:
-                    doc_model = session.get(DocumentModel, document.id)
-                    if doc_model and doc_model.basket_id:
-                        basket_id = doc_model.basket_id
-        except Exception as e:
-            logger.debug(f"Could not get basket_id for document {document.id}: {e}")
-            pass
-        
-        vectors[document.id] = {
-            'embedding': embedding,
-            'document_id': document.id,
-            'basket_id': basket_id,
-            'document_type': document.document_type if hasattr(document, 'document_type') else None,
-            'text_preview': text[:1000],
-            'metadata': document.get_metadata_dict()
-        }
+                    rows = session.execute(
+                        select(DocumentModel.id, DocumentModel.basket_id).where(DocumentModel.id.in_(missing))
+                    ).all()
+                    basket_ids.update({row.id: row.basket_id for row in rows})
+            except Exception as e:
+                logger.debug(f"Could not get basket_id for documents {missing}: {e}")
         
-        return document.id
+        return basket_ids
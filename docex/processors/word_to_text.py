@@ -11,11 +11,16 @@ from pathlib import Path
 from docex.processors.base import BaseProcessor, ProcessingResult
 from docex.document import Document
 from docex.db.connection import Database
+from docex.services.text_extraction_service import extract_docx_text
 
 
 class WordToTextProcessor(BaseProcessor):
     """Processor that converts Word documents to plain text format"""
 
+    # python-docx parsing is CPU-bound and would block the event loop
+    execution_mode = 'process'
+    records_operations = True
+
     def __init__(self, config: Dict[str, Any], db: Optional[Database] = None):
         """
         Initialize the Word to Text processor
@@ -58,7 +63,7 @@ class WordToTextProcessor(BaseProcessor):
         try:
             # Import python-docx (fail gracefully if not installed)
             try:
-                from docx import Document as DocxDocument
+                import docx  # noqa: F401
             except ImportError:
                 return ProcessingResult(
                     success=False,
@@ -80,46 +85,13 @@ class WordToTextProcessor(BaseProcessor):
                 )
 
             # Parse the .docx file
-            docx_doc = DocxDocument(io.BytesIO(doc_bytes))
-
-            # Extract text content
-            text_parts = []
-            paragraph_count = 0
-            table_count = 0
-
-            # Extract paragraphs
-            for paragraph in docx_doc.paragraphs:
-                paragraph_text = paragraph.text
-                if paragraph_text.strip():  # Only add non-empty paragraphs
-                    text_parts.append(paragraph_text)
-                    paragraph_count += 1
-                elif self.preserve_formatting:
-                    # Preserve empty lines for formatting
-                    text_parts.append('')
-
-            # Extract tables if configured
-            if self.extract_tables:
-                for table in docx_doc.tables:
-                    table_count += 1
-                    if self.preserve_formatting:
-                        text_parts.append('')  # Add spacing before table
-                        text_parts.append(f'--- Table {table_count} ---')
-
-                    for row in table.rows:
-                        row_texts = [cell.text.strip() for cell in row.cells]
-                        row_text = '\t'.join(row_texts)  # Tab-separated values
-                        text_parts.append(row_text)
-
-                    if self.preserve_formatting:
-                        text_parts.append(f'--- End Table {table_count} ---')
-                        text_parts.append('')  # Add spacing after table
-
-            # Join all text parts
-            if self.preserve_formatting:
-                full_text = '\n'.join(text_parts)
-            else:
-                # Join with single newline, no extra spacing
-                full_text = '\n'.join(part for part in text_parts if part)
+            full_text, extraction_stats = extract_docx_text(
+                io.BytesIO(doc_bytes),
+                preserve_formatting=self.preserve_formatting,
+                extract_tables=self.extract_tables,
+            )
+            paragraph_count = extraction_stats['paragraph_count']
+            table_count = extraction_stats['table_count']
 
             # Create output file name
             # document.path is like: docex/basket_xxx/doc_yyy.docx
@@ -150,7 +122,7 @@ class WordToTextProcessor(BaseProcessor):
             # Calculate statistics
             word_count = len(full_text.split())
             char_count = len(full_text)
-            line_count = len(text_parts)
+            line_count = extraction_stats['line_count']
 
             # Record the operation in the database
             self._record_operation(
@@ -6,6 +6,7 @@ from uuid import uuid4
 from sqlalchemy import select
 from pathlib import Path
 
+from docex.db.audit_writer import AuditWriter
 from docex.db.connection import Database
 from docex.db.models import Document as DocumentModel, DocBasket as DocBasketModel, FileHistory, Operation, DocumentMetadata, DocEvent
 from docex.models.metadata_keys import MetadataKey
@@ -241,7 +242,7 @@ class DocumentService:
             return session.execute(query).scalars().all()
     
     def create_operation(self, document_id: str, operation_type: str,
-                        status: str, details: Optional[Dict] = None) -> Operation:
+                        status: str, details: Optional[Dict] = None, sync: bool = False) -> Operation:
         """
         Create a document operation
         
@@ -250,23 +251,22 @@ class DocumentService:
             operation_type: Type of operation
             status: Operation status
             details: Optional operation details
+            sync: Write the row now instead of buffering it (see AuditWriter)
             
         Returns:
-            Created Operation instance
+            Created Operation instance (not attached to a session)
         """
-        with self.db.transaction() as session:
-            operation = Operation(
-                id=f"id_{uuid4().hex}",
-                document_id=document_id,
-                operation_type=operation_type,
-                status=status,
-                details=details or {},
-                created_at=datetime.now(timezone.utc),
-                completed_at=datetime.now(timezone.utc)
-            )
-            session.add(operation)
-            session.commit()
-            return operation
+        now = datetime.now(timezone.utc)
+        row = AuditWriter.for_database(self.db).add(Operation, {
+            'id': f"id_{uuid4().hex}",
+            'document_id': document_id,
+            'operation_type': operation_type,
+            'status': status,
+            'details': details or {},
+            'created_at': now,
+            'completed_at': now
+        }, sync=sync)
+        return Operation(**row)
     
     def set_document_metadata(self, document_id: str, key: Union[str, MetadataKey], value: Any,
                             metadata_type: str = 'custom') -> DocumentMetadata:
@@ -0,0 +1,268 @@
+"""
+Event consumer for DocEX
+
+``doc_events`` is an outbox: document operations append PENDING events and
+consumers hand them to downstream systems. An EventConsumer claims events in
+batches (see DocEventRepository.claim_events: FOR UPDATE SKIP LOCKED on
+PostgreSQL, a lease on every backend), runs a handler on each event and
+settles the whole batch with one UPDATE for the successes and one batched
+UPDATE for the failures. Failed events are retried with exponential backoff
+and marked FAILED after ``max_attempts``.
+
+Any number of consumers (threads, processes or hosts) can share a database;
+each event is handled by one consumer at a time. Delivery is at-least-once:
+an event whose handler outlives the lease, or whose consumer dies before
+acknowledging, is handled again, so handlers must be idempotent.
+"""
+
+import asyncio
+import inspect
+import logging
+import os
+import socket
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+from uuid import uuid4
+
+from docex.db.connection import Database
+from docex.db.models import DocEvent
+from docex.db.repository import DocEventRepository
+
+logger = logging.getLogger(__name__)
+
+# handler(event); may be a coroutine function. Raising marks the event failed.
+EventHandler = Callable[[DocEvent], Any]
+
+
+@dataclass
+class ConsumerStats:
+    """Counters of one consumer"""
+
+    consumer_id: str
+    batches: int = 0
+    claimed: int = 0
+    processed: int = 0
+    retried: int = 0
+    failed: int = 0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def throughput(self) -> float:
+        """Events handled per second"""
+        handled = self.processed + self.retried + self.failed
+        return handled / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+
+class EventConsumer:
+    """
+    Claims, handles and acknowledges doc_events in batches.
+
+    Example:
+        >>> consumer = EventConsumer(db, publish, batch_size=500, event_types=['ADD'])
+        >>> consumer.run(stop=stop_event)
+    """
+
+    def __init__(
+        self,
+        db: Database,
+        handler: EventHandler,
+        batch_size: int = 100,
+        lease_seconds: float = 60.0,
+        max_attempts: int = 5,
+        backoff_base: float = 1.0,
+        backoff_max: float = 300.0,
+        basket_id: Optional[str] = None,
+        event_types: Optional[Sequence[str]] = None,
+        consumer_id: Optional[str] = None,
+    ):
+        """
+        Initialize event consumer
+
+        Args:
+            db: Database holding the doc_events table
+            handler: Called with every claimed event
+            batch_size: Events claimed (and acknowledged) at once
+            lease_seconds: Time a claimed batch is reserved for this consumer;
+                must exceed the time needed to handle a batch
+            max_attempts: Attempts before an event is marked FAILED
+            backoff_base: Delay in seconds before the first retry; doubled on
+                every further attempt
+            backoff_max: Upper bound of the retry delay
+            basket_id: Only consume events of this basket
+            event_types: Only consume events of these types
+            consumer_id: Name in claim tokens (default: host:pid:random)
+        """
+        if batch_size <= 0:
+            raise ValueError("batch_size must be positive")
+        if lease_seconds <= 0:
+            raise ValueError("lease_seconds must be positive")
+        if max_attempts <= 0:
+            raise ValueError("max_attempts must be positive")
+        self.repository = DocEventRepository(db)
+        self.handler = handler
+        self.batch_size = batch_size
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.basket_id = basket_id
+        self.event_types = list(event_types) if event_types else None
+        self.consumer_id = consumer_id or f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+        self.stats = ConsumerStats(consumer_id=self.consumer_id)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def retry_delay(self, attempts: int) -> float:
+        """Seconds to wait before retrying an event that failed ``attempts`` times"""
+        return min(self.backoff_max, self.backoff_base * 2 ** max(attempts - 1, 0))
+
+    def run_once(self) -> int:
+        """
+        Claim one batch, handle it and settle it
+
+        Returns:
+            Number of events claimed (0 when none are due)
+        """
+        started = time.perf_counter()
+        claim_token = f"{self.consumer_id}:{uuid4().hex[:12]}"
+        events = self.repository.claim_events(
+            claim_token,
+            batch_size=self.batch_size,
+            lease_seconds=self.lease_seconds,
+            basket_id=self.basket_id,
+            event_types=self.event_types,
+        )
+        if not events:
+            return 0
+
+        processed: List[str] = []
+        failures: List[Tuple[str, str, Optional[datetime]]] = []
+        for event in events:
+            try:
+                self._handle(event)
+                processed.append(event.id)
+            except Exception as e:
+                attempts = event.attempts or 1
+                retry_at = None
+                if attempts < self.max_attempts:
+                    retry_at = datetime.now(timezone.utc) + timedelta(seconds=self.retry_delay(attempts))
+                logger.warning(
+                    f"Event {event.id} ({event.event_type}) failed on attempt {attempts}"
+                    f"{'' if retry_at else ', giving up'}: {e}"
+                )
+                failures.append((event.id, str(e), retry_at))
+
+        acknowledged = self.repository.ack_events(claim_token, processed)
+        if acknowledged < len(processed):
+            logger.warning(
+                f"{len(processed) - acknowledged} events of claim {claim_token} were taken over "
+                "after their lease expired"
+            )
+        self.repository.release_events(claim_token, failures)
+
+        self.stats.batches += 1
+        self.stats.claimed += len(events)
+        self.stats.processed += len(processed)
+        self.stats.retried += sum(1 for _, _, retry_at in failures if retry_at is not None)
+        self.stats.failed += sum(1 for _, _, retry_at in failures if retry_at is None)
+        self.stats.elapsed_seconds += time.perf_counter() - started
+        return len(events)
+
+    def run(
+        self,
+        stop: Optional[threading.Event] = None,
+        idle_interval: float = 1.0,
+        until_empty: bool = False,
+    ) -> ConsumerStats:
+        """
+        Consume events until ``stop`` is set
+
+        Full batches are followed immediately by the next claim; the consumer
+        sleeps ``idle_interval`` seconds only when nothing is due.
+
+        Args:
+            stop: Event that ends the loop (checked between batches)
+            idle_interval: Seconds to wait when no event is due
+            until_empty: Return as soon as no event is due
+
+        Returns:
+            This consumer's stats
+        """
+        stop = stop or threading.Event()
+        try:
+            while not stop.is_set():
+                try:
+                    claimed = self.run_once()
+                except Exception as e:
+                    # e.g. the database is briefly unavailable; claimed events
+                    # return to the queue when their lease expires
+                    logger.error(f"Event consumer {self.consumer_id} failed to process a batch: {e}")
+                    claimed = 0
+                    if until_empty:
+                        raise
+                if claimed == 0:
+                    if until_empty:
+                        break
+                    stop.wait(idle_interval)
+        finally:
+            if self._loop is not None:
+                self._loop.close()
+                self._loop = None
+        return self.stats
+
+    def _handle(self, event: DocEvent) -> None:
+        result = self.handler(event)
+        if inspect.isawaitable(result):
+            # Coroutine handlers run on this consumer's own loop
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+            self._loop.run_until_complete(result)
+
+
+def run_consumers(
+    db: Database,
+    handler: EventHandler,
+    consumers: int = 4,
+    stop: Optional[threading.Event] = None,
+    until_empty: bool = False,
+    **options: Any,
+) -> List[ConsumerStats]:
+    """
+    Run several EventConsumers in threads until ``stop`` is set
+
+    Args:
+        db: Database holding the doc_events table
+        handler: Called with every event (shared by all consumers)
+        consumers: Number of parallel consumers
+        stop: Event that ends every consumer
+        until_empty: Return once no event is due
+        **options: EventConsumer keyword arguments (batch_size, lease_seconds, ...)
+
+    Returns:
+        Stats of every consumer
+    """
+    if consumers <= 0:
+        raise ValueError("consumers must be positive")
+    stop = stop or threading.Event()
+    workers = [EventConsumer(db, handler, **options) for _ in range(consumers)]
+    threads = [
+        threading.Thread(
+            target=worker.run,
+            kwargs={'stop': stop, 'until_empty': until_empty},
+            name=f"docex-events-{number}",
+            daemon=True,
+        )
+        for number, worker in enumerate(workers)
+    ]
+    for thread in threads:
+        thread.start()
+    try:
+        for thread in threads:
+            thread.join()
+    except KeyboardInterrupt:
+        stop.set()
+        for thread in threads:
+            thread.join()
+    return [worker.stats for worker in workers]
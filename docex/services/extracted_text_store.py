@@ -0,0 +1,226 @@
+"""
+Extracted-text store for DocEX
+
+Text extracted from a PDF or DOCX document is a derived artifact: it only
+depends on the document's bytes and the extractor. The store persists it
+once per ``(document checksum, extractor version)`` in the basket's storage,
+next to the original::
+
+    <document dir>/_derived/<checksum>/text.<extractor>.v<version>.json
+
+so every processor (PO matching, vector indexing, LLM processors) reads the
+same extraction instead of parsing the document again. A small in-process
+LRU also avoids re-reading the artifact when several processors run on the
+same document. Other file types are decoded as before (and memoised in the
+LRU), without writing an artifact.
+"""
+
+import io
+import json
+import logging
+import posixpath
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from docex.document import Document
+from docex.services.text_extraction_service import Extractor, extract_docx_text, extract_pdf_text
+
+logger = logging.getLogger(__name__)
+
+DERIVED_DIRECTORY = '_derived'
+
+# suffix -> (extractor name, version, extractor). Bump the version when an
+# extractor's output changes so stale artifacts are no longer read.
+ARTIFACT_EXTRACTORS: Dict[str, Tuple[str, int, Extractor]] = {
+    '.pdf': ('pdfminer', 1, extract_pdf_text),
+    '.docx': ('python-docx', 1, extract_docx_text),
+}
+
+
+@dataclass
+class ExtractedTextArtifact:
+    """Extracted text of one document version"""
+
+    text: str
+    checksum: str
+    extractor: str
+    version: int
+    # Character offset at which each page starts (PDF only)
+    page_offsets: List[int] = field(default_factory=list)
+    stats: Dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'text': self.text,
+            'checksum': self.checksum,
+            'extractor': self.extractor,
+            'version': self.version,
+            'page_offsets': self.page_offsets,
+            'stats': self.stats,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ExtractedTextArtifact':
+        return cls(
+            text=data['text'],
+            checksum=data['checksum'],
+            extractor=data['extractor'],
+            version=int(data['version']),
+            page_offsets=list(data.get('page_offsets') or []),
+            stats=dict(data.get('stats') or {}),
+        )
+
+
+class ExtractedTextStore:
+    """
+    Reads extracted text from the artifact store, extracting and persisting
+    it on first use.
+
+    The in-process LRU is shared by every store instance, so processors
+    running on the same document in one process read its text once.
+    """
+
+    _memory: 'OrderedDict[Tuple[str, str], ExtractedTextArtifact]' = OrderedDict()
+    _lock = threading.Lock()
+    max_memory_entries = 128
+
+    def __init__(self, extractors: Optional[Dict[str, Tuple[str, int, Extractor]]] = None):
+        """
+        Initialize extracted-text store
+
+        Args:
+            extractors: Artifact extractors by lower-case file suffix
+                (default: ARTIFACT_EXTRACTORS)
+        """
+        self.extractors = extractors if extractors is not None else ARTIFACT_EXTRACTORS
+
+    def supports(self, document: Document) -> bool:
+        """Whether the document's text is kept as an artifact"""
+        name = getattr(document, 'name', None)
+        return isinstance(name, str) and Path(name).suffix.lower() in self.extractors
+
+    def artifact_path(self, document: Document) -> Optional[str]:
+        """Storage path of the document's text artifact (None without a checksum or extractor)"""
+        entry = self.extractors.get(Path(document.name).suffix.lower())
+        if entry is None or not document.checksum:
+            return None
+        name, version, _ = entry
+        return posixpath.join(
+            posixpath.dirname(document.path), DERIVED_DIRECTORY, document.checksum, f"text.{name}.v{version}.json"
+        )
+
+    def get_text(self, document: Document) -> str:
+        """Extracted text of a document"""
+        return self.get(document).text
+
+    def get(self, document: Document) -> ExtractedTextArtifact:
+        """
+        Extracted text artifact of a document
+
+        Looks in the in-process LRU, then the basket storage, and only then
+        runs the extractor (persisting its result). Documents without an
+        artifact extractor are decoded as UTF-8 text.
+
+        Raises:
+            FileNotFoundError: If the document content cannot be found
+            ImportError: If the extractor's parser is not installed
+        """
+        entry = self.extractors.get(Path(document.name).suffix.lower())
+        key = (document.checksum, f"{entry[0]}.v{entry[1]}" if entry else 'raw')
+        if document.checksum:
+            with self._lock:
+                artifact = self._memory.get(key)
+                if artifact is not None:
+                    self._memory.move_to_end(key)
+                    return artifact
+
+        if entry is None:
+            artifact = ExtractedTextArtifact(
+                text=Document.get_content(document, mode='text'), checksum=document.checksum or '',
+                extractor='raw', version=1,
+            )
+        else:
+            artifact = self.load(document) or self._extract(document, entry)
+        if document.checksum:
+            self._remember(key, artifact)
+        return artifact
+
+    def put(self, document: Document, text: str, stats: Optional[Dict[str, Any]] = None) -> Optional[ExtractedTextArtifact]:
+        """
+        Persist text extracted elsewhere (e.g. by TextExtractionService)
+
+        Returns:
+            The stored artifact, or None when the document has no artifact path
+        """
+        entry = self.extractors.get(Path(document.name).suffix.lower())
+        if entry is None or not document.checksum:
+            return None
+        artifact = self._artifact(document, entry, text, stats or {})
+        self._save(document, artifact)
+        self._remember((document.checksum, f"{entry[0]}.v{entry[1]}"), artifact)
+        return artifact
+
+    def _remember(self, key: Tuple[str, str], artifact: ExtractedTextArtifact) -> None:
+        with self._lock:
+            self._memory[key] = artifact
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_memory_entries:
+                self._memory.popitem(last=False)
+
+    @staticmethod
+    def _artifact(
+        document: Document,
+        entry: Tuple[str, int, Extractor],
+        text: str,
+        stats: Dict[str, Any],
+    ) -> ExtractedTextArtifact:
+        name, version, _ = entry
+        page_offsets: List[int] = []
+        if '\f' in text:
+            # pdfminer ends every page with a form feed
+            page_offsets = [0] + [index + 1 for index, char in enumerate(text) if char == '\f'][:-1]
+        return ExtractedTextArtifact(
+            text=text, checksum=document.checksum, extractor=name, version=version,
+            page_offsets=page_offsets, stats=stats,
+        )
+
+    def _extract(self, document: Document, entry: Tuple[str, int, Extractor]) -> ExtractedTextArtifact:
+        """Run the extractor in this process and persist the result"""
+        _, _, extractor = entry
+        content = Document.get_content(document, mode='bytes')
+        text, stats = extractor(io.BytesIO(content))
+        artifact = self._artifact(document, entry, text, stats)
+        self._save(document, artifact)
+        return artifact
+
+    def load(self, document: Document) -> Optional[ExtractedTextArtifact]:
+        """Read the persisted artifact, or None if there is none (or it is unreadable)"""
+        path = self.artifact_path(document)
+        if path is None:
+            return None
+        try:
+            content = document.storage_service.storage.retrieve(path)
+            if content is None:
+                return None
+            if hasattr(content, 'read'):
+                with content:
+                    content = content.read()
+            data = content if isinstance(content, dict) else json.loads(content)
+            return ExtractedTextArtifact.from_dict(data)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable text artifact {path}: {e}")
+            return None
+
+    def _save(self, document: Document, artifact: ExtractedTextArtifact) -> None:
+        path = self.artifact_path(document)
+        if path is None:
+            return
+        try:
+            payload = json.dumps(artifact.to_dict()).encode('utf-8')
+            document.storage_service.storage.save(path, io.BytesIO(payload))
+        except Exception as e:
+            # The text is still returned; it is extracted again next time
+            logger.warning(f"Could not persist text artifact {path}: {e}")
@@ -1,12 +1,140 @@
-from typing import Dict, Any, Optional, List
+from typing import Any, Callable, ContextManager, Dict, List, Optional
+from datetime import date, datetime, time, timezone
+from decimal import Decimal
 from docex.db.connection import Database
 from docex.db.models import Document, DocumentMetadata
-from sqlalchemy import select
+from sqlalchemy import bindparam, insert, select, update
 import json
 import logging
+import math
+import re
+from uuid import uuid4
 
 logger = logging.getLogger(__name__)
 
+# ISO-8601 dates/datetimes ("2024-05-01", "2024-05-01T10:00:00Z", "2024-05-01 10:00:00+02:00")
+_ISO_DATE_PATTERN = re.compile(
+    r'^\d{4}-\d{2}-\d{2}([T ]\d{2}:\d{2}(:\d{2}(\.\d+)?)?)?(Z|[+-]\d{2}:?\d{2})?$'
+)
+VALUE_TEXT_LENGTH = 255
+# Upper bound on ids per IN (...) list; keeps bulk reads under SQLite's bind limit
+BULK_ID_CHUNK_SIZE = 500
+
+
+def normalize_metadata_timestamp(value: Any) -> Optional[datetime]:
+    """
+    Convert a date, datetime or ISO-8601 string to a naive UTC datetime.
+
+    Returns:
+        The normalized datetime, or None if the value is not a date
+    """
+    if isinstance(value, str):
+        if not _ISO_DATE_PATTERN.match(value):
+            return None
+        try:
+            value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            return None
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+    if isinstance(value, date):
+        return datetime.combine(value, time())
+    return None
+
+
+def typed_metadata_values(value: Any) -> Dict[str, Any]:
+    """
+    Derive the typed shadow columns stored next to a metadata value.
+
+    Numbers fill ``value_num`` (so 1000 and 1000.0 compare equal), dates,
+    datetimes and ISO-8601 strings fill ``value_ts``, and strings fill
+    ``value_text`` (truncated to 255 characters). Booleans, None, lists
+    and dicts leave all three empty.
+
+    Args:
+        value: Metadata value before JSON serialization
+
+    Returns:
+        Dictionary with value_num, value_ts and value_text keys
+    """
+    typed = {'value_num': None, 'value_ts': None, 'value_text': None}
+    if value is None or isinstance(value, bool):
+        return typed
+    if isinstance(value, (int, float, Decimal)):
+        number = float(value)
+        if math.isfinite(number):
+            typed['value_num'] = number
+        return typed
+    if isinstance(value, (date, datetime)):
+        typed['value_ts'] = normalize_metadata_timestamp(value)
+        return typed
+    if isinstance(value, str):
+        typed['value_text'] = value[:VALUE_TEXT_LENGTH]
+        typed['value_ts'] = normalize_metadata_timestamp(value)
+    return typed
+
+
+def backfill_typed_metadata(transaction: Callable[[], ContextManager[Any]], batch_size: int = 1000) -> int:
+    """
+    Populate the typed shadow columns for metadata written before they existed.
+
+    Rows whose typed columns are all empty are decoded from their JSON
+    value and updated in batches, one transaction per batch. Safe to run
+    repeatedly; called automatically when a schema upgrade adds the columns.
+
+    Args:
+        transaction: Callable returning a transaction context that yields a
+            session or connection and commits on exit (``Database.transaction``
+            or ``Engine.begin``)
+        batch_size: Number of rows updated per transaction
+
+    Returns:
+        Number of rows that received at least one typed value
+    """
+    table = DocumentMetadata.__table__
+    updated = 0
+    last_id = ''
+    while True:
+        with transaction() as conn:
+            rows = conn.execute(
+                select(table.c.id, table.c.value)
+                .where(
+                    table.c.id > last_id,
+                    table.c.value_num.is_(None),
+                    table.c.value_ts.is_(None),
+                    table.c.value_text.is_(None),
+                )
+                .order_by(table.c.id)
+                .limit(batch_size)
+            ).all()
+            if not rows:
+                return updated
+            last_id = rows[-1].id
+            changes = []
+            for row in rows:
+                try:
+                    value = json.loads(row.value)
+                except (json.JSONDecodeError, TypeError):
+                    value = row.value
+                typed = typed_metadata_values(value)
+                if any(v is not None for v in typed.values()):
+                    changes.append({'row_id': row.id, **typed})
+            if changes:
+                conn.execute(
+                    update(table)
+                    .where(table.c.id == bindparam('row_id'))
+                    .values(
+                        value_num=bindparam('value_num'),
+                        value_ts=bindparam('value_ts'),
+                        value_text=bindparam('value_text'),
+                    ),
+                    changes,
+                )
+                updated += len(changes)
+
+
 class MetadataService:
     """Service for handling document metadata operations with direct value storage"""
     
@@ -30,17 +158,43 @@ class MetadataService:
             metadata_records = session.execute(
                 select(DocumentMetadata).where(DocumentMetadata.document_id == document_id)
             ).scalars().all()
-            metadata = {}
-            for record in metadata_records:
-                try:
-                    # Parse JSON value - stored directly, no wrapping
-                    value = json.loads(record.value)
-                    metadata[record.key] = value
-                except (json.JSONDecodeError, TypeError):
-                    # Fallback: treat as plain string if JSON parsing fails
-                    metadata[record.key] = record.value
+            return {record.key: self._decode_value(record.value) for record in metadata_records}
+    
+    def get_metadata_bulk(self, document_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get metadata for many documents with one ``IN`` query per chunk of ids.
+        
+        Args:
+            document_ids: Document IDs to load metadata for
             
+        Returns:
+            Dict of document_id -> metadata dict; documents without metadata
+            map to an empty dict
+        """
+        ids = list(dict.fromkeys(document_ids))
+        metadata: Dict[str, Dict[str, Any]] = {document_id: {} for document_id in ids}
+        if not ids:
             return metadata
+        with self.db.session() as session:
+            for start in range(0, len(ids), BULK_ID_CHUNK_SIZE):
+                chunk = ids[start:start + BULK_ID_CHUNK_SIZE]
+                rows = session.execute(
+                    select(DocumentMetadata.document_id, DocumentMetadata.key, DocumentMetadata.value)
+                    .where(DocumentMetadata.document_id.in_(chunk))
+                ).all()
+                for document_id, key, value in rows:
+                    metadata[document_id][key] = self._decode_value(value)
+        return metadata
+    
+    @staticmethod
+    def _decode_value(value: str) -> Any:
+        """Parse a stored JSON value, falling back to the raw string."""
+        try:
+            # Parse JSON value - stored directly, no wrapping
+            return json.loads(value)
+        except (json.JSONDecodeError, TypeError):
+            # Fallback: treat as plain string if JSON parsing fails
+            return value
     
     def update_metadata(self, document_id: str, metadata: Dict[str, Any]) -> None:
         """
@@ -52,12 +206,7 @@ class MetadataService:
         """
         with self.db.transaction() as session:
             for key, value in metadata.items():
-                # Serialize to JSON (handles dict, list, string, number, etc.)
-                try:
-                    value_json = json.dumps(value, default=str)
-                except (TypeError, ValueError) as e:
-                    logger.warning(f"Failed to serialize metadata {key}, storing as string: {e}")
-                    value_json = json.dumps(str(value))
+                value_json = self._encode_value(key, value)
                 
                 # Check if metadata already exists
                 existing = session.execute(
@@ -67,18 +216,96 @@ class MetadataService:
                     )
                 ).scalar_one_or_none()
                 
+                typed = typed_metadata_values(value)
                 if existing:
                     existing.value = value_json
+                    existing.value_num = typed['value_num']
+                    existing.value_ts = typed['value_ts']
+                    existing.value_text = typed['value_text']
                 else:
                     new_metadata = DocumentMetadata(
                         document_id=document_id,
                         key=key,
                         value=value_json,
-                        metadata_type='custom'
+                        metadata_type='custom',
+                        **typed
                     )
                     session.add(new_metadata)
             session.commit()
     
+    def update_metadata_bulk(self, updates: Dict[str, Dict[str, Any]]) -> None:
+        """
+        Update metadata for many documents in one transaction.
+        
+        Existing rows are looked up with one ``IN`` query per chunk of ids;
+        new rows are written with a single multi-row INSERT and changed rows
+        with a single executemany UPDATE.
+        
+        Args:
+            updates: Dict of document_id -> {key: value} to store
+        """
+        updates = {document_id: metadata for document_id, metadata in updates.items() if metadata}
+        if not updates:
+            return
+        document_ids = list(updates)
+        keys = sorted({key for metadata in updates.values() for key in metadata})
+        now = datetime.now(timezone.utc)
+        
+        with self.db.transaction() as session:
+            existing = {}
+            for start in range(0, len(document_ids), BULK_ID_CHUNK_SIZE):
+                chunk = document_ids[start:start + BULK_ID_CHUNK_SIZE]
+                rows = session.execute(
+                    select(DocumentMetadata.id, DocumentMetadata.document_id, DocumentMetadata.key)
+                    .where(DocumentMetadata.document_id.in_(chunk), DocumentMetadata.key.in_(keys))
+                ).all()
+                existing.update({(row.document_id, row.key): row.id for row in rows})
+            
+            new_rows = []
+            changed_rows = []
+            for document_id, metadata in updates.items():
+                for key, value in metadata.items():
+                    values = {'value': self._encode_value(key, value), **typed_metadata_values(value)}
+                    row_id = existing.get((document_id, key))
+                    if row_id:
+                        changed_rows.append({'row_id': row_id, 'updated_at': now, **values})
+                    else:
+                        new_rows.append({
+                            'id': f"dmt_{uuid4().hex}",
+                            'document_id': document_id,
+                            'key': key,
+                            'metadata_type': 'custom',
+                            'created_at': now,
+                            'updated_at': now,
+                            **values,
+                        })
+            
+            if new_rows:
+                session.execute(insert(DocumentMetadata), new_rows)
+            if changed_rows:
+                session.connection().execute(
+                    update(DocumentMetadata.__table__)
+                    .where(DocumentMetadata.__table__.c.id == bindparam('row_id'))
+                    .values(
+                        value=bindparam('value'),
+                        value_num=bindparam('value_num'),
+                        value_ts=bindparam('value_ts'),
+                        value_text=bindparam('value_text'),
+                        updated_at=bindparam('updated_at'),
+                    ),
+                    changed_rows,
+                )
+            session.commit()
+    
+    @staticmethod
+    def _encode_value(key: str, value: Any) -> str:
+        """Serialize a metadata value to JSON (handles dict, list, string, number, etc.)."""
+        try:
+            return json.dumps(value, default=str)
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Failed to serialize metadata {key}, storing as string: {e}")
+            return json.dumps(str(value))
+    
     def delete_metadata(self, document_id: str, keys: List[str]) -> None:
         """
         Delete metadata for a document
@@ -94,4 +321,18 @@ class MetadataService:
                     DocumentMetadata.key.in_(keys)
                 )
             )
-            session.commit() 
\ No newline at end of file
+            session.commit()
+    
+    def backfill_typed_values(self, batch_size: int = 1000) -> int:
+        """
+        Populate the typed shadow columns for metadata written before they existed.
+        
+        See :func:`backfill_typed_metadata`; runs against this service's database.
+        
+        Args:
+            batch_size: Number of rows updated per transaction
+            
+        Returns:
+            Number of rows that received at least one typed value
+        """
+        return backfill_typed_metadata(self.db.transaction, batch_size)
@@ -1,6 +1,6 @@
 import logging
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, BinaryIO, Dict, Optional
 
 from docex.storage.storage_factory import StorageFactory
 
@@ -59,7 +59,8 @@ class StorageService:
                 raise ValueError(f"Invalid S3 bucket name: {bucket_name}")
         
         logger.debug("Initialized storage service with type: %s", storage_type)
-        self.storage = StorageFactory.create_storage(config)
+        # Backends are shared per configuration, so building a service is cheap
+        self.storage = StorageFactory.get_storage(config)
     
     def store_document(self, source_path: str, full_document_path: str) -> str:
         """
@@ -96,6 +97,32 @@ class StorageService:
         """
         return self.storage.retrieve(full_document_path)
     
+    def open_document(self, full_document_path: str) -> BinaryIO:
+        """
+        Open a stored document for streaming reads.
+        
+        Args:
+            full_document_path: Full storage path (built from basket_id and document_id)
+            
+        Returns:
+            Readable binary file-like object (caller closes it)
+        """
+        return self.storage.open_stream(full_document_path)
+    
+    def read_document_range(self, full_document_path: str, start: int, end: Optional[int] = None) -> bytes:
+        """
+        Read a byte range of a stored document.
+        
+        Args:
+            full_document_path: Full storage path (built from basket_id and document_id)
+            start: Offset of the first byte to read
+            end: Offset one past the last byte to read (None reads to the end)
+            
+        Returns:
+            The requested bytes
+        """
+        return self.storage.read_range(full_document_path, start, end)
+    
     def delete_document(self, full_document_path: str) -> None:
         """
         Delete a document using full path.
@@ -0,0 +1,416 @@
+"""
+Text extraction service for DocEX
+
+pdfminer and python-docx are pure-Python, CPU-bound parsers: run in the
+calling process they hold the GIL and extract one document at a time. This
+service runs them in a pool of warm worker processes (parser modules are
+imported once per worker) so extraction scales with the number of cores.
+
+Document bytes are never pickled to a worker. Filesystem documents are
+handed over by path and opened by the worker; content from other storage
+backends (S3) is read once by the caller into a shared-memory block whose
+name is sent instead. Each document has a timeout, enforced inside the
+worker so a pathological file cannot occupy it forever.
+"""
+
+import asyncio
+import io
+import logging
+import multiprocessing
+import os
+import signal
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Any, AsyncIterator, BinaryIO, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from docex.document import Document
+
+logger = logging.getLogger(__name__)
+
+# Workers interrupt a parser with SIGALRM where the platform has it
+_WORKER_ALARM = hasattr(signal, 'setitimer')
+
+# extractor(stream) -> (text, stats); must be picklable (a module-level
+# function or a functools.partial of one)
+Extractor = Callable[[BinaryIO], Tuple[str, Dict[str, Any]]]
+
+
+def extract_pdf_text(stream: BinaryIO) -> Tuple[str, Dict[str, Any]]:
+    """Extract the text layer of a PDF with pdfminer (no OCR)"""
+    try:
+        from pdfminer.high_level import extract_text
+    except ImportError:
+        raise ImportError(
+            "PDF processing requires 'pdfminer.six' package. "
+            "Install it with: pip install docex[pdf]"
+        )
+    text = extract_text(stream)
+    return text, {'input_format': 'pdf', 'page_count': text.count('\f')}
+
+
+def extract_docx_text(
+    stream: BinaryIO,
+    preserve_formatting: bool = True,
+    extract_tables: bool = True,
+) -> Tuple[str, Dict[str, Any]]:
+    """
+    Extract paragraphs (and optionally tables) of a .docx file with python-docx
+
+    Args:
+        stream: Readable .docx content
+        preserve_formatting: Keep empty paragraphs and table separators
+        extract_tables: Append table rows as tab-separated lines
+
+    Returns:
+        Tuple of (text, stats with paragraph_count, table_count, line_count)
+    """
+    try:
+        from docx import Document as DocxDocument
+    except ImportError:
+        raise ImportError("python-docx library is not installed. Install it with: pip install python-docx")
+
+    docx_doc = DocxDocument(stream)
+    text_parts = []
+    paragraph_count = 0
+    table_count = 0
+
+    for paragraph in docx_doc.paragraphs:
+        paragraph_text = paragraph.text
+        if paragraph_text.strip():  # Only add non-empty paragraphs
+            text_parts.append(paragraph_text)
+            paragraph_count += 1
+        elif preserve_formatting:
+            # Preserve empty lines for formatting
+            text_parts.append('')
+
+    if extract_tables:
+        for table in docx_doc.tables:
+            table_count += 1
+            if preserve_formatting:
+                text_parts.append('')  # Add spacing before table
+                text_parts.append(f'--- Table {table_count} ---')
+
+            for row in table.rows:
+                row_texts = [cell.text.strip() for cell in row.cells]
+                text_parts.append('\t'.join(row_texts))  # Tab-separated values
+
+            if preserve_formatting:
+                text_parts.append(f'--- End Table {table_count} ---')
+                text_parts.append('')  # Add spacing after table
+
+    if preserve_formatting:
+        full_text = '\n'.join(text_parts)
+    else:
+        # Join with single newline, no extra spacing
+        full_text = '\n'.join(part for part in text_parts if part)
+    return full_text, {
+        'input_format': 'docx',
+        'paragraph_count': paragraph_count,
+        'table_count': table_count,
+        'line_count': len(text_parts),
+    }
+
+
+def extract_plain_text(stream: BinaryIO, encoding: str = 'utf-8') -> Tuple[str, Dict[str, Any]]:
+    """Decode a plain text file"""
+    return stream.read().decode(encoding, errors='replace'), {'input_format': 'text'}
+
+
+DEFAULT_EXTRACTORS: Dict[str, Extractor] = {
+    '.pdf': extract_pdf_text,
+    '.docx': extract_docx_text,
+    '.txt': extract_plain_text,
+}
+
+
+@dataclass
+class ExtractedText:
+    """Outcome of extracting one document's text"""
+
+    document_id: str
+    text: Optional[str] = None
+    stats: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+    seconds: float = 0.0
+
+    @property
+    def success(self) -> bool:
+        return self.error is None
+
+
+class TextExtractionService:
+    """
+    Extracts text from PDF, DOCX and text documents in worker processes.
+
+    Use as a context manager (or call close()) to stop the workers.
+
+    Example:
+        >>> with TextExtractionService(max_workers=32, timeout=30) as service:
+        ...     async for extracted in service.iter_extracted(basket.iter_documents()):
+        ...         print(extracted.document_id, extracted.success)
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        timeout: Optional[float] = 60.0,
+        extractors: Optional[Dict[str, Extractor]] = None,
+        mp_context: Optional[Any] = None,
+        max_tasks_per_child: Optional[int] = None,
+        text_store: Optional[Any] = None,
+    ):
+        """
+        Initialize text extraction service
+
+        Args:
+            max_workers: Worker processes (default: CPU count)
+            timeout: Seconds allowed per document (None: no limit)
+            extractors: Extractors by lower-case file suffix, replacing or
+                adding to DEFAULT_EXTRACTORS
+            mp_context: multiprocessing context for the pool
+            max_tasks_per_child: Replace a worker after this many documents
+                (bounds memory growth from leaky parsers)
+            text_store: Optional ExtractedTextStore; documents with a stored
+                artifact are not extracted again, and new extractions are
+                persisted so processors read them via get_extracted_text()
+        """
+        if timeout is not None and timeout <= 0:
+            raise ValueError("timeout must be positive")
+        self.max_workers = max_workers or os.cpu_count() or 1
+        if self.max_workers <= 0:
+            raise ValueError("max_workers must be positive")
+        self.timeout = timeout
+        self.extractors = {**DEFAULT_EXTRACTORS, **(extractors or {})}
+        self.mp_context = mp_context
+        self.max_tasks_per_child = max_tasks_per_child
+        self.text_store = text_store
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def __enter__(self) -> 'TextExtractionService':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Stop the worker processes"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+    def supports(self, document: Document) -> bool:
+        """Whether an extractor is registered for the document's file type"""
+        return Path(document.name).suffix.lower() in self.extractors
+
+    @property
+    def pool(self) -> ProcessPoolExecutor:
+        """The worker pool, started on first use and kept warm until close()"""
+        if self._pool is None:
+            kwargs: Dict[str, Any] = {}
+            if self.max_tasks_per_child:
+                kwargs['max_tasks_per_child'] = self.max_tasks_per_child
+            context = self.mp_context
+            if context is None and self.max_tasks_per_child:
+                # Worker replacement is not supported with fork
+                context = multiprocessing.get_context('spawn')
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=context or multiprocessing.get_context(),
+                initializer=_warm_worker,
+                **kwargs,
+            )
+        return self._pool
+
+    async def extract(self, document: Document) -> ExtractedText:
+        """
+        Extract one document's text in a worker process
+
+        Failures (unsupported type, parser errors, timeouts) are returned as
+        an ExtractedText with ``error`` set rather than raised.
+        """
+        started = time.perf_counter()
+        extractor = self.extractors.get(Path(document.name).suffix.lower())
+        if extractor is None:
+            return ExtractedText(document.id, error=f"No text extractor for {document.name}")
+
+        stored = self.text_store is not None and self.text_store.supports(document)
+        if stored:
+            artifact = await asyncio.to_thread(self.text_store.load, document)
+            if artifact is not None:
+                return ExtractedText(
+                    document.id, text=artifact.text, stats=artifact.stats, seconds=time.perf_counter() - started
+                )
+
+        block = None
+        try:
+            path = _filesystem_path(document)
+            if path is not None:
+                source: Tuple[str, Any, int] = ('path', path, 0)
+            else:
+                block, size = await asyncio.to_thread(_to_shared_memory, document)
+                source = ('shm', block.name, size)
+            future = asyncio.get_running_loop().run_in_executor(
+                self.pool, _extract_in_worker, extractor, source, self.timeout
+            )
+            if self.timeout is None or _WORKER_ALARM:
+                # The worker's timer starts when it picks the document up; a
+                # deadline here would also count time spent queued for a worker
+                text, stats = await future
+            else:
+                # No SIGALRM: the worker cannot interrupt itself, so fall back
+                # to a deadline from submission (may fire early when queued)
+                text, stats = await asyncio.wait_for(future, self.timeout + 5)
+        except (TimeoutError, asyncio.TimeoutError):
+            return ExtractedText(
+                document.id,
+                error=f"Text extraction timed out after {self.timeout}s",
+                seconds=time.perf_counter() - started,
+            )
+        except Exception as e:
+            logger.warning(f"Text extraction failed for document {document.id}: {e}")
+            return ExtractedText(document.id, error=str(e), seconds=time.perf_counter() - started)
+        finally:
+            if block is not None:
+                block.close()
+                block.unlink()
+        if stored:
+            await asyncio.to_thread(self.text_store.put, document, text, stats)
+        return ExtractedText(document.id, text=text, stats=stats, seconds=time.perf_counter() - started)
+
+    async def extract_many(
+        self,
+        documents: Iterable[Document],
+        concurrency: Optional[int] = None,
+    ) -> List[ExtractedText]:
+        """
+        Extract many documents, keeping every worker busy
+
+        Results are collected in memory; use iter_extracted() to handle
+        them as they arrive.
+
+        Args:
+            documents: Documents to extract
+            concurrency: Documents in flight at once (see iter_extracted)
+
+        Returns:
+            One ExtractedText per document, in input order
+        """
+        results: Dict[int, ExtractedText] = {}
+        async for index, extracted in self._extract_bounded(documents, concurrency):
+            results[index] = extracted
+        return [results[index] for index in range(len(results))]
+
+    async def iter_extracted(
+        self,
+        documents: Iterable[Document],
+        concurrency: Optional[int] = None,
+    ) -> AsyncIterator[ExtractedText]:
+        """
+        Extract documents, yielding each result as soon as it is ready
+
+        Args:
+            documents: Documents to extract; an iterator (such as
+                basket.iter_documents()) is consumed as extractions finish
+            concurrency: Documents in flight at once (default: twice the
+                worker count, so a worker never waits for its next document)
+
+        Yields:
+            One ExtractedText per document, in completion order
+        """
+        async for _, extracted in self._extract_bounded(documents, concurrency):
+            yield extracted
+
+    async def _extract_bounded(
+        self,
+        documents: Iterable[Document],
+        concurrency: Optional[int],
+    ) -> AsyncIterator[Tuple[int, ExtractedText]]:
+        """Run extract() on at most ``concurrency`` documents at a time, yielding (input index, result)"""
+        limit = concurrency or 2 * self.max_workers
+        if limit <= 0:
+            raise ValueError("concurrency must be positive")
+
+        async def indexed(index: int, document: Document) -> Tuple[int, ExtractedText]:
+            return index, await self.extract(document)
+
+        queue = enumerate(documents)
+        pending: Set[asyncio.Task] = set()
+        try:
+            for index, document in queue:
+                pending.add(asyncio.ensure_future(indexed(index, document)))
+                if len(pending) >= limit:
+                    break
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                # Refill before yielding so the workers stay busy while the caller handles results
+                for _ in done:
+                    document_entry = next(queue, None)
+                    if document_entry is not None:
+                        pending.add(asyncio.ensure_future(indexed(*document_entry)))
+                for task in done:
+                    yield task.result()
+        finally:
+            # The caller stopped early (break, exception or cancellation)
+            for task in pending:
+                task.cancel()
+
+
+def _filesystem_path(document: Document) -> Optional[str]:
+    """Absolute path of a document kept on filesystem storage, else None"""
+    from docex.storage.filesystem_storage import FileSystemStorage
+
+    storage = document.storage_service.storage
+    if isinstance(storage, FileSystemStorage):
+        return str(storage.get_path(document.path))
+    return None
+
+
+def _to_shared_memory(document: Document) -> Tuple[shared_memory.SharedMemory, int]:
+    """Copy a document's content into a new shared-memory block (caller unlinks it)"""
+    content = Document.get_content(document, mode='bytes')
+    block = shared_memory.SharedMemory(create=True, size=max(len(content), 1))
+    block.buf[:len(content)] = content
+    return block, len(content)
+
+
+def _warm_worker() -> None:
+    """Pool initializer: import the parsers once per worker instead of per document"""
+    for module in ('pdfminer.high_level', 'docx'):
+        try:
+            __import__(module)
+        except ImportError:
+            pass
+
+
+def _on_timeout(signum: int, frame: Any) -> None:
+    raise TimeoutError("Text extraction timed out")
+
+
+def _extract_in_worker(
+    extractor: Extractor,
+    source: Tuple[str, Any, int],
+    timeout: Optional[float],
+) -> Tuple[str, Dict[str, Any]]:
+    """Run one extraction in a worker process, interrupting it after ``timeout`` seconds"""
+    kind, location, size = source
+    use_alarm = timeout is not None and _WORKER_ALARM
+    if use_alarm:
+        previous = signal.signal(signal.SIGALRM, _on_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        if kind == 'path':
+            with open(location, 'rb') as stream:
+                return extractor(stream)
+        block = shared_memory.SharedMemory(name=location)
+        try:
+            # Parsers need a seekable file; the copy stays in this process
+            return extractor(io.BytesIO(bytes(block.buf[:size])))
+        finally:
+            block.close()
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous)
@@ -1,4 +1,6 @@
+import json
 from abc import ABC, abstractmethod
+from io import BytesIO
 from typing import Dict, Any, Optional, Union, BinaryIO, List
 from pathlib import Path
 
@@ -154,4 +156,50 @@ class AbstractStorage(ABC):
     @abstractmethod
     def set_metadata(self, path: str, metadata: Dict[str, Any]) -> bool:
         """Set metadata for content at the specified path"""
-        pass 
\ No newline at end of file
+        pass
+
+    def open_stream(self, path: str) -> BinaryIO:
+        """
+        Open content at the specified path for streaming reads
+
+        Backends should override this to avoid buffering; the default
+        implementation wraps the result of retrieve() in memory.
+
+        Args:
+            path: Path to open
+
+        Returns:
+            Readable binary file-like object (caller closes it)
+
+        Raises:
+            FileNotFoundError: If no content exists at the path
+        """
+        content = self.retrieve(path)
+        if content is None:
+            raise FileNotFoundError(f"Content not found at path: {path}")
+        if hasattr(content, 'read'):
+            return content
+        if isinstance(content, dict):
+            content = json.dumps(content).encode('utf-8')
+        elif isinstance(content, str):
+            content = content.encode('utf-8')
+        return BytesIO(content)
+
+    def read_range(self, path: str, start: int, end: Optional[int] = None) -> bytes:
+        """
+        Read a byte range of the content at the specified path
+
+        Args:
+            path: Path to read from
+            start: Offset of the first byte to read
+            end: Offset one past the last byte to read (None reads to the end)
+
+        Returns:
+            The requested bytes (shorter than requested if the content ends first)
+        """
+        stream = self.open_stream(path)
+        try:
+            stream.seek(start)
+            return stream.read(-1 if end is None else end - start)
+        finally:
+            stream.close() 
\ No newline at end of file
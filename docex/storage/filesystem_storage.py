@@ -382,6 +382,40 @@ class FileSystemStorage(AbstractStorage):
         except FileNotFoundError:
             return None
     
+    def open_stream(self, path: str) -> BinaryIO:
+        """
+        Open content for streaming reads
+
+        Args:
+            path: Path to open
+
+        Returns:
+            Binary file object positioned at the start of the content
+
+        Raises:
+            FileNotFoundError: If no content exists at the path
+        """
+        full_path = self.get_path(path)
+        if not full_path.is_file():
+            raise FileNotFoundError(f"Content not found at path: {path}")
+        return full_path.open('rb')
+
+    def read_range(self, path: str, start: int, end: Optional[int] = None) -> bytes:
+        """
+        Read a byte range by seeking in the file
+
+        Args:
+            path: Path to read from
+            start: Offset of the first byte to read
+            end: Offset one past the last byte to read (None reads to the end)
+
+        Returns:
+            The requested bytes
+        """
+        with self.open_stream(path) as f:
+            f.seek(start)
+            return f.read(-1 if end is None else end - start)
+
     def set_metadata(self, path: str, metadata: Dict[str, Any]) -> bool:
         """
         Set metadata for content at the specified path
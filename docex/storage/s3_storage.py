@@ -7,6 +7,8 @@ from datetime import datetime, timedelta
 from pathlib import Path
 import boto3
 from botocore.exceptions import ClientError, BotoCoreError
+from boto3.exceptions import S3UploadFailedError
+from boto3.s3.transfer import TransferConfig
 from botocore.config import Config
 from io import BytesIO
 
@@ -38,6 +40,12 @@ class S3Storage(AbstractStorage):
                 - retry_delay: Delay between retries in seconds (default: 1.0)
                 - connect_timeout: Connection timeout in seconds (default: 60)
                 - read_timeout: Read timeout in seconds (default: 60)
+                - max_pool_connections: HTTP connections kept in the client's pool
+                  (default: 50); the client is shared by all users of this storage
+                - multipart_threshold: Size in bytes above which uploads use
+                  multipart upload (default: 8 MiB)
+                - multipart_chunksize: Part size in bytes for multipart uploads (default: 8 MiB)
+                - max_concurrency: Parallel part uploads per transfer (default: 4)
                 
         Note:
             S3Storage is a low-level storage abstraction that accepts FULL paths.
@@ -93,7 +101,17 @@ class S3Storage(AbstractStorage):
                 'mode': 'adaptive'
             },
             connect_timeout=config.get('connect_timeout', 60),
-            read_timeout=config.get('read_timeout', 60)
+            read_timeout=config.get('read_timeout', 60),
+            max_pool_connections=config.get('max_pool_connections', 50)
+        )
+
+        # Managed transfer configuration: files are streamed from disk in parts
+        # so uploads never hold a whole document in memory
+        self.transfer_config = TransferConfig(
+            multipart_threshold=config.get('multipart_threshold', 8 * 1024 * 1024),
+            multipart_chunksize=config.get('multipart_chunksize', 8 * 1024 * 1024),
+            max_concurrency=config.get('max_concurrency', 4),
+            use_threads=True
         )
         
         # Initialize S3 client with proper credential handling
@@ -343,7 +361,21 @@ class S3Storage(AbstractStorage):
         elif isinstance(content, bytes):
             data = content
         elif hasattr(content, 'read'):
-            data = content.read()
+            # Stream file-like objects through the managed (multipart) uploader
+            try:
+                start = self._stream_position(content)
+                if start is None:
+                    # A failed attempt consumes part of the stream and it cannot
+                    # be rewound, so a retry would upload a truncated object
+                    self.s3.upload_fileobj(content, self.bucket, key, Config=self.transfer_config)
+                else:
+                    self._retry_on_error(self._upload_stream, content, start, key)
+                logger.debug(f"Saved stream to S3: {key}")
+                return
+            except (ClientError, S3UploadFailedError) as e:
+                error_msg = f"Failed to save content to S3 key {key}: {e}"
+                logger.error(error_msg)
+                raise IOError(error_msg) from e
         else:
             raise ValueError(f"Unsupported content type: {type(content)}")
         
@@ -360,6 +392,21 @@ class S3Storage(AbstractStorage):
             logger.error(error_msg)
             raise IOError(error_msg) from e
     
+    @staticmethod
+    def _stream_position(stream: BinaryIO) -> Optional[int]:
+        """Current offset of a seekable stream, or None if it cannot be rewound"""
+        try:
+            if stream.seekable():
+                return stream.tell()
+        except (AttributeError, OSError, ValueError):
+            pass
+        return None
+
+    def _upload_stream(self, stream: BinaryIO, start: int, key: str) -> None:
+        """Upload ``stream`` from offset ``start``, rewinding first so retries send the whole object"""
+        stream.seek(start)
+        self.s3.upload_fileobj(stream, self.bucket, key, Config=self.transfer_config)
+
     def load(self, path: str) -> Union[Dict, bytes]:
         """
         Load content from S3
@@ -636,11 +683,17 @@ class S3Storage(AbstractStorage):
             if not source_file.exists():
                 raise FileNotFoundError(f"Source file not found: {source_path}")
             
-            with open(source_file, 'rb') as f:
-                content = f.read()
-            
-            # Save to S3
-            self.save(document_path, content)
+            # Stream the file to S3 in parts (multipart above the threshold)
+            # instead of reading it into memory first
+            key = self._normalize_key(document_path)
+            self._retry_on_error(
+                self.s3.upload_file,
+                str(source_file),
+                self.bucket,
+                key,
+                Config=self.transfer_config
+            )
+            logger.debug(f"Uploaded {source_file} to S3: {key}")
             
             # Return the relative path (without prefix) for consistency with filesystem storage
             return document_path
@@ -666,6 +719,71 @@ class S3Storage(AbstractStorage):
             logger.error(f"Failed to retrieve content from S3 path {path}: {e}")
             return None
     
+    def open_stream(self, path: str) -> BinaryIO:
+        """
+        Open an object for streaming reads
+        
+        Args:
+            path: Full S3 key path (must include all prefixes)
+            
+        Returns:
+            The GetObject StreamingBody; data is pulled from S3 as it is read
+            
+        Raises:
+            FileNotFoundError: If the object does not exist
+        """
+        key = self._normalize_key(path)
+        
+        try:
+            response = self._retry_on_error(
+                self.s3.get_object,
+                Bucket=self.bucket,
+                Key=key
+            )
+            return response['Body']
+        except ClientError as e:
+            error_code = e.response.get('Error', {}).get('Code', '')
+            if error_code == 'NoSuchKey':
+                raise FileNotFoundError(f"File not found in S3: {key}")
+            error_msg = f"Failed to open S3 key {key}: {e}"
+            logger.error(error_msg)
+            raise IOError(error_msg) from e
+    
+    def read_range(self, path: str, start: int, end: Optional[int] = None) -> bytes:
+        """
+        Read a byte range of an object with an HTTP Range GET
+        
+        Args:
+            path: Full S3 key path (must include all prefixes)
+            start: Offset of the first byte to read
+            end: Offset one past the last byte to read (None reads to the end)
+            
+        Returns:
+            The requested bytes (empty if the range starts past the end)
+        """
+        if end is not None and end <= start:
+            return b''
+        key = self._normalize_key(path)
+        byte_range = f"bytes={start}-" if end is None else f"bytes={start}-{end - 1}"
+        
+        try:
+            response = self._retry_on_error(
+                self.s3.get_object,
+                Bucket=self.bucket,
+                Key=key,
+                Range=byte_range
+            )
+            return response['Body'].read()
+        except ClientError as e:
+            error_code = e.response.get('Error', {}).get('Code', '')
+            if error_code == 'NoSuchKey':
+                raise FileNotFoundError(f"File not found in S3: {key}")
+            if error_code == 'InvalidRange':
+                return b''
+            error_msg = f"Failed to read range {byte_range} from S3 key {key}: {e}"
+            logger.error(error_msg)
+            raise IOError(error_msg) from e
+    
     def set_metadata(self, path: str, metadata: Dict[str, Any]) -> bool:
         """
         Set metadata for an object in S3
@@ -1,5 +1,8 @@
 from typing import Dict, Optional, Any
 import importlib
+import json
+import threading
+from collections import OrderedDict
 from pathlib import Path
 
 from .abstract_storage import AbstractStorage
@@ -18,12 +21,21 @@ class StorageFactory:
     Factory for creating storage backends
     
     Creates and configures the appropriate storage backend based on configuration.
+    Backends returned by get_storage() are shared process-wide per configuration,
+    so documents in the same basket reuse one client and connection pool. The
+    least recently used backends are dropped once more than ``max_instances``
+    configurations are in use (e.g. one per tenant).
     """
     
     _storage_classes = {
         'filesystem': FileSystemStorage,
     }
     
+    # Shared backend instances keyed by normalised configuration, in LRU order
+    _instances: 'OrderedDict[str, AbstractStorage]' = OrderedDict()
+    _instances_lock = threading.Lock()
+    max_instances = 64
+    
     # Register S3 storage if available (at class level)
     if HAS_S3 and S3Storage:
         _storage_classes['s3'] = S3Storage
@@ -72,6 +84,71 @@ class StorageFactory:
         storage_class = cls._storage_classes[storage_type]
         return storage_class(config)
     
+    @classmethod
+    def get_storage(cls, config: Dict[str, Any]) -> AbstractStorage:
+        """
+        Get the shared storage backend for a configuration
+        
+        Backends are created once per normalised configuration (type, location
+        and credentials) and reused by every caller in the process. Creation
+        is guarded by a lock so concurrent callers never build duplicates.
+        Beyond ``max_instances`` configurations the least recently used
+        backend is dropped; callers still holding it keep working.
+        
+        Args:
+            config: Storage configuration dictionary (see create_storage)
+            
+        Returns:
+            Shared storage backend instance
+        """
+        key = cls._cache_key(config)
+        with cls._instances_lock:
+            storage = cls._instances.get(key)
+            if storage is None:
+                storage = cls.create_storage(config)
+                cls._instances[key] = storage
+            cls._instances.move_to_end(key)
+            while len(cls._instances) > cls.max_instances:
+                cls._instances.popitem(last=False)
+        return storage
+    
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Drop all shared storage backends (e.g. after credentials rotate)"""
+        with cls._instances_lock:
+            cls._instances.clear()
+    
+    # Settings that say where a backend stores documents and as whom
+    _IDENTITY_FIELDS = {
+        'filesystem': ('path',),
+        's3': ('bucket', 'bucket_application', 'prefix', 'region', 'access_key', 'secret_key', 'session_token'),
+    }
+    
+    @classmethod
+    def _cache_key(cls, config: Dict[str, Any]) -> str:
+        """
+        Build a stable cache key from the storage type, location and credentials
+        
+        Filesystem paths are made absolute and S3 prefixes lose surrounding
+        slashes, so different spellings of one location share a backend.
+        Remaining settings (timeouts, pool sizes) are part of the key too,
+        since they configure the backend's client.
+        """
+        settings = dict(config)
+        storage_type = settings.pop('type', 'filesystem')
+        identity = {
+            field: settings.pop(field)
+            for field in cls._IDENTITY_FIELDS.get(storage_type, ())
+            if settings.get(field) is not None
+        }
+        if storage_type == 'filesystem':
+            identity['path'] = str(Path(identity.get('path', 'storage')).resolve())
+        elif storage_type == 's3':
+            prefix = str(identity.pop('prefix', '')).strip('/')
+            if prefix:
+                identity['prefix'] = prefix
+        return json.dumps([storage_type, identity, settings], sort_keys=True, default=str)
+    
     @classmethod
     def get_available_storages(cls) -> Dict[str, type]:
         """
@@ -10,6 +10,7 @@ except ImportError:
 
 from .models import Route, RouteOperation
 from .config import RouteConfig, OtherParty, RouteMethod
+from docex.db.audit_writer import AuditWriter
 from docex.db.connection import Database
 from docex.db.repository import BaseRepository
 
@@ -137,6 +138,8 @@ class RouteRepository(BaseRepository[Route]):
         limit: int = 100
     ) -> List[RouteOperation]:
         """Get operations for a route"""
+        # Include operations still buffered by this process
+        AuditWriter.for_database(self.db).flush()
         with self.db.session() as session:
             stmt = select(RouteOperation).where(RouteOperation.route_id == route_id)
             
@@ -7,6 +7,7 @@ from uuid import uuid4
 from .base import BaseTransporter, TransportResult
 from .config import RouteConfig, OtherParty, TransportType, RouteMethod
 from docex.document import Document
+from docex.db.audit_writer import AuditWriter
 from docex.db.connection import Database
 from docex.transport.models import RouteOperation
 
@@ -149,36 +150,28 @@ class Route:
                 error=ValueError(f"Route '{self.name}' does not allow uploads")
             )
             
-        # Record operation start
-        # Use tenant-aware database if available, otherwise create new one
-        route_db = self.db or Database()
-        operation_id = f"op_{uuid4().hex}"
-        operation = RouteOperation(
-            id=operation_id,
-            route_id=self.route_id,
-            operation_type=RouteMethod.UPLOAD,
-            status="in_progress",
-            document_id=document.id,
-            details={
-                "document_name": document.name,
-                "document_source": document.model.source
-            }
-        )
-        with route_db.session() as session:
-            session.add(operation)
-            session.commit()
+        # Record operation start (buffered; written together with its outcome
+        # when the upload finishes before the next audit flush)
+        # Use tenant-aware database if available (route, then document), otherwise create new one
+        route_db = self.db or getattr(document, 'db', None) or Database()
+        audit = AuditWriter.for_database(route_db)
+        details = {
+            "document_name": document.name,
+            "document_source": document.model.source
+        }
+        operation_id = audit.add(RouteOperation, {
+            'id': f"op_{uuid4().hex}",
+            'route_id': self.route_id,
+            'operation_type': RouteMethod.UPLOAD.value,
+            'status': "in_progress",
+            'document_id': document.id,
+            'details': details
+        })['id']
             
         try:
-            # Get document content from storage
-            content = document.get_content()
-            
-            # If content is a dictionary with 'content' key, extract the actual content
-            if isinstance(content, dict) and 'content' in content:
-                content = content['content']
-            
-            # If content is a string or bytes, use document's source path from model
-            if isinstance(content, (str, bytes)):
-                content = Path(document.model.source)
+            # Transporters upload from the document's source path, so the
+            # stored content is never materialised in memory here
+            content = Path(document.model.source)
             
             # Determine destination based on route configuration and document
             destination = self._get_destination(document)
@@ -186,30 +179,24 @@ class Route:
             # Upload content
             result = await self.transporter.upload(content, destination)
             
-            # Update operation status and document status
-            with route_db.session() as session:
-                # Get operation from database
-                operation = session.query(RouteOperation).filter_by(id=operation_id).first()
-                
-                # Update operation status
-                operation.status = "success" if result.success else "failed"
-                operation.completed_at = datetime.now(timezone.utc)
-                if not result.success:
-                    operation.error = str(result.error)
-                operation.details.update({
+            # Update operation status
+            outcome = {
+                'status': "success" if result.success else "failed",
+                'completed_at': datetime.now(timezone.utc),
+                'details': {
+                    **details,
                     "success": result.success,
                     "message": result.message,
                     "destination": destination
-                })
-                
-                # Update document status if successful
-                if result.success:
-                    document.model.status = "SENT"
-                    
-                session.commit()
+                }
+            }
+            if not result.success:
+                outcome['error'] = str(result.error)
+            audit.update(RouteOperation, operation_id, outcome)
             
-            # Record document operation if successful
+            # Update document status and record document operation if successful
             if result.success:
+                document.model.status = "SENT"
                 document.create_operation(
                     operation_type="UPLOAD",
                     status="success",
@@ -223,15 +210,11 @@ class Route:
             return result
         except Exception as e:
             # Update operation status on error
-            with route_db.session() as session:
-                # Get operation from database
-                operation = session.query(RouteOperation).filter_by(id=operation_id).first()
-                
-                # Update operation status
-                operation.status = "failed"
-                operation.completed_at = datetime.now(timezone.utc)
-                operation.error = str(e)
-                session.commit()
+            audit.update(RouteOperation, operation_id, {
+                'status': "failed",
+                'completed_at': datetime.now(timezone.utc),
+                'error': str(e)
+            })
                 
             # Record document operation for failure
             document.create_operation(
@@ -292,53 +275,45 @@ class Route:
                 error=ValueError(f"Route '{self.name}' does not allow downloads")
             )
             
-        # Record operation start
+        # Record operation start (buffered, see upload_document)
         # Use tenant-aware database if available, otherwise create new one
         route_db = self.db or Database()
-        operation_id = f"op_{uuid4().hex}"
-        operation = RouteOperation(
-            id=operation_id,
-            route_id=self.route_id,
-            operation_type=RouteMethod.DOWNLOAD,
-            status="in_progress",
-            details={"file_path": file_path, "destination": str(destination_path)}
-        )
-        with route_db.session() as session:
-            session.add(operation)
-            session.commit()
+        audit = AuditWriter.for_database(route_db)
+        details = {"file_path": file_path, "destination": str(destination_path)}
+        operation_id = audit.add(RouteOperation, {
+            'id': f"op_{uuid4().hex}",
+            'route_id': self.route_id,
+            'operation_type': RouteMethod.DOWNLOAD.value,
+            'status': "in_progress",
+            'details': details
+        })['id']
             
         try:
             # Perform download
             result = await self.transporter.download(file_path, destination_path)
             
             # Update operation status
-            with route_db.session() as session:
-                # Get operation from database
-                operation = session.query(RouteOperation).filter_by(id=operation_id).first()
-                
-                # Update operation status
-                operation.status = "success" if result.success else "failed"
-                operation.completed_at = datetime.now(timezone.utc)
-                if not result.success:
-                    operation.error = str(result.error)
-                operation.details.update({
+            outcome = {
+                'status': "success" if result.success else "failed",
+                'completed_at': datetime.now(timezone.utc),
+                'details': {
+                    **details,
                     "success": result.success,
                     "message": result.message
-                })
-                session.commit()
+                }
+            }
+            if not result.success:
+                outcome['error'] = str(result.error)
+            audit.update(RouteOperation, operation_id, outcome)
                 
             return result
         except Exception as e:
             # Update operation status on error
-            with route_db.session() as session:
-                # Get operation from database
-                operation = session.query(RouteOperation).filter_by(id=operation_id).first()
-                
-                # Update operation status
-                operation.status = "failed"
-                operation.completed_at = datetime.now(timezone.utc)
-                operation.error = str(e)
-                session.commit()
+            audit.update(RouteOperation, operation_id, {
+                'status': "failed",
+                'completed_at': datetime.now(timezone.utc),
+                'error': str(e)
+            })
             raise
         
     async def list_files(self, path: str = "") -> TransportResult:
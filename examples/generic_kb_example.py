@@ -271,12 +271,13 @@ async def main():
     # Share memory vectors with semantic search
     memory_vectors = vector_processor.vector_db.get('vectors', {})
     semantic_search.vector_db['vectors'] = memory_vectors
+    semantic_search.vector_db['index'] = vector_processor.vector_db.get('index')
     print(f"Shared {len(memory_vectors)} vectors with semantic search service")
     if memory_vectors:
         print(f"   Document IDs: {list(memory_vectors.keys())[:5]}")
         # Check basket_id in vectors
         for doc_id, vec_data in list(memory_vectors.items())[:2]:
-            print(f"   Vector {doc_id}: basket_id={vec_data.get('basket_id')}, has_embedding={bool(vec_data.get('embedding'))}")
+            print(f"   Vector {doc_id}: basket_id={vec_data.get('basket_id')}, has_embedding={doc_id in (vector_processor.vector_db.get('index') or vec_data)}")
     print(f"   Basket ID: {basket.id}")
     print()
     
@@ -20,6 +20,9 @@ logger = logging.getLogger(__name__)
 class BaseLLMProcessor(BaseProcessor):
     """Base class for LLM-powered DocEX processors"""
     
+    # process() records its own success/failure operations
+    records_operations = True
+    
     def __init__(self, config: Dict[str, Any], db: Optional[Database] = None):
         """
         Initialize base LLM processor
@@ -73,8 +76,8 @@ class BaseLLMProcessor(BaseProcessor):
                 input_metadata={'document_id': document.id, 'document_type': document.document_type}
             )
             
-            # Get document content (DocEX method)
-            text_content = self.get_document_text(document)
+            # Get document content (DocEX method; PDF/DOCX text is extracted once and reused)
+            text_content = self.get_extracted_text(document)
             
             if not text_content.strip():
                 return ProcessingResult(
@@ -91,6 +94,7 @@ class BaseLLMProcessor(BaseProcessor):
                 from docex.services.metadata_service import MetadataService
                 metadata_service = MetadataService(self.db)
                 metadata_service.update_metadata(document.id, result.metadata)
+                document.invalidate_metadata()
             
             # DocEX tracks operation success
             # Convert metadata to plain dict for JSON serialization
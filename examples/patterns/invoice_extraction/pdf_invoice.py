@@ -40,6 +40,7 @@ class PDFInvoiceProcessor(BaseProcessor):
                 from docex.services.metadata_service import MetadataService
                 service = MetadataService(self.db)
                 service.update_metadata(document.id, {'cus_PO': po_number})
+                document.invalidate_metadata()
             # Use DocumentMetadata model for result metadata
             result_metadata = {
                 'input_format': DocumentMetadata(extra={'value': 'pdf'}),
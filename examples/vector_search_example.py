@@ -151,15 +151,16 @@ async def main():
         
         # Share memory database with search service
         # In production, this would be a shared database connection
-        # Get the vectors dict from the processor
+        # Get the vectors dict and its vector store from the processor
         memory_vectors = vector_processor.vector_db.get('vectors', {})
+        memory_index = vector_processor.vector_db.get('index')
         
         # Initialize semantic search service with shared memory database
         search_service = SemanticSearchService(
             doc_ex=docEX,
             llm_adapter=llm_adapter,
             vector_db_type='memory',
-            vector_db_config={'vectors': memory_vectors}
+            vector_db_config={'vectors': memory_vectors, 'index': memory_index}
         )
         
         logger.info("\n" + "=" * 60)
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark the IVF-Flat ANN index against the brute-force memory vector store.
+
+Generates clustered synthetic embeddings, then reports recall@10 (against the
+exact MemoryVectorStore results) and queries per second for several nprobe
+values.
+
+Usage:
+    python scripts/benchmark_ann_index.py
+    python scripts/benchmark_ann_index.py --sizes 100000 1000000 --dimension 384 --nlist 1024
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from docex.processors.vector.ivf_index import IVFFlatIndex
+from docex.processors.vector.memory_vector_store import MemoryVectorStore
+
+
+def make_vectors(count: int, dimension: int, clusters: int, rng: np.random.Generator) -> np.ndarray:
+    """Clustered vectors, closer to real embeddings than uniform noise"""
+    centers = rng.normal(size=(clusters, dimension)).astype(np.float32)
+    vectors = np.empty((count, dimension), dtype=np.float32)
+    for start in range(0, count, 100000):
+        end = min(count, start + 100000)
+        labels = rng.integers(0, clusters, end - start)
+        vectors[start:end] = centers[labels] + rng.normal(size=(end - start, dimension)).astype(np.float32)
+    return vectors
+
+
+def timed_queries(search, queries: np.ndarray):
+    """Run every query, returning (results, queries per second)"""
+    started = time.perf_counter()
+    results = [search(query) for query in queries]
+    return results, len(queries) / (time.perf_counter() - started)
+
+
+def benchmark(size: int, args: argparse.Namespace) -> None:
+    rng = np.random.default_rng(args.seed)
+    vectors = make_vectors(size, args.dimension, args.clusters, rng)
+    queries = vectors[rng.choice(size, args.queries, replace=False)]
+    queries = queries + 0.1 * rng.normal(size=queries.shape).astype(np.float32)
+
+    store = MemoryVectorStore(initial_capacity=size)
+    store.add([f"doc{i}" for i in range(size)], vectors)
+    del vectors
+
+    nlist = args.nlist or int(4 * np.sqrt(size))
+    started = time.perf_counter()
+    index = IVFFlatIndex.build(store, nlist=nlist, seed=args.seed)
+    build_seconds = time.perf_counter() - started
+
+    exact, exact_qps = timed_queries(lambda query: store.search(query, args.top_k), queries)
+    exact_ids = [{doc_id for doc_id, _ in hits} for hits in exact]
+
+    print(f"\n📊 {size:,} vectors x {args.dimension} dims, nlist={nlist} (built in {build_seconds:.1f}s)")
+    print(f"{'method':<22}{'recall@' + str(args.top_k):>12}{'QPS':>12}{'speedup':>10}")
+    print(f"{'brute force':<22}{1.0:>12.3f}{exact_qps:>12.1f}{1.0:>10.1f}")
+    for nprobe in args.nprobe:
+        approximate, qps = timed_queries(lambda query: index.search(query, args.top_k, nprobe=nprobe), queries)
+        recall = np.mean([
+            len(expected & {doc_id for doc_id, _ in hits}) / args.top_k
+            for expected, hits in zip(exact_ids, approximate)
+        ])
+        print(f"{'ivf nprobe=' + str(nprobe):<22}{recall:>12.3f}{qps:>12.1f}{qps / exact_qps:>10.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100000, 1000000])
+    parser.add_argument('--dimension', type=int, default=128)
+    parser.add_argument('--clusters', type=int, default=1000, help="Clusters in the synthetic data")
+    parser.add_argument('--nlist', type=int, default=None, help="Inverted lists (default: 4 * sqrt(size))")
+    parser.add_argument('--nprobe', type=int, nargs='+', default=[1, 4, 8, 16, 32])
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--top-k', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        benchmark(size, args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+"""Shared fixtures: a DocEX database and basket on a throwaway SQLite file."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from docex.config.docex_config import DocEXConfig
+from docex.db.audit_writer import AuditWriter
+from docex.db.connection import Database, EngineRegistry
+from docex.docbasket import DocBasket
+from docex.storage.storage_factory import StorageFactory
+
+
+@pytest.fixture
+def sqlite_config(tmp_path: Path, monkeypatch) -> DocEXConfig:
+    """DocEXConfig pointing at ``tmp_path/docex.db``; process-wide state is reset afterwards"""
+    config = DocEXConfig()
+    # DocEXConfig is a singleton - patch its settings so other tests are unaffected
+    monkeypatch.setattr(config, 'config', {
+        'database': {'type': 'sqlite', 'path': str(tmp_path / 'docex.db')},
+        'security': {},
+        'multi_tenancy': {},
+    })
+    # Audit writers are cached per engine; give every test its own
+    monkeypatch.setattr(AuditWriter, '_writers', {})
+    yield config
+    AuditWriter.flush_all()
+    StorageFactory.clear_cache()
+    EngineRegistry.discard(f"sqlite:///{(tmp_path / 'docex.db').resolve()}")
+
+
+@pytest.fixture
+def sqlite_db(sqlite_config: DocEXConfig) -> Database:
+    return Database(config=sqlite_config)
+
+
+@pytest.fixture
+def basket(sqlite_db: Database, tmp_path: Path) -> DocBasket:
+    """Empty basket with filesystem storage under ``tmp_path/storage``"""
+    return DocBasket.create(
+        'test_basket',
+        storage_config={'type': 'filesystem', 'path': str(tmp_path / 'storage')},
+        db=sqlite_db,
+    )
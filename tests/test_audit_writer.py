@@ -0,0 +1,198 @@
+"""Tests for buffered, batched audit writes."""
+
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+import pytest
+from sqlalchemy import event, func, select
+from sqlalchemy.exc import OperationalError
+
+from docex.db.audit_writer import AuditWriter
+from docex.db.connection import Database
+from docex.db.models import Operation, ProcessingOperation, Processor
+from docex.docbasket import DocBasket
+from docex.processors.base import BaseProcessor, ProcessingResult
+from docex.transport.models import Route, RouteOperation
+
+
+class AuditedProcessor(BaseProcessor):
+    def can_process(self, document):
+        return True
+
+    async def process(self, document):
+        self._record_operation(document, status='in_progress')
+        self._record_operation(document, status='success', output_metadata={'ok': True})
+        return ProcessingResult(success=True)
+
+
+def _documents(basket: DocBasket, tmp_path: Path, count: int):
+    documents = []
+    for number in range(count):
+        source = tmp_path / f"doc{number}.txt"
+        source.write_text(f"document {number}")
+        documents.append(basket.add(str(source)))
+    return documents
+
+
+def _count(db: Database, model) -> int:
+    with db.session() as session:
+        return session.execute(select(func.count()).select_from(model)).scalar()
+
+
+def _count_inserts(db: Database, table: str) -> list:
+    statements = []
+
+    def before_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith(f"INSERT INTO {table}"):
+            statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', before_execute)
+    return statements
+
+
+@pytest.mark.asyncio
+async def test_processor_operations_are_buffered_and_batched(basket: DocBasket, tmp_path: Path) -> None:
+    documents = _documents(basket, tmp_path, 5)
+    AuditWriter.for_database(basket.db).flush()
+    processor = AuditedProcessor({}, db=basket.db)
+    inserts = _count_inserts(basket.db, 'processing_operations')
+
+    for document in documents:
+        await processor.process(document)
+
+    assert _count(basket.db, ProcessingOperation) == 0
+    processor.audit_writer.flush()
+    assert _count(basket.db, ProcessingOperation) == 10
+    assert len(inserts) == 1
+    assert _count(basket.db, Processor) == 1
+
+
+def test_update_of_a_buffered_row_is_folded_into_its_insert(basket: DocBasket, tmp_path: Path) -> None:
+    document = _documents(basket, tmp_path, 1)[0]
+    writer = AuditWriter(basket.db, flush_interval=None)
+
+    row = writer.add(Operation, {'document_id': document.id, 'operation_type': 'UPLOAD', 'status': 'in_progress'})
+    writer.update(Operation, row['id'], {'status': 'success', 'details': {'destination': 'out'}})
+    assert writer.pending == 1
+    writer.flush()
+    writer.update(Operation, row['id'], {'status': 'failed', 'error': 'late'})
+    writer.flush()
+
+    with basket.db.session() as session:
+        stored = session.get(Operation, row['id'])
+    assert (stored.status, stored.details, stored.error) == ('failed', {'destination': 'out'}, 'late')
+
+
+def test_size_threshold_and_sync_mode_write_immediately(basket: DocBasket, tmp_path: Path) -> None:
+    document = _documents(basket, tmp_path, 1)[0]
+    before = _count(basket.db, Operation)
+    writer = AuditWriter(basket.db, max_rows=3, flush_interval=None)
+
+    for _ in range(2):
+        writer.add(Operation, {'document_id': document.id, 'operation_type': 'TEST', 'status': 'success'})
+    assert _count(basket.db, Operation) == before
+    writer.add(Operation, {'document_id': document.id, 'operation_type': 'TEST', 'status': 'success'})
+    assert _count(basket.db, Operation) == before + 3
+
+    operation = document.create_operation('TEST', 'success', sync=True)
+    with basket.db.session() as session:
+        assert session.get(Operation, operation.id) is not None
+
+
+def test_rows_are_flushed_after_the_interval(basket: DocBasket, tmp_path: Path) -> None:
+    document = _documents(basket, tmp_path, 1)[0]
+    before = _count(basket.db, Operation)
+    writer = AuditWriter(basket.db, flush_interval=0.05)
+
+    writer.add(Operation, {'document_id': document.id, 'operation_type': 'TEST', 'status': 'success'})
+
+    deadline = time.monotonic() + 5
+    while _count(basket.db, Operation) == before and time.monotonic() < deadline:
+        time.sleep(0.02)
+    assert _count(basket.db, Operation) == before + 1
+
+
+def test_readers_see_buffered_operations_and_bad_rows_are_dropped(basket: DocBasket, tmp_path: Path) -> None:
+    document = _documents(basket, tmp_path, 1)[0]
+    writer = AuditWriter.for_database(basket.db)
+    orphan = writer.add(Operation, {'document_id': 'missing-document', 'operation_type': 'TEST', 'status': 'success'})
+
+    document.create_operation('UPLOAD', 'success', details={'route_name': 'out'})
+
+    operations = document.get_operations()
+    assert [op['type'] for op in operations] == ['ADD', 'UPLOAD']
+    assert writer.pending == 0
+    with basket.db.session() as session:
+        assert session.get(Operation, orphan['id']) is None
+
+
+class FlakyDatabase:
+    """Database whose next ``failures`` sessions fail as if it were unavailable"""
+
+    def __init__(self, db: Database, failures: int):
+        self.db = db
+        self.failures = failures
+
+    def session(self):
+        if self.failures:
+            self.failures -= 1
+            raise OperationalError('INSERT INTO operations', {}, Exception('database is locked'))
+        return self.db.session()
+
+
+def test_transient_failures_are_retried_a_bounded_number_of_times(basket: DocBasket, tmp_path: Path) -> None:
+    document = _documents(basket, tmp_path, 1)[0]
+    before = _count(basket.db, Operation)
+    flaky = FlakyDatabase(basket.db, failures=1)
+    writer = AuditWriter(flaky, flush_interval=None, max_retries=2)
+
+    row = writer.add(Operation, {'document_id': document.id, 'operation_type': 'TEST', 'status': 'in_progress'})
+    writer.flush()
+    assert writer.pending == 1
+    writer.update(Operation, row['id'], {'status': 'success'})
+    writer.flush()
+    assert writer.pending == 0
+    with basket.db.session() as session:
+        assert session.get(Operation, row['id']).status == 'success'
+
+    flaky.failures = 3
+    writer.add(Operation, {'document_id': document.id, 'operation_type': 'TEST', 'status': 'success'})
+    for _ in range(3):
+        writer.flush()
+    assert writer.pending == 0
+    assert _count(basket.db, Operation) == before + 1
+
+
+def test_rows_with_different_columns_keep_their_defaults(basket: DocBasket, tmp_path: Path) -> None:
+    document = _documents(basket, tmp_path, 1)[0]
+    writer = AuditWriter(basket.db, flush_interval=None)
+
+    plain = writer.add(Operation, {'document_id': document.id, 'operation_type': 'TEST', 'status': 'success'})
+    detailed = writer.add(
+        Operation, {'document_id': document.id, 'operation_type': 'TEST', 'status': 'success', 'details': {'a': 1}}
+    )
+    writer.flush()
+
+    with basket.db.session() as session:
+        without_details = set(session.execute(select(Operation.id).where(Operation.details.is_(None))).scalars())
+    assert plain['id'] in without_details
+    assert detailed['id'] not in without_details
+
+
+def test_route_operations_are_written_and_updated(basket: DocBasket, tmp_path: Path) -> None:
+    document = _documents(basket, tmp_path, 1)[0]
+    with basket.db.transaction() as session:
+        session.add(Route(id='route_1', name='out', purpose='distribution', protocol='local', config={}))
+    writer = AuditWriter(basket.db, flush_interval=None)
+
+    row = writer.add(RouteOperation, {
+        'route_id': 'route_1', 'operation_type': 'upload', 'status': 'in_progress', 'document_id': document.id
+    })
+    writer.flush()
+    writer.update(RouteOperation, row['id'], {'status': 'success'})
+    writer.flush()
+
+    with basket.db.session() as session:
+        assert session.get(RouteOperation, row['id']).status == 'success'
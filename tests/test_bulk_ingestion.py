@@ -0,0 +1,91 @@
+"""Tests for DocBasket.add_many bulk ingestion."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from sqlalchemy import event, func, select
+
+from docex.db.models import DocEvent, DocumentMetadata, Operation
+from docex.db.models import Document as DocumentModel
+from docex.docbasket import DocBasket
+
+
+def _write_files(directory: Path, count: int) -> list[Path]:
+    directory.mkdir(exist_ok=True)
+    paths = []
+    for index in range(count):
+        path = directory / f"invoice_{index:03d}.txt"
+        path.write_text(f"Invoice {index}")
+        paths.append(path)
+    return paths
+
+
+def test_add_many_inserts_documents_metadata_and_operations(basket: DocBasket, tmp_path: Path) -> None:
+    paths = _write_files(tmp_path / 'src', 7)
+
+    documents = basket.add_many(paths, metadata={'category': 'invoice'}, batch_size=3)
+
+    assert [doc.name for doc in documents] == [path.name for path in paths]
+    for doc in documents:
+        assert doc.get_content(mode='text').startswith('Invoice')
+        assert doc.get_metadata() == {'category': 'invoice', 'original_filename': doc.name}
+    with basket.db.session() as session:
+        assert session.execute(select(func.count(DocumentModel.id))).scalar() == 7
+        assert session.execute(select(func.count(DocumentMetadata.id))).scalar() == 14
+        assert session.execute(select(func.count(Operation.id))).scalar() == 7
+
+
+def test_add_many_matches_add_duplicate_detection(basket: DocBasket, tmp_path: Path) -> None:
+    paths = _write_files(tmp_path / 'src', 3)
+    first = basket.add(str(paths[0]))
+
+    documents = basket.add_many([paths[0], paths[1], paths[1], paths[2]])
+
+    assert documents[0].id == first.id
+    assert documents[1].id == documents[2].id
+    assert basket.count_documents() == 3
+    with basket.db.session() as session:
+        events = session.execute(select(DocEvent.event_type)).scalars().all()
+    assert events == ['DUPLICATE', 'DUPLICATE']
+
+
+def test_add_many_uses_one_duplicate_query_per_batch(basket: DocBasket, tmp_path: Path) -> None:
+    paths = _write_files(tmp_path / 'src', 10)
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)  # noqa: E731
+    event.listen(basket.db.engine, 'before_cursor_execute', listener)
+    try:
+        basket.add_many(paths, batch_size=5)
+    finally:
+        event.remove(basket.db.engine, 'before_cursor_execute', listener)
+
+    selects = [stmt for stmt in statements if stmt.lstrip().upper().startswith('SELECT')]
+    assert len(selects) == 2
+
+
+def test_add_many_rejects_misaligned_metadata(basket: DocBasket, tmp_path: Path) -> None:
+    paths = _write_files(tmp_path / 'src', 2)
+
+    with pytest.raises(ValueError, match="one entry per file path"):
+        basket.add_many(paths, metadata=[{'a': 1}])
+
+
+def test_add_many_removes_stored_files_when_the_batch_is_not_committed(basket: DocBasket, tmp_path: Path) -> None:
+    paths = _write_files(tmp_path / 'src', 3)
+
+    def fail_operation_insert(conn, cursor, statement, *args):
+        if statement.lstrip().upper().startswith('INSERT INTO OPERATIONS'):
+            raise RuntimeError("database went away")
+
+    event.listen(basket.db.engine, 'before_cursor_execute', fail_operation_insert)
+    try:
+        with pytest.raises(RuntimeError, match="database went away"):
+            basket.add_many(paths)
+    finally:
+        event.remove(basket.db.engine, 'before_cursor_execute', fail_operation_insert)
+
+    assert [path for path in (tmp_path / 'storage').rglob('*') if path.is_file()] == []
+    with basket.db.session() as session:
+        assert session.execute(select(func.count(DocumentModel.id))).scalar() == 0
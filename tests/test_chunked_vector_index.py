@@ -0,0 +1,93 @@
+"""Tests for chunk-level vector indexing and chunk-granularity search."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+from sqlalchemy import select
+
+from docex import DocEX
+from docex.db.models import DocumentChunk
+from docex.docbasket import DocBasket
+from docex.processors.chunking import ChunkingConfig, FixedSizeChunking
+from docex.processors.vector import ChunkedVectorIndexingProcessor, SemanticSearchService
+
+TOPICS = ('apple', 'banana', 'cherry')
+CONTRACT = (
+    "Section one covers apple orchards and apple harvests. "
+    "Section two covers banana shipping, banana ripening and banana storage. "
+    "Section three covers cherry pricing and cherry contracts."
+)
+
+
+def embed(texts):
+    """Batched toy embedding: one dimension per topic word"""
+    return [[float(text.count(topic)) for topic in TOPICS] + [0.01] for text in texts]
+
+
+def _processor(basket: DocBasket, **kwargs) -> ChunkedVectorIndexingProcessor:
+    chunker = FixedSizeChunking(ChunkingConfig(chunk_size=60, chunk_overlap=0, min_chunk_size=10))
+    return ChunkedVectorIndexingProcessor(
+        embedding_fn=embed, chunking_strategy=chunker, db=basket.db, batch_embedding=True,
+        include_metadata=False, **kwargs
+    )
+
+
+@pytest.mark.asyncio
+async def test_chunks_are_persisted_with_offsets(basket: DocBasket, tmp_path: Path) -> None:
+    source = tmp_path / 'contract.txt'
+    source.write_text(CONTRACT)
+    document = basket.add(str(source))
+    processor = _processor(basket)
+
+    result = await processor.process(document)
+
+    assert result.success is True
+    assert result.metadata['chunk_count'] > 1
+    with basket.db.session() as session:
+        chunks = session.execute(
+            select(DocumentChunk).where(DocumentChunk.document_id == document.id).order_by(DocumentChunk.chunk_index)
+        ).scalars().all()
+    assert len(chunks) == result.metadata['chunk_count']
+    assert all(chunk.basket_id == basket.id for chunk in chunks)
+    assert all(CONTRACT[chunk.start_idx:chunk.end_idx].strip() == chunk.content for chunk in chunks)
+    assert document.get_metadata(refresh=True)['chunk_indexed'] is True
+    assert processor.can_process(document) is False
+
+    # Re-indexing replaces the previous chunks instead of adding more
+    await _processor(basket, force_reindex=True).process(document)
+    with basket.db.session() as session:
+        count = len(session.execute(select(DocumentChunk.id)).all())
+    assert count == len(chunks)
+
+
+@pytest.mark.asyncio
+async def test_search_returns_best_chunks_with_offsets(basket: DocBasket, tmp_path: Path) -> None:
+    source = tmp_path / 'contract.txt'
+    source.write_text(CONTRACT)
+    document = basket.add(str(source))
+    processor = _processor(basket)
+    await processor.process(document)
+
+    doc_ex = Mock(spec=DocEX)
+    doc_ex.get_basket = Mock(return_value=basket)
+    service = SemanticSearchService(
+        doc_ex=doc_ex,
+        embedding_fn=embed,
+        batch_embedding=True,
+        vector_db_config={'chunks': processor.vector_db['chunks']},
+    )
+
+    results = await service.search('banana', top_k=2, basket_id=basket.id, granularity='chunk')
+
+    assert results[0].document.id == document.id
+    best = results[0].chunk
+    assert 'banana' in best['content']
+    assert CONTRACT[best['start_idx']:best['end_idx']].strip() == best['content']
+    assert results[0].to_dict()['chunk']['id'] == best['id']
+    assert results[0].similarity_score >= results[-1].similarity_score
+
+    with pytest.raises(ValueError, match="granularity"):
+        await service.search('banana', granularity='page')
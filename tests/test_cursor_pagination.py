@@ -0,0 +1,113 @@
+"""Tests for keyset (cursor) pagination of documents and baskets."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from sqlalchemy import event, update
+
+from docex.db.connection import Database
+from docex.db.models import Document as DocumentModel
+from docex.db.pagination import decode_cursor, encode_cursor
+from docex.docbasket import DocBasket
+
+
+@pytest.fixture
+def basket(basket: DocBasket, tmp_path: Path) -> DocBasket:
+    sources = tmp_path / 'src'
+    sources.mkdir()
+    paths = []
+    for index in range(23):
+        path = sources / f"doc_{index:02d}.txt"
+        path.write_text(f"document {index}")
+        paths.append(path)
+    basket.add_many(paths)
+    # Force timestamp ties so the id tiebreaker is exercised
+    with basket.db.transaction() as session:
+        session.execute(
+            update(DocumentModel)
+            .where(DocumentModel.name.in_([p.name for p in paths[:10]]))
+            .values(created_at=datetime(2024, 1, 1))
+        )
+    return basket
+
+
+def test_cursor_round_trip() -> None:
+    stamp = datetime(2024, 5, 1, 12, 30)
+    cursor = decode_cursor(encode_cursor('created_at', True, stamp, 'doc_1'))
+
+    assert cursor == ('created_at', True, stamp, 'doc_1')
+    with pytest.raises(ValueError):
+        decode_cursor('not-a-cursor')
+
+
+@pytest.mark.parametrize('order_by,order_desc', [('created_at', True), ('name', False)])
+def test_pages_cover_every_document_once(basket: DocBasket, order_by: str, order_desc: bool) -> None:
+    expected = [
+        doc.id for doc in sorted(
+            basket.list_documents(),
+            key=lambda d: (getattr(d.model, order_by), d.id),
+            reverse=order_desc,
+        )
+    ]
+
+    seen, cursor, pages = [], None, 0
+    while True:
+        docs, cursor = basket.list_documents_page(
+            page_size=5, after=cursor, order_by=order_by, order_desc=order_desc
+        )
+        seen.extend(doc.id for doc in docs)
+        pages += 1
+        if cursor is None:
+            break
+
+    assert seen == expected
+    assert pages == 5
+    assert [doc.id for doc in basket.iter_documents(page_size=4, order_by=order_by, order_desc=order_desc)] == expected
+
+
+def test_cursor_queries_seek_instead_of_offset(basket: DocBasket) -> None:
+    _, cursor = basket.list_documents_page(page_size=5)
+    executed = []
+    listener = lambda conn, cursor_, statement, parameters, *args: executed.append((statement, parameters))  # noqa: E731
+    event.listen(basket.db.engine, 'before_cursor_execute', listener)
+    try:
+        basket.list_documents_page(page_size=5, after=cursor)
+    finally:
+        event.remove(basket.db.engine, 'before_cursor_execute', listener)
+
+    assert len(executed) == 1
+    statement, parameters = executed[0]
+    assert 'document.created_at < ?' in statement
+    # SQLite always renders an OFFSET clause; keyset pages never skip rows
+    assert parameters[-1] == 0
+
+
+def test_cursor_rejects_other_ordering(basket: DocBasket) -> None:
+    _, cursor = basket.list_documents_page(page_size=5)
+
+    with pytest.raises(ValueError, match="different ordering"):
+        basket.list_documents_page(page_size=5, after=cursor, order_desc=False)
+    with pytest.raises(ValueError):
+        basket.list_documents_page(order_by='size')
+
+
+def test_iter_baskets_pages_through_all_baskets(sqlite_db: Database, tmp_path: Path) -> None:
+    from docex.docCore import DocEX
+
+    for index in range(7):
+        DocBasket.create(
+            f"cursor_basket_{index}",
+            storage_config={'type': 'filesystem', 'path': str(tmp_path / f"b{index}")},
+            db=sqlite_db,
+        )
+    docex = object.__new__(DocEX)  # bypass the singleton; only the db is needed
+    docex.db = sqlite_db
+
+    baskets, cursor = docex.list_baskets_page(page_size=3, order_by='name', order_desc=False)
+    assert [b.name for b in baskets] == ['cursor_basket_0', 'cursor_basket_1', 'cursor_basket_2']
+    assert cursor is not None
+    names = [b.name for b in docex.iter_baskets(page_size=3, order_by='name', order_desc=False)]
+    assert names == [f"cursor_basket_{index}" for index in range(7)]
@@ -0,0 +1,36 @@
+"""Tests for streaming and ranged content reads on Document."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from docex.docbasket import DocBasket
+
+
+@pytest.fixture
+def document(basket: DocBasket, tmp_path: Path):
+    source = tmp_path / 'scan.pdf'
+    source.write_bytes(bytes(range(256)) * 40)
+    return basket.add(str(source))
+
+
+def test_open_returns_readable_stream(document) -> None:
+    with document.open() as stream:
+        assert stream.read(4) == bytes([0, 1, 2, 3])
+        assert len(stream.read()) == 256 * 40 - 4
+
+
+def test_iter_content_yields_bounded_chunks(document) -> None:
+    chunks = list(document.iter_content(chunk_size=1000))
+
+    assert [len(chunk) for chunk in chunks] == [1000] * 10 + [240]
+    assert b''.join(chunks) == document.get_content()
+
+
+def test_read_range_returns_only_requested_bytes(document) -> None:
+    assert document.read_range(256, 260) == bytes([0, 1, 2, 3])
+    assert document.read_range(256 * 40 - 2) == bytes([254, 255])
+    with pytest.raises(ValueError):
+        document.read_range(10, 5)
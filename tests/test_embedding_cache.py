@@ -0,0 +1,110 @@
+"""Tests for the embedding cache keyed by (model_id, sha256(text))."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pytest
+
+from docex import DocEX
+from docex.docbasket import DocBasket
+from docex.processors.vector import EmbeddingCache, SemanticSearchService, VectorIndexingProcessor
+from docex.processors.vector.embeddings import resolve_embeddings
+
+
+class CountingEmbedder:
+    """Batched toy embedding that records every text it is asked to embed"""
+
+    def __init__(self):
+        self.texts = []
+
+    def __call__(self, texts):
+        self.texts.extend(texts)
+        return [[float(len(text)), 1.0 / 3.0] for text in texts]
+
+
+@pytest.mark.asyncio
+async def test_only_distinct_misses_are_embedded() -> None:
+    embed = CountingEmbedder()
+    cache = EmbeddingCache('toy-model')
+
+    first = await resolve_embeddings(embed, ['a', 'bb', 'a'], batched=True, cache=cache)
+    second = await resolve_embeddings(embed, ['bb', 'ccc'], batched=True, cache=cache)
+
+    assert embed.texts == ['a', 'bb', 'ccc']
+    assert first == [[1.0, 1.0 / 3.0], [2.0, 1.0 / 3.0], [1.0, 1.0 / 3.0]]
+    assert second[0] == first[1]
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses']) == (1, 4)
+
+
+def test_memory_tier_evicts_least_recently_used() -> None:
+    cache = EmbeddingCache('toy-model', max_memory_entries=2)
+    cache.put('a', [1.0])
+    cache.put('b', [2.0])
+    cache.get('a')
+    cache.put('c', [3.0])
+
+    assert cache.get_many(['a', 'b', 'c']) == [[1.0], None, [3.0]]
+    assert cache.stats()['memory_evictions'] == 1
+
+
+def test_database_tier_is_shared_and_bounded(basket: DocBasket) -> None:
+    writer = EmbeddingCache('toy-model', db=basket.db, max_db_entries=2)
+    writer.put_many(['a', 'b'], [[0.1, 0.2], [0.3, 0.4]])
+    writer.get('a')
+    writer.put('c', [0.5, 0.6])
+
+    # A fresh cache (another process) sees the rows; 'b' was least recently used
+    reader = EmbeddingCache('toy-model', db=basket.db)
+    assert reader.get_many(['a', 'b', 'c']) == [[0.1, 0.2], None, [0.5, 0.6]]
+    assert reader.stats()['db_hits'] == 2
+    assert writer.stats()['db_evictions'] == 1
+    # Keys include the model id
+    assert EmbeddingCache('other-model', db=basket.db).get('a') is None
+
+
+@pytest.mark.asyncio
+async def test_reindexing_unchanged_corpus_makes_no_embedding_calls(basket: DocBasket, tmp_path: Path) -> None:
+    documents = []
+    for number in range(3):
+        source = tmp_path / f"doc{number}.txt"
+        source.write_text(f"document number {number}")
+        documents.append(basket.add(str(source)))
+    embed = CountingEmbedder()
+
+    def processor() -> VectorIndexingProcessor:
+        # A new cache instance each time: only the database tier carries over
+        return VectorIndexingProcessor(
+            embedding_fn=embed, vector_db_type='memory', db=basket.db, batch_embedding=True,
+            include_metadata=False, force_reindex=True,
+            embedding_cache=EmbeddingCache('toy-model', db=basket.db),
+        )
+
+    assert all(result.success for result in await processor().process_many(documents))
+    calls = len(embed.texts)
+    assert all(result.success for result in await processor().process_many(documents))
+
+    assert calls == 3
+    assert len(embed.texts) == calls
+
+
+@pytest.mark.asyncio
+async def test_repeated_queries_are_embedded_once() -> None:
+    embed = Mock(return_value=[1.0, 0.0])
+    basket = Mock()
+    basket.get_documents = Mock(return_value=[SimpleNamespace(id='doc_1')])
+    doc_ex = Mock(spec=DocEX)
+    doc_ex.get_basket = Mock(return_value=basket)
+    service = SemanticSearchService(
+        doc_ex=doc_ex, embedding_fn=embed, vector_db_type='memory',
+        vector_db_config={'vectors': {'doc_1': {'document_id': 'doc_1', 'basket_id': 'bas_1', 'embedding': [1.0, 0.0]}}},
+        embedding_cache=EmbeddingCache('toy-model'),
+    )
+
+    for _ in range(3):
+        await service.search('invoice totals', use_cache=False)
+
+    embed.assert_called_once_with('invoice totals')
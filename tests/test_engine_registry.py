@@ -0,0 +1,91 @@
+"""Tests for the process-wide engine registry used by Database()."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from sqlalchemy import text
+
+from docex.config.docex_config import DocEXConfig
+from docex.db.connection import Database
+
+
+def test_databases_share_engine_and_session_factory(sqlite_config: DocEXConfig) -> None:
+    first = Database(config=sqlite_config)
+    second = Database(config=sqlite_config)
+
+    assert first.engine is second.engine
+    assert first.Session is second.Session
+    with second.session() as session:
+        assert session.execute(text("SELECT 1")).scalar() == 1
+
+
+def test_schema_is_verified_once(sqlite_config: DocEXConfig, monkeypatch) -> None:
+    Database(config=sqlite_config)
+
+    calls = []
+    monkeypatch.setattr(
+        'docex.db.connection.inspect',
+        lambda engine: calls.append(engine) or pytest.fail("schema re-inspected"),
+    )
+    Database(config=sqlite_config)
+
+    assert calls == []
+
+
+def test_tenants_get_separate_entries(sqlite_config: DocEXConfig) -> None:
+    default_db = Database(config=sqlite_config)
+    tenant_db = Database(config=sqlite_config, tenant_id='acme')
+
+    assert default_db.engine is not tenant_db.engine
+
+
+def test_deleted_sqlite_file_gets_fresh_engine(sqlite_config: DocEXConfig) -> None:
+    first = Database(config=sqlite_config)
+    Path(sqlite_config.get('database')['path']).unlink()
+
+    second = Database(config=sqlite_config)
+
+    assert second.engine is not first.engine
+    with second.session() as session:
+        tables = session.execute(
+            text("SELECT name FROM sqlite_master WHERE type='table' AND name='document'")
+        ).scalars().all()
+    assert tables == ['document']
+
+
+def test_close_releases_only_its_handle(sqlite_config: DocEXConfig) -> None:
+    first = Database(config=sqlite_config)
+    second = Database(config=sqlite_config)
+    engine, pool = second.engine, second.engine.pool
+
+    first.close()
+
+    assert first.engine is None
+    assert second.engine.pool is pool
+    with first.session() as session:
+        assert session.execute(text("SELECT 1")).scalar() == 1
+    assert first.engine is engine
+
+
+def test_closed_handle_reconnects_for_transactions_and_queries(sqlite_config: DocEXConfig) -> None:
+    db = Database(config=sqlite_config)
+
+    db.close()
+    with db.transaction() as session:
+        assert session.execute(text("SELECT 1")).scalar() == 1
+
+    db.close()
+    assert db.fetch_one("SELECT 1 AS one") is not None
+    db.close()
+    assert db.get_engine() is not None
+
+
+def test_dispose_goes_through_the_registry(sqlite_config: DocEXConfig) -> None:
+    first = Database(config=sqlite_config)
+    engine = first.engine
+
+    first.dispose()
+
+    assert Database(config=sqlite_config).engine is not engine
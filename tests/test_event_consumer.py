@@ -0,0 +1,105 @@
+"""Tests for batched doc_events consumption."""
+
+from __future__ import annotations
+
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import insert, select
+
+from docex.db.models import DocEvent
+from docex.db.repository import DocEventRepository
+from docex.docbasket import DocBasket
+from docex.services.event_consumer import EventConsumer, run_consumers
+
+
+def _add_events(basket: DocBasket, count: int, event_type: str = 'TEST') -> list:
+    start = datetime.now(timezone.utc) - timedelta(minutes=1)
+    rows = [
+        {
+            'id': f"evt_{number:05d}",
+            'basket_id': basket.id,
+            'event_type': event_type,
+            'event_timestamp': start + timedelta(milliseconds=number),
+            'data': {'number': number},
+            'source': 'test',
+            'status': 'PENDING',
+        }
+        for number in range(count)
+    ]
+    with basket.db.session() as session:
+        session.execute(insert(DocEvent), rows)
+        session.commit()
+    return [row['id'] for row in rows]
+
+
+def _statuses(basket: DocBasket) -> dict:
+    with basket.db.session() as session:
+        return dict(session.execute(select(DocEvent.id, DocEvent.status).where(DocEvent.source == 'test')).all())
+
+
+def test_parallel_consumers_handle_every_event_once(basket: DocBasket) -> None:
+    ids = _add_events(basket, 300)
+    handled = []
+    lock = threading.Lock()
+
+    def handler(event):
+        with lock:
+            handled.append(event.id)
+
+    stats = run_consumers(basket.db, handler, consumers=4, until_empty=True, batch_size=25, event_types=['TEST'])
+
+    assert sorted(handled) == ids
+    assert set(_statuses(basket).values()) == {'PROCESSED'}
+    assert sum(s.processed for s in stats) == 300
+    assert sum(s.batches for s in stats) == 12
+
+
+def test_failed_events_are_retried_with_backoff_then_failed(basket: DocBasket) -> None:
+    flaky, broken = _add_events(basket, 2)
+    calls = {flaky: 0, broken: 0}
+
+    def handler(event):
+        calls[event.id] += 1
+        if event.id == broken or calls[event.id] == 1:
+            raise RuntimeError(f"cannot publish {event.id}")
+
+    consumer = EventConsumer(basket.db, handler, max_attempts=3, backoff_base=60, event_types=['TEST'])
+    assert consumer.run_once() == 2
+    # Rescheduled a minute ahead, so nothing is due yet
+    assert consumer.run_once() == 0
+    with basket.db.session() as session:
+        session.execute(DocEvent.__table__.update().values(available_at=None))
+        session.commit()
+
+    consumer.backoff_base = 0.001
+    deadline = time.monotonic() + 10
+    while _statuses(basket)[broken] == 'PENDING' and time.monotonic() < deadline:
+        consumer.run(until_empty=True)
+        time.sleep(0.005)
+
+    assert _statuses(basket) == {flaky: 'PROCESSED', broken: 'FAILED'}
+    assert calls == {flaky: 2, broken: 3}
+    with basket.db.session() as session:
+        event = session.get(DocEvent, broken)
+    assert (event.attempts, event.error_message) == (3, f"cannot publish {broken}")
+    assert consumer.retry_delay(1) == 0.001 and consumer.retry_delay(20) == consumer.backoff_max
+
+
+def test_expired_lease_is_taken_over_and_stale_ack_ignored(basket: DocBasket) -> None:
+    (event_id,) = _add_events(basket, 1)
+    repository = DocEventRepository(basket.db)
+
+    first = repository.claim_events('consumer-a', lease_seconds=0.001)
+    assert [event.id for event in first] == [event_id]
+    time.sleep(0.01)
+
+    second = repository.claim_events('consumer-b', lease_seconds=60)
+    assert [event.id for event in second] == [event_id]
+    assert second[0].attempts == 2
+    assert repository.claim_events('consumer-c') == []
+
+    assert repository.ack_events('consumer-a', [event_id]) == 0
+    assert repository.ack_events('consumer-b', [event_id]) == 1
+    assert _statuses(basket) == {event_id: 'PROCESSED'}
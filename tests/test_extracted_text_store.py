@@ -0,0 +1,114 @@
+"""Tests for the per-checksum extracted-text artifact store."""
+
+from __future__ import annotations
+
+import json
+from collections import OrderedDict
+from pathlib import Path
+
+import pytest
+
+from docex.docbasket import DocBasket
+from docex.processors.base import BaseProcessor, ProcessingResult
+from docex.services import extracted_text_store
+from docex.services.extracted_text_store import ExtractedTextStore
+from docex.services.text_extraction_service import TextExtractionService
+
+CALLS = []
+
+
+def fake_pdf(stream):
+    """Stand-in for pdfminer: pages are separated by form feeds"""
+    CALLS.append(1)
+    pages = stream.read().decode().split('|')
+    return ''.join(page + '\f' for page in pages), {'input_format': 'pdf', 'page_count': len(pages)}
+
+
+def upper_pdf(stream):
+    return stream.read().decode().upper(), {'input_format': 'pdf'}
+
+
+class TextProcessor(BaseProcessor):
+    def can_process(self, document):
+        return True
+
+    async def process(self, document):
+        return ProcessingResult(success=True, content=self.get_extracted_text(document))
+
+
+@pytest.fixture
+def basket(basket: DocBasket, monkeypatch) -> DocBasket:
+    monkeypatch.setattr(ExtractedTextStore, '_memory', OrderedDict())
+    monkeypatch.setitem(extracted_text_store.ARTIFACT_EXTRACTORS, '.pdf', ('fake', 1, fake_pdf))
+    CALLS.clear()
+    return basket
+
+
+def _add(basket: DocBasket, tmp_path: Path, name: str, content: str):
+    source = tmp_path / name
+    source.write_text(content)
+    return basket.add(str(source))
+
+
+@pytest.mark.asyncio
+async def test_processors_share_one_extraction(basket: DocBasket, tmp_path: Path) -> None:
+    document = _add(basket, tmp_path, 'invoice.pdf', 'page one|page two')
+
+    first = await TextProcessor({}, db=basket.db).process(document)
+    second = await TextProcessor({}, db=basket.db).process(document)
+
+    assert first.content == second.content == 'page one\fpage two\f'
+    assert len(CALLS) == 1
+
+    store = ExtractedTextStore()
+    path = Path(basket.storage_service.storage.get_path(store.artifact_path(document)))
+    assert path.parent.name == document.checksum
+    assert json.loads(path.read_text())['page_offsets'] == [0, 9]
+
+
+@pytest.mark.asyncio
+async def test_artifact_survives_a_new_process(basket: DocBasket, tmp_path: Path, monkeypatch) -> None:
+    document = _add(basket, tmp_path, 'report.pdf', 'only page')
+    ExtractedTextStore().get(document)
+    # A new process starts with an empty LRU and reads the stored artifact
+    monkeypatch.setattr(ExtractedTextStore, '_memory', OrderedDict())
+
+    artifact = ExtractedTextStore().get(document)
+
+    assert artifact.text == 'only page\f'
+    assert artifact.stats == {'input_format': 'pdf', 'page_count': 1}
+    assert len(CALLS) == 1
+
+
+def test_extractor_version_bump_extracts_again(basket: DocBasket, tmp_path: Path) -> None:
+    document = _add(basket, tmp_path, 'contract.pdf', 'terms')
+    assert ExtractedTextStore().get_text(document) == 'terms\f'
+
+    upgraded = ExtractedTextStore({'.pdf': ('fake', 2, upper_pdf)})
+
+    assert upgraded.get_text(document) == 'TERMS'
+    assert upgraded.get(document).version == 2
+    assert ExtractedTextStore().get_text(document) == 'terms\f'
+
+
+def test_other_types_are_read_without_an_artifact(basket: DocBasket, tmp_path: Path) -> None:
+    document = _add(basket, tmp_path, 'notes.txt', 'plain notes')
+
+    assert TextProcessor({}, db=basket.db).get_extracted_text(document) == 'plain notes'
+    assert ExtractedTextStore().artifact_path(document) is None
+
+
+@pytest.mark.asyncio
+async def test_extraction_service_persists_for_processors(basket: DocBasket, tmp_path: Path) -> None:
+    document = _add(basket, tmp_path, 'scan.pdf', 'a|b')
+    store = ExtractedTextStore()
+
+    with TextExtractionService(max_workers=1, extractors={'.pdf': fake_pdf}, text_store=store) as service:
+        first = await service.extract(document)
+        second = await service.extract(document)
+
+    assert first.text == second.text == 'a\fb\f'
+    ExtractedTextStore._memory.clear()
+    assert TextProcessor({}, db=basket.db).get_extracted_text(document) == 'a\fb\f'
+    # Extraction ran in the worker only; the processor read the artifact
+    assert CALLS == []
@@ -0,0 +1,95 @@
+"""Tests for the pure-NumPy IVF-Flat approximate nearest neighbour index."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from unittest.mock import Mock
+
+import numpy as np
+import pytest
+
+from docex import DocEX
+from docex.processors.vector import SemanticSearchService, VectorIndexingProcessor
+from docex.processors.vector.ivf_index import IVFFlatIndex
+from docex.processors.vector.memory_vector_store import MemoryVectorStore
+
+
+@pytest.fixture
+def store() -> MemoryVectorStore:
+    rng = np.random.default_rng(7)
+    centers = rng.normal(size=(20, 16))
+    vectors = centers[rng.integers(0, 20, 2000)] + 0.3 * rng.normal(size=(2000, 16))
+    store = MemoryVectorStore()
+    store.add([f"doc{i}" for i in range(2000)], vectors, basket_ids=['even' if i % 2 == 0 else 'odd' for i in range(2000)])
+    return store
+
+
+def _recall(index: IVFFlatIndex, store: MemoryVectorStore, queries: np.ndarray, **kwargs) -> float:
+    found = 0
+    for query in queries:
+        expected = {doc_id for doc_id, _ in store.search(query, 10, basket_id=kwargs.get('basket_id'))}
+        found += len(expected & {doc_id for doc_id, _ in index.search(query, 10, **kwargs)})
+    return found / (10 * len(queries))
+
+
+def test_build_matches_brute_force_and_nprobe_controls_recall(store: MemoryVectorStore) -> None:
+    index = IVFFlatIndex.build(store, nlist=32, nprobe=4)
+    queries = np.random.default_rng(1).normal(size=(20, 16))
+
+    assert len(index) == 2000
+    assert _recall(index, store, queries, nprobe=32) == 1.0
+    assert _recall(index, store, queries, nprobe=1) <= _recall(index, store, queries, nprobe=8)
+    assert _recall(index, store, queries, basket_id='odd') >= 0.9
+    assert all(int(doc_id[3:]) % 2 == 1 for doc_id, _ in index.search(queries[0], 10, basket_id='odd'))
+
+
+def test_incremental_insert_replace_and_delete(store: MemoryVectorStore) -> None:
+    index = IVFFlatIndex.build(store, nlist=16)
+    probe = np.eye(16)[3] * 100
+
+    index.add(['new'], [probe])
+    assert index.search(probe, 1)[0] == ('new', pytest.approx(1.0))
+
+    index.add(['doc0'], [probe])  # Replaces the existing doc0 vector
+    assert len(index) == 2001
+    assert {doc_id for doc_id, _ in index.search(probe, 2)} == {'new', 'doc0'}
+
+    assert index.delete(['new', 'doc0', 'missing']) == 2
+    assert 'doc0' not in index
+    assert 'new' not in {doc_id for doc_id, _ in index.search(probe, 10, nprobe=16)}
+
+    with pytest.raises(ValueError, match="trained"):
+        IVFFlatIndex().add(['a'], [[1.0]])
+
+
+def test_save_and_load_round_trip(store: MemoryVectorStore, tmp_path: Path) -> None:
+    index = IVFFlatIndex.build(store, nlist=16, nprobe=3)
+    index.save(tmp_path / 'docs.ivf.npz')
+
+    loaded = IVFFlatIndex.load(tmp_path / 'docs.ivf.npz')
+    query = np.random.default_rng(2).normal(size=16)
+
+    assert (loaded.nlist, loaded.nprobe, len(loaded)) == (16, 3, 2000)
+    assert loaded.search(query, 10, basket_id='even') == index.search(query, 10, basket_id='even')
+    loaded.add(['extra'], [query])
+    assert loaded.search(query, 1)[0][0] == 'extra'
+
+
+@pytest.mark.asyncio
+async def test_processor_and_search_service_share_ann_index(store: MemoryVectorStore) -> None:
+    ann = IVFFlatIndex.build(store, nlist=16)
+    processor = VectorIndexingProcessor(embedding_fn=lambda text: [1.0] * 16, vector_db_config={'ann': ann})
+    document = Mock(id='doc_new', basket=None, basket_id='basket', document_type='file')
+    document.get_metadata_dict = Mock(return_value={})
+
+    await processor._store_embeddings([(document, [1.0] * 16, 'text')])
+
+    assert 'doc_new' in ann
+    service = SemanticSearchService(
+        doc_ex=Mock(spec=DocEX),
+        embedding_fn=lambda text: [1.0] * 16,
+        vector_db_config={'vectors': processor.vector_db['vectors'], 'index': processor.vector_db['index'], 'ann': ann},
+    )
+    hits = await service._search_memory([1.0] * 16, top_k=1)
+    assert hits[0]['document_id'] == 'doc_new'
+    assert hits[0]['basket_id'] == 'basket'
@@ -0,0 +1,80 @@
+"""Tests for the float32 MemoryVectorStore behind the memory vector backend."""
+
+from __future__ import annotations
+
+from unittest.mock import Mock
+
+import numpy as np
+import pytest
+
+from docex import DocEX
+from docex.processors.vector import SemanticSearchService
+from docex.processors.vector.memory_vector_store import MemoryVectorStore
+
+
+def test_search_ranks_by_cosine_and_filters_by_basket_and_type() -> None:
+    store = MemoryVectorStore(initial_capacity=2)
+    store.add(
+        ['a', 'b', 'c'],
+        [[2.0, 0.0], [0.0, 1.0], [1.0, 1.0]],
+        basket_ids=['x', 'y', 'x'],
+        document_types=['invoice', 'invoice', 'contract'],
+    )
+
+    assert [doc_id for doc_id, _ in store.search([1.0, 0.1], top_k=2)] == ['a', 'c']
+    assert store.search([1.0, 0.0], top_k=1)[0][1] == pytest.approx(1.0)
+    assert [doc_id for doc_id, _ in store.search([1.0, 0.0], top_k=5, basket_id='y')] == ['b']
+    assert [doc_id for doc_id, _ in store.search([1.0, 0.0], top_k=5, document_type='contract')] == ['c']
+    assert store.search([1.0, 0.0], top_k=5, basket_id='unknown') == []
+    assert store._matrix.dtype == np.float32
+    assert np.linalg.norm(store.get('a')) == pytest.approx(1.0)
+
+    with pytest.raises(ValueError, match="different dimensions"):
+        store.search([1.0, 0.0, 0.0], top_k=1)
+
+
+def test_replace_and_delete_use_tombstones_then_compact() -> None:
+    store = MemoryVectorStore(initial_capacity=8, compact_ratio=0.5)
+    store.add([f"doc{i}" for i in range(4)], np.eye(4, dtype=np.float32))
+
+    store.add(['doc0'], [[0.0, 1.0, 0.0, 0.0]])
+    assert len(store) == 4
+    assert store.tombstones == 1
+    assert [doc_id for doc_id, _ in store.search([0.0, 1.0, 0.0, 0.0], top_k=2)] == ['doc1', 'doc0']
+
+    assert store.delete(['doc1', 'doc2', 'missing']) == 2
+    # 3 of 5 rows were dead, so the matrix was compacted
+    assert store.tombstones == 0
+    assert store.ids == ['doc3', 'doc0']
+    assert [doc_id for doc_id, _ in store.search([0.0, 1.0, 0.0, 0.0], top_k=5)] == ['doc0', 'doc3']
+
+
+def test_store_grows_past_initial_capacity() -> None:
+    store = MemoryVectorStore(initial_capacity=2)
+    embeddings = np.random.default_rng(0).normal(size=(100, 8))
+    store.add([f"doc{i}" for i in range(100)], embeddings)
+
+    assert len(store) == 100
+    assert store.search(embeddings[42], top_k=1)[0][0] == 'doc42'
+
+
+@pytest.mark.asyncio
+async def test_search_service_builds_store_from_shared_vectors_once() -> None:
+    service = SemanticSearchService(
+        doc_ex=Mock(spec=DocEX),
+        embedding_fn=lambda text: [1.0, 0.0],
+        vector_db_config={'vectors': {
+            'doc1': {'embedding': [1.0, 0.0], 'basket_id': 'b1', 'metadata': {'k': 'v'}},
+            'doc2': {'embedding': [0.0, 1.0], 'basket_id': 'b1', 'metadata': {}},
+        }},
+    )
+
+    results = await service._search_memory([1.0, 0.2], top_k=1)
+    store = service._memory_store()
+    await service._search_memory([0.0, 1.0], top_k=1)
+
+    assert results == [{'document_id': 'doc1', 'basket_id': 'b1', 'similarity': pytest.approx(0.98058, abs=1e-4),
+                        'metadata': {'k': 'v'}}]
+    assert service._memory_store() is store
+    with pytest.raises(ValueError, match="No vectors matched"):
+        await service._search_memory([1.0, 0.0], top_k=1, basket_id='other')
@@ -0,0 +1,75 @@
+"""Tests for bulk metadata hydration of document lists."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from sqlalchemy import event
+
+from docex.docbasket import DocBasket
+from docex.services import metadata_service
+from docex.services.metadata_service import MetadataService
+
+
+@pytest.fixture
+def basket(basket: DocBasket, tmp_path: Path) -> DocBasket:
+    sources = tmp_path / 'src'
+    sources.mkdir()
+    paths = []
+    for index in range(6):
+        path = sources / f"doc_{index}.txt"
+        path.write_text(f"document {index}")
+        paths.append(path)
+    basket.add_many(paths, metadata=[{'index': index, 'tags': ['a', str(index)]} for index in range(6)])
+    return basket
+
+
+def _count_selects(basket: DocBasket, action) -> int:
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)  # noqa: E731
+    event.listen(basket.db.engine, 'before_cursor_execute', listener)
+    try:
+        action()
+    finally:
+        event.remove(basket.db.engine, 'before_cursor_execute', listener)
+    return len([stmt for stmt in statements if stmt.lstrip().upper().startswith('SELECT')])
+
+
+def test_list_documents_with_metadata_uses_one_metadata_query(basket: DocBasket) -> None:
+    documents = []
+    assert _count_selects(basket, lambda: documents.extend(basket.list_documents(with_metadata=True))) == 2
+
+    def read_all_metadata():
+        for document in documents:
+            document.get_metadata_dict()
+            document.get_metadata_dict()
+
+    assert _count_selects(basket, read_all_metadata) == 0
+    assert sorted(doc.get_metadata()['index'] for doc in documents) == list(range(6))
+    assert documents[0].get_metadata()['tags'][0] == 'a'
+
+
+def test_get_metadata_bulk_chunks_ids_and_keeps_empty_documents(basket: DocBasket, monkeypatch) -> None:
+    monkeypatch.setattr(metadata_service, 'BULK_ID_CHUNK_SIZE', 4)
+    ids = [doc.id for doc in basket.list_documents()]
+
+    bulk = MetadataService(basket.db).get_metadata_bulk(ids + ['missing', ids[0]])
+
+    assert list(bulk) == ids + ['missing']
+    assert bulk['missing'] == {}
+    assert all(bulk[doc_id] == MetadataService(basket.db).get_metadata(doc_id) for doc_id in ids)
+
+
+def test_metadata_cache_is_refreshed_after_update(basket: DocBasket) -> None:
+    document = basket.list_documents(limit=1, with_metadata=True)[0]
+
+    document.get_metadata()['index'] = 'mutated'
+    assert document.get_metadata()['index'] != 'mutated'
+
+    document.update_metadata({'index': 42})
+    assert document.get_metadata()['index'] == 42
+
+    MetadataService(basket.db).update_metadata(document.id, {'index': 7})
+    assert document.get_metadata()['index'] == 42
+    assert document.get_metadata(refresh=True)['index'] == 7
@@ -0,0 +1,86 @@
+"""Query-plan regression tests for metadata filters."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, inspect, select, text
+
+from docex.db.models import Document as DocumentModel
+from docex.db.models import DocumentMetadata
+from docex.db.schema_upgrade import ensure_model_columns
+from docex.docbasket import DocBasket
+
+
+@pytest.fixture
+def basket(basket: DocBasket, tmp_path: Path) -> DocBasket:
+    sources = tmp_path / 'src'
+    sources.mkdir()
+    paths = []
+    for index in range(20):
+        path = sources / f"doc_{index}.txt"
+        path.write_text(f"document {index}")
+        paths.append(path)
+    basket.add_many(paths, metadata=[
+        {'category': 'invoice' if index % 2 else 'receipt', 'vendor': f"vendor_{index % 5}", 'amount': index * 100}
+        for index in range(20)
+    ])
+    return basket
+
+
+def _query_plan(basket: DocBasket, metadata) -> str:
+    manager = basket.document_manager
+    query = manager._apply_metadata_filter(
+        select(DocumentModel.id).where(DocumentModel.basket_id == basket.id), metadata
+    )
+    with basket.db.session() as session:
+        connection = session.connection()
+        compiled = query.compile(dialect=connection.dialect)
+        params = tuple(compiled.params[name] for name in compiled.positiontup)
+        rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", params).fetchall()
+    return '\n'.join(row[-1] for row in rows)
+
+
+def test_multi_key_filter_is_one_indexed_aggregate(basket: DocBasket) -> None:
+    filters = {'category': 'invoice', 'vendor': 'vendor_1', 'amount': {'gte': 500}}
+    plan = _query_plan(basket, filters)
+
+    assert 'INTERSECT' not in plan and 'COMPOUND' not in plan
+    assert 'idx_document_metadata_key_text' in plan
+    assert 'idx_document_metadata_key_num' in plan
+    assert 'SCAN document_metadata' not in plan
+    assert [doc.get_metadata()['amount'] for doc in basket.find_documents_by_metadata(filters)] == [1100]
+
+
+def test_single_key_filter_uses_bounded_typed_index(basket: DocBasket) -> None:
+    plan = _query_plan(basket, {'category': 'receipt'})
+
+    assert 'idx_document_metadata_key_text' in plan
+    assert 'SCAN document_metadata' not in plan
+    assert basket.count_documents_by_metadata({'category': 'receipt'}) == 10
+
+
+def test_long_values_are_stored_and_matched(basket: DocBasket, tmp_path: Path) -> None:
+    document = basket.list_documents()[0]
+    long_value = 'x' * 5000
+    embedding = [0.123456789] * 600
+    document.update_metadata({'notes': long_value, 'embedding': embedding})
+
+    assert [doc.id for doc in basket.find_documents_by_metadata({'notes': long_value})] == [document.id]
+    assert basket.find_documents_by_metadata({'notes': 'x' * 4999}) == []
+    assert [doc.id for doc in basket.find_documents_by_metadata({'embedding': embedding})] == [document.id]
+
+
+def test_schema_upgrade_drops_retired_key_value_index(tmp_path: Path) -> None:
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    DocumentMetadata.__table__.create(engine)
+    with engine.begin() as conn:
+        conn.execute(text("CREATE INDEX idx_document_metadata_key_value ON document_metadata(key, value)"))
+
+    ensure_model_columns(engine, [DocumentMetadata.__table__])
+
+    indexes = {index['name']: index['column_names'] for index in inspect(engine).get_indexes('document_metadata')}
+    assert 'idx_document_metadata_key_value' not in indexes
+    assert indexes['idx_document_metadata_key_text'] == ['key', 'value_text']
+    engine.dispose()
@@ -0,0 +1,74 @@
+"""Tests for the persisted, memory-mapped ('mmap') vector backend."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from unittest.mock import Mock
+
+import numpy as np
+import pytest
+
+from docex import DocEX
+from docex.docbasket import DocBasket
+from docex.processors.vector import SemanticSearchService, VectorIndexingProcessor
+from docex.processors.vector.mmap_vector_store import MmapVectorStore
+
+TOPICS = ('apple', 'banana', 'cherry')
+
+
+def embed(texts):
+    """Batched toy embedding: one dimension per topic word"""
+    return [[float(text.count(topic)) for topic in TOPICS] + [0.01] for text in texts]
+
+
+def test_readers_pick_up_appends_tombstones_and_compaction(tmp_path: Path) -> None:
+    writer = MmapVectorStore(tmp_path / 'index' / 'docs')
+    writer.add(['a', 'b', 'c'], [[1.0, 0.0], [0.0, 1.0], [1.0, 1.0]], basket_ids=['x', 'y', 'x'])
+
+    reader = MmapVectorStore(tmp_path / 'index' / 'docs')
+    assert isinstance(reader._matrix, np.memmap)
+    assert [doc_id for doc_id, _ in reader.search([1.0, 0.1], top_k=2)] == ['a', 'c']
+    assert reader.basket_of('b') == 'y'
+
+    writer.add(['a', 'd'], [[0.0, 2.0], [0.5, 0.5]])
+    assert reader.search([0.0, 1.0], top_k=2)[1] == ('a', pytest.approx(1.0))
+    assert len(reader) == 4
+
+    # Three of five rows are then dead, which triggers a rewrite of the files
+    writer.delete(['b', 'c'])
+    assert writer.tombstones == 0
+    reader.refresh()
+    assert sorted(reader.ids) == ['a', 'd']
+    assert [doc_id for doc_id, _ in reader.search([0.0, 1.0], top_k=5)] == ['a', 'd']
+
+    with pytest.raises(ValueError, match="dimension"):
+        writer.add(['e'], [[1.0, 2.0, 3.0]])
+
+
+@pytest.mark.asyncio
+async def test_index_persists_next_to_sqlite_database(basket: DocBasket, tmp_path: Path) -> None:
+    documents = []
+    for topic in TOPICS:
+        source = tmp_path / f"{topic}.txt"
+        source.write_text(f"All about {topic} and more {topic}")
+        documents.append(basket.add(str(source)))
+
+    processor = VectorIndexingProcessor(
+        embedding_fn=embed, vector_db_type='mmap', db=basket.db, batch_embedding=True, include_metadata=False
+    )
+    results = await processor.process_many(documents)
+
+    assert all(result.success for result in results)
+    assert (tmp_path / 'docex.vectors.f32').exists()
+    assert processor.can_process(documents[0]) is False
+
+    # A fresh service (as after a restart) maps the same files without re-embedding
+    doc_ex = Mock(spec=DocEX)
+    doc_ex.get_basket = Mock(return_value=basket)
+    service = SemanticSearchService(
+        doc_ex=doc_ex, embedding_fn=embed, vector_db_type='mmap', db=basket.db, batch_embedding=True
+    )
+    hits = await service.search('banana', top_k=1, basket_id=basket.id)
+
+    assert [hit.document.id for hit in hits] == [documents[1].id]
+    assert hits[0].similarity_score > 0.9
@@ -0,0 +1,132 @@
+"""Tests for the concurrent ProcessingEngine."""
+
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import os
+import threading
+from pathlib import Path
+
+import pytest
+
+from docex.docbasket import DocBasket
+from docex.processors.base import BaseProcessor, ProcessingResult
+from docex.processors.engine import ProcessingEngine
+
+
+@pytest.fixture
+def basket(basket: DocBasket, tmp_path: Path) -> DocBasket:
+    for number in range(12):
+        source = tmp_path / f"doc{number}.txt"
+        source.write_text(f"document {number}")
+        basket.add(str(source))
+    return basket
+
+
+class UpperCaseProcessor(BaseProcessor):
+    """Sync processor: runs in the thread pool"""
+
+    def __init__(self, config, db=None):
+        super().__init__(config, db=db)
+        self.threads = set()
+
+    def can_process(self, document) -> bool:
+        return True
+
+    def process(self, document) -> ProcessingResult:
+        self.threads.add(threading.get_ident())
+        return ProcessingResult(success=True, content=self.get_document_text(document).upper())
+
+
+class SlowAsyncProcessor(BaseProcessor):
+    """Async processor: runs on the loop and tracks how many documents are in flight"""
+
+    def __init__(self, config, db=None):
+        super().__init__(config, db=db)
+        self.in_flight = 0
+        self.peak = 0
+
+    def can_process(self, document) -> bool:
+        return not document.name.startswith('doc1')
+
+    async def process(self, document) -> ProcessingResult:
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        return ProcessingResult(success=document.name != 'doc3.txt', error='bad document')
+
+
+class PidProcessor(BaseProcessor):
+    """CPU-bound stand-in: runs in the process pool"""
+
+    execution_mode = 'process'
+
+    def can_process(self, document) -> bool:
+        return True
+
+    def process(self, document) -> ProcessingResult:
+        return ProcessingResult(success=True, content=self.get_document_text(document), metadata={'pid': os.getpid()})
+
+
+@pytest.mark.asyncio
+async def test_pipeline_runs_each_processor_in_its_mode(basket: DocBasket) -> None:
+    upper = UpperCaseProcessor({}, db=basket.db)
+    slow = SlowAsyncProcessor({}, db=basket.db)
+    results = []
+    engine = ProcessingEngine([upper, slow], concurrency=4, queue_size=2, batch_size=5)
+
+    stats = await engine.run(basket, on_result=lambda document, name, result: results.append((document.name, name)))
+
+    assert engine.modes == {'UpperCaseProcessor': 'thread', 'SlowAsyncProcessor': 'async'}
+    assert threading.get_ident() not in upper.threads
+    assert stats['UpperCaseProcessor'].succeeded == 12
+    # doc1, doc10 and doc11 are skipped by can_process; doc3 fails
+    assert (stats['SlowAsyncProcessor'].succeeded, stats['SlowAsyncProcessor'].failed) == (8, 1)
+    assert stats['SlowAsyncProcessor'].skipped == 3
+    assert 1 < slow.peak <= 4
+    assert stats['UpperCaseProcessor'].throughput > 0
+    assert len(results) == 21
+
+
+@pytest.mark.asyncio
+async def test_resume_skips_documents_that_already_succeeded(basket: DocBasket) -> None:
+    await ProcessingEngine([UpperCaseProcessor({}, db=basket.db), SlowAsyncProcessor({}, db=basket.db)]).run(basket)
+
+    stats = await ProcessingEngine(
+        [UpperCaseProcessor({}, db=basket.db), SlowAsyncProcessor({}, db=basket.db)]
+    ).run(basket, resume=True)
+
+    assert stats['UpperCaseProcessor'].processed == 0
+    # Only the failed document is retried
+    assert stats['SlowAsyncProcessor'].processed == 1
+
+
+@pytest.mark.asyncio
+async def test_stop_on_failure_skips_later_processors(basket: DocBasket) -> None:
+    upper = UpperCaseProcessor({}, db=basket.db)
+    documents = basket.list_documents(limit=12)
+
+    stats = await ProcessingEngine([SlowAsyncProcessor({}, db=basket.db), upper]).run(documents)
+
+    assert stats['UpperCaseProcessor'].processed == 11
+
+
+@pytest.mark.asyncio
+async def test_process_mode_runs_in_worker_processes(basket: DocBasket) -> None:
+    pids = []
+    engine = ProcessingEngine(
+        [PidProcessor({}, db=basket.db)], process_workers=2,
+        mp_context=multiprocessing.get_context('spawn'),
+    )
+
+    stats = await engine.run(basket, on_result=lambda document, name, result: pids.append(result.metadata['pid']))
+
+    assert stats['PidProcessor'].succeeded == 12
+    assert os.getpid() not in pids
+
+
+def test_invalid_mode_is_rejected(basket: DocBasket) -> None:
+    with pytest.raises(ValueError):
+        ProcessingEngine([UpperCaseProcessor({}, db=basket.db)], modes={'UpperCaseProcessor': 'gpu'})
@@ -8,7 +8,10 @@ import tempfile
 from pathlib import Path
 from moto import mock_aws
 import boto3
+from botocore.exceptions import ClientError
 from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
 
 from docex.storage.s3_storage import S3Storage
 from docex.storage.storage_factory import StorageFactory
@@ -319,7 +322,84 @@ class TestS3Storage(unittest.TestCase):
         # Retrieve non-existent
         retrieved_none = storage.retrieve('non-existent')
         self.assertIsNone(retrieved_none)
-    
+
+    @mock_aws
+    def test_s3_storage_store_file_uses_multipart_upload(self):
+        """Test that large files are streamed to S3 as multipart uploads"""
+        s3_client = boto3.client('s3', region_name=self.region)
+        s3_client.create_bucket(Bucket=self.bucket_name)
+
+        part_size = 5 * 1024 * 1024
+        storage = S3Storage({
+            **self.config,
+            'multipart_threshold': part_size,
+            'multipart_chunksize': part_size
+        })
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            source = Path(temp_dir) / 'large.bin'
+            source.write_bytes(os.urandom(part_size + 1024))
+
+            stored_path = storage.store(str(source), 'docs/large.bin')
+            self.assertEqual(stored_path, 'docs/large.bin')
+
+            head = s3_client.head_object(Bucket=self.bucket_name, Key='docs/large.bin')
+            self.assertTrue(head['ETag'].strip('"').endswith('-2'))
+            self.assertEqual(head['ContentLength'], source.stat().st_size)
+
+    @mock_aws
+    def test_s3_storage_save_stream_retries_from_the_start(self):
+        """Test that a retried stream upload rewinds, and unseekable streams are not retried"""
+        s3_client = boto3.client('s3', region_name=self.region)
+        s3_client.create_bucket(Bucket=self.bucket_name)
+        storage = S3Storage({**self.config, 'retry_delay': 0})
+        upload = storage.s3.upload_fileobj
+        calls = []
+
+        def flaky_upload(stream, *args, **kwargs):
+            calls.append(stream)
+            if len(calls) == 1:
+                stream.read(4)
+                raise ClientError({'Error': {'Code': '503', 'Message': 'Slow Down'}}, 'PutObject')
+            return upload(stream, *args, **kwargs)
+
+        storage.s3.upload_fileobj = flaky_upload
+        stream = BytesIO(b'header:payload')
+        stream.read(7)
+        storage.save('docs/stream.bin', stream)
+
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(storage.load('docs/stream.bin'), b'payload')
+
+        class Unseekable(BytesIO):
+            def seekable(self):
+                return False
+
+        calls.clear()
+        with self.assertRaises(IOError):
+            storage.save('docs/pipe.bin', Unseekable(b'payload'))
+        self.assertEqual(len(calls), 1)
+
+    @mock_aws
+    def test_s3_storage_open_stream_and_read_range(self):
+        """Test streaming reads and ranged GETs"""
+        s3_client = boto3.client('s3', region_name=self.region)
+        s3_client.create_bucket(Bucket=self.bucket_name)
+
+        storage = S3Storage(self.config)
+        storage.save('docs/blob.bin', b'0123456789')
+
+        stream = storage.open_stream('docs/blob.bin')
+        self.assertEqual(stream.read(4), b'0123')
+        self.assertEqual(stream.read(), b'456789')
+        stream.close()
+
+        self.assertEqual(storage.read_range('docs/blob.bin', 2, 5), b'234')
+        self.assertEqual(storage.read_range('docs/blob.bin', 7), b'789')
+        self.assertEqual(storage.read_range('docs/blob.bin', 20, 30), b'')
+        with self.assertRaises(FileNotFoundError):
+            storage.open_stream('docs/missing.bin')
+
     @mock_aws
     def test_s3_storage_set_metadata(self):
         """Test setting metadata"""
@@ -422,11 +502,75 @@ class TestS3StorageFactory(unittest.TestCase):
         
         self.assertIsInstance(storage, S3Storage)
         self.assertEqual(storage.bucket, 'test-bucket')
+    
+    def test_cache_key_normalises_the_location(self):
+        """Test that different spellings of one location share a cache key"""
+        key = StorageFactory._cache_key
+        s3_config = {'type': 's3', 'bucket': 'test-bucket', 'region': 'us-east-1', 'prefix': 'docs'}
+        
+        self.assertEqual(key({'path': 'storage'}), key({'type': 'filesystem', 'path': str(Path('storage').resolve())}))
+        self.assertEqual(key(s3_config), key({**s3_config, 'prefix': '/docs/'}))
+        self.assertEqual(key({**s3_config, 'prefix': ''}), key({k: v for k, v in s3_config.items() if k != 'prefix'}))
+        self.assertNotEqual(key(s3_config), key({**s3_config, 'access_key': 'other-key'}))
+        self.assertNotEqual(key(s3_config), key({**s3_config, 'max_pool_connections': 64}))
+    
+    def test_shared_backends_are_evicted_least_recently_used_first(self):
+        """Test that the shared backend cache stays bounded"""
+        StorageFactory.clear_cache()
+        self.addCleanup(StorageFactory.clear_cache)
+        with tempfile.TemporaryDirectory() as temp_dir, \
+                patch.object(StorageFactory, 'max_instances', 2):
+            configs = [{'type': 'filesystem', 'path': str(Path(temp_dir) / f"tenant_{n}")} for n in range(3)]
+            first = StorageFactory.get_storage(configs[0])
+            second = StorageFactory.get_storage(configs[1])
+            self.assertIs(StorageFactory.get_storage(configs[0]), first)
+            
+            StorageFactory.get_storage(configs[2])
+            
+            self.assertEqual(len(StorageFactory._instances), 2)
+            self.assertIs(StorageFactory.get_storage(configs[0]), first)
+            self.assertIsNot(StorageFactory.get_storage(configs[1]), second)
 
 
 class TestS3StorageService(unittest.TestCase):
     """Test S3 storage service integration"""
     
+    def setUp(self):
+        """Start every test without shared backends from earlier mocks"""
+        StorageFactory.clear_cache()
+    
+    def tearDown(self):
+        StorageFactory.clear_cache()
+    
+    @mock_aws
+    def test_storage_services_share_backend_per_config(self):
+        """Test that equal configurations share one S3 client"""
+        s3_client = boto3.client('s3', region_name='us-east-1')
+        s3_client.create_bucket(Bucket='test-bucket')
+        s3_client.create_bucket(Bucket='other-bucket')
+        
+        storage_config = {
+            'type': 's3',
+            's3': {
+                'bucket': 'test-bucket',
+                'region': 'us-east-1',
+                'access_key': 'test-key',
+                'secret_key': 'test-secret',
+                'max_pool_connections': 64
+            }
+        }
+        
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            services = list(executor.map(lambda _: StorageService(storage_config), range(16)))
+        other = StorageService({
+            'type': 's3',
+            's3': {**storage_config['s3'], 'bucket': 'other-bucket'}
+        })
+        
+        self.assertEqual(len({id(service.storage) for service in services}), 1)
+        self.assertIsNot(other.storage, services[0].storage)
+        self.assertEqual(services[0].storage.s3.meta.config.max_pool_connections, 64)
+    
     @mock_aws
     def test_storage_service_with_s3(self):
         """Test StorageService with S3 configuration"""
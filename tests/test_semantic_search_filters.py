@@ -0,0 +1,163 @@
+"""Tests for metadata filters applied inside semantic search."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock, Mock
+
+import pytest
+
+from docex import DocEX
+from docex.docbasket import DocBasket
+from docex.processors.chunking import ChunkingConfig, FixedSizeChunking
+from docex.processors.vector import (
+    ChunkedVectorIndexingProcessor, SemanticSearchService, VectorIndexingProcessor,
+)
+
+TOPICS = ('apple', 'banana', 'cherry')
+
+
+def embed(texts):
+    """Batched toy embedding: one dimension per topic word"""
+    return [[float(text.count(topic)) for topic in TOPICS] + [0.01] for text in texts]
+
+
+@pytest.mark.asyncio
+async def test_selective_filter_still_returns_top_k(basket: DocBasket, tmp_path: Path) -> None:
+    # 30 documents about bananas; the three 'red' ones are the least similar to the query
+    documents = []
+    for number in range(30):
+        source = tmp_path / f"doc{number}.txt"
+        red = number >= 27
+        source.write_text(f"doc {number} " + ('banana ' if red else 'banana banana banana ') + 'apple')
+        documents.append(basket.add(str(source), metadata={'team': 'red' if red else 'blue', 'priority': number}))
+
+    processor = VectorIndexingProcessor(
+        embedding_fn=embed, vector_db_type='mmap', db=basket.db, batch_embedding=True, include_metadata=False,
+        store_in_metadata=False,
+    )
+    assert all(result.success for result in await processor.process_many(documents))
+
+    doc_ex = Mock(spec=DocEX)
+    doc_ex.get_basket = Mock(return_value=basket)
+    service = SemanticSearchService(
+        doc_ex=doc_ex, embedding_fn=embed, vector_db_type='mmap', db=basket.db, batch_embedding=True
+    )
+
+    hits = await service.search('banana', top_k=3, basket_id=basket.id, filters={'team': 'red'}, use_cache=False)
+    assert sorted(hit.document.id for hit in hits) == sorted(document.id for document in documents[27:])
+
+    # Operator filters use the typed metadata columns, as in find_documents_by_metadata
+    hits = await service.search('banana', top_k=5, filters={'priority': {'gte': 28}}, use_cache=False)
+    assert sorted(hit.document.id for hit in hits) == sorted(document.id for document in documents[28:])
+
+
+@pytest.mark.asyncio
+async def test_memory_filters_use_indexed_metadata_columns() -> None:
+    vectors = {
+        f"doc{number}": {
+            'document_id': f"doc{number}",
+            'basket_id': 'bas_1',
+            'embedding': [1.0, number / 10],
+            'metadata': {
+                'team': {'extra': {'value': 'red' if number % 5 == 0 else 'blue'}},
+                'priority': {'extra': {'value': number}},
+            },
+        }
+        for number in range(20)
+    }
+    documents = {doc_id: SimpleNamespace(id=doc_id) for doc_id in vectors}
+    basket = Mock()
+    basket.get_documents = Mock(side_effect=lambda ids: [documents[doc_id] for doc_id in ids])
+    doc_ex = Mock(spec=DocEX)
+    doc_ex.get_basket = Mock(return_value=basket)
+    service = SemanticSearchService(
+        doc_ex=doc_ex, embedding_fn=lambda text: [1.0, 0.0], vector_db_type='memory',
+        vector_db_config={'vectors': vectors},
+    )
+
+    hits = await service.search('query', top_k=4, filters={'team': 'red'})
+
+    assert [hit.document.id for hit in hits] == ['doc0', 'doc5', 'doc10', 'doc15']
+    assert await service.search('query', top_k=4, filters={'team': 'green'}) == []
+
+    # Operators have the semantics of find_documents_by_metadata
+    hits = await service.search('query', top_k=4, filters={'team': 'red', 'priority': {'gte': 6}})
+    assert [hit.document.id for hit in hits] == ['doc10', 'doc15']
+    hits = await service.search('query', top_k=4, filters={'priority': {'between': [2, 3]}})
+    assert [hit.document.id for hit in hits] == ['doc2', 'doc3']
+    hits = await service.search('query', top_k=4, filters={'team': {'in': ['green', 'red']}, 'priority': 5.0})
+    assert [hit.document.id for hit in hits] == ['doc5']
+    hits = await service.search('query', top_k=4, filters={'team': {'prefix': 're'}, 'priority': {'lt': 1}})
+    assert [hit.document.id for hit in hits] == ['doc0']
+
+
+@pytest.mark.asyncio
+async def test_chunk_filters_support_operators(basket: DocBasket, tmp_path: Path) -> None:
+    documents = []
+    for number in range(6):
+        source = tmp_path / f"chunks{number}.txt"
+        source.write_text(f"Report {number}: banana shipping and banana storage. Cherry pricing follows.")
+        documents.append(basket.add(str(source), metadata={'priority': number, 'region': f"EU-{number}"}))
+
+    processor = ChunkedVectorIndexingProcessor(
+        embedding_fn=embed, db=basket.db, batch_embedding=True, include_metadata=False,
+        chunking_strategy=FixedSizeChunking(ChunkingConfig(chunk_size=60, chunk_overlap=0, min_chunk_size=10)),
+    )
+    assert all(result.success for result in await processor.process_many(documents))
+
+    doc_ex = Mock(spec=DocEX)
+    doc_ex.get_basket = Mock(return_value=basket)
+    service = SemanticSearchService(
+        doc_ex=doc_ex, embedding_fn=embed, db=basket.db, batch_embedding=True,
+        vector_db_config={'chunks': processor.vector_db['chunks']},
+    )
+
+    filters = {'priority': {'gte': 4}, 'region': {'prefix': 'EU-'}}
+    hits = await service.search('banana', top_k=5, filters=filters, granularity='chunk', use_cache=False)
+    assert hits and {hit.document.id for hit in hits} == {documents[4].id, documents[5].id}
+    assert all(hit.chunk is not None for hit in hits)
+
+    records = await service.search_records('banana', top_k=5, filters=filters, granularity='chunk')
+    assert {record.record.id for record in records} == {documents[4].id, documents[5].id}
+
+    hits = await service.search(
+        'banana', top_k=5, filters={'priority': {'in': [1, 3]}}, granularity='chunk', use_cache=False
+    )
+    assert {hit.document.id for hit in hits} == {documents[1].id, documents[3].id}
+
+
+@pytest.mark.asyncio
+async def test_pgvector_filters_are_pushed_into_sql_and_widen_the_scan() -> None:
+    session = MagicMock()
+    statements = []
+
+    def execute(statement, params=None):
+        statements.append((str(statement), params or {}))
+        # Every page returns one row: the filter leaves fewer rows than the limit
+        return Mock(fetchall=Mock(return_value=[('doc_1', 'bas_1', 0.9)]), scalar=Mock(return_value='public'))
+
+    session.execute = Mock(side_effect=execute)
+    db = Mock()
+    db.session = Mock(return_value=MagicMock(__enter__=Mock(return_value=session)))
+    basket = Mock()
+    basket.get_documents = Mock(return_value=[SimpleNamespace(id='doc_1')])
+    doc_ex = Mock(spec=DocEX)
+    doc_ex.get_basket = Mock(return_value=basket)
+    service = SemanticSearchService(
+        doc_ex=doc_ex, embedding_fn=lambda text: [0.1, 0.2], vector_db_type='pgvector', db=db,
+    )
+    service.vector_db = {'type': 'pgvector', 'db': db}
+
+    hits = await service.search('query', top_k=5, filters={'category': 'support'})
+
+    assert [hit.document.id for hit in hits] == ['doc_1']
+    searches = [(sql, params) for sql, params in statements if 'ORDER BY' in sql]
+    assert 'd.id IN (SELECT document_metadata.document_id' in searches[0][0]
+    # Values are compared JSON-encoded, as the metadata write path stores them
+    assert '"support"' in searches[0][1].values()
+    assert [params['limit'] for _, params in searches] == [10, 20, 40, 80, 160, 320, 640, 1000]
+    assert [sql for sql, _ in statements if 'ef_search' in sql] == [
+        f"SET LOCAL hnsw.ef_search = {ef}" for ef in (80, 160, 320, 640, 1000)
+    ]
@@ -0,0 +1,72 @@
+"""Tests for hydrating semantic search hits with a constant number of queries."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+from sqlalchemy import event
+
+from docex import DocEX
+from docex.docbasket import DocBasket
+from docex.models.records import DocumentRecord
+from docex.processors.vector import SemanticSearchService, VectorIndexingProcessor
+
+
+def embed(texts):
+    """Batched toy embedding: the document number and a constant"""
+    return [[float(text.split()[1]) + 1.0, 10.0] for text in texts]
+
+
+async def _indexed_service(basket: DocBasket, tmp_path: Path) -> SemanticSearchService:
+    documents = []
+    for number in range(50):
+        source = tmp_path / f"doc{number}.txt"
+        source.write_text(f"doc {number} text")
+        documents.append(basket.add(str(source)))
+    processor = VectorIndexingProcessor(
+        embedding_fn=embed, vector_db_type='memory', db=basket.db, batch_embedding=True,
+        include_metadata=False, store_in_metadata=False,
+    )
+    assert all(result.success for result in await processor.process_many(documents))
+
+    doc_ex = Mock(spec=DocEX)
+    doc_ex.get_basket = Mock(return_value=basket)
+    return SemanticSearchService(
+        doc_ex=doc_ex, embedding_fn=lambda text: [0.0, 1.0], vector_db_type='memory',
+        vector_db_config={'vectors': processor.vector_db['vectors'], 'index': processor.vector_db['index']},
+        db=basket.db,
+    )
+
+
+def _count_queries(basket: DocBasket) -> list:
+    statements = []
+    event.listen(basket.db.engine, 'before_cursor_execute', lambda *args: statements.append(args[2]))
+    return statements
+
+
+@pytest.mark.asyncio
+async def test_top_50_hydrates_with_one_query(basket: DocBasket, tmp_path: Path) -> None:
+    service = await _indexed_service(basket, tmp_path)
+    statements = _count_queries(basket)
+
+    hits = await service.search('query', top_k=50, use_cache=False)
+
+    assert len(hits) == 50
+    assert len(statements) == 1
+    assert 'IN' in statements[0]
+
+
+@pytest.mark.asyncio
+async def test_search_records_returns_document_records(basket: DocBasket, tmp_path: Path) -> None:
+    service = await _indexed_service(basket, tmp_path)
+    statements = _count_queries(basket)
+
+    hits = await service.search_records('query', top_k=5)
+
+    assert len(statements) == 1
+    assert all(isinstance(hit.record, DocumentRecord) for hit in hits)
+    assert [hit.record.name for hit in hits] == [f"doc{number}.txt" for number in range(5)]
+    assert {hit.basket_id for hit in hits} == {basket.id}
+    assert hits[0].similarity_score >= hits[-1].similarity_score
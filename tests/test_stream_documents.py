@@ -0,0 +1,60 @@
+"""Tests for DocBasket.stream_documents full-basket scans."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from sqlalchemy import event
+
+from docex.docbasket import DocBasket
+
+
+@pytest.fixture
+def basket(basket: DocBasket, tmp_path: Path) -> DocBasket:
+    sources = tmp_path / 'src'
+    sources.mkdir()
+    paths = []
+    for index in range(12):
+        path = sources / f"doc_{index:02d}.txt"
+        path.write_text(f"document body {index}")
+        paths.append(path)
+    basket.add_many(paths)
+    return basket
+
+
+def _capture_statements(basket: DocBasket, consume) -> list:
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)  # noqa: E731
+    event.listen(basket.db.engine, 'before_cursor_execute', listener)
+    try:
+        consume()
+    finally:
+        event.remove(basket.db.engine, 'before_cursor_execute', listener)
+    return statements
+
+
+def test_stream_documents_defers_content_columns(basket: DocBasket) -> None:
+    streamed = []
+    statements = _capture_statements(
+        basket, lambda: streamed.extend(basket.stream_documents(batch_size=5))
+    )
+
+    assert sorted(doc.id for doc in streamed) == sorted(doc.id for doc in basket.list_documents())
+    assert len(statements) == 1
+    assert 'raw_content' not in statements[0]
+    assert streamed[0].get_content(mode='text').startswith('document body')
+
+
+def test_stream_documents_with_columns_yields_dicts(basket: DocBasket) -> None:
+    rows = list(basket.stream_documents(columns=['id', 'name', 'size'], batch_size=4))
+
+    assert len(rows) == 12
+    assert set(rows[0]) == {'id', 'name', 'size'}
+    assert [row['id'] for row in rows] == sorted(row['id'] for row in rows)
+
+
+def test_stream_documents_can_include_content(basket: DocBasket) -> None:
+    document = next(basket.stream_documents(include_content=True))
+
+    assert document.model.raw_content.startswith('document body')
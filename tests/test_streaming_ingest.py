@@ -0,0 +1,50 @@
+"""Tests for streaming ingest into baskets that do not store content in the database."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from sqlalchemy import select
+
+from docex.db.connection import Database
+from docex.db.models import Document as DocumentModel
+from docex.docbasket import DocBasket
+
+
+def _basket(db: Database, tmp_path: Path, name: str, **options) -> DocBasket:
+    storage_config = {'type': 'filesystem', 'path': str(tmp_path / name), **options}
+    return DocBasket.create(name, storage_config=storage_config, db=db)
+
+
+def test_streaming_basket_skips_content_columns(sqlite_db: Database, tmp_path: Path, monkeypatch) -> None:
+    source = tmp_path / 'report.txt'
+    source.write_text("line one\r\nline two\n" * 1000)
+    streaming = _basket(sqlite_db, tmp_path, 'streaming', store_content=False, ingest_chunk_size=64)
+    assert streaming.store_content is False
+
+    def fail(*args, **kwargs):
+        raise AssertionError("streaming ingest must not read whole files")
+
+    with monkeypatch.context() as patched:
+        patched.setattr(Path, 'read_text', fail)
+        patched.setattr(Path, 'read_bytes', fail)
+        document = streaming.add(str(source))
+
+    with sqlite_db.session() as session:
+        row = session.execute(select(DocumentModel).where(DocumentModel.id == document.id)).scalar_one()
+        assert row.raw_content is None
+        assert row.content == {'content': None}
+    assert document.get_content(mode='bytes') == source.read_bytes()
+
+
+def test_streaming_checksum_matches_buffered_ingest(sqlite_db: Database, tmp_path: Path) -> None:
+    source = tmp_path / 'scan.pdf'
+    source.write_bytes(b'%PDF-1.4\x00' + bytes(range(256)) * 300)
+    buffered = _basket(sqlite_db, tmp_path, 'buffered')
+    streaming = _basket(sqlite_db, tmp_path, 'streaming', store_content=False, ingest_chunk_size=100)
+
+    first = buffered.add(str(source))
+    second = streaming.add(str(source))
+
+    assert second.model.checksum == first.model.checksum
+    assert second.model.size == first.model.size == source.stat().st_size
@@ -0,0 +1,117 @@
+"""Tests for process-pool text extraction."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+
+from docex.docbasket import DocBasket
+from docex.document import Document
+from docex.services.text_extraction_service import ExtractedText, TextExtractionService
+
+
+def worker_pid(stream):
+    """Extractor reporting which process parsed the document"""
+    return stream.read().decode(), {'pid': os.getpid()}
+
+
+def hang(stream):
+    time.sleep(30)
+    return '', {}
+
+
+def _document(name: str, content: bytes) -> Document:
+    """Document kept on a non-filesystem storage backend"""
+    storage_service = Mock()
+    storage_service.retrieve_document.return_value = content
+    return Document(
+        id='doc_remote', name=name, path=f"bucket/{name}", content_type='text/plain', document_type='file',
+        size=len(content), checksum='', status='ACTIVE', created_at=None, updated_at=None,
+        storage_service=storage_service,
+    )
+
+
+@pytest.mark.asyncio
+async def test_filesystem_documents_are_extracted_by_path_in_workers(basket: DocBasket, tmp_path: Path) -> None:
+    documents = []
+    for number in range(6):
+        source = tmp_path / f"doc{number}.txt"
+        source.write_text(f"text of document {number}")
+        documents.append(basket.add(str(source)))
+
+    with TextExtractionService(max_workers=2, extractors={'.txt': worker_pid}) as service:
+        results = await service.extract_many(documents)
+
+    assert [result.text for result in results] == [f"text of document {number}" for number in range(6)]
+    assert all(result.success for result in results)
+    assert os.getpid() not in {result.stats['pid'] for result in results}
+
+
+@pytest.mark.asyncio
+async def test_remote_documents_are_handed_over_in_shared_memory() -> None:
+    document = _document('remote.txt', 'héllo from s3'.encode())
+
+    with TextExtractionService(max_workers=1) as service:
+        result = await service.extract(document)
+
+    assert result.text == 'héllo from s3'
+    assert result.stats == {'input_format': 'text'}
+
+
+@pytest.mark.asyncio
+async def test_timeout_frees_the_worker() -> None:
+    with TextExtractionService(max_workers=1, timeout=0.5, extractors={'.bin': hang}) as service:
+        timed_out = await service.extract(_document('slow.bin', b'x'))
+        after = await service.extract(_document('fast.txt', b'done'))
+
+    assert 'timed out' in timed_out.error
+    assert timed_out.seconds < 5
+    assert after.text == 'done'
+
+
+@pytest.mark.asyncio
+async def test_unsupported_type_is_reported() -> None:
+    service = TextExtractionService(max_workers=1)
+
+    result = await service.extract(_document('image.png', b'\x89PNG'))
+
+    assert not result.success
+    assert not service.supports(_document('image.png', b''))
+    assert service._pool is None
+
+
+@pytest.mark.asyncio
+async def test_iter_extracted_keeps_a_bounded_number_of_documents_in_flight() -> None:
+    service = TextExtractionService(max_workers=1)
+    in_flight, peak, pulled = 0, 0, []
+
+    async def extract(number):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01 * (number % 3))
+        in_flight -= 1
+        return ExtractedText(str(number), text=str(number))
+
+    def documents():
+        for number in range(20):
+            pulled.append(number)
+            yield number
+
+    service.extract = extract
+    seen = []
+    async for extracted in service.iter_extracted(documents(), concurrency=3):
+        if not seen:
+            # Documents are taken from the iterator as extractions finish
+            assert len(pulled) < 20
+        seen.append(extracted.document_id)
+
+    assert peak == 3
+    assert sorted(seen, key=int) == [str(number) for number in range(20)]
+    results = await service.extract_many(documents(), concurrency=3)
+    assert [result.document_id for result in results] == [str(number) for number in range(20)]
@@ -0,0 +1,122 @@
+"""Tests for typed metadata columns and range/prefix metadata queries."""
+
+from __future__ import annotations
+
+from datetime import date, datetime, timezone
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, inspect, text, update
+
+from docex.db.models import DocumentMetadata
+from docex.db.schema_upgrade import ensure_model_columns
+from docex.docbasket import DocBasket
+from docex.services.metadata_service import MetadataService, typed_metadata_values
+
+INVOICES = [
+    {'amount': 1000, 'due_date': '2024-01-15', 'vendor': 'ACME_Corp', 'invoice_number': 'INV-2024-001'},
+    {'amount': 1500.5, 'due_date': '2024-02-20', 'vendor': 'ACME Tools', 'invoice_number': 'INV-2024-002'},
+    {'amount': 250, 'due_date': date(2024, 3, 31), 'vendor': 'Globex', 'invoice_number': 'INV-2023-117'},
+    {'amount': 99999, 'due_date': datetime(2024, 6, 1, 12, tzinfo=timezone.utc), 'vendor': 'Initech', 'invoice_number': 'PO-77'},
+]
+
+
+@pytest.fixture
+def basket(basket: DocBasket, tmp_path: Path) -> DocBasket:
+    sources = tmp_path / 'src'
+    sources.mkdir()
+    paths = []
+    for index in range(len(INVOICES)):
+        path = sources / f"invoice_{index}.txt"
+        path.write_text(f"invoice {index}")
+        paths.append(path)
+    basket.add_many(paths, metadata=[dict(invoice) for invoice in INVOICES])
+    return basket
+
+
+def _invoice_numbers(basket: DocBasket, metadata) -> list:
+    documents = basket.find_documents_by_metadata(metadata)
+    return sorted(doc.get_metadata()['invoice_number'] for doc in documents)
+
+
+def test_typed_metadata_values() -> None:
+    assert typed_metadata_values(1000) == {'value_num': 1000.0, 'value_ts': None, 'value_text': None}
+    assert typed_metadata_values(True) == {'value_num': None, 'value_ts': None, 'value_text': None}
+    assert typed_metadata_values('2024-05-01T10:00:00+02:00')['value_ts'] == datetime(2024, 5, 1, 8)
+    assert typed_metadata_values('x' * 300)['value_text'] == 'x' * 255
+
+
+def test_numeric_operators(basket: DocBasket) -> None:
+    assert _invoice_numbers(basket, {'amount': {'gt': 1000}}) == ['INV-2024-002', 'PO-77']
+    assert _invoice_numbers(basket, {'amount': {'gte': 250, 'lt': 1500}}) == ['INV-2023-117', 'INV-2024-001']
+    assert _invoice_numbers(basket, {'amount': 1000.0}) == ['INV-2024-001']
+    assert _invoice_numbers(basket, {'amount': {'in': [250, 99999]}}) == ['INV-2023-117', 'PO-77']
+
+
+def test_date_range_matches_strings_dates_and_datetimes(basket: DocBasket) -> None:
+    first_quarter = {'due_date': {'between': ['2024-02-01', date(2024, 3, 31)]}}
+
+    assert _invoice_numbers(basket, first_quarter) == ['INV-2023-117', 'INV-2024-002']
+    assert _invoice_numbers(basket, {'due_date': {'gt': datetime(2024, 4, 1)}}) == ['PO-77']
+
+
+def test_prefix_and_in_on_text(basket: DocBasket) -> None:
+    assert _invoice_numbers(basket, {'invoice_number': {'prefix': 'INV-2024'}}) == ['INV-2024-001', 'INV-2024-002']
+    # '_' is matched literally, not as a LIKE wildcard
+    assert _invoice_numbers(basket, {'vendor': {'prefix': 'ACME_'}}) == ['INV-2024-001']
+    assert _invoice_numbers(basket, {'vendor': {'in': ['Globex', 'Initech']}}) == ['INV-2023-117', 'PO-77']
+    assert basket.count_documents_by_metadata({'vendor': {'prefix': 'ACME'}, 'amount': {'lt': 1200}}) == 1
+
+
+def test_invalid_operands_raise(basket: DocBasket) -> None:
+    with pytest.raises(ValueError):
+        basket.find_documents_by_metadata({'amount': {'between': [1, '2024-01-01']}})
+    with pytest.raises(ValueError):
+        basket.find_documents_by_metadata({'vendor': {'prefix': 5}})
+
+
+def test_update_metadata_refreshes_typed_columns(basket: DocBasket) -> None:
+    document = basket.find_documents_by_metadata({'invoice_number': 'PO-77'})[0]
+
+    MetadataService(basket.db).update_metadata(document.id, {'amount': 5, 'vendor': 'Umbrella'})
+
+    assert _invoice_numbers(basket, {'amount': {'lt': 10}}) == ['PO-77']
+    assert _invoice_numbers(basket, {'vendor': {'prefix': 'Umb'}}) == ['PO-77']
+
+
+def test_backfill_typed_values(basket: DocBasket) -> None:
+    with basket.db.transaction() as session:
+        session.execute(update(DocumentMetadata).values(value_num=None, value_ts=None, value_text=None))
+    assert _invoice_numbers(basket, {'amount': {'gt': 1000}}) == []
+    # Equality still matches rows that have not been backfilled yet
+    assert _invoice_numbers(basket, {'amount': 250}) == ['INV-2023-117']
+    assert _invoice_numbers(basket, {'vendor': 'Globex'}) == ['INV-2023-117']
+
+    assert MetadataService(basket.db).backfill_typed_values(batch_size=3) > 0
+    assert _invoice_numbers(basket, {'amount': {'gt': 1000}}) == ['INV-2024-002', 'PO-77']
+
+
+def test_schema_upgrade_adds_typed_columns_and_indexes(tmp_path: Path) -> None:
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE document_metadata (id VARCHAR(36) PRIMARY KEY, document_id VARCHAR(36) NOT NULL, "
+            "key VARCHAR(255) NOT NULL, value TEXT NOT NULL, metadata_type VARCHAR(50) NOT NULL, "
+            "coordination_id CHAR(32), created_at DATETIME NOT NULL, updated_at DATETIME NOT NULL)"
+        ))
+        conn.execute(text(
+            "INSERT INTO document_metadata VALUES ('m1', 'd1', 'amount', '42', 'custom', NULL, "
+            "'2024-01-01 00:00:00', '2024-01-01 00:00:00')"
+        ))
+
+    added = ensure_model_columns(engine, [DocumentMetadata.__table__])
+
+    assert sorted(added) == [
+        'document_metadata.value_num', 'document_metadata.value_text', 'document_metadata.value_ts'
+    ]
+    index_names = {index['name'] for index in inspect(engine).get_indexes('document_metadata')}
+    assert {'idx_document_metadata_key_num', 'idx_document_metadata_key_ts', 'idx_document_metadata_key_text'} <= index_names
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT value_num FROM document_metadata WHERE id = 'm1'")).scalar() == 42.0
+    assert ensure_model_columns(engine, [DocumentMetadata.__table__]) == []
+    engine.dispose()
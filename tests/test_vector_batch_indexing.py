@@ -0,0 +1,122 @@
+"""Tests for batched embeddings and VectorIndexingProcessor.process_many."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+from sqlalchemy import func, select
+
+from docex.db.models import ProcessingOperation
+from docex.docbasket import DocBasket
+from docex.processors.vector import VectorIndexingProcessor
+from docex.processors.vector.embeddings import resolve_embedding, resolve_embeddings
+from docex.services.metadata_service import MetadataService
+
+
+def _add_documents(basket: DocBasket, directory: Path, texts: list) -> list:
+    directory.mkdir()
+    paths = []
+    for index, text in enumerate(texts):
+        path = directory / f"doc_{index}.txt"
+        path.write_text(text)
+        paths.append(path)
+    return basket.add_many(paths, metadata=[{'vendor_name': f"Vendor {index}"} for index in range(len(texts))])
+
+
+class BatchEmbedder:
+    """Batched embedding function that records the size of every call"""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, texts):
+        self.calls.append(len(texts))
+        return np.array([[float(len(text)), 1.0, 0.0] for text in texts], dtype=np.float32)
+
+
+@pytest.mark.asyncio
+async def test_resolve_embeddings_accepts_batched_and_single_text_functions() -> None:
+    embedder = BatchEmbedder()
+    assert await resolve_embeddings(embedder, ['a', 'bbb'], batched=True) == [[1.0, 1.0, 0.0], [3.0, 1.0, 0.0]]
+    assert await resolve_embedding(embedder, 'cc', batched=True) == [2.0, 1.0, 0.0]
+    assert embedder.calls == [2, 1]
+
+    async def embed_one(text):
+        return [float(len(text))]
+
+    assert await resolve_embeddings(embed_one, ['a', 'bb']) == [[1.0], [2.0]]
+    with pytest.raises(ValueError, match="one embedding per text"):
+        await resolve_embeddings(lambda texts: [[1.0]], ['a', 'b'], batched=True)
+
+
+@pytest.mark.asyncio
+async def test_process_many_embeds_and_writes_per_batch(basket: DocBasket, tmp_path: Path) -> None:
+    documents = _add_documents(basket, tmp_path / 'src', ['alpha', 'beta', '   ', 'gamma', 'delta'])
+    embedder = BatchEmbedder()
+    processor = VectorIndexingProcessor(embedding_fn=embedder, db=basket.db, batch_embedding=True)
+
+    results = await processor.process_many(documents, batch_size=3)
+
+    assert [result.success for result in results] == [True, True, False, True, True]
+    assert results[2].error == "No text content available for indexing"
+    assert embedder.calls == [2, 2]
+    vectors = processor.vector_db['vectors']
+    assert set(vectors) == {documents[i].id for i in (0, 1, 3, 4)}
+    assert all(entry['basket_id'] == basket.id for entry in vectors.values())
+    assert vectors[documents[0].id]['text_preview'] == 'alpha'
+    assert set(processor.vector_db['index'].ids) == set(vectors)
+
+    metadata = MetadataService(basket.db).get_metadata_bulk([doc.id for doc in documents])
+    assert metadata[documents[0].id]['vector_indexed'] is True
+    assert metadata[documents[0].id]['embedding_dimension'] == 3
+    assert metadata[documents[0].id]['vendor_name'] == 'Vendor 0'
+    assert 'vector_indexed' not in metadata[documents[2].id]
+
+    with basket.db.session() as session:
+        statuses = session.execute(
+            select(ProcessingOperation.status, func.count()).group_by(ProcessingOperation.status)
+        ).all()
+    assert dict(statuses) == {'in_progress': 5, 'success': 4, 'failed': 1}
+
+
+@pytest.mark.asyncio
+async def test_process_many_failed_embedding_fails_whole_batch(basket: DocBasket, tmp_path: Path) -> None:
+    documents = _add_documents(basket, tmp_path / 'src', ['alpha', 'beta'])
+
+    def broken(texts):
+        raise RuntimeError("model unavailable")
+
+    processor = VectorIndexingProcessor(embedding_fn=broken, db=basket.db, batch_embedding=True)
+    results = await processor.process_many(documents)
+
+    assert [result.error for result in results] == ["model unavailable", "model unavailable"]
+    assert processor.vector_db['vectors'] == {}
+
+
+@pytest.mark.asyncio
+async def test_indexing_refreshes_cached_document_metadata(basket: DocBasket, tmp_path: Path) -> None:
+    documents = _add_documents(basket, tmp_path / 'src', ['alpha', 'beta', 'gamma'])
+    assert all('vector_indexed' not in doc.get_metadata() for doc in documents)
+    processor = VectorIndexingProcessor(embedding_fn=BatchEmbedder(), db=basket.db, batch_embedding=True)
+
+    await processor.process(documents[0])
+    await processor.process_many(documents[1:])
+
+    assert all(doc.get_metadata()['vector_indexed'] is True for doc in documents)
+
+
+def test_update_metadata_bulk_inserts_and_updates(basket: DocBasket, tmp_path: Path) -> None:
+    documents = _add_documents(basket, tmp_path / 'src', ['one', 'two'])
+    service = MetadataService(basket.db)
+
+    service.update_metadata_bulk({
+        documents[0].id: {'vendor_name': 'Renamed', 'amount': 10},
+        documents[1].id: {'amount': 2500},
+    })
+
+    metadata = service.get_metadata_bulk([doc.id for doc in documents])
+    assert metadata[documents[0].id]['vendor_name'] == 'Renamed'
+    assert metadata[documents[1].id] == {'vendor_name': 'Vendor 1', 'amount': 2500, 'original_filename': 'doc_1.txt'}
+    assert [doc.id for doc in basket.find_documents_by_metadata({'amount': {'gt': 100}})] == [documents[1].id]